@@ -30,7 +30,7 @@ import re
 import lisa._btf as btf
 
 
-def process_btf(out, path, introspect, internal_type_prefix, define_typ_names):
+def process_btf(out, path, introspect, internal_type_prefix, define_typ_names, cache_dir=None):
     with open(path, 'rb') as f:
         data = f.read()
 
@@ -42,7 +42,12 @@ def process_btf(out, path, introspect, internal_type_prefix, define_typ_names):
     # one of those type is a type we asked for in define_typs, there is not
     # much we can do since we would not be able to know which one is to elect
     # as the one we want.
-    typs = btf.parse_btf(data)
+    if introspect:
+        typs = btf.parse_btf(data, cache_dir=cache_dir)
+    # If we don't need introspection information for all types, only
+    # materialize the ones we are going to define.
+    else:
+        typs = btf.parse_btf(data, select_names=define_typ_names, cache_dir=cache_dir)
 
     if define_typ_names:
         define_typ_names = set(define_typ_names)
@@ -255,6 +260,7 @@ def main():
 
     parser.add_argument('--introspect', action='store_true', help='Create introspection macros for the given --btf or --kallsyms')
     parser.add_argument('--internal-type-prefix', help='Add the given prefix to the types found in --btf and dump the resulting renamed C header')
+    parser.add_argument('--btf-cache-dir', help='Folder used to cache the types parsed from --btf, so that parsing the same blob again is faster')
 
     parser.add_argument('--kallsyms', help='kallsyms content to parse')
     parser.add_argument('--conf', help='JSON configuration')
@@ -279,7 +285,7 @@ def main():
 
     try:
         if args.btf:
-            process_btf(out, args.btf, args.introspect, args.internal_type_prefix, conf.get('btf-types', []))
+            process_btf(out, args.btf, args.introspect, args.internal_type_prefix, conf.get('btf-types', []), cache_dir=args.btf_cache_dir)
 
         if args.kallsyms and args.introspect:
             dump_records(process_kallsyms_introspection(args.kallsyms))
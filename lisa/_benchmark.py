@@ -0,0 +1,737 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (C) 2026, ARM Limited and contributors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Benchmark suite for the trace parsing and analysis hot paths.
+
+The traces are generated by :class:`SyntheticTrace`, which simulates a very
+simple scheduler so that the analyses get coherent data to work on. The same
+events can be written both as a text trace in the format of ``trace-cmd report
+-R`` and as a ``trace.dat`` file, so that the text and binary parsers can be
+compared on the same data.
+"""
+
+import os
+import sys
+import time
+import math
+import struct
+import random
+import fnmatch
+import functools
+import platform
+import tempfile
+import contextlib
+import statistics
+import multiprocessing
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from lisa.trace import Trace, TxtTraceParser, TraceDatParser, TraceCache, MissingTraceEventError
+from lisa.utils import Loggable, measure_time
+from lisa.version import VERSION_TOKEN
+from lisa._git import get_sha1
+
+
+class _Field(namedtuple('_Field', ('decl', 'name', 'size', 'signed', 'fmt'))):
+    """
+    Field of a synthetic event.
+
+    :param decl: C declaration of the field, as it appears in the event
+        format stored in ``trace.dat`` files.
+    :param fmt: :mod:`struct` format used to pack the value, or ``None`` for
+        ``char`` arrays.
+    """
+    __slots__ = []
+
+    @classmethod
+    def scalar(cls, ctype, name, size, signed):
+        fmt = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}[size]
+        fmt = fmt if signed else fmt.upper()
+        return cls(f'{ctype} {name}', name, size, signed, fmt)
+
+    @classmethod
+    def char_array(cls, name, size):
+        return cls(f'char {name}[{size}]', name, size, True, None)
+
+
+_COMMON_FIELDS = [
+    _Field.scalar('unsigned short', 'common_type', 2, False),
+    _Field.scalar('unsigned char', 'common_flags', 1, False),
+    _Field.scalar('unsigned char', 'common_preempt_count', 1, False),
+    _Field.scalar('int', 'common_pid', 4, True),
+]
+
+_TASK_COMM_LEN = 16
+_PATH_LEN = 64
+
+
+class SyntheticTrace(Loggable):
+    """
+    Synthetic trace generator.
+
+    :param nr_events: Number of events in the trace.
+    :type nr_events: int
+
+    :param events: Mapping of event names to their relative frequency in the
+        trace. If ``None``, :attr:`DEFAULT_EVENTS` is used.
+    :type events: dict(str, float) or None
+
+    :param nr_cpus: Number of CPUs of the simulated system.
+    :type nr_cpus: int
+
+    :param nr_tasks: Number of tasks of the simulated system.
+    :type nr_tasks: int
+
+    :param seed: Seed of the random number generator. The same seed gives the
+        same trace.
+    :type seed: int
+
+    The tasks are woken up on a random CPU and are scheduled in FIFO order
+    when a ``sched_switch`` event occurs on that CPU. The task being switched
+    out either goes to sleep or is preempted.
+    """
+
+    DEFAULT_EVENTS = {
+        'sched_switch': 40,
+        'sched_wakeup': 25,
+        'lisa__sched_pelt_se': 15,
+        'lisa__sched_pelt_cfs': 5,
+        'cpu_idle': 10,
+        'cpu_frequency': 5,
+    }
+    """
+    Default event mix.
+    """
+
+    EVENT_FIELDS = {
+        'sched_switch': [
+            _Field.char_array('prev_comm', _TASK_COMM_LEN),
+            _Field.scalar('pid_t', 'prev_pid', 4, True),
+            _Field.scalar('int', 'prev_prio', 4, True),
+            _Field.scalar('long', 'prev_state', 8, True),
+            _Field.char_array('next_comm', _TASK_COMM_LEN),
+            _Field.scalar('pid_t', 'next_pid', 4, True),
+            _Field.scalar('int', 'next_prio', 4, True),
+        ],
+        'sched_wakeup': [
+            _Field.char_array('comm', _TASK_COMM_LEN),
+            _Field.scalar('pid_t', 'pid', 4, True),
+            _Field.scalar('int', 'prio', 4, True),
+            _Field.scalar('int', 'target_cpu', 4, True),
+        ],
+        'cpu_idle': [
+            _Field.scalar('u32', 'state', 4, False),
+            _Field.scalar('u32', 'cpu_id', 4, False),
+        ],
+        'cpu_frequency': [
+            _Field.scalar('u32', 'state', 4, False),
+            _Field.scalar('u32', 'cpu_id', 4, False),
+        ],
+        'lisa__sched_pelt_se': [
+            _Field.scalar('int', 'cpu', 4, True),
+            _Field.char_array('path', _PATH_LEN),
+            _Field.char_array('comm', _TASK_COMM_LEN),
+            _Field.scalar('int', 'pid', 4, True),
+            _Field.scalar('unsigned long', 'load', 8, False),
+            _Field.scalar('unsigned long', 'rbl_load', 8, False),
+            _Field.scalar('unsigned long', 'util', 8, False),
+            _Field.scalar('unsigned long long', 'update_time', 8, False),
+        ],
+        'lisa__sched_pelt_cfs': [
+            _Field.scalar('int', 'cpu', 4, True),
+            _Field.char_array('path', _PATH_LEN),
+            _Field.scalar('unsigned long', 'load', 8, False),
+            _Field.scalar('unsigned long', 'rbl_load', 8, False),
+            _Field.scalar('unsigned long', 'util', 8, False),
+            _Field.scalar('unsigned long long', 'update_time', 8, False),
+        ],
+    }
+    """
+    Fields of the events that can be generated.
+    """
+
+    FREQUENCIES = [500000, 1000000, 1500000, 2000000]
+    """
+    Frequencies in kHz used in ``cpu_frequency`` events.
+    """
+
+    START_TIME = 100
+    """
+    Timestamp in seconds of the first event.
+    """
+
+    _PAGE_SIZE = 4096
+    _PAGE_DATA_OFFSET = 16
+    _MAX_SMALL_RECORD = 28 * 4
+
+    def __init__(self, nr_events, events=None, nr_cpus=8, nr_tasks=100, seed=0):
+        events = dict(events or self.DEFAULT_EVENTS)
+        unknown = events.keys() - self.EVENT_FIELDS.keys()
+        if unknown:
+            raise ValueError(f'Unsupported events: {", ".join(sorted(unknown))}. Supported events: {", ".join(sorted(self.EVENT_FIELDS.keys()))}')
+
+        self.nr_events = int(nr_events)
+        self.events = events
+        self.nr_cpus = nr_cpus
+        self.nr_tasks = nr_tasks
+        self.seed = seed
+
+    @property
+    def comms(self):
+        """
+        Mapping of PIDs to task names.
+        """
+        return {
+            pid: f'task{pid}'
+            for pid in range(1000, 1000 + self.nr_tasks)
+        }
+
+    def iter_events(self):
+        """
+        Iterate over the events of the trace.
+
+        :returns: An iterator of tuples ``(ts, cpu, pid, event, values)``
+            where ``ts`` is a timestamp in nanoseconds, ``pid`` is the PID
+            of the task running on ``cpu`` and ``values`` is the list of the
+            values of the fields of the event in :attr:`EVENT_FIELDS` order.
+        """
+        rng = random.Random(self.seed)
+        nr_cpus = self.nr_cpus
+        comms = self.comms
+
+        def comm(pid, cpu):
+            return comms[pid] if pid else f'swapper/{cpu}'
+
+        sleeping = list(comms.keys())
+        runqueues = [[] for _ in range(nr_cpus)]
+        curr = [0] * nr_cpus
+        idle = [True] * nr_cpus
+        pelt = {pid: rng.randrange(1024) for pid in comms.keys()}
+        # Events are spaced by at least 1us, so that the timestamps are
+        # exactly represented with the 6 digits of the text format and are
+        # unique.
+        ts = self.START_TIME * 10**9
+
+        def sched_switch(cpu):
+            prev = curr[cpu]
+            runqueue = runqueues[cpu]
+            if runqueue:
+                next_ = runqueue.pop(0)
+                if prev and rng.random() < 0.5:
+                    runqueue.append(prev)
+                    prev_state = 0
+                elif prev:
+                    sleeping.append(prev)
+                    prev_state = 1
+                else:
+                    prev_state = 0
+            elif prev:
+                next_ = 0
+                sleeping.append(prev)
+                prev_state = 1
+            else:
+                return None
+
+            curr[cpu] = next_
+            return [comm(prev, cpu), prev, 120, prev_state, comm(next_, cpu), next_, 120]
+
+        def sched_wakeup(cpu):
+            if not sleeping:
+                return None
+            pid = sleeping.pop(rng.randrange(len(sleeping)))
+            target_cpu = rng.randrange(nr_cpus)
+            runqueues[target_cpu].append(pid)
+            return [comms[pid], pid, 120, target_cpu]
+
+        def cpu_idle(cpu):
+            idle[cpu] = not idle[cpu]
+            return [0 if idle[cpu] else 2**32 - 1, cpu]
+
+        def cpu_frequency(cpu):
+            return [rng.choice(self.FREQUENCIES), cpu]
+
+        def lisa__sched_pelt_se(cpu):
+            pid = curr[cpu]
+            if not pid:
+                return None
+            util = min(1024, max(0, pelt[pid] + rng.randrange(-32, 33)))
+            pelt[pid] = util
+            return [cpu, '(null)', comms[pid], pid, util, util, util, ts]
+
+        def lisa__sched_pelt_cfs(cpu):
+            util = min(1024, sum(pelt[pid] for pid in runqueues[cpu]))
+            return [cpu, '/', util, util, util, ts]
+
+        generators = {
+            'sched_switch': sched_switch,
+            'sched_wakeup': sched_wakeup,
+            'cpu_idle': cpu_idle,
+            'cpu_frequency': cpu_frequency,
+            'lisa__sched_pelt_se': lisa__sched_pelt_se,
+            'lisa__sched_pelt_cfs': lisa__sched_pelt_cfs,
+        }
+        events = list(self.events.keys())
+        weights = list(self.events.values())
+
+        count = 0
+        while count < self.nr_events:
+            ts += rng.randrange(1, 20) * 1000
+            cpu = rng.randrange(nr_cpus)
+            event = rng.choices(events, weights)[0]
+            # The header is about the task running before the event
+            pid = curr[cpu]
+            values = generators[event](cpu)
+            if values is not None:
+                count += 1
+                yield (ts, cpu, pid, event, values)
+
+    def write_txt(self, path):
+        """
+        Write the trace in the format of ``trace-cmd report -R``.
+        """
+        comms = self.comms
+        with open(path, 'w') as f:
+            f.write(f'cpus={self.nr_cpus}\n')
+            for ts, cpu, pid, event, values in self.iter_events():
+                fields = ' '.join(
+                    f'{field.name}={value}'
+                    for field, value in zip(self.EVENT_FIELDS[event], values)
+                )
+                comm = comms.get(pid, '<idle>')
+                sec, nsec = divmod(ts, 10**9)
+                f.write(f'{comm:>16}-{pid:<5} [{cpu:03}] {sec}.{nsec // 1000:06}: {event}: {fields}\n')
+
+    def write_dat(self, path):
+        """
+        Write the trace as a version 6 ``trace.dat`` file, as recorded by
+        ``trace-cmd record``.
+        """
+        page_size = self._PAGE_SIZE
+        data_size = page_size - self._PAGE_DATA_OFFSET
+        event_ids = {
+            event: i
+            for i, event in enumerate(sorted(self.EVENT_FIELDS.keys()), start=300)
+        }
+        structs = {
+            event: self._make_struct(event)
+            for event in self.EVENT_FIELDS.keys()
+        }
+
+        # For each CPU, the list of pages already filled, the content of the
+        # current page, its timestamp and the timestamp of the last record
+        pages = [[] for _ in range(self.nr_cpus)]
+        current = [None] * self.nr_cpus
+
+        def flush(cpu):
+            page_ts, last_ts, data = current[cpu]
+            header = struct.pack('<QQ', page_ts, len(data))
+            pages[cpu].append(header + data + bytes(data_size - len(data)))
+            current[cpu] = None
+
+        for ts, cpu, pid, event, values in self.iter_events():
+            values = [
+                value.encode('ascii') if isinstance(value, str) else value
+                for value in values
+            ]
+            payload = structs[event].pack(event_ids[event], 0, 0, pid, *values)
+
+            if current[cpu] is None:
+                current[cpu] = (ts, ts, bytearray())
+            page_ts, last_ts, data = current[cpu]
+
+            record = self._make_record(payload, ts - last_ts)
+            # The first record of a new page has a null delta, since the
+            # page header holds its timestamp.
+            if len(data) + len(record) > data_size:
+                flush(cpu)
+                page_ts, last_ts, data = (ts, ts, bytearray())
+                record = self._make_record(payload, 0)
+
+            data += record
+            current[cpu] = (page_ts, ts, data)
+
+        for cpu in range(self.nr_cpus):
+            if current[cpu] is not None:
+                flush(cpu)
+
+        header = self._dat_header(event_ids)
+        # Offset table of the CPU buffers
+        header_size = len(header) + 16 * self.nr_cpus
+        offset = math.ceil(header_size / page_size) * page_size
+
+        buffers = []
+        for cpu_pages in pages:
+            size = len(cpu_pages) * page_size
+            buffers.append((offset, size))
+            offset += size
+
+        with open(path, 'wb') as f:
+            f.write(header)
+            for offset, size in buffers:
+                f.write(struct.pack('<QQ', offset, size))
+            f.write(bytes(buffers[0][0] - header_size))
+            for cpu_pages in pages:
+                for page in cpu_pages:
+                    f.write(page)
+
+    @classmethod
+    def _make_record(cls, payload, delta):
+        record = bytearray()
+        # Time extend record if the delta does not fit in 27 bits
+        if delta >> 27:
+            record += struct.pack('<II', 30 | ((delta & ((1 << 27) - 1)) << 5), delta >> 27)
+            delta = 0
+
+        length = len(payload)
+        if length <= cls._MAX_SMALL_RECORD:
+            record += struct.pack('<I', (length // 4) | (delta << 5))
+        else:
+            record += struct.pack('<II', delta << 5, length + 4)
+        return record + payload
+
+    def _make_struct(self, event):
+        fmt = ''.join(
+            f'{field.size}s' if field.fmt is None else field.fmt
+            for field in _COMMON_FIELDS + self.EVENT_FIELDS[event]
+        )
+        # The records are padded to a multiple of 4 bytes
+        size = struct.calcsize('<' + fmt)
+        pad = -size % 4
+        return struct.Struct('<' + fmt + (f'{pad}x' if pad else ''))
+
+    def _dat_header(self, event_ids):
+        def sized(data, size_len):
+            return len(data).to_bytes(size_len, 'little') + data
+
+        def format_fields(fields, offset=0):
+            lines = []
+            for field in fields:
+                lines.append(f'\tfield:{field.decl};\toffset:{offset};\tsize:{field.size};\tsigned:{int(field.signed)};\n')
+                offset += field.size
+            return ''.join(lines)
+
+        common_size = sum(field.size for field in _COMMON_FIELDS)
+
+        def format_event(event):
+            return (
+                f'name: {event}\n'
+                f'ID: {event_ids[event]}\n'
+                'format:\n'
+                f'{format_fields(_COMMON_FIELDS)}\n'
+                f'{format_fields(self.EVENT_FIELDS[event], offset=common_size)}\n'
+                'print fmt: ""\n'
+            ).encode('ascii')
+
+        header_page = (
+            '\tfield: u64 timestamp;\toffset:0;\tsize:8;\tsigned:0;\n'
+            '\tfield: local_t commit;\toffset:8;\tsize:8;\tsigned:1;\n'
+            '\tfield: int overwrite;\toffset:8;\tsize:1;\tsigned:1;\n'
+            f'\tfield: char data;\toffset:{self._PAGE_DATA_OFFSET};\tsize:{self._PAGE_SIZE - self._PAGE_DATA_OFFSET};\tsigned:1;\n'
+        ).encode('ascii')
+        header_event = (
+            '# compressed entry header\n'
+            '\ttype_len    :    5 bits\n'
+            '\ttime_delta  :   27 bits\n'
+            '\tarray       :   32 bits\n'
+            '\n'
+            '\tpadding     : type == 29\n'
+            '\ttime_extend : type == 30\n'
+            '\ttime_stamp : type == 31\n'
+            '\tdata max type_len  == 28\n'
+        ).encode('ascii')
+
+        systems = {}
+        for event in sorted(self.EVENT_FIELDS.keys()):
+            system = 'lisa' if event.startswith('lisa__') else event.split('_', 1)[0]
+            systems.setdefault(system, []).append(event)
+
+        cmdlines = ''.join(
+            f'{pid} {comm}\n'
+            for pid, comm in self.comms.items()
+        ).encode('ascii')
+
+        header = bytearray()
+        header += TraceDatParser._MAGIC + b'6\0'
+        # Little endian, 8 bytes long, page size
+        header += bytes([0, 8]) + struct.pack('<I', self._PAGE_SIZE)
+        header += b'header_page\0' + sized(header_page, 8)
+        header += b'header_event\0' + sized(header_event, 8)
+        # No ftrace events
+        header += struct.pack('<I', 0)
+        header += struct.pack('<I', len(systems))
+        for system, events in systems.items():
+            header += system.encode('ascii') + b'\0'
+            header += struct.pack('<I', len(events))
+            for event in events:
+                header += sized(format_event(event), 8)
+        # kallsyms and printk formats
+        header += sized(b'', 4)
+        header += sized(b'', 4)
+        header += sized(cmdlines, 8)
+        header += struct.pack('<I', self.nr_cpus)
+        header += b'flyrecord\0'
+        return bytes(header)
+
+
+class _Benchmark(namedtuple('_Benchmark', ('name', 'setup', 'run'))):
+    """
+    Benchmark case.
+
+    :param setup: Called before each run, the return value is passed to
+        ``run``. This part is not timed.
+    :param run: Function timed by the benchmark.
+    """
+    __slots__ = []
+
+
+class BenchmarkSuite(Loggable):
+    """
+    Benchmark suite of the trace parsing and analysis hot paths.
+
+    :param traces: Mapping of trace format (``txt`` or ``dat``) to the path of
+        the trace to use for that format.
+    :type traces: dict(str, str)
+
+    :param repeat: Number of times each benchmark is run. Every run starts
+        from a cold :class:`lisa.trace.Trace`, without any swap area.
+    :type repeat: int
+
+    :param events: Events to benchmark with :meth:`lisa.trace.Trace.df_event`.
+        If ``None``, the events available in the trace are used.
+    :type events: list(str) or None
+    """
+
+    PARSERS = {
+        'txt': TxtTraceParser.from_txt_file,
+        'dat': TraceDatParser,
+    }
+    """
+    Parser used for each trace format.
+    """
+
+    ANALYSES = {
+        'tasks.df_tasks_states': lambda trace: trace.ana.tasks.df_tasks_states(),
+        'tasks.df_tasks_runtime': lambda trace: trace.ana.tasks.df_tasks_runtime(),
+        'tasks.df_tasks_wakeups': lambda trace: trace.ana.tasks.df_tasks_wakeups(),
+        'latency.df_runtimes': lambda trace: trace.ana.latency.df_runtimes(1000),
+        'idle.df_cpus_idle': lambda trace: trace.ana.idle.df_cpus_idle(),
+        'frequency.df_cpus_frequency': lambda trace: trace.ana.frequency.df_cpus_frequency(),
+        'load_tracking.df_tasks_signal': lambda trace: trace.ana.load_tracking.df_tasks_signal('util'),
+        'load_tracking.df_cpus_signal': lambda trace: trace.ana.load_tracking.df_cpus_signal('util'),
+    }
+    """
+    Analysis dataframe getters to benchmark, called with a trace where all the
+    events are already parsed.
+    """
+
+    def __init__(self, traces, repeat=3, events=None):
+        self.traces = traces
+        self.repeat = repeat
+        self._events = events
+
+    def _make_trace(self, fmt, **kwargs):
+        kwargs.setdefault('enable_swap', False)
+        return Trace(
+            self.traces[fmt],
+            parser=self.PARSERS[fmt],
+            **kwargs,
+        )
+
+    def _get_events(self, fmt):
+        if self._events is None:
+            return sorted(self._make_trace(fmt).available_events)
+        else:
+            return list(self._events)
+
+    def _get_benchmarks(self, fmt, swap_dir):
+        events = self._get_events(fmt)
+
+        def trace_with_events():
+            trace = self._make_trace(fmt, events=events, strict_events=False)
+            for event in events:
+                with contextlib.suppress(MissingTraceEventError):
+                    trace.df_event(event)
+            return trace
+
+        def swap_trace():
+            return self._make_trace(fmt, swap_dir=swap_dir, enable_swap=True)
+
+        available = self._make_trace(fmt).available_events
+        swap_events = [
+            event
+            for event in events
+            if event in available
+        ]
+
+        @functools.lru_cache(maxsize=None)
+        def fill_swap():
+            trace = swap_trace()
+            for event in swap_events:
+                trace.df_event(event)
+
+        def reload_setup():
+            fill_swap()
+            return swap_trace()
+
+        @functools.lru_cache(maxsize=None)
+        def swap_data():
+            # Biggest dataframe of the trace
+            trace = self._make_trace(fmt)
+            return max(
+                (
+                    trace.df_event(event)
+                    for event in swap_events
+                ),
+                key=len,
+            )
+
+        def swap_file(swap_fmt):
+            path = os.path.join(swap_dir, f'data.{swap_fmt}')
+            if not os.path.exists(path):
+                TraceCache._write_data(swap_fmt, swap_data(), path)
+            return path
+
+        yield _Benchmark(
+            name='trace.init',
+            setup=lambda: None,
+            run=lambda _: self._make_trace(fmt),
+        )
+        yield _Benchmark(
+            name='trace.init.events',
+            setup=lambda: None,
+            run=lambda _: self._make_trace(fmt, events=events, strict_events=False),
+        )
+
+        for event in events:
+            yield _Benchmark(
+                name=f'df_event.{event}',
+                setup=lambda: self._make_trace(fmt),
+                run=lambda trace, event=event: trace.df_event(event),
+            )
+
+        # The swap is filled once, then each run reloads from it with a new
+        # Trace instance
+        for event in swap_events:
+            yield _Benchmark(
+                name=f'swap.reload.{event}',
+                setup=reload_setup,
+                run=lambda trace, event=event: trace.df_event(event),
+            )
+
+        for swap_fmt in sorted(TraceCache.SWAP_LOAD_COST_RATIO.keys()):
+            yield _Benchmark(
+                name=f'swap.write.{swap_fmt}',
+                setup=lambda: swap_data(),
+                run=lambda df, swap_fmt=swap_fmt: TraceCache._write_data(
+                    swap_fmt, df, os.path.join(swap_dir, f'write.{swap_fmt}')
+                ),
+            )
+            yield _Benchmark(
+                name=f'swap.load.{swap_fmt}',
+                setup=lambda swap_fmt=swap_fmt: swap_file(swap_fmt),
+                run=lambda path, swap_fmt=swap_fmt: TraceCache._load_data(swap_fmt, path),
+            )
+
+        for name, f in sorted(self.ANALYSES.items()):
+            yield _Benchmark(
+                name=f'ana.{name}',
+                setup=trace_with_events,
+                run=f,
+            )
+
+    def run(self, select=None):
+        """
+        Run the benchmarks.
+
+        :param select: If not ``None``, list of :mod:`fnmatch` patterns. Only
+            the benchmarks with a name matching one of the patterns are run.
+        :type select: list(str) or None
+
+        :returns: A JSON-serializable mapping with a ``metadata`` key and a
+            ``results`` key containing a list of mappings for each benchmark
+            and trace format.
+        """
+        results = []
+        for fmt in sorted(self.traces.keys()):
+            with tempfile.TemporaryDirectory() as swap_dir:
+                for benchmark in self._get_benchmarks(fmt, swap_dir):
+                    if select and not any(
+                        fnmatch.fnmatch(benchmark.name, pattern)
+                        for pattern in select
+                    ):
+                        continue
+
+                    result = self._run_benchmark(benchmark)
+                    result.update(
+                        name=benchmark.name,
+                        format=fmt,
+                    )
+                    results.append(result)
+
+        return dict(
+            metadata=self._get_metadata(),
+            results=results,
+        )
+
+    def _run_benchmark(self, benchmark):
+        logger = self.logger
+        times = []
+        for _ in range(self.repeat):
+            try:
+                data = benchmark.setup()
+                with measure_time(clock=time.perf_counter) as measure:
+                    benchmark.run(data)
+            except MissingTraceEventError as e:
+                logger.info(f'Skipping {benchmark.name}: {e}')
+                return dict(skipped=str(e))
+            times.append(measure.delta)
+
+        logger.info(f'{benchmark.name}: {min(times):.3f}s')
+        return dict(
+            times=times,
+            min=min(times),
+            median=statistics.median(times),
+        )
+
+    def _get_metadata(self):
+        # pylint: disable=import-outside-toplevel
+        import lisa
+        try:
+            sha1 = get_sha1(list(lisa.__path__)[0])
+        except Exception: # pylint: disable=broad-except
+            sha1 = None
+
+        return dict(
+            date=datetime.now(timezone.utc).isoformat(),
+            version_token=VERSION_TOKEN,
+            git_sha1=sha1,
+            python=sys.version,
+            platform=platform.platform(),
+            cpu_count=multiprocessing.cpu_count(),
+            repeat=self.repeat,
+            traces={
+                fmt: dict(
+                    path=os.path.abspath(path),
+                    size=os.stat(path).st_size,
+                )
+                for fmt, path in self.traces.items()
+            },
+        )
+
+
+# vim :set tabstop=4 shiftwidth=4 textwidth=80 expandtab
@@ -23,6 +23,11 @@ https://www.kernel.org/doc/html/latest/bpf/btf.html
 
 import itertools
 import struct
+import array
+import hashlib
+import os
+import pickle
+import tempfile
 import enum
 import functools
 import io
@@ -468,8 +473,10 @@ class _BTFStructUnion(_CDecl, BTFType):
 
         for member in members:
             # Avoid modifying the existing member in case it is shared with
-            # another struct.
-            member = copy.copy(member)
+            # another struct. Members that don't belong to any struct yet, such
+            # as the ones freshly created by the parser, can be used as-is.
+            if member.parent is not None:
+                member = copy.copy(member)
             member.parent = self
             self.members.append(member)
 
@@ -1059,6 +1066,9 @@ class _LinkedForwardDecl(BTFForwardDecl):
     def typ_cls(self):
         return self.parent.__class__
 
+    def __reduce__(self):
+        return (self.__class__, (self.parent,))
+
 
 class BTFFunc(_FixupTyp,  BTFType):
     __slots__ = ('name', 'typ', 'linkage')
@@ -1195,87 +1205,204 @@ class BTFTypeTag(_CDeclSpecifier):
         return f'__attribute__(({self.attribute}))'
 
 
-def _parse_btf(buf):
-    # Creating a memoryview() allows a copy-less slicing operation, so we can
-    # manipulate slices just as buffers without having to pay the astronomical
-    # cost of copying data every time (which would otherwise make this parser
-    # O(N^2) with the input size).
-    buf = memoryview(buf).toreadonly()
-
-    magic, = struct.unpack_from('<H', buf)
-    if magic == 0xeb9f:
-        little_endian = True
-    elif magic == 0x9feb:
-        little_endian = False
-    else:
-        raise ValueError(f'Not a BTF binary blob, invalid magic: {magic:02x}')
+class _BTFIndex:
+    """
+    Compact index of the types of a BTF blob.
+
+    The index only records the offset, kind and name offset of each type
+    record, which allows looking up types by ID or name without decoding the
+    whole blob. Types are then materialized on demand along with the types
+    they reference.
+
+    :param buf: BTF blob.
+    :type buf: bytes
+    """
+
+    # Size of the data following the struct btf_type header of each kind
+    _EXTRA_SIZE = {
+        # BTF_KIND_INT
+        1: 4,
+        # BTF_KIND_ARRAY
+        3: 12,
+        # BTF_KIND_VAR
+        14: 4,
+        # BTF_KIND_DECL_TAG
+        17: 4,
+    }
 
-    buf = buf[2:]
+    # Size of each of the "vlen" items following the struct btf_type header
+    _VLEN_SIZE = {
+        # BTF_KIND_STRUCT
+        4: 12,
+        # BTF_KIND_UNION
+        5: 12,
+        # BTF_KIND_ENUM
+        6: 8,
+        # BTF_KIND_FUNC_PROTO
+        13: 8,
+        # BTF_KIND_DATASEC
+        15: 12,
+        # BTF_KIND_ENUM64
+        19: 12,
+    }
 
-    def make_decode(fmt, array):
-        fmt = f'<{fmt}' if little_endian else f'>{fmt}'
+    _MAX_KIND = 19
 
-        decoder = struct.Struct(fmt)
-        size = decoder.size
+    def __init__(self, buf):
+        # Creating a memoryview() allows a copy-less slicing operation, so we can
+        # manipulate slices just as buffers without having to pay the astronomical
+        # cost of copying data every time (which would otherwise make this parser
+        # O(N^2) with the input size).
+        buf = memoryview(buf).toreadonly()
 
-        if array:
-            decoder = decoder.iter_unpack
-            def decode(buf, vlen):
-                total_size = size * vlen
-                _buf = buf[:total_size]
-                return (
-                    buf[total_size:],
-                    decoder(_buf)
-                )
+        magic, = struct.unpack_from('<H', buf)
+        if magic == 0xeb9f:
+            little_endian = True
+        elif magic == 0x9feb:
+            little_endian = False
         else:
-            decoder = decoder.unpack_from
-            def decode(buf):
-                return (
-                    buf[size:],
-                    decoder(buf)
-                )
-        return decode
+            raise ValueError(f'Not a BTF binary blob, invalid magic: {magic:02x}')
+
+        buf = buf[2:]
+
+        def make_decode(fmt, array):
+            fmt = f'<{fmt}' if little_endian else f'>{fmt}'
+
+            decoder = struct.Struct(fmt)
+            size = decoder.size
+
+            if array:
+                decoder = decoder.iter_unpack
+                def decode(buf, vlen):
+                    total_size = size * vlen
+                    _buf = buf[:total_size]
+                    return (
+                        buf[total_size:],
+                        decoder(_buf)
+                    )
+            else:
+                decoder = decoder.unpack_from
+                def decode(buf):
+                    return (
+                        buf[size:],
+                        decoder(buf)
+                    )
+            return decode
+
+        self._decode_B = make_decode('B', array=False)
+        self._decode_BI = make_decode('BI', array=False)
+        self._decode_I = make_decode('I', array=False)
+        self._decode_III = make_decode('III', array=False)
+        self._decode_IIII = make_decode('IIII', array=False)
 
-    decode_B = make_decode('B', array=False)
-    decode_BI = make_decode('BI', array=False)
-    decode_I = make_decode('I', array=False)
-    decode_III = make_decode('III', array=False)
-    decode_IIII = make_decode('IIII', array=False)
+        self._decode_array_II = make_decode('II', array=True)
+        self._decode_array_III = make_decode('III', array=True)
+        self._decode_array_Ii = make_decode('II', array=True)
 
-    decode_array_II = make_decode('II', array=True)
-    decode_array_III = make_decode('III', array=True)
-    decode_array_Ii = make_decode('II', array=True)
 
+        buf, (version,) = self._decode_B(buf)
+        if version != 1:
+            raise ValueError(f'BTF version {version} not supported')
 
-    buf, (version,) = decode_B(buf)
-    if version != 1:
-        raise ValueError(f'BTF version {version} not supported')
 
+        buf, (flags, hdr_len) = self._decode_BI(buf)
 
-    buf, (flags, hdr_len) = decode_BI(buf)
+        _, (type_off, type_len, str_off, str_len) = self._decode_IIII(buf)
 
-    _, (type_off, type_len, str_off, str_len) = decode_IIII(buf)
+        # We already parsed 8 bytes of the header
+        assert hdr_len >= 8
+        data = buf[hdr_len - 8:]
 
-    # We already parsed 8 bytes of the header
-    assert hdr_len >= 8
-    data = buf[hdr_len - 8:]
+        self._strings = data[str_off:str_off + str_len].tobytes()
+        self._names = {0: None}
+        assert self._strings[:1] == b'\x00'
 
-    string_section = data[str_off:str_off + str_len]
-    _strings = string_section.tobytes().split(b'\x00')
+        self._type_section = data[type_off:type_off + type_len]
 
+        # The type at index 0 is by definition void, and all indices are
+        # shifted by this.
+        self._offsets = array.array('L', [0])
+        self._kinds = bytearray([0])
+        self._name_offs = array.array('L', [0])
+        self._build_index(little_endian)
 
-    i = 0
-    strings = {}
-    for s in _strings:
-        strings[i] = s.decode('utf-8')
-        i += len(s) + 1
+        self._typs = {0: BTFVoid()}
+        self._typs[0].id = 0
 
-    assert strings[0] == ''
+    def _build_index(self, little_endian):
+        decode = struct.Struct('<III' if little_endian else '>III').unpack_from
+        extra_size = self._EXTRA_SIZE
+        vlen_size = self._VLEN_SIZE
+        max_kind = self._MAX_KIND
 
-    def resolve_name(i):
-        return strings[i] or None
+        offsets = self._offsets
+        kinds = self._kinds
+        name_offs = self._name_offs
+
+        buf = self._type_section
+        size = len(buf)
+        offset = 0
+        while offset < size:
+            name_off, info, _ = decode(buf, offset)
+            vlen = info & 0xffff
+            kind = (info & (0b111111 << 24)) >> 24
+            if kind > max_kind:
+                raise ValueError(f'Unknown BTF kind: {kind}')
+
+            offsets.append(offset)
+            kinds.append(kind)
+            name_offs.append(name_off)
+
+            offset += 12 + extra_size.get(kind, 0) + vlen * vlen_size.get(kind, 0)
+
+    def resolve_name(self, i):
+        """
+        Resolve the name at offset ``i`` in the string section, or ``None`` for
+        the empty string.
+        """
+        names = self._names
+        try:
+            return names[i]
+        except KeyError:
+            strings = self._strings
+            name = strings[i:strings.index(b'\x00', i)].decode('utf-8') or None
+            names[i] = name
+            return name
+
+    def find(self, names):
+        """
+        Return the IDs of the types with any of the given ``names``, without
+        materializing any type.
+        """
+        strings = self._strings
+        name_offs = set()
+        for name in filter(None, names):
+            # Any offset pointing at that NULL-terminated string resolves to
+            # the name, including offsets in the middle of another string.
+            needle = name.encode('utf-8') + b'\x00'
+            start = 0
+            while (i := strings.find(needle, start)) != -1:
+                name_offs.add(i)
+                start = i + 1
+
+        return [
+            id_
+            for id_, name_off in enumerate(self._name_offs)
+            if id_ and name_off in name_offs
+        ]
+
+    def _size_or_type(self, id_):
+        _, (_, _, size_or_type) = self._decode_III(self._type_section[self._offsets[id_]:])
+        return size_or_type
+
+    def _parse_type(self, buf):
+        decode_I = self._decode_I
+        decode_III = self._decode_III
+        decode_array_II = self._decode_array_II
+        decode_array_III = self._decode_array_III
+        decode_array_Ii = self._decode_array_Ii
+        resolve_name = self.resolve_name
 
-    def parse_type(buf):
         buf, (name_off, info, size_or_type) = decode_III(buf)
 
         name = resolve_name(name_off)
@@ -1591,71 +1718,275 @@ def _parse_btf(buf):
         return (buf, typ)
 
 
-    type_section = data[type_off:type_off + type_len]
-    typs = _scan(type_section, parse_type)
+    def parse_all(self):
+        """
+        Materialize all the types of the blob, in ID order.
+        """
+        typs = _scan(self._type_section, self._parse_type)
+        typs.insert(0, self._typs[0])
+
+        for i, typ in enumerate(typs):
+            typ.id = i
+
+        self._typs = dict(enumerate(typs))
+        _remap_refs(typs, functools.partial(_TypeRef.fixup, typs=typs))
+        return typs
+
+    def materialize(self, ids):
+        """
+        Materialize the types with the given IDs, along with all the types
+        reachable from them.
+        """
+        typs = self._typs
+        type_section = self._type_section
+        offsets = self._offsets
+
+        def collect(x):
+            if isinstance(x, _TypeRef) and x.index not in typs:
+                todo.append(x.index)
+            return x
 
-    # The type at index 0 is by definition void, and all indices are shifted by
-    # this.
-    typs.insert(0, BTFVoid())
+        new = []
+        todo = list(ids)
+        while todo:
+            id_ = todo.pop()
+            if id_ not in typs:
+                _, typ = self._parse_type(type_section[offsets[id_]:])
+                typ.id = id_
+                typs[id_] = typ
+                new.append(typ)
+                _remap_refs((typ,), collect)
 
-    fixup_refs = lambda typ: _TypeRef.fixup(typ, typs)
-    fixup_visited = set()
-    for i, typ in enumerate(typs):
-        typ.id = i
-        typ._map_typs(fixup_refs, visited=fixup_visited)
+        _remap_refs(new, functools.partial(_TypeRef.fixup, typs=typs))
+        return [typs[id_] for id_ in ids]
 
-    def is_ptr_sized(typ):
-        if isinstance(typ, BTFTypedef):
-            return typ.name in ('intptr_t', 'uintptr_t', 'ptrdiff_t')
-        elif isinstance(typ, BTFInt):
-            return typ.name in ('long int', 'long unsigned int', 'long', 'unsigned long', 'long unsigned')
+    @property
+    def typs(self):
+        """
+        Types materialized so far, in ID order.
+        """
+        return [
+            typ
+            for _, typ in sorted(self._typs.items())
+        ]
+
+    def finalize(self):
+        """
+        Fill in the attributes of the materialized types that depend on
+        information found elsewhere in the blob, such as the size of pointers.
+        """
+        kinds = self._kinds
+        resolve_name = lambda id_: self.resolve_name(self._name_offs[id_])
+
+        ptr_sized = [
+            id_
+            for id_ in self.find(('intptr_t', 'uintptr_t', 'ptrdiff_t'))
+            # BTF_KIND_TYPEDEF
+            if kinds[id_] == 8
+        ] + [
+            id_
+            for id_ in self.find(('long int', 'long unsigned int', 'long', 'unsigned long', 'long unsigned'))
+            # BTF_KIND_INT
+            if kinds[id_] == 1
+        ]
+
+        if ptr_sized:
+            uintptr_t, = self.materialize([max(ptr_sized)])
+            ptr_size = uintptr_t.size
         else:
-            return False
+            raise ValueError(f'Could not find pointer-sized type in BTF types')
 
-    uintptr_t = None
-    int_sizes = {}
+        if any(isinstance(typ, BTFEnum) for typ in self._typs.values()):
+            int_sizes = self._find_int_typedefs()
+        else:
+            int_sizes = {}
+
+        for typ in self._typs.values():
+            if isinstance(typ, BTFPtr):
+                typ.size = ptr_size
+            elif isinstance(typ, BTFEnum):
+                typ.int_typ = int_sizes.get(typ.size, None)
+
+    def _find_int_typedefs(self):
+        kinds = self._kinds
+        name_offs = self._name_offs
+
+        def underlying_int(id_):
+            # BTF_KIND_TYPEDEF, BTF_KIND_VOLATILE, BTF_KIND_CONST,
+            # BTF_KIND_RESTRICT, BTF_KIND_TYPE_TAG
+            while (kind := kinds[id_]) in (8, 9, 10, 11, 18):
+                id_ = self._size_or_type(id_)
+
+            # BTF_KIND_INT
+            return id_ if kind == 1 else None
+
+        # Look for typedefs of int types. Something like "uint16_t" should show
+        # up in that list
+        int_sizes = {}
+        for id_, kind in enumerate(kinds):
+            if kind == 8 and (int_id := underlying_int(id_)) is not None:
+                int_typ, = self.materialize([int_id])
+                if not int_typ.is_bitfield:
+                    int_sizes.setdefault(int_typ.size, []).append(id_)
+
+        # Give priority to standard types
+        fixed_size_re = re.compile(r'u?int[0-9]+_t$')
+        def select_int(ids):
+            for id_ in ids:
+                if fixed_size_re.match(self.resolve_name(name_offs[id_])):
+                    return id_
+
+            return ids[0]
+
+        sizes, ids = zip(*int_sizes.items()) if int_sizes else ((), ())
+        ids = self.materialize(list(map(select_int, ids)))
+        return dict(zip(sizes, ids))
+
+
+def _remap_refs(typs, f):
+    """
+    Replace the type references ``x`` of the given types by ``f(x)``, without
+    following them.
+    """
     for typ in typs:
-        # Look for typedefs of int types. Something like "uint16_t" should show up in that list
-        if isinstance(typ, BTFTypedef) and isinstance(underlying := typ.underlying, BTFInt) and not underlying.is_bitfield:
-            int_sizes.setdefault(typ.size, []).append(typ)
+        for attr in typ._TYP_ATTRS:
+            setattr(typ, attr, f(getattr(typ, attr)))
 
-        if is_ptr_sized(typ):
-            uintptr_t = typ
+        for attr in typ._ITERABLE_TYP_ATTRS:
+            _remap_refs(getattr(typ, attr), f)
 
-    # Give priority to standard types
-    fixed_size_re = re.compile(r'u?int[0-9]+_t$')
-    def select_int(typs):
-        for typ in typs:
-            if fixed_size_re.match(typ.name):
-                return typ
 
-        return typs[0]
+# Bump this when the layout of the BTF types classes changes, so that stale
+# cache entries are ignored.
+_BTF_CACHE_VERSION = 1
 
-    int_sizes = {
-        size: select_int(typs)
-        for size, typs in int_sizes.items()
-    }
 
-    if uintptr_t:
-        ptr_size = uintptr_t.size
+def _btf_cache_path(cache_dir, buf, select_names):
+    if select_names is None:
+        selection = 'all'
     else:
-        raise ValueError(f'Could not find pointer-sized type in BTF types')
+        selection = hashlib.sha256(
+            '\n'.join(select_names).encode('utf-8')
+        ).hexdigest()
 
-    for typ in typs:
-        if isinstance(typ, BTFPtr):
-            typ.size = ptr_size
-        elif isinstance(typ, BTFEnum):
-            typ.int_typ = int_sizes.get(typ.size, None)
+    blob = hashlib.sha256(buf).hexdigest()
+    return os.path.join(cache_dir, blob, f'{selection}.pickle')
+
+
+def _load_btf_cache(path):
+    with open(path, 'rb') as f:
+        version, root_ids, typs = pickle.load(f)
+
+    if version != _BTF_CACHE_VERSION:
+        raise ValueError(f'Unsupported BTF cache version: {version}')
+
+    by_id = {typ.id: typ for typ in typs}
+    _remap_refs(typs, functools.partial(_resolve_btf_cache_ref, by_id=by_id))
+    return [by_id[id_] for id_ in root_ids]
+
+
+def _resolve_btf_cache_ref(x, by_id):
+    return by_id[x] if isinstance(x, int) else x
+
+
+def _dump_btf_cache(path, roots, typs):
+    # Replace references by the plain integer ID of the type so that pickle
+    # does not have to recurse along the type graph, which would overflow the
+    # stack on a vmlinux blob. Plain integers are also much cheaper to pickle
+    # than _TypeRef.
+    def unref(x):
+        if isinstance(x, BTFType) and (id_ := getattr(x, 'id', None)) is not None:
+            return id_
+        else:
+            return x
+
+    root_ids = [typ.id for typ in roots]
+    by_id = {typ.id: typ for typ in typs}
+    _remap_refs(typs, unref)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(
+                    (_BTF_CACHE_VERSION, root_ids, typs),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            # Atomically publish the entry so that concurrent builds never
+            # see a partially written file.
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+    finally:
+        _remap_refs(typs, functools.partial(_resolve_btf_cache_ref, by_id=by_id))
+
+
+def _parse_btf(buf, select_names=None, cache_dir=None):
+    if select_names is not None:
+        select_names = sorted(set(select_names))
+
+    if cache_dir:
+        cache_path = _btf_cache_path(cache_dir, buf, select_names)
+        try:
+            return _load_btf_cache(cache_path)
+        # Missing or unusable entries (e.g. created by another version of this
+        # module) are simply replaced by a fresh one.
+        except Exception:
+            pass
+    else:
+        cache_path = None
+
+    index = _BTFIndex(buf)
+    if select_names is None:
+        typs = index.parse_all()
+    else:
+        typs = index.materialize(index.find(select_names))
+    index.finalize()
+
+    if cache_path:
+        try:
+            _dump_btf_cache(cache_path, typs, index.typs)
+        # The cache is an optimization, e.g. the folder may be read-only
+        except OSError:
+            pass
 
     return typs
 
 
-def parse_btf(buf, select_typ=None, rename_typ=None):
-    typs = _parse_btf(buf)
+def parse_btf(buf, select_typ=None, rename_typ=None, select_names=None, cache_dir=None):
+    """
+    Parse a BTF blob and return a list of :class:`BTFType`.
+
+    :param buf: BTF blob, e.g. the content of ``/sys/kernel/btf/vmlinux``.
+    :type buf: bytes
+
+    :param select_typ: Only return the types for which this predicate is
+        ``True``.
+    :type select_typ: collections.abc.Callable or None
+
+    :param rename_typ: Called on named types reachable from the returned
+        types to get their new name.
+    :type rename_typ: collections.abc.Callable or None
+
+    :param select_names: Only materialize the types with the given names and
+        the types reachable from them, rather than the whole blob. This is
+        much faster when only a handful of types are needed out of a
+        ``vmlinux`` blob.
+    :type select_names: list(str) or None
+
+    :param cache_dir: Folder used to cache the parsed types, keyed by the hash
+        of ``buf`` and ``select_names``. Repeated parsing of the same blob
+        will load the types from the cache instead.
+    :type cache_dir: str or None
+    """
+    typs = _parse_btf(buf, select_names=select_names, cache_dir=cache_dir)
 
     if select_typ:
         typs = list(filter(select_typ, typs))
 
+    if select_typ or select_names is not None:
         reachable_typs = BTFType.reachable_from(typs)
     else:
         reachable_typs = set(typs)
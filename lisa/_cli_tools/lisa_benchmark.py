@@ -0,0 +1,168 @@
+#! /usr/bin/env python3
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (C) 2026, ARM Limited and contributors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import contextlib
+
+from lisa.utils import setup_logging
+from lisa._benchmark import SyntheticTrace, BenchmarkSuite
+
+
+def parse_events(spec):
+    """
+    Parse a comma-separated list of ``event=weight`` items.
+    """
+    def parse(item):
+        event, sep, weight = item.partition('=')
+        return (event.strip(), float(weight) if sep else 1)
+
+    return dict(map(parse, spec.split(',')))
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description="""
+Benchmark the trace parsing and analysis hot paths.
+
+The benchmarks run on synthetic traces generated with the given parameters,
+unless an existing trace is given with --trace. The results are written as
+JSON.
+""",
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument('--out', '-o',
+        help='Path of the JSON file to write the results to. Defaults to stdout.',
+    )
+
+    parser.add_argument('--format', action='append', choices=sorted(BenchmarkSuite.PARSERS.keys()),
+        help='Trace format to benchmark. Can be repeated. Defaults to all formats.',
+    )
+
+    parser.add_argument('--trace', action='append', nargs=2, metavar=('FORMAT', 'PATH'), default=[],
+        help='Use an existing trace of the given format instead of a synthetic one. Can be repeated.',
+    )
+
+    parser.add_argument('--nr-events', type=int, default=100000,
+        help='Number of events in the synthetic traces.',
+    )
+
+    parser.add_argument('--events', type=parse_events,
+        help='Comma-separated list of "event=weight" to set the mix of events of the synthetic traces. Defaults to: {}'.format(
+            ','.join(
+                f'{event}={weight}'
+                for event, weight in SyntheticTrace.DEFAULT_EVENTS.items()
+            )
+        ),
+    )
+
+    parser.add_argument('--nr-cpus', type=int, default=8,
+        help='Number of CPUs in the synthetic traces.',
+    )
+
+    parser.add_argument('--nr-tasks', type=int, default=100,
+        help='Number of tasks in the synthetic traces.',
+    )
+
+    parser.add_argument('--seed', type=int, default=0,
+        help='Seed used to generate the synthetic traces.',
+    )
+
+    parser.add_argument('--trace-dir',
+        help='Folder where the synthetic traces are written. Defaults to a temporary folder.',
+    )
+
+    parser.add_argument('--repeat', type=int, default=3,
+        help='Number of runs of each benchmark.',
+    )
+
+    parser.add_argument('--select', action='append',
+        help='Only run the benchmarks with a name matching the given pattern, e.g. "df_event.*". Can be repeated.',
+    )
+
+    parser.add_argument('--log-level',
+        default='info',
+        choices=('warning', 'info', 'debug'),
+        help='Verbosity level of the logs.'
+    )
+
+    args = parser.parse_args(argv)
+    setup_logging(level=args.log_level.upper())
+
+    traces = dict(args.trace)
+    formats = args.format or (
+        sorted(traces.keys())
+        if traces else
+        sorted(BenchmarkSuite.PARSERS.keys())
+    )
+
+    with contextlib.ExitStack() as stack:
+        trace_dir = args.trace_dir or stack.enter_context(tempfile.TemporaryDirectory())
+        synthetic = SyntheticTrace(
+            nr_events=args.nr_events,
+            events=args.events,
+            nr_cpus=args.nr_cpus,
+            nr_tasks=args.nr_tasks,
+            seed=args.seed,
+        )
+
+        for fmt in formats:
+            if fmt not in traces:
+                path = os.path.join(trace_dir, f'trace.{fmt}')
+                getattr(synthetic, f'write_{fmt}')(path)
+                traces[fmt] = path
+
+        suite = BenchmarkSuite(
+            traces={
+                fmt: traces[fmt]
+                for fmt in formats
+            },
+            repeat=args.repeat,
+        )
+        results = suite.run(select=args.select)
+
+    if not args.trace:
+        results['metadata']['synthetic'] = dict(
+            nr_events=synthetic.nr_events,
+            events=synthetic.events,
+            nr_cpus=synthetic.nr_cpus,
+            nr_tasks=synthetic.nr_tasks,
+            seed=synthetic.seed,
+        )
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=4)
+    else:
+        json.dump(results, sys.stdout, indent=4)
+        print()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# vim :set tabstop=4 shiftwidth=4 textwidth=80 expandtab
@@ -28,7 +28,7 @@ import webbrowser
 import time
 import types
 
-from lisa.utils import get_short_doc, nullcontext
+from lisa.utils import get_short_doc, nullcontext, mp_spawn_pool
 from lisa.trace import Trace
 from lisa.conf import ConfigKeyError
 from lisa.analysis.base import TraceAnalysisBase
@@ -135,25 +135,176 @@ def make_plot_kwargs(meth, file_path, extra_options, backend='bokeh'):
     )
     return kwargs
 
-@contextlib.contextmanager
-def handle_plot_excep(exit_on_error=True):
-    try:
-        yield
-    except ConfigKeyError as e:
+def get_plot_excep_msg(e):
+    """
+    Get the message to display for an exception raised by a plot method.
+    """
+    if isinstance(e, ConfigKeyError):
         try:
             key = e.args[1]
         except IndexError:
-            excep_msg = str(e)
+            return str(e)
         else:
-            excep_msg = 'Please specify --plat-info with the "{}" filled in'.format(e.args[1])
+            return 'Please specify --plat-info with the "{}" filled in'.format(key)
+    else:
+        return str(e)
+
+@contextlib.contextmanager
+def handle_plot_excep(exit_on_error=True):
+    try:
+        yield
     except Exception as e:
-        excep_msg = str(e)
+        excep_msg = get_plot_excep_msg(e)
     else:
         excep_msg = None
 
     if excep_msg:
         error(excep_msg, -1 if exit_on_error else None)
 
+def do_plot(trace, meth, file_path, extra_options):
+    """
+    Call the plot method ``meth`` on ``trace`` and save the plot to
+    ``file_path``, or open it in a web browser if ``file_path`` is
+    ``"interactive"``.
+    """
+    interactive = file_path == 'interactive'
+    if interactive:
+        outfile_cm = NamedTemporaryFile(suffix='.html')
+    else:
+        outfile_cm = nullcontext(
+            types.SimpleNamespace(name=file_path)
+        )
+        dirname = os.path.dirname(file_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+    with outfile_cm as outfile:
+        _file_path = outfile.name
+
+        kwargs = make_plot_kwargs(
+            meth,
+            file_path=_file_path,
+            extra_options=extra_options
+        )
+
+        TraceAnalysisBase.call_on_trace(meth, trace, kwargs)
+
+        if interactive:
+            webbrowser.open_new(_file_path)
+            # Wait for the page to load before the file is removed
+            time.sleep(1)
+
+# State of the --jobs worker processes, set by _plot_worker_init()
+_WORKER_STATE = {}
+
+def _plot_worker_init(trace_path, plat_info_path, normalize_time, swap_dir, window):
+    if plat_info_path:
+        plat_info = PlatformInfo.from_yaml_map(plat_info_path)
+    else:
+        plat_info = None
+
+    # Events are not listed here, so that they are loaded lazily from the swap
+    # populated by the parent process rather than all preloaded in each worker.
+    trace = Trace(
+        trace_path,
+        plat_info=plat_info,
+        normalize_time=normalize_time,
+        swap_dir=swap_dir,
+        shared_swap=True,
+        write_swap=True,
+    )
+    if window:
+        trace = trace.get_view(window)
+
+    _WORKER_STATE.update(
+        trace=trace,
+        plot_map={
+            plot_name: meth
+            for plot_list in get_plots_map().values()
+            for plot_name, meth in plot_list.items()
+        },
+    )
+
+def _plot_worker(spec):
+    plot_name, file_path, extra_options = spec
+    start = time.monotonic()
+    try:
+        do_plot(
+            trace=_WORKER_STATE['trace'],
+            meth=_WORKER_STATE['plot_map'][plot_name],
+            file_path=file_path,
+            extra_options=extra_options,
+        )
+    except Exception as e:
+        excep_msg = get_plot_excep_msg(e)
+    else:
+        excep_msg = None
+
+    return (plot_name, file_path, time.monotonic() - start, excep_msg)
+
+def run_plot_jobs(jobs, plot_spec_list, worker_initargs, extra_options, best_effort):
+    """
+    Run the plots in a pool of ``jobs`` worker processes, each reopening the
+    trace from the swap.
+
+    :returns: The list of ``(plot_name, file_path, duration, excep_msg)``
+        tuples of the plots. ``excep_msg`` is ``None`` for successful plots,
+        and ``duration`` is ``None`` for plots that were not run because of an
+        earlier failure.
+    """
+    # Refer to the worker functions by their module name, so they can be
+    # unpickled by the workers even when this file is run as __main__
+    # pylint: disable=import-outside-toplevel,import-self
+    from lisa._cli_tools import lisa_plot
+
+    results = {}
+    with mp_spawn_pool(
+        processes=min(jobs, len(plot_spec_list)),
+        initializer=lisa_plot._plot_worker_init,
+        initargs=worker_initargs,
+    ) as pool:
+        res_it = pool.imap_unordered(
+            lisa_plot._plot_worker,
+            [
+                (plot_name, file_path, extra_options)
+                for plot_name, file_path in plot_spec_list
+            ],
+            chunksize=1,
+        )
+        for plot_name, file_path, duration, excep_msg in res_it:
+            results[(plot_name, file_path)] = (duration, excep_msg)
+            if excep_msg:
+                error('{}: {}'.format(plot_name, excep_msg), ret=None)
+                # Exiting the pool context terminates the pending plots
+                if not best_effort:
+                    break
+            else:
+                print('Plotted {} in {:.2f}s'.format(plot_name, duration))
+
+    return [
+        (plot_name, file_path, *results.get((plot_name, file_path), (None, None)))
+        for plot_name, file_path in plot_spec_list
+    ]
+
+def print_plot_summary(results):
+    name_len = max(len('Plot'), *(len(plot_name) for plot_name, *_ in results))
+    fmt = '{:<%s}  {:>8}  {}' % name_len
+    print()
+    print(fmt.format('Plot', 'Time (s)', 'Status'))
+    for plot_name, file_path, duration, excep_msg in results:
+        if duration is None:
+            status = 'not run'
+        elif excep_msg:
+            status = 'FAILED: {}'.format(excep_msg)
+        else:
+            status = file_path
+
+        print(fmt.format(
+            plot_name,
+            '-' if duration is None else '{:.2f}'.format(duration),
+            status,
+        ))
+
 def get_meth_options_help(meth):
     sig = inspect.signature(meth)
 
@@ -252,6 +403,15 @@ Available plots:
         help='Platform information, necessary for some plots',
     )
 
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+        metavar='N',
+        help='Generate the plots in N parallel processes. The events used by all the plots are parsed once beforehand, and each process reloads them from the swap. A summary of the time spent on each plot is printed at the end.',
+    )
+
+    parser.add_argument('--swap-dir',
+        help='Swap directory of the trace, where the parsed events are stored. Defaults to a hidden folder next to the trace.',
+    )
+
     args = parser.parse_args(argv)
 
     flat_plot_map = {
@@ -294,21 +454,32 @@ Available plots:
 
         plot_methods.add(f)
 
+    events = set()
+    for f in plot_methods:
+        with contextlib.suppress(AttributeError):
+            events.update(f.used_events.get_all_events())
+    events = sorted(events)
+
     # If best effort is used, we don't want to trigger exceptions ahead of
     # time. Let it fail for individual plot methods instead, so the trace can
-    # be used for the other events
-    if args.best_effort:
+    # be used for the other events. When running multiple jobs, the events are
+    # still parsed beforehand so that the workers can reload them from the swap
+    # instead of all parsing the trace.
+    parallel = args.jobs > 1 and len(plot_spec_list) > 1
+    if args.best_effort and not parallel:
         events = None
     else:
-        events = set()
-        for f in plot_methods:
-            with contextlib.suppress(AttributeError):
-                events.update(f.used_events.get_all_events())
-
-        events = sorted(events)
         print('Parsing trace events: {}'.format(', '.join(events)))
 
-    trace = Trace(args.trace, plat_info=plat_info, events=events, normalize_time=args.normalize_time, write_swap=True)
+    trace = Trace(
+        args.trace,
+        plat_info=plat_info,
+        events=events,
+        normalize_time=args.normalize_time,
+        write_swap=True,
+        swap_dir=args.swap_dir,
+        shared_swap=parallel,
+    )
     if args.window:
         window = args.window
         def clip(l, x, r):
@@ -330,36 +501,52 @@ Available plots:
             window = trace.window
 
         trace = trace.get_view(window)
+    else:
+        window = None
+
+    if parallel:
+        start = time.monotonic()
+        results = run_plot_jobs(
+            jobs=args.jobs,
+            plot_spec_list=sorted(plot_spec_list),
+            worker_initargs=(
+                args.trace,
+                args.plat_info,
+                args.normalize_time,
+                args.swap_dir,
+                window,
+            ),
+            extra_options=args.option,
+            best_effort=args.best_effort,
+        )
+        print_plot_summary(results)
 
-    for plot_name, file_path in sorted(plot_spec_list):
-        interactive = file_path == 'interactive'
-        if interactive:
-            outfile_cm = NamedTemporaryFile(suffix='.html')
-        else:
-            outfile_cm = nullcontext(
-                types.SimpleNamespace(name=file_path)
-            )
-            dirname = os.path.dirname(file_path)
-            if dirname:
-                os.makedirs(dirname, exist_ok=True)
-
-        with outfile_cm as outfile:
-            _file_path = outfile.name
-
-            f = flat_plot_map[plot_name]
-            kwargs = make_plot_kwargs(
-                f,
-                file_path=_file_path,
-                extra_options=args.option
-            )
-
+        nr_done = sum(
+            1
+            for plot_name, file_path, duration, excep_msg in results
+            if duration is not None and not excep_msg
+        )
+        failed = [
+            plot_name
+            for plot_name, file_path, duration, excep_msg in results
+            if excep_msg
+        ]
+        print('\nGenerated {} plots in {:.2f}s, {} failed'.format(
+            nr_done,
+            time.monotonic() - start,
+            len(failed),
+        ))
+        if failed and not args.best_effort:
+            return -1
+    else:
+        for plot_name, file_path in sorted(plot_spec_list):
             with handle_plot_excep(exit_on_error=not args.best_effort):
-                fig = TraceAnalysisBase.call_on_trace(f, trace, kwargs)
-
-            if interactive:
-                webbrowser.open_new(_file_path)
-                # Wait for the page to load before the file is removed
-                time.sleep(1)
+                do_plot(
+                    trace=trace,
+                    meth=flat_plot_map[plot_name],
+                    file_path=file_path,
+                    extra_options=args.option,
+                )
 
 
 if __name__ == '__main__':
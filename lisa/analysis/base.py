@@ -1106,7 +1106,7 @@ class TraceAnalysisBase(AnalysisHelpers):
 
     @optional_kwargs
     @classmethod
-    def cache(cls, f, fmt='parquet', ignored_params=None):
+    def cache(cls, f, fmt=None, ignored_params=None):
         """
         Decorator to enable caching of the output of dataframe getter function
         in the trace cache.
@@ -1120,8 +1120,9 @@ class TraceAnalysisBase(AnalysisHelpers):
             to the allocated cache file is passed as first parameter to the
             wrapped function. This allows manual management of the file's
             content, as well having a path to a file to pass to external tools
-            if they can consume the data directly.
-        :type fmt: str
+            if they can consume the data directly. If ``None``, the dataframe
+            swap format of the trace cache is used.
+        :type fmt: str or None
 
         :param ignored_params: Parameters to ignore when trying to hit the
             cache.
@@ -1167,8 +1168,8 @@ class TraceAnalysisBase(AnalysisHelpers):
                     if k not in ignored_kwargs
                 }),
             )
-            cache_desc = _CacheDataDesc(spec=spec, fmt=fmt)
             cache = trace._cache
+            cache_desc = _CacheDataDesc(spec=spec, fmt=fmt or cache.dataframe_swap_format)
 
             def call_f():
                 if not memory_cache:
@@ -1195,7 +1196,13 @@ class TraceAnalysisBase(AnalysisHelpers):
                 try:
                     data = cache.fetch(cache_desc)
                 except KeyError:
-                    data = call_f()
+                    with cache.computation_lock(cache_desc):
+                        # Another process sharing the swap might have
+                        # computed it while we were waiting for the lock
+                        try:
+                            data = cache.fetch(cache_desc)
+                        except KeyError:
+                            data = call_f()
             else:
                 data = call_f()
 
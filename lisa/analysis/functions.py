@@ -20,6 +20,7 @@ import json
 import os
 from operator import itemgetter, attrgetter, mul
 from functools import reduce
+import itertools
 from itertools import chain
 from collections.abc import Mapping
 from enum import IntEnum
@@ -484,114 +485,196 @@ class _CallGraph:
         """
         thread_root_functions = set(thread_root_functions) if thread_root_functions else set()
 
-        def make_visitor():
-            _max_thread = -1
-            def make_thread():
-                nonlocal _max_thread
-                _max_thread += 1
-                return _max_thread
+        return cls(
+            cpu_nodes={
+                cpu: cls._build_cpu_graph(
+                    subdf,
+                    thread_root_functions=thread_root_functions,
+                    ts_cols=ts_cols,
+                )
+                for cpu, subdf in df.groupby('__cpu', observed=True, group_keys=False)
+            }
+        )
 
-            root_node = _CallGraphNode(
-                func_name=None,
-                parent=None,
-                cpu=None,
-                cpu_capacity=None,
-                logical_thread=make_thread(),
+    @classmethod
+    def _build_cpu_graph(cls, df, thread_root_functions, ts_cols):
+        """
+        Build the call tree of one CPU and return its root node.
+
+        The structure of the tree is computed on the whole dataframe at once:
+        the stack depth is the cumulative sum of entries and exits, and the
+        parent of an entry is the last entry one level above it. Only the
+        creation of the :class:`_CallGraphNode` is done row by row.
+        """
+        event_enum = cls._EVENT
+        events = df['event'].to_numpy()
+        nr_rows = len(events)
+
+        known = np.isin(events, [event.value for event in event_enum])
+        if not known.all():
+            curr_event = events[~known][0]
+            raise ValueError(f'Unknown event "{curr_event}"')
+
+        is_entry = np.asarray(events == event_enum.ENTRY, dtype=bool)
+        is_exit = np.asarray(events == event_enum.EXIT, dtype=bool)
+
+        # Trying to exit the root is probably the sign of a missing entry
+        # event (could have been cropped out of the trace), so these exits are
+        # ignored. This makes the depth a walk reflected at 0.
+        walk = np.cumsum(is_entry.astype(np.int64) - is_exit)
+        depth = walk - np.minimum(np.minimum.accumulate(walk), 0)
+        depth_before = np.zeros_like(depth)
+        depth_before[1:] = depth[:-1]
+
+        entry_pos = np.flatnonzero(is_entry)
+        entry_level = depth[entry_pos]
+        keys = entry_level * (nr_rows + 1) + entry_pos
+        # Entries sorted by level, and then by position in the dataframe
+        entry_order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[entry_order]
+
+        def find_node(level, pos):
+            """
+            Index of the node entered last at ``level`` before ``pos``, or -1
+            for the root node.
+            """
+            node = np.full(len(level), -1, dtype=np.int64)
+            non_root = level > 0
+            i = np.searchsorted(
+                sorted_keys,
+                level[non_root] * (nr_rows + 1) + pos[non_root],
+                side='right',
             )
-            curr_node = root_node
-            # This is expected to be overriden right away by a SET_CAPACITY
-            # event
-            curr_capacity = PELT_SCALE
-            event_enum = cls._EVENT
-
-            def visit(row):
-                nonlocal curr_node, curr_capacity
-                curr_event = row['event']
-
-                if curr_event == event_enum.ENTRY:
-                    func_name = row['func_name']
-                    cpu = row['__cpu']
-
-                    # If we got preempted by a function that is considered to
-                    # be part of different logical thread (e.g. the toplevel
-                    # function of an ISR), create a new ID
-                    if func_name in thread_root_functions:
-                        logical_thread = make_thread()
-                    # Otherwise, just inherit it from the parent
-                    else:
-                        logical_thread = curr_node.logical_thread
-
-                    child = _CallGraphNode(
-                        func_name=func_name,
-                        cpu=cpu,
-                        parent=curr_node,
-                        cpu_capacity=curr_capacity,
-                        entry_time=row.name,
-                        logical_thread=logical_thread,
-                    )
-                    curr_node._children.append(child)
-                    curr_node = child
-
-                elif curr_event == event_enum.EXIT:
-                    # We are trying to exit the root, which is probably the sign of
-                    # a missing entry event (could have been cropped out of the
-                    # trace). We therefore just ignore it.
-                    if curr_node is not root_node:
-                        # That node is unusable for stats, since the function
-                        # used to enter the call is not the same one as for the
-                        # exit. This usually means that the kernel returned to
-                        # userspace in between.
-                        if row['func_name'] != curr_node.func_name:
-                            curr_node.valid_metrics = False
-
-                        if ts_cols is None:
-                            curr_node.exit_time = row.name
-                        else:
-                            entry_ts, exit_ts = ts_cols
-                            curr_node.entry_time = row[entry_ts] * 1e-9
-                            curr_node.exit_time = row[exit_ts] * 1e-9
-
-                        curr_node = curr_node.parent
-
-                elif curr_event == event_enum.SET_TAG:
-                    tags = row['tags']
-                    curr_node.set_tags(tags)
-                elif curr_event == event_enum.SET_CAPACITY:
-                    curr_capacity = row['capacity']
-                else:
-                    raise ValueError(f'Unknown event "{curr_event}"')
-
-            def finalize(df):
-                # Fixup the exit time if there were missing exit events
-                if curr_node is not root_node:
-                    last_time = df.index[-1]
-                    for node in chain([curr_node], curr_node.parents):
-                        node.exit_time = last_time
-                        node.valid_metrics = False
-
-                root_children = root_node.children
-                if root_children:
-                    root_node.entry_time = min(map(attrgetter('entry_time'), root_children))
-                    root_node.exit_time = max(map(attrgetter('exit_time'), root_children))
-                else:
-                    root_node.entry_time = 0
-                    root_node.exit_time = 0
+            node[non_root] = entry_order[i - 1]
+            return node
 
-            return (root_node, visit, finalize)
+        parents = find_node(entry_level - 1, entry_pos)
 
-        def build_graph(subdf):
-            root_node, visitor, finalizer = make_visitor()
-            subdf.apply(visitor, axis=1)
-            finalizer(subdf)
-            return root_node
+        func_names = df['func_name'].to_numpy()
+        entry_funcs = func_names[entry_pos]
 
-        return cls(
-            cpu_nodes = {
-                cpu: build_graph(subdf)
-                for cpu, subdf in df.groupby('__cpu', observed=True, group_keys=False)
-            }
+        # If we got preempted by a function that is considered to be part of
+        # different logical thread (e.g. the toplevel function of an ISR),
+        # create a new ID. Otherwise, just inherit it from the parent.
+        if thread_root_functions:
+            is_thread_root = pd.Series(entry_funcs, dtype='object').isin(thread_root_functions).to_numpy()
+        else:
+            is_thread_root = np.zeros(len(entry_pos), dtype=bool)
+        new_threads = np.cumsum(is_thread_root)
+        threads = np.zeros(len(entry_pos), dtype=np.int64)
+        # Parents are always one level above, so process the levels in order
+        level_bounds = np.searchsorted(
+            entry_level[entry_order],
+            np.arange(1, entry_level.max(initial=0) + 2),
         )
+        for start, end in zip(level_bounds, level_bounds[1:]):
+            idx = entry_order[start:end]
+            parent = parents[idx]
+            inherited = np.where(parent >= 0, threads[parent], 0)
+            threads[idx] = np.where(is_thread_root[idx], new_threads[idx], inherited)
+
+        # Capacity of the CPU when the function was entered. This is expected
+        # to be set right away by a SET_CAPACITY event
+        is_capacity = np.asarray(events == event_enum.SET_CAPACITY, dtype=bool)
+        if is_capacity.any():
+            capacities = df['capacity'].tolist()
+            last_capacity = np.maximum.accumulate(
+                np.where(is_capacity, np.arange(nr_rows), -1)
+            )
+            entry_capacities = [
+                capacities[i] if i >= 0 else PELT_SCALE
+                for i in last_capacity[entry_pos].tolist()
+            ]
+        else:
+            entry_capacities = [PELT_SCALE] * len(entry_pos)
+
+        root_node = _CallGraphNode(
+            func_name=None,
+            parent=None,
+            cpu=None,
+            cpu_capacity=None,
+            logical_thread=0,
+        )
+
+        index = df.index.to_numpy()
+        nodes = [
+            _CallGraphNode(
+                func_name=func_name,
+                cpu=cpu,
+                parent=None,
+                cpu_capacity=capacity,
+                entry_time=entry_time,
+                logical_thread=thread,
+            )
+            for func_name, cpu, capacity, entry_time, thread in zip(
+                entry_funcs.tolist(),
+                df['__cpu'].to_numpy()[entry_pos].tolist(),
+                entry_capacities,
+                index[entry_pos].tolist(),
+                threads.tolist(),
+            )
+        ]
+        for node, parent in zip(nodes, parents.tolist()):
+            parent = root_node if parent < 0 else nodes[parent]
+            node.parent = parent
+            parent._children.append(node)
+
+        exit_pos = np.flatnonzero(is_exit & (depth_before > 0))
+        exit_nodes = find_node(depth_before[exit_pos], exit_pos)
+        # That node is unusable for stats, since the function used to enter
+        # the call is not the same one as for the exit. This usually means
+        # that the kernel returned to userspace in between.
+        mismatch = func_names[exit_pos] != entry_funcs[exit_nodes]
+
+        if ts_cols is None:
+            entry_times = itertools.repeat(None)
+            exit_times = index[exit_pos]
+        else:
+            entry_ts, exit_ts = ts_cols
+            entry_times = (df[entry_ts].to_numpy()[exit_pos] * 1e-9).tolist()
+            exit_times = df[exit_ts].to_numpy()[exit_pos] * 1e-9
+
+        for node, invalid, entry_time, exit_time in zip(
+            exit_nodes.tolist(),
+            mismatch.tolist(),
+            entry_times,
+            exit_times.tolist(),
+        ):
+            node = nodes[node]
+            if invalid:
+                node.valid_metrics = False
+            if entry_time is not None:
+                node.entry_time = entry_time
+            node.exit_time = exit_time
+
+        tag_pos = np.flatnonzero(events == event_enum.SET_TAG)
+        if len(tag_pos):
+            tag_nodes = find_node(depth[tag_pos], tag_pos)
+            for node, tags in zip(tag_nodes.tolist(), df['tags'].to_numpy()[tag_pos]):
+                node = root_node if node < 0 else nodes[node]
+                node.set_tags(tags)
+
+        # Fixup the exit time if there were missing exit events
+        final_depth = depth[-1] if nr_rows else 0
+        if final_depth:
+            last_time = df.index[-1]
+            open_nodes = find_node(
+                np.arange(1, final_depth + 1),
+                np.full(final_depth, nr_rows),
+            )
+            for node in chain(map(nodes.__getitem__, open_nodes.tolist()), [root_node]):
+                node.exit_time = last_time
+                node.valid_metrics = False
+
+        root_children = root_node.children
+        if root_children:
+            root_node.entry_time = min(map(attrgetter('entry_time'), root_children))
+            root_node.exit_time = max(map(attrgetter('exit_time'), root_children))
+        else:
+            root_node.entry_time = 0
+            root_node.exit_time = 0
 
+        return root_node
 
 
 class _CallGraphNode(Mapping):
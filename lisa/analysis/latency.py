@@ -134,41 +134,31 @@ class LatencyAnalysis(TraceAnalysisBase):
         """
         df = self.ana.tasks.df_task_states(task)
 
-        runtimes = []
-        spurious_wkp = False
-
-        # Using df.apply() is risky for counting (can be called more than once
-        # on the same row), so use a loop instead
-        for index, row in df.iterrows():
-            runtime = runtimes[-1] if len(runtimes) else 0
-
-            if row.curr_state == TaskState.TASK_WAKING:
-                # This is required to capture strange trace sequences where
-                # a switch_in event is followed by a wakeup_event.
-                # This sequence is not expected, but we found it in some traces.
-                # Possible reasons could be:
-                # - misplaced sched_wakeup events
-                # - trace buffer artifacts
-                # TO BE BETTER investigated in kernel space.
-                # For the time being, we account this interval as RUNNING time,
-                # which is what kernelshark does.
-                if spurious_wkp:
-                    runtime += row.delta
-                    spurious_wkp = False
-                else:
-                    # This is a new activation, reset the runtime counter
-                    runtime = 0
-
-            elif row.curr_state == TaskState.TASK_ACTIVE:
-                # This is the spurious wakeup thing mentionned above
-                if row.next_state == TaskState.TASK_WAKING:
-                    spurious_wkp = True
-
-                runtime += row.delta
-
-            runtimes.append(runtime)
-
-        df["running_time"] = runtimes
+        curr_state = df['curr_state']
+        waking = curr_state == TaskState.TASK_WAKING
+        active = curr_state == TaskState.TASK_ACTIVE
+
+        # This is required to capture strange trace sequences where a
+        # switch_in event is followed by a wakeup_event.
+        # This sequence is not expected, but we found it in some traces.
+        # Possible reasons could be:
+        # - misplaced sched_wakeup events
+        # - trace buffer artifacts
+        # TO BE BETTER investigated in kernel space.
+        # For the time being, we account this interval as RUNNING time,
+        # which is what kernelshark does.
+        spurious = active & (df['next_state'] == TaskState.TASK_WAKING)
+        # The spurious wakeup flag is raised by an active row and consumed by
+        # the next waking row
+        since_waking = waking.cumsum().shift(1, fill_value=0).to_numpy()
+        spurious_wkp = waking & spurious.groupby(since_waking).cummax().astype(bool)
+
+        # A waking row that is not a spurious wakeup is a new activation,
+        # which resets the runtime counter. Other rows add their delta to it.
+        activation = waking & ~spurious_wkp
+        delta = df['delta'].where(active | spurious_wkp, 0)
+        runtimes = delta.groupby(activation.cumsum().to_numpy()).cumsum(skipna=False)
+        df = df.assign(running_time=runtimes)
 
         # The runtime column is not entirely correct - at a task's first
         # TASK_ACTIVE occurence, the running_time will be non-zero, even
@@ -22,12 +22,13 @@ import itertools
 import typing
 
 import holoviews as hv
+import numpy as np
 import pandas as pd
 
 from lisa.analysis.base import TraceAnalysisBase
 from lisa.analysis.status import StatusAnalysis
 from lisa.trace import requires_one_event_of, may_use_events, will_use_events_from, TaskID, CPU, MissingTraceEventError, OrTraceEventChecker
-from lisa.utils import deprecate
+from lisa.utils import deprecate, memoized, TASK_COMM_MAX_LEN
 from lisa.datautils import df_refit_index, series_refit_index, df_filter_task_ids, df_split_signals
 from lisa.notebook import plot_signal, _hv_neutral
 
@@ -223,16 +224,12 @@ class LoadTrackingAnalysis(TraceAnalysisBase):
         elif signal == 'required_capacity':
             # Add a column which represents the max capacity of the smallest
             # CPU which can accomodate the task utilization
-            capacities = sorted(self.trace.plat_info["cpu-capacities"]['orig'].values())
-
-            def fits_capacity(util):
-                for capacity in capacities:
-                    if util <= capacity:
-                        return capacity
-
-                return capacities[-1]
+            capacities = np.array(sorted(self.trace.plat_info["cpu-capacities"]['orig'].values()))
             df = self._df_either_event(self._SCHED_PELT_SE_NAMES)
-            df['required_capacity'] = df['util'].map(fits_capacity)
+            # Index of the first capacity >= util. Utilizations larger than
+            # the biggest capacity (or NaN) get the biggest capacity.
+            idx = np.searchsorted(capacities, df['util'].to_numpy(), side='left')
+            df['required_capacity'] = capacities[np.minimum(idx, len(capacities) - 1)]
 
         else:
             raise ValueError(f'Signal "{signal}" not supported')
@@ -242,7 +239,75 @@ class LoadTrackingAnalysis(TraceAnalysisBase):
         columns = sorted(set(df.columns) & columns)
         return df[columns]
 
-    @TraceAnalysisBase.cache
+    @memoized
+    def _df_tasks_signal_positions(self, signal):
+        """
+        Positions of the rows of each ``(pid, comm)`` in
+        :meth:`df_tasks_signal`.
+        """
+        df = self.df_tasks_signal(signal=signal)
+        return df.groupby(['pid', 'comm'], observed=True, sort=False, dropna=False).indices
+
+    def _get_task_positions(self, signal, task_id):
+        positions = self._df_tasks_signal_positions(signal)
+        pid, comm = task_id
+        if comm is not None:
+            comm = comm[:TASK_COMM_MAX_LEN]
+
+        if pid is not None and comm is not None:
+            try:
+                return positions[(pid, comm)]
+            except KeyError:
+                return np.array([], dtype=int)
+        # Partial TaskID can match multiple (pid, comm)
+        else:
+            selected = [
+                pos
+                for (_pid, _comm), pos in positions.items()
+                if (pid is None or _pid == pid) and (comm is None or _comm == comm)
+            ]
+            if selected:
+                return np.sort(np.concatenate(selected))
+            else:
+                return np.array([], dtype=int)
+
+    @df_tasks_signal.used_events
+    def df_tasks_signal_split(self, signal, tasks: typing.Sequence[TaskID]=None):
+        """
+        Same as :meth:`df_tasks_signal` but split per task.
+
+        :param signal: See :meth:`df_tasks_signal`.
+
+        :param tasks: Tasks to select. Each item can be the name or PID of a
+            task, or a :class:`lisa.trace.TaskID`. If ``None``, all the tasks
+            are selected.
+        :type tasks: list(lisa.trace.TaskID) or None
+
+        :returns: A dictionary of :class:`lisa.trace.TaskID` to the
+            :class:`pandas.DataFrame` of that task, as returned by
+            :meth:`df_task_signal`. Task names and PIDs are resolved with
+            :meth:`lisa.trace.Trace.get_task_ids`, so there is one item for
+            each matching :class:`lisa.trace.TaskID`.
+
+        The dataframe is split for all the tasks at once, which is much
+        cheaper than calling :meth:`df_task_signal` for each task.
+        """
+        df = self.df_tasks_signal(signal=signal)
+        if tasks is None:
+            return {
+                TaskID(pid=pid, comm=comm): df.iloc[pos]
+                for (pid, comm), pos in self._df_tasks_signal_positions(signal).items()
+            }
+        else:
+            task_ids = itertools.chain.from_iterable(
+                self.trace.get_task_ids(task, update=False)
+                for task in tasks
+            )
+            return {
+                task_id: df.iloc[self._get_task_positions(signal, task_id)]
+                for task_id in task_ids
+            }
+
     @df_tasks_signal.used_events
     def df_task_signal(self, task, signal):
         """
@@ -252,10 +317,13 @@ class LoadTrackingAnalysis(TraceAnalysisBase):
         :type task: str or int or tuple
 
         :param signal: See :meth:`df_tasks_signal`.
+
+        .. seealso:: :meth:`df_tasks_signal_split` to get the dataframes of
+            multiple tasks.
         """
         task_id = self.trace.get_task_id(task, update=False)
         df = self.df_tasks_signal(signal=signal)
-        return df_filter_task_ids(df, [task_id])
+        return df.iloc[self._get_task_positions(signal, task_id)]
 
     @deprecate(replaced_by=df_tasks_signal, deprecated_in='2.0', removed_in='4.0')
     @requires_one_event_of(*_SCHED_PELT_SE_NAMES)
@@ -270,39 +270,20 @@ class TasksAnalysis(TraceAnalysisBase):
     @requires_events('sched_switch', 'sched_wakeup')
     @will_use_events_from('task_rename')
     @may_use_events('sched_wakeup_new')
-    def _df_tasks_states(self, tasks=None, return_one_df=False):
+    def _df_tasks_states_timeline(self, add_rename=False):
         """
-        Compute tasks states for all tasks.
+        Assemble the ``sched_switch`` and ``sched_wakeup`` events of all tasks
+        in a single dataframe sorted by time.
 
-        :param tasks: If specified, states of these tasks only will be yielded.
-            The :class:`lisa.trace.TaskID` must have a ``pid`` field specified,
-            since the task state is per-PID.
-        :type tasks: list(lisa.trace.TaskID) or list(int)
-
-        :param return_one_df: If ``True``, a single dataframe is returned with
-            new extra columns. If ``False``, a generator is returned that
-            yields tuples of ``(TaskID, task_df)``. Each ``task_df`` contains
-            the new columns.
-        :type return_one_df: bool
+        :param add_rename: If ``True``, the ``task_rename`` events are added
+            so that the old comm of a task can be matched.
+        :type add_rename: bool
         """
-        ######################################################
-        # A) Assemble the sched_switch and sched_wakeup events
-        ######################################################
-
         def get_df(event):
             # Ignore the end of the window so we can properly compute the
             # durations
             return self.trace.df_event(event, window=(self.trace.start, None))
 
-        def filters_comm(task):
-            try:
-                return task.comm is not None
-            except AttributeError:
-                return isinstance(task, str)
-
-        # Add the rename events if we are interested in the comm of tasks
-        add_rename = any(map(filters_comm, tasks or []))
-
         wk_df = get_df('sched_wakeup')
         sw_df = get_df('sched_switch')
 
@@ -350,28 +331,58 @@ class TasksAnalysis(TraceAnalysisBase):
         df.sort_index(inplace=True)
         df.rename(columns={'__cpu': 'cpu'}, inplace=True)
 
-        # Restrict the set of data we will process to a given set of tasks
-        if tasks is not None:
-            def resolve_task(task):
-                """
-                Get a TaskID for each task, and only update existing TaskID if
-                they lack a PID field, since that's what we care about in that
-                function.
-                """
-                try:
-                    do_update = task.pid is None
-                except AttributeError:
-                    do_update = False
+        return df_window(df, window=self.trace.window)
+
+    @TraceAnalysisBase.cache
+    @_df_tasks_states_timeline.used_events
+    def _df_tasks_states_index(self, add_rename=False):
+        """
+        Same as :meth:`_df_tasks_states_timeline` but sorted by PID first, so
+        that the events of a given PID are contiguous and can be sliced out
+        without scanning the whole trace.
 
-                return self.trace.get_task_id(task, update=do_update)
+        Since it is cached in the trace swap, it is only computed once for all
+        the tasks.
+        """
+        df = self._df_tasks_states_timeline(add_rename=add_rename)
+        # Stable sort to keep the events of each PID sorted by time
+        return df.sort_values('pid', kind='stable')
+
+    @_df_tasks_states_timeline.used_events
+    def _df_tasks_states(self, tasks=None, return_one_df=False):
+        """
+        Compute tasks states for all tasks.
+
+        :param tasks: If specified, states of these tasks only will be yielded.
+            The :class:`lisa.trace.TaskID` must have a ``pid`` field specified,
+            since the task state is per-PID.
+        :type tasks: list(lisa.trace.TaskID) or list(int)
 
-            tasks = list(map(resolve_task, tasks))
-            df = df_filter_task_ids(df, tasks)
+        :param return_one_df: If ``True``, a single dataframe is returned with
+            new extra columns. If ``False``, a generator is returned that
+            yields tuples of ``(TaskID, task_df)``. Each ``task_df`` contains
+            the new columns.
+        :type return_one_df: bool
+        """
+        def filters_comm(task):
+            try:
+                return task.comm is not None
+            except AttributeError:
+                return isinstance(task, str)
 
-        df = df_window(df, window=self.trace.window)
+        # Add the rename events if we are interested in the comm of tasks
+        add_rename = any(map(filters_comm, tasks or []))
 
         # Return a unique dataframe with new columns added
         if return_one_df:
+            df = self._df_tasks_states_timeline(add_rename=add_rename)
+
+            # Restrict the set of data we will process to a given set of tasks
+            if tasks is not None:
+                df = df_filter_task_ids(df, self._resolve_tasks_states_ids(tasks))
+
+            # The dataframe is modified in place below
+            df = df.copy(deep=False)
             df.sort_index(inplace=True)
             df.index.name = 'Time'
             df.reset_index(inplace=True)
@@ -398,6 +409,44 @@ class TasksAnalysis(TraceAnalysisBase):
 
         # Return a generator yielding (TaskID, task_df) tuples
         else:
+            df = self._df_tasks_states_index(add_rename=add_rename)
+            pids = df['pid'].to_numpy()
+
+            if tasks is None:
+                # Boundaries of the contiguous blocks of each PID
+                bounds = np.flatnonzero(pids[1:] != pids[:-1]) + 1
+                slices = zip(
+                    itertools.chain([0], bounds),
+                    itertools.chain(bounds, [len(pids)]),
+                )
+                pid_dfs = (
+                    df.iloc[start:end]
+                    for start, end in slices
+                )
+            else:
+                tasks = self._resolve_tasks_states_ids(tasks)
+                if any(task.pid is None for task in tasks):
+                    pid_dfs = (
+                        pid_df
+                        for _, pid_df in df_split_signals(
+                            df_filter_task_ids(df, tasks),
+                            ['pid'],
+                        )
+                    )
+                else:
+                    def get_pid_df(pid):
+                        start = np.searchsorted(pids, pid, side='left')
+                        end = np.searchsorted(pids, pid, side='right')
+                        return df_filter_task_ids(
+                            df.iloc[start:end],
+                            [task for task in tasks if task.pid == pid],
+                        )
+
+                    pid_dfs = map(
+                        get_pid_df,
+                        sorted({task.pid for task in tasks}),
+                    )
+
             def make_pid_df(pid_df):
                 # Even though the initial dataframe contains duplicated indices due to
                 # using both prev_pid and next_pid in sched_switch event, we should
@@ -413,12 +462,28 @@ class TasksAnalysis(TraceAnalysisBase):
                 pid_df['next_state'] = pid_df['curr_state'].shift(-1, fill_value=TaskState.TASK_UNKNOWN)
                 return pid_df
 
-            signals = df_split_signals(df, ['pid'])
             return (
-                (TaskID(pid=col['pid'], comm=None), make_pid_df(pid_df))
-                for col, pid_df in signals
+                (TaskID(pid=int(pid_df['pid'].iloc[0]), comm=None), make_pid_df(pid_df))
+                for pid_df in pid_dfs
+                if not pid_df.empty
             )
 
+    def _resolve_tasks_states_ids(self, tasks):
+        """
+        Get a :class:`lisa.trace.TaskID` for each task, and only update the
+        existing ones if they lack a PID field, since the task states are
+        per-PID.
+        """
+        def resolve_task(task):
+            try:
+                do_update = task.pid is None
+            except AttributeError:
+                do_update = False
+
+            return self.trace.get_task_id(task, update=do_update)
+
+        return list(map(resolve_task, tasks))
+
     @staticmethod
     def _reorder_tasks_states_columns(df):
         """
@@ -18,9 +18,13 @@
 
 from collections import namedtuple, OrderedDict
 from itertools import product
+import functools
+import itertools
+import math
 import operator
 import re
 
+import numpy as np
 import pandas
 
 from devlib.utils.misc import mask_to_list, ranges_to_list
@@ -466,6 +470,95 @@ class EnergyModel(Serializable, Loggable):
             return ret
         return [find_deepest(pd) for pd in self.cpu_pds]
 
+    def _deepest_idle_idxs_array(self, cpus_active):
+        """
+        Vectorised version of :meth:`_deepest_idle_idxs`.
+
+        :param cpus_active: 2D boolean array with one row per CPU state
+            combination and one column per CPU.
+
+        :returns: A 2D integer array of the same shape as ``cpus_active``.
+        """
+        memo = {}
+
+        def find_deepest(pd):
+            try:
+                return memo[id(pd)]
+            except KeyError:
+                all_idle = ~cpus_active[:, list(pd.cpus)].any(axis=1)
+                if pd.parent:
+                    parent_idx = find_deepest(pd.parent)
+                else:
+                    parent_idx = -1
+                ret = np.where(all_idle, parent_idx + len(pd.idle_states), -1)
+                memo[id(pd)] = ret
+                return ret
+
+        return np.stack(
+            [find_deepest(pd) for pd in self.cpu_pds],
+            axis=1,
+        )
+
+    @property
+    @memoized
+    def _power_tables(self):
+        """
+        Dense lookup tables compiled from the model, used to vectorise
+        :meth:`estimate_from_trace`.
+
+        The returned dict has the following keys:
+
+            * ``cpu_freqs``: For each CPU, sorted array of the OPP frequencies.
+            * ``cpu_capacities``: For each CPU, capacity at each OPP.
+            * ``cpu_nr_idle``: For each CPU, number of idle states.
+            * ``nodes``: List of ``(cpus, freqs, active_power, idle_power)``
+              for each node with energy data. ``active_power[opp]`` is the
+              power of the node at the given OPP index of ``freqs``.
+              ``idle_power[i][idx]`` is the idle power of the node when its
+              i-th CPU is in its idle state of index ``idx``, or NaN if the
+              node does not know about that state.
+        """
+        def opp_table(active_states, attr):
+            freqs = np.array(sorted(active_states.keys()))
+            values = np.array([
+                getattr(active_states[freq], attr)
+                for freq in freqs
+            ])
+            return (freqs, values)
+
+        cpu_freqs, cpu_capacities = zip(*(
+            opp_table(node.active_states, 'capacity')
+            for node in self.cpu_nodes
+        ))
+
+        nodes = []
+        for node in self.root.iter_nodes():
+            if not node.active_states or not node.idle_states:
+                continue
+
+            freqs, active_power = opp_table(node.active_states, 'power')
+            idle_power = [
+                np.array(
+                    [
+                        node.idle_states.get(name, np.nan)
+                        for name in self.cpu_nodes[cpu].idle_states or []
+                    ],
+                    dtype='float64',
+                )
+                for cpu in node.cpus
+            ]
+            nodes.append((tuple(node.cpus), freqs, active_power, idle_power))
+
+        return dict(
+            cpu_freqs=cpu_freqs,
+            cpu_capacities=cpu_capacities,
+            cpu_nr_idle=[
+                len(node.idle_states or [])
+                for node in self.cpu_nodes
+            ],
+            nodes=nodes,
+        )
+
     def _guess_idle_states(self, cpus_active):
         idxs = self._deepest_idle_idxs(cpus_active)
         return [n.idle_state_by_idx(max(i, 0)) for n, i in zip(self.cpu_nodes, idxs)]
@@ -701,8 +794,12 @@ class EnergyModel(Serializable, Loggable):
         states for CPUs.
 
         .. note::
-            This is a brute force search taking time exponential wrt. the number
-            of tasks.
+            This is a branch-and-bound search over the distributions of tasks
+            on the CPUs. Interchangeable CPUs are only explored once, and
+            branches are pruned as soon as they are estimated to use more power
+            than the best placement found so far. The worst case complexity is
+            still exponential wrt. the number of tasks, but realistic workloads
+            of a few dozen of tasks can be handled.
 
         :param capacities: Dict mapping tasks to expected utilization
                            values. These tasks are assumed not to change; they
@@ -716,50 +813,324 @@ class EnergyModel(Serializable, Loggable):
                   that result in the same CPU utilizations are considered
                   equivalent.
         """
-        tasks = list(capacities.keys())
-
-        num_candidates = len(self.cpus) ** len(tasks)
+        # The final CPU utilizations do not depend on the order in which tasks
+        # are placed. Placing the biggest tasks first allows detecting
+        # overutilization and expensive placements earlier.
+        task_utils = sorted(capacities.values(), reverse=True)
+        # Utilization left to place after the i-th task
+        remaining_utils = list(itertools.accumulate(
+            reversed(task_utils + [0]),
+        ))[::-1][1:]
+        symmetries = self._placement_symmetries
 
         logger = self.logger
         logger.debug(
-            f'Searching {num_candidates} configurations for optimal task placement...')
+            f'Searching optimal task placement for {len(task_utils)} tasks, using CPU symmetries {symmetries}...')
+
+        def canonical(util):
+            # Sort the utilization of interchangeable CPUs so that all the
+            # symmetrical placements map to the same vector
+            util = list(util)
+            for cpus in symmetries:
+                for cpu, u in zip(cpus, sorted((util[cpu] for cpu in cpus), reverse=True)):
+                    util[cpu] = u
+            return tuple(util)
+
+        @functools.lru_cache(maxsize=None)
+        def estimate(util):
+            freqs, overutilized = self._guess_freqs(util, capacity_margin_pct)
+            if overutilized:
+                return None
+            else:
+                power = self.estimate_from_cpu_util(util, freqs=freqs)
+                return sum(power.values())
 
+        # Relative tolerance used when pruning, so that placements with the
+        # same power are not pruned because of floating point rounding.
+        rtol = 1e-9
+        best_power = math.inf
         candidates = {}
-        excluded = []
-        for cpus in product(self.cpus, repeat=len(tasks)):
-            placement = dict(zip(tasks, cpus))
-
-            util = [0] * len(self.cpus)
-            for task, cpu in placement.items():
-                util[cpu] += capacities[task]
-            util = tuple(util)
-
-            # Filter out candidate placements that have tasks greater than max
-            # or that we have already determined that we cannot place.
-            if (any(u > self.capacity_scale for u in util) or util in excluded):
-                continue
+        seen = set()
 
-            if util not in candidates:
-                freqs, overutilized = self._guess_freqs(util, capacity_margin_pct)
-                if overutilized:
-                    # This isn't a valid placement
-                    excluded.append(util)
-                else:
-                    power = self.estimate_from_cpu_util(util, freqs=freqs)
-                    candidates[util] = sum(power.values())
+        def explore(util, i):
+            nonlocal best_power
+
+            key = (util, i)
+            if key in seen:
+                return
+            else:
+                seen.add(key)
+
+            if i == len(task_utils):
+                power = estimate(util)
+                if power is not None:
+                    candidates[util] = power
+                    best_power = min(best_power, power)
+                return
+
+            task_util = task_utils[i]
+            remaining_util = remaining_utils[i]
+            children = []
+            for cpus in symmetries:
+                # Only place the task on the first of the interchangeable CPUs
+                # having a given utilization, since the others would lead to
+                # symmetrical placements.
+                for u in sorted({util[cpu] for cpu in cpus}):
+                    cpu = min(cpu for cpu in cpus if util[cpu] == u)
+                    child = list(util)
+                    child[cpu] += task_util
+                    child = canonical(child)
+                    if (child, i + 1) in seen:
+                        continue
+
+                    min_power = self._placement_min_power(
+                        child,
+                        remaining_util,
+                        capacity_margin_pct,
+                    )
+                    # The branch is invalid if the remaining tasks cannot fit
+                    if min_power is not None:
+                        children.append((min_power, child))
+
+            # Explore the most promising branches first so that a good bound
+            # is found early.
+            for min_power, child in sorted(children):
+                if min_power > best_power + abs(best_power) * rtol:
+                    break
+                explore(child, i + 1)
+
+        explore(canonical([0] * len(self.cpus)), 0)
+
+        candidates = {
+            util: power
+            for util, power in candidates.items()
+            if power <= best_power + abs(best_power) * rtol
+        }
 
         if not candidates:
             # The system can't provide full throughput to this workload.
             raise EnergyModelCapacityError(
                 f"Can't handle workload: total capacity = {sum(capacities.values())}")
 
+        # Expand the symmetrical placements and re-estimate all of them
+        # individually, so that the result is not influenced by the rounding
+        # errors of the canonical placements.
+        def expand(util):
+            def permutations(cpus):
+                return sorted(set(itertools.permutations(util[cpu] for cpu in cpus)))
+
+            for perms in product(*map(permutations, symmetries)):
+                _util = list(util)
+                for cpus, perm in zip(symmetries, perms):
+                    for cpu, u in zip(cpus, perm):
+                        _util[cpu] = u
+                yield tuple(_util)
+
+        candidates = {
+            _util: estimate(_util)
+            for util in candidates
+            for _util in expand(util)
+        }
+
         # Whittle down to those that give the lowest energy estimate
-        min_power = min(p for p in iter(candidates.values()))
-        ret = [u for u, p in candidates.items() if p == min_power]
+        min_power = min(candidates.values())
+        ret = sorted(
+            (u for u, p in candidates.items() if p == min_power),
+            reverse=True,
+        )
 
         logger.debug('done')
         return ret
 
+    @property
+    @memoized
+    def _placement_symmetries(self):
+        """
+        Partition of the CPUs in groups of interchangeable CPUs.
+
+        Two CPUs are interchangeable when they are siblings in both the
+        :class:`EnergyModelNode` and :class:`PowerDomain` trees, have the same
+        energy data and belong to the same frequency domain. Swapping the
+        utilization of such CPUs does not change the estimated power.
+        """
+        def key(cpu):
+            node = self.cpu_nodes[cpu]
+            pd = self.cpu_pds[cpu]
+            [freq_domain] = [
+                i
+                for i, dom in enumerate(self.freq_domains)
+                if cpu in dom
+            ]
+            return (
+                id(node.parent),
+                id(pd.parent),
+                freq_domain,
+                sorted(node.active_states.items()),
+                list((node.idle_states or {}).items()),
+                list(pd.idle_states),
+            )
+
+        groups = []
+        for cpu in self.cpus:
+            for group in groups:
+                if key(group[0]) == key(cpu):
+                    group.append(cpu)
+                    break
+            else:
+                groups.append([cpu])
+
+        return groups
+
+    @property
+    @memoized
+    def _placement_tables(self):
+        """
+        Lookup tables used by :meth:`_placement_min_power`.
+
+        For each CPU, the cheapest idle power and power per unit of utilization
+        are tabulated for every frequency of its domain and every idle state
+        index. For other nodes with energy data, the cheapest active power is
+        tabulated for every frequency and the cheapest idle power for every
+        idle state index of each of its CPUs.
+        """
+        def min_idle_powers(node, cpu):
+            # Cheapest idle power of the node for the CPU in any of the idle
+            # states up to a given index
+            powers = [
+                node.idle_states.get(name)
+                for name in self.cpu_nodes[cpu].idle_states or []
+            ]
+            return [
+                min(
+                    (power for power in powers[:idx + 1] if power is not None),
+                    default=0,
+                )
+                for idx in range(len(powers))
+            ] or [0]
+
+        domain_freqs = {
+            cpu: sorted({
+                freq
+                for _cpu in dom
+                for freq in self.cpu_nodes[_cpu].active_states.keys()
+            })
+            for dom in self.freq_domains
+            for cpu in dom
+        }
+
+        cpus = []
+        for cpu, node in enumerate(self.cpu_nodes):
+            if node.active_states and node.idle_states:
+                costs = {
+                    freq: [
+                        (
+                            idle,
+                            min(
+                                (
+                                    (state.power - idle) / state.capacity
+                                    for _freq, state in node.active_states.items()
+                                    if _freq >= freq
+                                ),
+                                default=0,
+                            )
+                        )
+                        for idle in min_idle_powers(node, cpu)
+                    ]
+                    for freq in domain_freqs[cpu]
+                }
+            else:
+                costs = None
+            cpus.append((node.max_capacity, costs))
+
+        nodes = [
+            (
+                node.cpus,
+                {
+                    freq: min(
+                        (
+                            state.power
+                            for _freq, state in node.active_states.items()
+                            if _freq >= freq
+                        ),
+                        default=0,
+                    )
+                    for freq in domain_freqs[node.cpus[0]]
+                },
+                [min_idle_powers(node, cpu) for cpu in node.cpus],
+            )
+            for node in self.root.iter_nodes()
+            if node.children and node.active_states and node.idle_states
+        ]
+
+        return dict(cpus=cpus, nodes=nodes)
+
+    def _placement_min_power(self, cpu_utils, remaining_util, capacity_margin_pct):
+        """
+        Lower bound of the power estimated by :meth:`estimate_from_cpu_util`
+        for any placement of ``remaining_util`` on top of ``cpu_utils``.
+
+        :returns: The lower bound, or ``None`` if the remaining utilization
+            cannot be placed without over-utilizing a CPU.
+
+        Adding some utilization can only increase the frequencies and make the
+        idle states shallower. The power of each CPU is bounded by the
+        cheapest idle and active states it can end up in. The remaining
+        utilization is placed fractionally on the CPUs with the cheapest power
+        per unit of utilization, and other nodes are bounded by the power of
+        their cheapest states.
+        """
+        freqs, overutilized = self._guess_freqs(cpu_utils, capacity_margin_pct)
+        if overutilized:
+            return None
+
+        deepest = self._deepest_idle_idxs(cpu_utils)
+        tables = self._placement_tables
+        margin = 100 / (100 - capacity_margin_pct)
+
+        def idle_idx(cpu, powers):
+            return min(max(deepest[cpu], 0), len(powers) - 1)
+
+        min_power = 0
+        costs = []
+        for cpu, (max_cap, cpu_costs) in enumerate(tables['cpus']):
+            util = cpu_utils[cpu]
+            if cpu_costs is None:
+                cost = 0
+            else:
+                cpu_costs = cpu_costs[freqs[cpu]]
+                idle, cost = cpu_costs[idle_idx(cpu, cpu_costs)]
+                min_power += idle + util * cost
+            costs.append((cost, max_cap / margin - util))
+
+        for cost, headroom in sorted(costs):
+            util = min(remaining_util, headroom)
+            min_power += util * cost
+            remaining_util -= util
+            if remaining_util <= 0:
+                break
+        else:
+            # Tolerate rounding errors of the headroom computation
+            if remaining_util > 1e-6:
+                return None
+
+        cpus_max_cap = [max_cap for max_cap, _ in tables['cpus']]
+        for cpus, active_powers, idle_powers in tables['nodes']:
+            min_active_time = max(
+                min(cpu_utils[cpu] / cpus_max_cap[cpu], 1)
+                for cpu in cpus
+            )
+            idle = max(
+                powers[idle_idx(cpu, powers)]
+                for cpu, powers in zip(cpus, idle_powers)
+            )
+            active = active_powers[freqs[cpus[0]]]
+            min_power += min(
+                idle * (1 - min_active_time) + active * min_active_time,
+                active,
+            )
+
+        return min_power
+
     @classmethod
     def probe_target(cls, target):
         """
@@ -880,47 +1251,93 @@ class EnergyModel(Serializable, Loggable):
         inputs = inputs.astype(int)
         inputs = df_deduplicate(inputs, keep='first', consecutives=True)
 
-        memo_cache = {}
-
-        def f(input_row):
-            # The code in this module is slow. Try not to call it too much.
-            memo_key = tuple(input_row)
-            if memo_key in memo_cache:
-                return memo_cache[memo_key]
-
-            # cpuidle doesn't understand shared resources so it will claim to
-            # put a CPU into e.g. 'cluster sleep' while its cluster siblings are
-            # active. Rectify those false claims.
-            cpus_active = input_row['idle'] == -1
-            deepest_possible = self._deepest_idle_idxs(cpus_active)
-            idle_idxs = [min(i, j) for i, j in zip(deepest_possible,
-                                                   input_row['idle'])]
+        cpus = list(self.cpus)
 
-            # Convert indexes to state names
-            idle_states = [n.idle_state_by_idx(max(i, 0))
-                           for n, i in zip(self.cpu_nodes, idle_idxs)]
-
-            # We don't use tracked load, we just treat a CPU as active or idle,
-            # so set util to 0 or 100%.
-            utils = cpus_active * self.capacity_scale
-
-            nrg = self.estimate_from_cpu_util(cpu_utils=utils,
-                                              idle_states=idle_states,
-                                              freqs=input_row['freq'])
-
-            # nrg is a dict mapping CPU group tuples to energy values.
-            # Unfortunately tuples don't play nicely as pandas column labels
-            # because parts of its API treat that as nested indexing
-            # (i.e. df[(0, 1)] sometimes means df[0][1]). So we'll give them
-            # awkward names.
+        def get_values(col):
+            df = inputs[col]
+            if list(df.columns) != cpus:
+                raise ValueError(
+                    f'{col} data available for CPUs {list(df.columns)} but must be available for all CPUs {cpus}')
+            return df.to_numpy()
+
+        idle = get_values('idle')
+        freqs = get_values('freq')
+
+        def opp_idxs(opp_freqs, freqs):
+            idxs = np.searchsorted(opp_freqs, freqs).clip(max=len(opp_freqs) - 1)
+            found = opp_freqs[idxs] == freqs
+            if not found.all():
+                raise KeyError(freqs[~found][0])
+            return idxs
+
+        tables = self._power_tables
+
+        # cpuidle doesn't understand shared resources so it will claim to
+        # put a CPU into e.g. 'cluster sleep' while its cluster siblings are
+        # active. Rectify those false claims.
+        cpus_active = idle == -1
+        deepest_possible = self._deepest_idle_idxs_array(cpus_active)
+        idle_idxs = np.maximum(np.minimum(deepest_possible, idle), 0)
+
+        for cpu, nr_idle in enumerate(tables['cpu_nr_idle']):
+            invalid = idle_idxs[:, cpu] >= nr_idle
+            if invalid.any():
+                idx = idle_idxs[:, cpu][invalid][0]
+                raise KeyError(f'No idle state with index {idx}')
+
+        # We don't use tracked load, we just treat a CPU as active or idle,
+        # so set util to 0 or 100%.
+        utils = cpus_active * self.capacity_scale
+        cpu_active_time = np.stack(
+            [
+                np.minimum(
+                    utils[:, cpu] / capacities[opp_idxs(opp_freqs, freqs[:, cpu])],
+                    1.0
+                )
+                for cpu, (opp_freqs, capacities) in enumerate(zip(
+                    tables['cpu_freqs'],
+                    tables['cpu_capacities'],
+                ))
+            ],
+            axis=1,
+        )
 
-            nrg = {'-'.join(str(c) for c in k): v for k, v in iter(nrg.items())}
+        nrg = {}
+        for node_cpus, opp_freqs, active_power, idle_power in tables['nodes']:
+            # For now we assume topology nodes with energy models do not
+            # overlap with frequency domains
+            opps = opp_idxs(opp_freqs, freqs[:, node_cpus[0]])
 
-            ret = pandas.Series(nrg)
-            memo_cache[memo_key] = ret
-            return ret
+            # The active time of a node is estimated as the max of the active
+            # times of its children, see _estimate_from_active_time()
+            active_time = cpu_active_time[:, list(node_cpus)].max(axis=1)
 
-        return inputs.apply(f, axis=1)
+            _idle_power = np.stack(
+                [
+                    power[idle_idxs[:, cpu]]
+                    for cpu, power in zip(node_cpus, idle_power)
+                ],
+                axis=1,
+            )
+            if np.isnan(_idle_power).any():
+                raise KeyError(f'Node for CPUs {node_cpus} is missing some idle states')
+            _idle_power = _idle_power.max(axis=1)
+
+            power = active_power[opps] * active_time + _idle_power * (1 - active_time)
+            nrg[node_cpus] = nrg.get(node_cpus, 0) + power
+
+        # nrg is a dict mapping CPU group tuples to energy values.
+        # Unfortunately tuples don't play nicely as pandas column labels
+        # because parts of its API treat that as nested indexing
+        # (i.e. df[(0, 1)] sometimes means df[0][1]). So we'll give them
+        # awkward names.
+        return pandas.DataFrame(
+            {
+                '-'.join(str(c) for c in k): v
+                for k, v in nrg.items()
+            },
+            index=inputs.index,
+        )
 
     @classmethod
     @memoized
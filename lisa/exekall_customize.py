@@ -28,7 +28,7 @@ from exekall.utils import get_name, add_argument, NoValue, flatten_seq
 from exekall.engine import ExprData, Consumer, PrebuiltOperator
 from exekall.customization import AdaptorBase
 
-from lisa.target import TargetConf
+from lisa.target import Target, TargetConf
 from lisa.utils import HideExekallID, ArtifactPath, Serializable, get_nested_key, ExekallTaggable
 from lisa.conf import MultiSrcConf
 from lisa.tests.base import Result, ResultBundleBase
@@ -73,6 +73,10 @@ class LISAAdaptor(AdaptorBase):
     def get_non_reusable_type_set(self):
         return {NonReusable}
 
+    def get_exclusive_type_set(self):
+        # A target can only run one test at a time
+        return {Target}
+
     def get_prebuilt_op_set(self):
         non_reusable_type_set = self.get_non_reusable_type_set()
         op_set = set()
@@ -388,10 +392,10 @@ comparison. Can be repeated.""")
         return {'*.ResultBundleBase'}
 
     @classmethod
-    def reload_db(cls, db, path=None):
+    def reload_value(cls, value, path=None):
         # If path is not known, we cannot do anything here
         if not path:
-            return db
+            return value
 
         # This will relocate ArtifactPath instances to the new absolute path of
         # the results folder, in case it has been moved to another place
@@ -399,22 +403,21 @@ comparison. Can be repeated.""")
 
         # Relocate ArtifactPath embeded in objects so they will always
         # contain an absolute path that adapts to the local filesystem
-        for serial in db.get_all():
-            val = serial.value
-            try:
-                dct = val.__dict__
-            except AttributeError:
-                continue
-            for attr, attr_val in dct.items():
-                if isinstance(attr_val, ArtifactPath):
-                    new_path = attr_val.with_root(artifact_dir)
-                    # Only update paths to existing files, otherwise assume it
-                    # was pointing outside the artifact_dir and therefore
-                    # should not be fixed up
-                    if os.path.exists(new_path):
-                        setattr(val, attr, new_path)
-
-        return db
+        try:
+            dct = value.__dict__
+        except AttributeError:
+            return value
+
+        for attr, attr_val in dct.items():
+            if isinstance(attr_val, ArtifactPath):
+                new_path = attr_val.with_root(artifact_dir)
+                # Only update paths to existing files, otherwise assume it
+                # was pointing outside the artifact_dir and therefore
+                # should not be fixed up
+                if os.path.exists(new_path):
+                    setattr(value, attr, new_path)
+
+        return value
 
     def finalize_expr(self, expr):
         expr_artifact_dir = expr.data['expr_artifact_dir']
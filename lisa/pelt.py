@@ -18,6 +18,7 @@
 import math
 import functools
 
+import numpy as np
 import pandas as pd
 
 from lisa.datautils import series_envelope_mean
@@ -184,104 +185,135 @@ def simulate_pelt(activations, init=0, index=None, clock=None, capacity=None, wi
     # some NaN at the beginning of the dataframe as well
     df.dropna(inplace=True)
 
-    def make_windowed_pelt_sim(init, scale, window, half_life):
-        decay = (1 / 2)**(1 / half_life)
-        # Alpha as defined in https://en.wikipedia.org/wiki/Moving_average
-        alpha = 1 - decay
-
-        # Accumulator of running time within a PELT window
-        acc = 0
-        # Output signal
-        signal = init / scale
-        output = signal
-
-        def pelt(row):
-            nonlocal acc, signal, output
-
-            # 1=running 0=sleeping
-            running = row['activations']
-            clock = row['clock']
-            delta = row['delta']
-            windows = row['crossed_windows'].astype('int')
-
-            # We crossed one or more windows boundaries
-            if windows:
-                # Handle last piece of the window in which this activation started
-                first_window_fraction = window - ((clock - delta) % window)
-                first_window_fraction /= window
-
-                acc += running * first_window_fraction
-                signal = alpha * acc + (1 - alpha) * signal
-
-                # Handle the windows we fully crossed
-                for _ in range(windows - 1):
-                    signal = alpha * running + (1 - alpha) * signal
-
-                # Handle the current incomplete window
-                last_window_fraction = (clock % window) / window
-
-                # Extrapolate the signal as it would look with the same
-                # `running` state at the end of the current window
-                extrapolated = running * alpha + (1 - alpha) * signal
-                # Take an value between signal and extrapolated based on the
-                # current completion of the window. This implements the same
-                # idea as introduced by kernel commit:
-                #  sched/cfs: Make util/load_avg more stable 625ed2bf049d5a352c1bcca962d6e133454eaaff
-                output = signal + last_window_fraction * (extrapolated - signal)
-
-                signal += alpha * running * last_window_fraction
-                acc = 0
-            # If we are still in the same window, just accumulate the running
-            # time
-            else:
-                acc += running * delta / window
-
-            return output * scale
-
-        return pelt
-
-    def make_windowless_pelt_sim(init, scale, window, half_life):
-        tau = _pelt_tau(half_life, window)
-        signal = init
-
-        def pelt_after(init, t, running):
-            # Compute the the response of the 1st order filter at time "t",
-            # with the given initial condition
-            # http://fourier.eng.hmc.edu/e59/lectures/e59/node33.html
-            exp_ = math.exp(-t / tau)
-            non_zero = running * scale * (1 - exp_)
-            zero = init * exp_
-            return non_zero + zero
-
-        def pelt(row):
-            nonlocal signal
-            # 1=running 0=sleeping
-            running = row['activations']
-            delta = row['delta']
-
-            signal = pelt_after(signal, delta, running)
-            return signal
-
-        return pelt
-
     if windowless:
-        make_sim = make_windowless_pelt_sim
+        simulate = _simulate_windowless_pelt
     else:
-        make_sim = make_windowed_pelt_sim
+        simulate = _simulate_windowed_pelt
 
-    sim = make_sim(
+    df['pelt'] = simulate(
+        df,
         init=init,
         window=window,
         half_life=half_life,
         scale=scale,
     )
-    df['pelt'] = df.apply(sim, axis=1)
     pelt = df['pelt']
     if pelt.index is not index:
         pelt = pelt.reindex(index, method='ffill')
     return pelt
 
 
+def _simulate_windowed_pelt(df, init, scale, window, half_life):
+    """
+    Windowed PELT simulator used by :func:`simulate_pelt`.
+
+    All the quantities that only depend on a given row are computed with
+    vectorized operations, and only the recursion itself is computed
+    iteratively on Python floats. Reordering the recursion as a cumulative
+    product would change the floating point rounding, so it is kept as is.
+    """
+    decay = (1 / 2)**(1 / half_life)
+    # Alpha as defined in https://en.wikipedia.org/wiki/Moving_average
+    alpha = 1 - decay
+    one_minus_alpha = 1 - alpha
+
+    # 1=running 0=sleeping
+    running = df['activations'].to_numpy(dtype=np.float64)
+    clock = df['clock'].to_numpy(dtype=np.float64)
+    delta = df['delta'].to_numpy(dtype=np.float64)
+    crossed_windows = df['crossed_windows'].to_numpy(dtype=np.float64).astype('int')
+
+    # Last piece of the window in which each activation started
+    first_window_fraction = window - ((clock - delta) % window)
+    first_window_fraction /= window
+    # Current incomplete window
+    last_window_fraction = (clock % window) / window
+
+    first_window_acc = running * first_window_fraction
+    same_window_acc = running * delta / window
+    alpha_running = alpha * running
+    last_window_increment = alpha_running * last_window_fraction
+
+    # Accumulator of running time within a PELT window
+    acc = 0
+    # Output signal
+    signal = init / scale
+    output = signal
+    outputs = np.empty(len(df), dtype=np.float64)
+
+    for i, (windows, alpha_running_, last_window_fraction_) in enumerate(zip(
+        crossed_windows.tolist(),
+        alpha_running.tolist(),
+        last_window_fraction.tolist(),
+    )):
+        # We crossed one or more windows boundaries
+        if windows:
+            # Handle last piece of the window in which this activation started
+            acc += first_window_acc[i]
+            signal = alpha * acc + one_minus_alpha * signal
+
+            # Handle the windows we fully crossed
+            for _ in range(windows - 1):
+                new = alpha_running_ + one_minus_alpha * signal
+                # The signal converged, so the remaining windows will not
+                # change it anymore.
+                if new == signal:
+                    break
+                signal = new
+
+            # Extrapolate the signal as it would look with the same
+            # `running` state at the end of the current window
+            extrapolated = alpha_running_ + one_minus_alpha * signal
+            # Take an value between signal and extrapolated based on the
+            # current completion of the window. This implements the same
+            # idea as introduced by kernel commit:
+            #  sched/cfs: Make util/load_avg more stable 625ed2bf049d5a352c1bcca962d6e133454eaaff
+            output = signal + last_window_fraction_ * (extrapolated - signal)
+
+            signal += last_window_increment[i]
+            acc = 0
+        # If we are still in the same window, just accumulate the running
+        # time
+        else:
+            acc += same_window_acc[i]
+
+        outputs[i] = output
+
+    return outputs * scale
+
+
+def _simulate_windowless_pelt(df, init, scale, window, half_life):
+    """
+    Windowless PELT simulator used by :func:`simulate_pelt`.
+
+    The response of the 1st order filter at each row is a linear function of
+    the value at the previous row, whose coefficients are computed with
+    vectorized operations. Only the recursion itself is computed iteratively,
+    to get the same floating point rounding as a direct computation.
+    """
+    tau = _pelt_tau(half_life, window)
+
+    # 1=running 0=sleeping
+    running = df['activations'].to_numpy(dtype=np.float64)
+    delta = df['delta'].to_numpy(dtype=np.float64)
+
+    # Compute the the response of the 1st order filter at time "t",
+    # with the given initial condition
+    # http://fourier.eng.hmc.edu/e59/lectures/e59/node33.html
+    # math.exp() is used rather than np.exp() since their results can differ
+    # in the last bit.
+    exp_ = np.fromiter(map(math.exp, (-delta / tau).tolist()), dtype=np.float64, count=len(delta))
+    non_zero = running * scale * (1 - exp_)
+
+    signal = init
+    outputs = np.empty(len(df), dtype=np.float64)
+    for i, (non_zero_, exp__) in enumerate(zip(non_zero.tolist(), exp_.tolist())):
+        signal = non_zero_ + signal * exp__
+        outputs[i] = signal
+
+    return outputs
+
+
 def _pelt_tau(half_life, window):
     """
     Compute the time constant of an equivalent continuous-time system as
@@ -23,6 +23,7 @@ import sys
 import re
 import gc
 import math
+import time
 import abc
 import copy
 import io
@@ -31,11 +32,14 @@ import os.path
 import json
 import inspect
 import shlex
+import hashlib
 import contextlib
 import tempfile
+import fcntl
+import weakref
 from functools import wraps
 from collections.abc import Set, Mapping, Sequence
-from collections import namedtuple
+from collections import namedtuple, deque
 from operator import itemgetter, attrgetter
 from numbers import Number, Integral, Real
 import multiprocessing
@@ -52,10 +56,11 @@ import pandas as pd
 from pandas.api.types import is_numeric_dtype
 import pyarrow.lib
 import pyarrow.parquet
+import pyarrow.ipc
 
 import devlib
 
-from lisa.utils import Loggable, HideExekallID, memoized, lru_memoized, deduplicate, take, deprecate, nullcontext, measure_time, checksum, newtype, groupby, PartialInit, kwargs_forwarded_to, kwargs_dispatcher, ComposedContextManager, get_nested_key, bothmethod
+from lisa.utils import Loggable, HideExekallID, memoized, lru_memoized, deduplicate, take, deprecate, nullcontext, measure_time, checksum, newtype, groupby, PartialInit, kwargs_forwarded_to, kwargs_dispatcher, ComposedContextManager, get_nested_key, bothmethod, LISA_CACHE_HOME
 from lisa.conf import SimpleMultiSrcConf, LevelKeyDesc, KeyDesc, TopLevelKeyDesc, Configurable
 from lisa.datautils import SignalDesc, df_add_delta, df_deduplicate, df_window, df_window_signals, series_convert
 from lisa.version import VERSION_TOKEN
@@ -186,6 +191,12 @@ class TraceParserBase(abc.ABC, Loggable, PartialInit):
 
     :param needed_metadata: Set of metadata name to gather in the parser.
     :type needed_metadata: collections.abc.Iterable(str)
+
+    :param events_columns: Mapping of event names to the columns that are
+        needed for that event. Parsers are free to ignore it and to parse
+        other columns as well, but doing so allows skipping the extraction of
+        fields that are not going to be used.
+    :type events_columns: dict(str, collections.abc.Iterable(str)) or None
     """
 
     METADATA_KEYS = [
@@ -198,9 +209,13 @@ class TraceParserBase(abc.ABC, Loggable, PartialInit):
     Possible metadata keys
     """
 
-    def __init__(self, events, needed_metadata=None):
+    def __init__(self, events, needed_metadata=None, events_columns=None):
         # pylint: disable=unused-argument
         self._needed_metadata = set(needed_metadata or [])
+        self._events_columns = {
+            event: set(columns)
+            for event, columns in (events_columns or {}).items()
+        }
 
     def get_metadata(self, key):
         """
@@ -477,10 +492,58 @@ class TxtEventParser(EventParserBase):
             event=event,
             fields=fields,
         )
+        self._positional_field = positional_field
+        self._greedy_field = greedy_field
         regex = self._get_regex(event, fields, positional_field, greedy_field)
         self.regex = re.compile(regex, flags=re.ASCII)
         self.raw = raw
 
+    def restrict_fields(self, fields):
+        """
+        Return a copy of the parser that only extracts the given fields.
+
+        :param fields: Names of the fields to extract. This can include header
+            fields such as ``__cpu``. Names that are not fields of the event
+            are ignored.
+        :type fields: collections.abc.Iterable(str)
+
+        The fields regex is rebuilt with only these fields, and the other
+        named groups (e.g. header fields) are turned into non-capturing
+        groups. This makes the regex cheaper to apply and avoids storing the
+        values that are not needed.
+        """
+        fields = set(fields)
+        # The positional and greedy fields are still matched since they
+        # delimit the other fields.
+        delimiters = {self._positional_field, self._greedy_field}
+        regex = self._get_regex(
+            self.event,
+            {
+                field: dtype
+                for field, dtype in self.fields.items()
+                if field in fields or field in delimiters
+            },
+            self._positional_field,
+            self._greedy_field,
+        )
+
+        def uncapture(match):
+            if match.group('name') in fields:
+                return match.group(0)
+            else:
+                return '(?:'
+
+        regex = re.sub(r'(?<!\\)\(\?P<(?P<name>\w+)>', uncapture, regex)
+
+        new = copy.copy(self)
+        new.regex = re.compile(regex, flags=self.regex.flags)
+        new.fields = {
+            field: dtype
+            for field, dtype in self.fields.items()
+            if field in fields
+        }
+        return new
+
     @property
     def bytes_regex(self):
         """
@@ -541,8 +604,9 @@ class TxtEventParser(EventParserBase):
 
             # Catch-all field that will consume any unknown field, allowing for
             # partial parsing (both for performance/memory consumption and
-            # forward compatibility)
-            fields_regexes.append(r'{identifier}=.*?(?=(?:{other_fields})=)'.format(
+            # forward compatibility). The word boundary prevents matching
+            # the end of another field name, e.g. "pid=" in "prev_pid=".
+            fields_regexes.append(r'{identifier}=.*?\b(?=(?:{other_fields})=)'.format(
                 other_fields='|'.join(fields),
                 **cls.PARSER_REGEX_TERMINALS
             ))
@@ -571,7 +635,7 @@ class TxtEventParser(EventParserBase):
         """
         blank = cls.PARSER_REGEX_TERMINALS['blank']
         regex_map = dict(
-            __comm=r'.+',
+            __comm=r'[^ ]+',
             __pid=cls.PARSER_REGEX_TERMINALS['integer'],
             __cpu=cls.PARSER_REGEX_TERMINALS['integer'],
             __timestamp=cls.PARSER_REGEX_TERMINALS['floating'],
@@ -591,7 +655,10 @@ class TxtEventParser(EventParserBase):
             if field in ('__timestamp', '__event')
         )
 
-        regex = r'^.*:?{blank}{__comm}-{__pid}{blank}\[{__cpu}\]{blank}{__timestamp}:{blank}{__event}:'.format(**compos, blank=blank)
+        # The task name is the last word before the PID. This is equivalent
+        # to r'^.*:?{blank}(?P<__comm>.+)-' but avoids the backtracking of
+        # that regex, which otherwise dominates the parsing time.
+        regex = r'(?<= ){__comm}-{__pid}{blank}\[{__cpu}\]{blank}{__timestamp}:{blank}{__event}:'.format(**compos, blank=blank)
         return regex
 
     def _get_regex(self, event, fields, positional_field, greedy_field):
@@ -681,6 +748,289 @@ class CustomFieldsTxtEventParser(TxtEventParser):
         return self._fields_regex
 
 
+_TXT_PARSER_WORKER_PARSE = None
+
+
+def _txt_parser_worker_init(parse):
+    # pylint: disable=global-statement
+    global _TXT_PARSER_WORKER_PARSE
+    _TXT_PARSER_WORKER_PARSE = parse
+
+
+def _txt_parser_worker(lines):
+    try:
+        return _TXT_PARSER_WORKER_PARSE(lines=lines)
+    except _NoEventLinesError:
+        return None
+
+
+class _NoEventLinesError(ValueError):
+    pass
+
+
+def _df_concat(dfs):
+    """
+    Same as :func:`pandas.concat` but keeps the categorical columns
+    categorical.
+
+    The categories of each column are unified before concatenating, which
+    avoids going through an ``object`` dtype that would otherwise be used by
+    :func:`pandas.concat` if the categories are not identical.
+    """
+    cat_cols = [
+        col
+        for col, dtype in dfs[0].dtypes.items()
+        if dtype.name == 'category' and all(
+            col in df.columns and df[col].dtype.name == 'category'
+            for df in dfs
+        )
+    ]
+
+    if cat_cols and len(dfs) > 1:
+        # Sort the categories so that the result is the same as if the data
+        # had been parsed in one go.
+        categories = {
+            col: functools.reduce(
+                lambda x, y: x.union(y, sort=False),
+                (df[col].cat.categories for df in dfs),
+            ).sort_values()
+            for col in cat_cols
+        }
+
+        def unify(df):
+            df = df.copy(deep=False)
+            for col, cats in categories.items():
+                df[col] = df[col].cat.set_categories(cats)
+            return df
+
+        dfs = list(map(unify, dfs))
+
+    return pd.concat(dfs, copy=False)
+
+
+def _series_to_category(series):
+    """
+    Convert ``series`` to strings stored as a categorical series.
+
+    The categories have an ``object`` dtype like the ones built by
+    :class:`_TxtDataFrameBuilder` and the ones loaded back from the swap.
+    """
+    series = series_convert(series, 'string').astype('category')
+    categories = series.cat.categories
+    return series.cat.rename_categories(categories.astype(object))
+
+
+class _TxtDataFrameBuilder:
+    """
+    Build a :class:`pandas.DataFrame` out of the tuples of :class:`bytes`
+    matched by a regex in a columnar way.
+
+    :param columns: Name of the columns, in the same order as the tuples.
+    :type columns: list(str)
+
+    :param dtypes: Mapping of column names to dtypes.
+    :type dtypes: dict(str, object)
+
+    :param index: Name of the column to use as index.
+    :type index: str or None
+
+    The tuples are appended to :attr:`rows`, and :meth:`compact` converts them
+    into compact columns so that the memory used by the Python objects does not
+    grow with the number of rows:
+
+        * ``string`` columns are factorized into the codes of a
+          :class:`pandas.Categorical`, and each distinct string is only decoded
+          once.
+        * Integer and float columns are parsed directly into their dtype.
+
+    Other columns (e.g. ``bytes`` or inferred dtypes) are kept as Python
+    objects and will need to be converted afterwards. If some values of a
+    chunk cannot be parsed by numpy (e.g. hexadecimal integers, missing values),
+    that chunk is converted using :func:`lisa.datautils.series_convert`.
+    """
+
+    def __init__(self, columns, dtypes=None, index=None):
+        dtypes = dtypes or {}
+
+        def get_kind(dtype):
+            if dtype == 'string':
+                return 'category'
+            # np.dtype(None) is float64
+            elif dtype is None:
+                return 'object'
+            else:
+                try:
+                    dtype = np.dtype(dtype)
+                # Callables and pandas-specific dtypes
+                except TypeError:
+                    return 'object'
+                else:
+                    return 'numeric' if dtype.kind in 'iuf' else 'object'
+
+        self.columns = columns
+        self.index = index
+        self.rows = []
+        self._dtypes = {
+            col: dtypes.get(col)
+            for col in columns
+        }
+        self._kinds = {
+            col: get_kind(dtype)
+            for col, dtype in self._dtypes.items()
+        }
+        self._chunks = {col: [] for col in columns}
+        self._categories = {
+            col: {}
+            for col, kind in self._kinds.items()
+            if kind == 'category'
+        }
+        self._nr_rows = 0
+
+    def __len__(self):
+        return self._nr_rows + len(self.rows)
+
+    @staticmethod
+    def _parse_numeric(values, dtype):
+        if None in values:
+            raise ValueError('Missing values')
+
+        dtype = np.dtype(dtype)
+        array = np.array(values)
+
+        # The values might already be numbers, e.g. the timestamps
+        if array.dtype.kind != 'S':
+            return array.astype(dtype, copy=False)
+        elif dtype.kind == 'f':
+            return array.astype(dtype)
+        else:
+            # numpy silently wraps out of range values, so check the range
+            # ourselves.
+            try:
+                parsed = array.astype(np.int64)
+            except OverflowError:
+                if dtype != np.uint64 or np.char.startswith(array, b'-').any():
+                    raise
+                else:
+                    return array.astype(np.uint64)
+            else:
+                info = np.iinfo(dtype)
+                if len(parsed) and (
+                    parsed.min() < info.min or
+                    parsed.max() > info.max
+                ):
+                    raise ValueError(f'Value out of range of {dtype}')
+                return parsed.astype(dtype, copy=False)
+
+    def compact(self):
+        """
+        Convert the content of :attr:`rows` into compact columns and empty it.
+        """
+        rows = self.rows
+        if not rows:
+            return
+
+        for col, values in zip(self.columns, zip(*rows)):
+            kind = self._kinds[col]
+            if kind == 'category':
+                cats = self._categories[col]
+                get_code = cats.setdefault
+                chunk = np.fromiter(
+                    (
+                        -1 if x is None else get_code(x, len(cats))
+                        for x in values
+                    ),
+                    dtype=np.int32,
+                    count=len(values),
+                )
+            elif kind == 'numeric':
+                dtype = self._dtypes[col]
+                try:
+                    chunk = self._parse_numeric(values, dtype)
+                except (ValueError, TypeError, OverflowError):
+                    chunk = series_convert(
+                        pd.Series(values, dtype='object'),
+                        dtype,
+                    )
+            else:
+                chunk = values
+
+            self._chunks[col].append(chunk)
+
+        self._nr_rows += len(rows)
+        # Keep the same list object, as it is referenced by the parsing loop
+        rows.clear()
+
+    def _get_column(self, col):
+        chunks = self._chunks[col]
+        kind = self._kinds[col]
+
+        if kind == 'category':
+            cats = list(self._categories[col].keys())
+            codes = np.concatenate(chunks) if chunks else np.array([], dtype=np.int32)
+            try:
+                decoded = pd.Index(
+                    [x.decode('ascii') for x in cats],
+                    dtype='object',
+                )
+            # Let series_convert() deal with the edge cases
+            except UnicodeDecodeError:
+                values = pd.Categorical.from_codes(codes, cats)
+                return _series_to_category(
+                    pd.Series(values).astype(object),
+                )
+            else:
+                # Sort the categories like Series.astype('category') does, so
+                # that the result does not depend on the order of appearance
+                order = decoded.argsort()
+                # The extra trailing item maps the -1 code of missing values
+                # to itself
+                remap = np.full(len(order) + 1, -1, dtype=codes.dtype)
+                remap[order] = np.arange(len(order), dtype=codes.dtype)
+                return pd.Categorical.from_codes(remap[codes], decoded[order])
+        elif kind == 'numeric' and all(isinstance(chunk, np.ndarray) for chunk in chunks):
+            if chunks:
+                return np.concatenate(chunks)
+            else:
+                return np.array([], dtype=self._dtypes[col])
+        elif kind == 'numeric':
+            return pd.concat(
+                [pd.Series(chunk) for chunk in chunks],
+                ignore_index=True,
+                copy=False,
+            )
+        else:
+            values = np.empty(self._nr_rows, dtype='object')
+            values[:] = list(itertools.chain.from_iterable(chunks))
+            return values
+
+    def to_df(self):
+        """
+        Build the :class:`pandas.DataFrame`.
+        """
+        self.compact()
+        index = self.index if self._nr_rows else None
+
+        data = {}
+        for col in self.columns:
+            values = self._get_column(col)
+            # Free the memory as we go
+            self._chunks[col] = None
+            if isinstance(values, pd.Series):
+                values = values.array
+            data[col] = values
+
+        if index is None:
+            df = pd.DataFrame(data, columns=self.columns)
+        else:
+            index_values = data.pop(index)
+            df = pd.DataFrame(
+                data,
+                columns=[col for col in self.columns if col != index],
+                index=pd.Index(index_values, name=index),
+            )
+        return df
+
+
 class TxtTraceParserBase(TraceParserBase):
     """
     Text trace parser base class.
@@ -707,6 +1057,25 @@ class TxtTraceParserBase(TraceParserBase):
     :param pre_filled_metadata: Metadata pre-filled by the caller of the
         constructor.
     :type pre_filled_metadata: dict(str, object) or None
+
+    :param jobs: Number of worker processes used to parse ``lines``. The
+        stream of lines is consumed only once and split in chunks of
+        :attr:`PARALLEL_CHUNK_SIZE` lines, each chunk being parsed for all the
+        requested events by a worker. The global timestamp deduplication is
+        preserved when merging the chunks. If ``None`` or ``1``, the lines are
+        parsed in the current process.
+    :type jobs: int or None
+
+    :param prev_time: Timestamp of the last event preceding ``lines``. This
+        allows parsing a trace in multiple parts while getting the same
+        timestamp deduplication as if it was parsed in one go.
+    :type prev_time: float
+
+    :param events_columns: Mapping of event names to the columns to parse for
+        that event. The event parsers supporting it (see
+        :meth:`TxtEventParser.restrict_fields`) will only extract these
+        columns, which speeds up parsing and lowers memory consumption.
+    :type events_columns: dict(str, collections.abc.Iterable(str)) or None
     """
 
     _KERNEL_DTYPE = {
@@ -763,6 +1132,17 @@ class TxtTraceParserBase(TraceParserBase):
     will be used as is.
     """
 
+    PARALLEL_CHUNK_SIZE = 100000
+    """
+    Number of lines in each chunk parsed by a worker when ``jobs > 1``.
+    """
+
+    COMPACT_CHUNK_SIZE = 65536
+    """
+    Number of lines after which the parsed events are turned into compact
+    columns, see :class:`_TxtDataFrameBuilder`.
+    """
+
     _RE_MATCH_CLS = re.Match
 
     def __init__(self,
@@ -772,8 +1152,11 @@ class TxtTraceParserBase(TraceParserBase):
         event_parsers=None,
         default_event_parser_cls=None,
         pre_filled_metadata=None,
+        jobs=None,
+        prev_time=0,
+        events_columns=None,
     ):
-        super().__init__(events, needed_metadata=needed_metadata)
+        super().__init__(events, needed_metadata=needed_metadata, events_columns=events_columns)
         self._pre_filled_metadata = pre_filled_metadata or {}
         events = set(events or [])
 
@@ -781,7 +1164,7 @@ class TxtTraceParserBase(TraceParserBase):
 
         # Remove all the parsers that are unnecessary
         event_parsers = {
-            event: parser
+            event: self._restrict_event_parser(parser)
             for event, parser in event_parsers.items()
             if event in events
         }
@@ -793,11 +1176,19 @@ class TxtTraceParserBase(TraceParserBase):
 
         self.logger.debug(f'Scanning the trace for metadata {needed_metadata} and events: {events}')
 
-        events_df, skeleton_df, time_range, available_events = self._eagerly_parse_lines(
+        # Daemonic processes cannot have children, so we cannot create a Pool
+        # if we are already executing from a Pool.
+        if jobs and jobs > 1 and not multiprocessing.current_process().daemon:
+            parse_lines = functools.partial(self._eagerly_parse_lines_mp, jobs=jobs)
+        else:
+            parse_lines = self._eagerly_parse_lines
+
+        events_df, skeleton_df, time_range, available_events = parse_lines(
             lines=lines,
             skeleton_regex=skeleton_regex,
             event_parsers=event_parsers,
             events=events,
+            prev_time=prev_time,
         )
 
         self._events_df = events_df
@@ -813,9 +1204,11 @@ class TxtTraceParserBase(TraceParserBase):
 
         event_parsers = {
             **{
-                event: default_event_parser_cls(
-                    event=event,
-                    **desc,
+                event: self._restrict_event_parser(
+                    default_event_parser_cls(
+                        event=event,
+                        **desc,
+                    )
                 )
                 for event, desc in inferred_event_descs.items()
             },
@@ -825,6 +1218,22 @@ class TxtTraceParserBase(TraceParserBase):
         }
         self._event_parsers = event_parsers
 
+    def _restrict_event_parser(self, parser):
+        """
+        Restrict the event parser to the columns requested in the
+        ``events_columns`` constructor parameter, if it supports it.
+        """
+        try:
+            columns = self._events_columns[parser.event]
+        except KeyError:
+            return parser
+        else:
+            try:
+                restrict = parser.restrict_fields
+            except AttributeError:
+                return parser
+            else:
+                return restrict(columns)
 
     @classmethod
     def _resolve_event_parsers(cls, event_parsers, default_event_parser_cls):
@@ -880,14 +1289,24 @@ class TxtTraceParserBase(TraceParserBase):
 
     @PartialInit.factory
     @kwargs_forwarded_to(__init__, ignore=['lines'])
-    def from_txt_file(cls, path, **kwargs):
+    def from_txt_file(cls, path, offset=0, size=None, **kwargs):
         """
         Build an instance from a path to a text file.
 
+        :param offset: Offset in bytes of the first line to parse in the file.
+            It must be at the beginning of a line.
+        :type offset: int
+
+        :param size: If not ``None``, only parse ``size`` bytes starting from
+            ``offset``. The end of the range must be at the end of a line.
+        :type size: int or None
+
         :Variable keyword arguments: Forwarded to ``__init__``
         """
         with open(path, 'rb') as f:
-            return cls(lines=f, **kwargs)
+            f.seek(offset)
+            lines = f if size is None else io.BytesIO(f.read(size))
+            return cls(lines=lines, **kwargs)
 
     @abc.abstractmethod
     def _get_skeleton_regex(self, need_fields):
@@ -903,8 +1322,15 @@ class TxtTraceParserBase(TraceParserBase):
             scan the whole trace.
         """
 
-    @staticmethod
-    def _make_df_from_data(regex, data, extra_cols=None):
+    @classmethod
+    def _make_df_builder(cls, regex, parser=None, extra_cols=None):
+        """
+        Create a :class:`_TxtDataFrameBuilder` for the tuples of the groups of
+        ``regex``, followed by ``extra_cols``.
+
+        The dtypes of the fields of ``parser`` are used to build compact
+        columns.
+        """
         extra_cols = extra_cols or []
         columns = sorted(
             regex.groupindex.keys(),
@@ -920,20 +1346,30 @@ class TxtTraceParserBase(TraceParserBase):
         ]
         columns += extra_cols
 
-        index = '__timestamp' if data and '__timestamp' in columns else None
-        return pd.DataFrame.from_records(
-            data,
-            columns=columns,
-            index=index,
-        )
+        if parser is None:
+            dtypes = {}
+        else:
+            dtypes = {
+                **parser.fields,
+                **cls.HEADER_FIELDS,
+            }
+        # Timestamps are already parsed by _eagerly_parse_lines()
+        if '__timestamp' in extra_cols:
+            dtypes['__timestamp'] = cls.HEADER_FIELDS['__timestamp']
+
+        index = '__timestamp' if '__timestamp' in columns else None
+        return _TxtDataFrameBuilder(columns, dtypes=dtypes, index=index)
 
-    def _eagerly_parse_lines(self, lines, skeleton_regex, event_parsers, events, time=None):
+    def _eagerly_parse_lines(self, lines, skeleton_regex, event_parsers, events, time=None, prev_time=0):
         """
         Filter the lines to select the ones with events.
 
         Also eagerly parse events from them to avoid the extra memory
         consumption from line storage, and to speed up parsing by acting as a
         pipeline on lazy lines stream.
+
+        ``prev_time`` is the timestamp of the line preceding ``lines``, so
+        that the timestamp deduplication can carry on across chunks of lines.
         """
 
         # Recompile all regex so that they work on bytes rather than strings.
@@ -965,15 +1401,25 @@ class TxtTraceParserBase(TraceParserBase):
         # tuples since they are:
         # 1) the most compact Python representation of a product type
         # 2) output directly by regex.search()
-        skeleton_data = []
+        skeleton_builder = self._make_df_builder(skeleton_regex, extra_cols=['__timestamp', 'line'])
+        skeleton_data = skeleton_builder.rows
+        builders = {
+            event: self._make_df_builder(parser.regex, parser=parser, extra_cols=['__timestamp'])
+            for event, parser in event_parsers.items()
+        }
         events_data = {
             **{event: (None, None) for event in events},
             **{
-                event: (parser.bytes_regex.search, [])
+                event: (parser.bytes_regex.search, builders[event].rows)
                 for event, parser in event_parsers.items()
             },
         }
         available_events = set()
+        # The parsed data are regularly turned into compact columns to avoid
+        # accumulating Python objects for every line.
+        chunk_size = self.COMPACT_CHUNK_SIZE
+        lines = iter(lines)
+        chunks = iter(lambda: list(itertools.islice(lines, chunk_size)), [])
 
         begin_time = None
         end_time = None
@@ -993,104 +1439,108 @@ class TxtTraceParserBase(TraceParserBase):
         groups = self._RE_MATCH_CLS.groups
         nextafter = np.nextafter
         inf = math.inf
-        line_time = 0
+        line_time = prev_time
         parse_time = '__timestamp' in skeleton_regex.groupindex.keys()
 
-        for line in lines:
-            prev_time = line_time
-            if time_is_provided:
-                line_time, line = line
+        for chunk in chunks:
+            for line in chunk:
+                prev_time = line_time
+                if time_is_provided:
+                    line_time, line = line
 
-            match = skel_search(line)
-            # Stop at the first non-matching line
-            try:
-                event = group(match, '__event')
-                line_time = time_type(group(match, '__timestamp'))
-            # Assume only "time" is not in the regex. Keep that out of the hot
-            # path since it's only needed in rare cases (like nesting parsers)
-            except IndexError:
-                # If we are supposed to parse time, let's re-raise the
-                # exception
-                if parse_time:
-                    raise
-                else:
-                    # Otherwise, make sure "event" is defined so that we only
-                    # go a match failure on "time"
-                    event # pylint: disable=pointless-statement
-            # The line did not match the skeleton regex, so skip it
-            except TypeError:
-                if b'EVENTS DROPPED' in line:
-                    raise DroppedTraceEventError('The trace buffer got overridden by new data, increase the buffer size to ensure all events are recorded')
-                # Unknown line, could be coming e.g. from stderr
-                else:
-                    continue
+                match = skel_search(line)
+                # Stop at the first non-matching line
+                try:
+                    event = group(match, '__event')
+                    line_time = time_type(group(match, '__timestamp'))
+                # Assume only "time" is not in the regex. Keep that out of the hot
+                # path since it's only needed in rare cases (like nesting parsers)
+                except IndexError:
+                    # If we are supposed to parse time, let's re-raise the
+                    # exception
+                    if parse_time:
+                        raise
+                    else:
+                        # Otherwise, make sure "event" is defined so that we only
+                        # go a match failure on "time"
+                        event # pylint: disable=pointless-statement
+                # The line did not match the skeleton regex, so skip it
+                except TypeError:
+                    if b'EVENTS DROPPED' in line:
+                        raise DroppedTraceEventError('The trace buffer got overridden by new data, increase the buffer size to ensure all events are recorded')
+                    # Unknown line, could be coming e.g. from stderr
+                    else:
+                        continue
 
-            # Do a global deduplication of timestamps, across all
-            # events regardless of the one we will parse. This ensures
-            # stable results and joinable dataframes from multiple
-            # parser instance.
-            if line_time <= prev_time:
-                line_time = nextafter(prev_time, inf)
+                # Do a global deduplication of timestamps, across all
+                # events regardless of the one we will parse. This ensures
+                # stable results and joinable dataframes from multiple
+                # parser instance.
+                if line_time <= prev_time:
+                    line_time = nextafter(prev_time, inf)
 
-            if begin_time is None:
-                begin_time = line_time
+                if begin_time is None:
+                    begin_time = line_time
 
-            # If we can parse it right away, let's do it now
-            try:
-                search, data = events_data[event]
-                append(
-                    data,
-                    # Add the fixedup time
-                    groups(search(line)) + (line_time,)
-                )
-            # If we don't have a parser for it yet (search == None),
-            # just store the line so we can infer its parser later
-            except TypeError:
-                # Add the fixedup time and the full line for later
-                # parsing as well
-                append(
-                    skeleton_data,
-                    groups(match) + (line_time, line)
-                )
-            # We are not interested in that event, but we still remember the
-            # pareseable events
-            except KeyError:
-                available_events.add(event)
+                # If we can parse it right away, let's do it now. The event
+                # regex matches the header again, but it is cheap compared to
+                # the fields: reusing the skeleton match and only matching the
+                # fields from its end only saves ~10% of this loop.
+                try:
+                    search, data = events_data[event]
+                    append(
+                        data,
+                        # Add the fixedup time
+                        groups(search(line)) + (line_time,)
+                    )
+                # If we don't have a parser for it yet (search == None),
+                # just store the line so we can infer its parser later
+                except TypeError:
+                    # Add the fixedup time and the full line for later
+                    # parsing as well
+                    append(
+                        skeleton_data,
+                        groups(match) + (line_time, line)
+                    )
+                # We are not interested in that event, but we still remember the
+                # pareseable events
+                except KeyError:
+                    available_events.add(event)
+
+            skeleton_builder.compact()
+            for builder in builders.values():
+                builder.compact()
 
         # This should have been set on the first line.
         # Note: we don't raise the exception if no events were asked for, to
         # allow creating dummy parsers without any line
         if begin_time is None and events:
-            raise ValueError('No lines containing events have been found')
+            raise _NoEventLinesError('No lines containing events have been found')
 
         end_time = line_time
         available_events.update(
             event
-            for event, (search, data) in events_data.items()
-            if data
+            for event, builder in builders.items()
+            if len(builder)
         )
 
         events_df = {}
         for event, parser in event_parsers.items():
-            try:
-                # Remove the tuple data from the dict as we go, to free memory
-                # before proceeding to the next event to smooth the peak memory
-                # consumption
-                _, data = events_data.pop(event)
-            except KeyError:
-                pass
-            else:
-                decoded_event = event.decode('ascii')
-                df = self._make_df_from_data(parser.regex, data, ['__timestamp'])
-                # Post-process immediately to shorten the memory consumption
-                # peak
-                df = self._postprocess_df(decoded_event, parser, df)
-                events_df[decoded_event] = df
+            # Remove the builder from the dict as we go, to free memory before
+            # proceeding to the next event to smooth the peak memory
+            # consumption
+            builder = builders.pop(event)
+            decoded_event = event.decode('ascii')
+            df = builder.to_df()
+            # Post-process immediately to shorten the memory consumption
+            # peak
+            df = self._postprocess_df(decoded_event, parser, df)
+            events_df[decoded_event] = df
 
         # Compute the skeleton dataframe for the events that have not been
         # parsed already. It contains the event name, the time, and potentially
         # the fields if they are needed
-        skeleton_df = self._make_df_from_data(skeleton_regex, skeleton_data, ['__timestamp', 'line'])
+        skeleton_df = skeleton_builder.to_df()
         # Drop unnecessary columns that might have been parsed by the regex
         to_keep = {'__event', '__fields', 'line'}
         skeleton_df = skeleton_df[sorted(to_keep & set(skeleton_df.columns))]
@@ -1102,6 +1552,106 @@ class TxtTraceParserBase(TraceParserBase):
         available_events = {event.decode('ascii') for event in available_events}
         return (events_df, skeleton_df, (begin_time, end_time), available_events)
 
+    def _eagerly_parse_lines_mp(self, lines, skeleton_regex, event_parsers, events, jobs, prev_time=0):
+        """
+        Same as :meth:`_eagerly_parse_lines` but split ``lines`` in chunks that
+        are parsed by a pool of ``jobs`` worker processes.
+
+        The output of ``lines`` is only consumed once, and the number of chunks
+        in-flight is bounded so that the memory consumption does not depend on
+        the size of the trace.
+        """
+        parse = functools.partial(
+            self._eagerly_parse_lines,
+            skeleton_regex=skeleton_regex,
+            event_parsers=event_parsers,
+            events=events,
+        )
+
+        chunk_size = self.PARALLEL_CHUNK_SIZE
+        lines = iter(lines)
+        chunks = iter(lambda: list(itertools.islice(lines, chunk_size)), [])
+
+        # Avoid the cost of creating a pool if everything fits in one chunk
+        first_chunks = list(itertools.islice(chunks, 2))
+        if len(first_chunks) < 2:
+            return parse(lines=first_chunks[0] if first_chunks else [], prev_time=prev_time)
+        chunks = itertools.chain(first_chunks, chunks)
+
+        # Use fork explicitly, so that the parser and event parsers are
+        # inherited by the workers rather than pickled: some event parser
+        # classes are defined locally and cannot be pickled.
+        ctx = multiprocessing.get_context('fork')
+        pool = ctx.Pool(
+            processes=jobs,
+            initializer=_txt_parser_worker_init,
+            initargs=(parse,),
+        )
+
+        def results():
+            pending = deque()
+            with pool:
+                for chunk in chunks:
+                    pending.append((chunk, pool.apply_async(_txt_parser_worker, (chunk,))))
+                    # Bound the amount of chunks waiting to be processed
+                    if len(pending) > 2 * jobs:
+                        chunk, res = pending.popleft()
+                        yield (chunk, res.get())
+
+                while pending:
+                    chunk, res = pending.popleft()
+                    yield (chunk, res.get())
+
+        events_dfs = {}
+        skeleton_dfs = []
+        available_events = set()
+        begin_time = None
+        end_time = prev_time
+
+        for chunk, res in results():
+            # The first line of the chunk was deduplicated without knowing about
+            # the previous chunk. If it collides with the end of the previous
+            # chunk, re-parse it with the correct starting point, so we get
+            # exactly the same timestamps as a sequential parse.
+            if res is not None and res[2][0] <= end_time:
+                res = parse(lines=chunk, prev_time=end_time)
+
+            if res is not None:
+                _events_df, _skeleton_df, (_begin_time, _end_time), _available_events = res
+                for event, df in _events_df.items():
+                    events_dfs.setdefault(event, []).append(df)
+                skeleton_dfs.append(_skeleton_df)
+                available_events.update(_available_events)
+
+                if begin_time is None:
+                    begin_time = _begin_time
+                end_time = _end_time
+
+        # No chunk contained any event, let the sequential implementation deal
+        # with it so we get the same behavior.
+        if begin_time is None:
+            return parse(lines=[], prev_time=prev_time)
+
+        def concat(df_list):
+            non_empty = [df for df in df_list if not df.empty]
+            if not non_empty:
+                return df_list[0]
+            elif len(non_empty) == 1:
+                return non_empty[0]
+            else:
+                return _df_concat(non_empty)
+
+        events_df = {
+            event: concat(df_list)
+            for event, df_list in events_dfs.items()
+        }
+        skeleton_df = concat(skeleton_dfs)
+        # Concatenating categorical columns with different categories gives
+        # an object dtype
+        skeleton_df['__event'] = skeleton_df['__event'].astype('category', copy=False)
+
+        return (events_df, skeleton_df, (begin_time, end_time), available_events)
+
     def _lazyily_parse_event(self, event, parser, df):
         # Only parse the lines that have a chance to match
         df = df[df['__event'] == event.encode('ascii')]
@@ -1114,11 +1664,12 @@ class TxtTraceParserBase(TraceParserBase):
         # Parse the lines with the regex.
         # note: we cannot use Series.str.extract(expand=True) since it does
         # not work on bytes
-        data = [
+        builder = self._make_df_builder(parser.regex, parser=parser)
+        builder.rows.extend(
             groups(search(line))
             for line in df['line']
-        ]
-        df = self._make_df_from_data(regex, data)
+        )
+        df = builder.to_df()
         df.index = index
         df = self._postprocess_df(event, parser, df)
         return df
@@ -1254,9 +1805,20 @@ class TxtTraceParserBase(TraceParserBase):
             else:
                 return first_success
 
+        def convert_string(x):
+            # Strings are stored as categories, as most of them are task names
+            # with a lot of duplicates. _TxtDataFrameBuilder already built the
+            # category so there is nothing left to do.
+            if x.dtype.name == 'category':
+                return x
+            else:
+                return _series_to_category(x)
+
         def make_converter(dtype):
             # If the dtype is already known, just use that
-            if dtype:
+            if dtype == 'string':
+                return convert_string
+            elif dtype:
                 return lambda x: series_convert(x, dtype)
             else:
                 # Otherwise, infer it from the data we have
@@ -1995,87 +2557,804 @@ class SysTraceParser(HRTxtTraceParser):
         return super().from_txt_file(*args, **kwargs)
 
 
-class TrappyTraceParser(TraceParserBase):
+class _TraceDatField(namedtuple('_TraceDatField', ('name', 'offset', 'size', 'signed', 'kind', 'is_char'))):
     """
-    Glue with :mod:`trappy` trace parsers.
+    Field of an event as described in the format stored in a ``trace.dat``
+    file.
 
-    .. note:: This class is deprecated and the use of :class:`TxtTraceParser`
-        is recommended instead. This class is only provided in case
-        compatibility with :mod:`trappy` is needed for one reason or another.
+    ``kind`` is one of:
+
+        * ``scalar``: fixed-size integer
+        * ``array``: fixed-size array
+        * ``data_loc``: ``__data_loc`` dynamic array
+        * ``rel_loc``: ``__rel_loc`` dynamic array
+        * ``tail``: zero-sized array consuming the rest of the record
     """
+    __slots__ = []
 
-    @kwargs_forwarded_to(TraceParserBase.__init__)
-    def __init__(self, path, events, trace_format=None, **kwargs):
-        super().__init__(events=events, **kwargs)
 
-        # Lazy import so that it's not a required dependency
-        import trappy # pylint: disable=import-outside-toplevel,import-error
+class _TraceDatEventFormat(namedtuple('_TraceDatEventFormat', ('event', 'id', 'fields'))):
+    """
+    Format of an event as stored in a ``trace.dat`` file.
+    """
+    __slots__ = []
 
-        events = set(events)
-        # Make sure we won't attempt parsing 'print' events, so that this
-        # parser is not used to resolve meta events.
-        events -= {'print'}
-        self._events = events
 
-        events = set(events)
-        if trace_format is None:
-            if path.endswith('html'):
-                trace_format = 'SySTrace'
-            else:
-                trace_format = 'FTrace'
+class TraceDatParser(TraceParserBase):
+    """
+    Binary parser for ``trace.dat`` files recorded by ``trace-cmd``.
 
-        self.logger.debug(f'Parsing {trace_format} events from {path}: {sorted(events)}')
-        if trace_format == 'SysTrace':
-            trace_class = trappy.SysTrace
-        elif trace_format == 'FTrace':
-            trace_class = trappy.FTrace
-        else:
-            raise ValueError(f'Unknown trace format: {trace_format}')
+    :param path: Path to the ``trace.dat`` file.
+    :type path: str
 
-        # Since we handle the cache in lisa.trace.Trace, we do not need to duplicate it
-        trace_class.disable_cache = True
-        trace = trace_class(
-            path,
-            scope="custom",
-            events=sorted(events),
-            normalize_time=False,
-        )
-        self._trace = trace
+    :param events: Events to parse. If ``None``, all the events available in
+        the trace can be parsed.
+    :type events: collections.abc.Iterable(str) or None
 
-        # trappy sometimes decides to be "clever" and overrules the path to be
-        # used, even though it was specifically asked for a given file path
-        assert path == trace.trace_path
+    :param events_columns: Mapping of event names to the columns to decode
+        for that event.
+    :type events_columns: dict(str, collections.abc.Iterable(str)) or None
 
-    def get_metadata(self, key):
-        if key == 'time-range':
-            trace = self._trace
-            return (trace.basetime, trace.endtime)
-        else:
-            return super().get_metadata(key)
+    :Variable keyword arguments: Forwarded to :class:`TraceParserBase`
 
-    def parse_event(self, event):
-        trace = self._trace
+    Unlike :class:`TxtTraceParser`, this parser does not spawn ``trace-cmd
+    report``. The file is memory-mapped, the ring buffer pages of all the CPUs
+    are decoded in lockstep and the fields of each event are extracted into
+    NumPy arrays using the event formats stored in the file. The resulting
+    dataframes follow the same conventions as :class:`TxtTraceParser`, so
+    that the two can be used interchangeably::
 
-        if event not in self._events:
-            raise MissingTraceEventError([event])
+        trace = Trace('trace.dat', parser=TraceDatParser)
 
-        df = getattr(trace, event).data_frame
-        if df.empty:
-            raise MissingTraceEventError([event])
+    .. note:: Only version 6 of the ``trace.dat`` format is supported, and only
+        the top-level buffer is parsed. Use :class:`TxtTraceParser` for other
+        files.
+    """
 
-        return df
+    _MAGIC = b'\x17\x08Dtracing'
 
+    _TYPE_PADDING = 29
+    _TYPE_TIME_EXTEND = 30
+    _TYPE_TIME_STAMP = 31
+    _TS_SHIFT = 27
+    _COMMIT_MASK = (1 << 27) - 1
+    _MISSING_EVENTS = 1 << 31
 
-class TraceBase(abc.ABC):
-    """
-    Base class for common functionalities between :class:`Trace` and :class:`TraceView`
-    """
+    _OPTION_OFFSET = 7
 
-    def __init__(self):
-        # Import here to avoid a circular dependency issue at import time
-        # with lisa.analysis.base
+    _FORMAT_FIELD_REGEX = re.compile(
+        rb'field:(?P<decl>.*?);\s*offset:(?P<offset>\d+);\s*size:(?P<size>\d+);\s*(?:signed:(?P<signed>\d+);)?'
+    )
+    _FORMAT_DECL_REGEX = re.compile(
+        rb'(?P<name>\w+)\s*(?:\[[^\]]*\])?\s*$'
+    )
+    _PRINTK_FORMAT_REGEX = re.compile(
+        rb'^(?:0x)?(?P<addr>[0-9a-fA-F]+)\s*:\s*"(?P<fmt>.*)"$',
+        flags=re.MULTILINE,
+    )
+    _BPRINT_SPEC_REGEX = re.compile(
+        rb'%(?P<flags>[-+ #0]*)(?P<width>\*|\d+)?(?:\.(?P<prec>\*|\d+))?(?P<length>hh|h|ll|l|L|z|j|t|q)?(?P<conv>[%cdiouxXsp])(?P<ext>(?<=p)[a-zA-Z]*)?'
+    )
 
-        # pylint: disable=import-outside-toplevel
+    @kwargs_forwarded_to(TraceParserBase.__init__)
+    def __init__(self, path, events=None, events_columns=None, **kwargs):
+        super().__init__(events=events, events_columns=events_columns, **kwargs)
+        self._path = path
+
+        with open(path, 'rb') as f:
+            # An empty file cannot be mapped
+            if not os.fstat(f.fileno()).st_size:
+                raise ValueError(f'Empty trace.dat file: {path}')
+            import mmap # pylint: disable=import-outside-toplevel
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._read_headers()
+        self._read_records()
+
+        available = set(
+            self._formats_by_id[id_].event
+            for id_ in np.unique(self._rec_id)
+        )
+        if events is not None:
+            available &= set(events)
+        self._available_events = available
+
+    def _read_headers(self):
+        buf = self._buf
+        pos = 0
+
+        def read(size):
+            nonlocal pos
+            data = buf[pos:pos + size]
+            if len(data) != size:
+                raise ValueError(f'Truncated trace.dat file: {self._path}')
+            pos += size
+            return data
+
+        def read_int(size):
+            return int.from_bytes(read(size), byteorder=byteorder)
+
+        def read_str():
+            nonlocal pos
+            end = buf.find(b'\0', pos)
+            if end < 0:
+                raise ValueError(f'Truncated trace.dat file: {self._path}')
+            data = buf[pos:end]
+            pos = end + 1
+            return data
+
+        def read_sized(size_len):
+            return read(read_int(size_len))
+
+        if read(len(self._MAGIC)) != self._MAGIC:
+            raise ValueError(f'Not a trace.dat file: {self._path}')
+
+        version = read_str()
+        if version != b'6':
+            raise ValueError(f'Unsupported trace.dat version {version.decode()}, use TxtTraceParser instead')
+
+        big_endian, long_size = read(2)
+        byteorder = 'big' if big_endian else 'little'
+        self._endian = '>' if big_endian else '<'
+        self._long_size = long_size
+        self._page_size = read_int(4)
+
+        if read_str() != b'header_page':
+            raise ValueError('Could not find header_page section')
+        header_page = self._parse_fields(read_sized(8))
+        self._page_data_offset = header_page['data'].offset
+
+        if read_str() != b'header_event':
+            raise ValueError('Could not find header_event section')
+        read_sized(8)
+
+        formats = [
+            self._parse_format(read_sized(8))
+            for _ in range(read_int(4))
+        ]
+        for _ in range(read_int(4)):
+            read_str()
+            formats.extend(
+                self._parse_format(read_sized(8))
+                for _ in range(read_int(4))
+            )
+        self._formats_by_id = {
+            fmt.id: fmt
+            for fmt in formats
+        }
+        self._formats_by_name = {
+            fmt.event: fmt
+            for fmt in formats
+        }
+
+        self._kallsyms = read_sized(4)
+        self._printk_formats = read_sized(4)
+        cmdlines = read_sized(8)
+        self._cmdlines = {
+            int(pid): comm.decode('utf-8', errors='replace')
+            for pid, _, comm in (
+                line.partition(b' ')
+                for line in cmdlines.splitlines()
+                if line
+            )
+        }
+
+        self._nr_cpus = read_int(4)
+
+        self._ts_offset = 0
+        section = read(10)
+        if section == b'options  \0':
+            while True:
+                option = read_int(2)
+                if not option:
+                    break
+                data = read_sized(4)
+                if option == self._OPTION_OFFSET:
+                    self._ts_offset = int(data.rstrip(b'\0'), 0)
+            section = read(10)
+
+        if section != b'flyrecord\0':
+            raise ValueError(f'Unsupported trace.dat data section: {section.rstrip(bytes(1)).decode()}')
+
+        self._cpu_buffers = [
+            (read_int(8), read_int(8))
+            for _ in range(self._nr_cpus)
+        ]
+
+    @classmethod
+    def _parse_fields(cls, desc):
+        def parse(match):
+            decl = match.group('decl').strip()
+            offset = int(match.group('offset'))
+            size = int(match.group('size'))
+            signed = bool(int(match.group('signed') or 0))
+
+            if decl.startswith(b'__data_loc'):
+                kind = 'data_loc'
+            elif decl.startswith(b'__rel_loc'):
+                kind = 'rel_loc'
+            # Old kernels declare "char buf;" with a zero size for the
+            # content of the "print" event.
+            elif decl.endswith(b'[]') or not size:
+                kind = 'tail'
+            elif decl.endswith(b']'):
+                kind = 'array'
+            else:
+                kind = 'scalar'
+
+            match = cls._FORMAT_DECL_REGEX.search(decl)
+            name = match.group('name')
+            is_char = re.search(rb'\bchar\b', decl[:match.start()]) is not None
+            return _TraceDatField(
+                name=name.decode('ascii'),
+                offset=offset,
+                size=size,
+                signed=signed,
+                kind=kind,
+                is_char=is_char,
+            )
+
+        return {
+            field.name: field
+            for field in map(parse, cls._FORMAT_FIELD_REGEX.finditer(desc))
+        }
+
+    @classmethod
+    def _parse_format(cls, desc):
+        def get(name):
+            match = re.search(rb'^' + name + rb':\s*(.*)$', desc, flags=re.MULTILINE)
+            if match is None:
+                raise ValueError(f'Could not find "{name.decode()}" in event format')
+            return match.group(1).strip()
+
+        return _TraceDatEventFormat(
+            event=get(b'name').decode('ascii'),
+            id=int(get(b'ID')),
+            fields=cls._parse_fields(desc),
+        )
+
+    def _read_records(self):
+        """
+        Walk all the ring buffer pages and collect the position, length,
+        timestamp, CPU and type of every record.
+        """
+        buf = self._buf
+        endian = self._endian
+        page_size = self._page_size
+        nr_words = len(buf) // 4
+        u32 = np.frombuffer(buf, dtype=f'{endian}u4', count=nr_words)
+        u64 = np.frombuffer(buf, dtype=f'{endian}u8', count=len(buf) // 8)
+
+        pages = [
+            (np.arange(offset, offset + size - page_size + 1, page_size, dtype=np.int64), cpu)
+            for cpu, (offset, size) in enumerate(self._cpu_buffers)
+        ]
+        page_cpu = np.concatenate([
+            np.full(len(_pages), cpu, dtype=np.uint32)
+            for _pages, cpu in pages
+        ])
+        pages = np.concatenate([_pages for _pages, cpu in pages])
+
+        if (pages % 8).any():
+            raise ValueError('trace.dat ring buffer pages are not aligned')
+
+        ts = u64[pages // 8]
+        commit_pos = pages + 8
+        if self._long_size == 8:
+            commit = u64[commit_pos // 8]
+        else:
+            commit = u32[commit_pos // 4].astype(np.uint64)
+
+        if (commit & self._MISSING_EVENTS).any():
+            raise DroppedTraceEventError('The trace buffer got overridden by new data, increase the buffer size to ensure all events are recorded')
+
+        pos = pages + self._page_data_offset
+        end = pos + (commit & self._COMMIT_MASK).astype(np.int64)
+        page_idx = np.arange(len(pages))
+
+        keep = pos < end
+        pos, end, ts, page_idx = pos[keep], end[keep], ts[keep], page_idx[keep]
+
+        rec_pos = []
+        rec_len = []
+        rec_ts = []
+        rec_page = []
+
+        # Each iteration decodes one record of every page that still has
+        # data, so the number of iterations is bounded by the number of
+        # records in the fullest page.
+        while len(pos):
+            header = u32[pos // 4]
+            if endian == '>':
+                type_len = header >> 27
+                delta = header & self._COMMIT_MASK
+            else:
+                type_len = header & 0x1f
+                delta = header >> 5
+
+            delta = delta.astype(np.uint64)
+            data = pos + 4
+            length = np.zeros_like(pos)
+
+            is_time = type_len >= self._TYPE_TIME_EXTEND
+            if is_time.any():
+                extra = u32[data[is_time] // 4].astype(np.uint64)
+                delta[is_time] += extra << np.uint64(self._TS_SHIFT)
+                data[is_time] += 4
+
+            is_stamp = type_len == self._TYPE_TIME_STAMP
+            ts = np.where(is_stamp, delta, ts + delta)
+
+            is_padding = type_len == self._TYPE_PADDING
+            if is_padding.any():
+                length[is_padding] = u32[data[is_padding] // 4]
+
+            is_data = type_len < self._TYPE_PADDING
+            is_big = type_len == 0
+            if is_big.any():
+                big_len = u32[data[is_big] // 4].astype(np.int64) - 4
+                length[is_big] = (big_len + 3) & ~3
+                data[is_big] += 4
+
+            is_small = is_data & ~is_big
+            length[is_small] = type_len[is_small].astype(np.int64) * 4
+
+            rec_pos.append(data[is_data])
+            rec_len.append(length[is_data])
+            rec_ts.append(ts[is_data])
+            rec_page.append(page_idx[is_data])
+
+            pos = data + length
+            keep = pos < end
+            pos, end, ts, page_idx = pos[keep], end[keep], ts[keep], page_idx[keep]
+
+        def concat(arrays, dtype):
+            if arrays:
+                return np.concatenate(arrays)
+            else:
+                return np.array([], dtype=dtype)
+
+        rec_pos = concat(rec_pos, np.int64)
+        rec_len = concat(rec_len, np.int64)
+        rec_ts = concat(rec_ts, np.uint64)
+        rec_cpu = page_cpu[concat(rec_page, np.int64)]
+
+        rec_id = self._gather(rec_pos, np.dtype(f'{endian}u2'))
+        known = np.isin(rec_id, list(self._formats_by_id.keys()))
+
+        rec_pos = rec_pos[known]
+        rec_len = rec_len[known]
+        rec_ts = rec_ts[known]
+        rec_cpu = rec_cpu[known]
+        rec_id = rec_id[known]
+
+        # Records of a given CPU are stored in order in the file, so sorting
+        # on the position preserves the order inside a CPU buffer. This
+        # gives the same order as trace-cmd report.
+        order = np.lexsort((rec_pos, rec_cpu, rec_ts))
+        self._rec_pos = rec_pos[order]
+        self._rec_len = rec_len[order]
+        self._rec_cpu = rec_cpu[order]
+        self._rec_id = rec_id[order]
+
+        time = (rec_ts[order] + np.uint64(self._ts_offset)).astype(np.float64) / 1e9
+        self._rec_time = self._dedup_time(time)
+
+    @staticmethod
+    def _dedup_time(time):
+        """
+        Make the timestamps strictly increasing the same way
+        :class:`TxtTraceParserBase` does it, by bumping each duplicated
+        timestamp to the next representable float.
+        """
+        time = time.copy()
+        if len(time) < 2:
+            return time
+
+        while True:
+            dup = np.flatnonzero(time[1:] <= time[:-1]) + 1
+            if not len(dup):
+                return time
+            # Only fixup the first element of each run of duplicates, since
+            # the fixed up value is needed to fix the next one.
+            first = dup[np.insert(np.diff(dup) != 1, 0, True)]
+            time[first] = np.nextafter(time[first - 1], math.inf)
+
+    def _gather(self, pos, dtype):
+        """
+        Read a value of the given dtype at each of the given offsets in the
+        file.
+        """
+        buf = self._buf
+        size = dtype.itemsize
+        out = np.empty(len(pos), dtype=dtype)
+        shifts = pos % size
+        for shift in np.unique(shifts):
+            shift = int(shift)
+            sel = shifts == shift
+            view = np.frombuffer(buf, dtype=dtype, offset=shift, count=(len(buf) - shift) // size)
+            out[sel] = view[(pos[sel] - shift) // size]
+        return out
+
+    @property
+    @memoized
+    def _symbols(self):
+        symbols = {}
+        for line in self._kallsyms.splitlines():
+            addr, _, rest = line.partition(b' ')
+            name = rest.partition(b' ')[2].partition(b'\t')[0]
+            with contextlib.suppress(ValueError):
+                symbols[int(addr, 16)] = name.decode('ascii')
+        return symbols
+
+    @property
+    @memoized
+    def _sorted_symbols(self):
+        addrs, names = zip(*sorted(self._symbols.items())) if self._symbols else ((), ())
+        return (np.array(addrs, dtype=np.uint64), list(names))
+
+    def _resolve_symbols(self, addrs):
+        """
+        Resolve addresses to the name of the symbol they belong to, like the
+        ``%ps`` format does.
+        """
+        sym_addrs, names = self._sorted_symbols
+        idx = np.searchsorted(sym_addrs, addrs.astype(np.uint64), side='right') - 1
+        return [
+            names[i] if i >= 0 else hex(addr)
+            for i, addr in zip(idx.tolist(), addrs.tolist())
+        ]
+
+    @property
+    @memoized
+    def _printk_map(self):
+        def unescape(fmt):
+            return fmt.decode('unicode_escape').encode('latin-1')
+
+        return {
+            int(match.group('addr'), 16): unescape(match.group('fmt'))
+            for match in self._PRINTK_FORMAT_REGEX.finditer(self._printk_formats)
+        }
+
+    def get_metadata(self, key):
+        if key == 'time-range':
+            time = self._rec_time
+            if len(time):
+                return (time[0].item(), time[-1].item())
+            else:
+                return (0, 0)
+        elif key == 'cpus-count':
+            return self._nr_cpus
+        elif key == 'available-events':
+            return sorted(
+                self._formats_by_id[id_].event
+                for id_ in np.unique(self._rec_id)
+            )
+        elif key == 'symbols-address':
+            symbols = self._symbols
+            # Kernels with kptr_restrict will give 0 for all symbols
+            if symbols and set(symbols.keys()) != {0}:
+                return symbols
+            else:
+                return super().get_metadata(key)
+        else:
+            return super().get_metadata(key)
+
+    def parse_event(self, event):
+        if event not in self._available_events:
+            raise MissingTraceEventError([event])
+
+        fmt = self._formats_by_name[event]
+        sel = self._rec_id == fmt.id
+        pos = self._rec_pos[sel]
+        length = self._rec_len[sel]
+
+        columns = self._events_columns.get(event)
+        def wanted(name):
+            return columns is None or name in columns
+
+        fields = fmt.fields
+        pid = self._get_field(fields['common_pid'], pos, length)
+        data = {}
+        if wanted('__comm'):
+            cmdlines = self._cmdlines
+            data['__comm'] = [
+                '<idle>' if not _pid else cmdlines.get(_pid, '<...>')
+                for _pid in pid.tolist()
+            ]
+        if wanted('__pid'):
+            data['__pid'] = pid
+        if wanted('__cpu'):
+            data['__cpu'] = self._rec_cpu[sel]
+
+        data.update(
+            (name, self._get_field(field, pos, length))
+            for name, field in fields.items()
+            if not name.startswith('common_') and (
+                wanted(name) or
+                # The format string is needed to decode the buffer
+                (event == 'bprint' and name == 'fmt' and wanted('buf'))
+            )
+        )
+
+        # trace-cmd does not display the final newline of "print" events
+        # and the conversion specifiers of "bprint" events are applied.
+        if event == 'print' and 'buf' in data:
+            data['buf'] = [
+                buf[:-1] if buf.endswith(b'\n') else buf
+                for buf in data['buf']
+            ]
+        elif event == 'bprint' and 'buf' in data:
+            data['buf'] = self._format_bprint(data.pop('fmt'), data['buf'])
+        elif event == 'bputs' and 'str' in data:
+            printk = self._printk_map
+            data['str'] = [
+                printk.get(addr, b'')
+                for addr in data['str'].tolist()
+            ]
+
+        df = pd.DataFrame(
+            data,
+            index=pd.Index(self._rec_time[sel], name='Time'),
+        )
+        return self._postprocess_df(event, df)
+
+    def _get_field(self, field, pos, length):
+        endian = self._endian
+        pos = pos + field.offset
+        kind = field.kind
+
+        if kind == 'scalar' and field.size in (1, 2, 4, 8):
+            dtype = np.dtype(f"{endian}{'i' if field.signed else 'u'}{field.size}")
+            return self._gather(pos, dtype).astype(dtype.newbyteorder('='))
+        elif kind == 'array' and field.is_char:
+            values = self._gather(pos, np.dtype(f'S{field.size}'))
+            # NumPy already stripped the trailing NUL, but C strings end at
+            # the first one.
+            return [
+                value.partition(b'\0')[0]
+                for value in values.tolist()
+            ]
+
+        buf = self._buf
+        if kind in ('data_loc', 'rel_loc'):
+            loc = self._gather(pos, np.dtype(f'{endian}u4')).astype(np.int64)
+            start = pos - field.offset + (loc & 0xffff)
+            if kind == 'rel_loc':
+                start += field.offset + field.size
+            end = start + (loc >> 16)
+        elif kind == 'tail':
+            start = pos
+            end = pos - field.offset + length
+        else:
+            start = pos
+            end = pos + field.size
+
+        values = [
+            buf[_start:_end]
+            for _start, _end in zip(start.tolist(), end.tolist())
+        ]
+        if field.is_char:
+            values = [
+                value.partition(b'\0')[0]
+                for value in values
+            ]
+        return values
+
+    def _format_bprint(self, fmt, buf):
+        printk = self._printk_map
+        return [
+            self._vbin_printf(printk.get(addr, b''), data)
+            for addr, data in zip(fmt.tolist(), buf)
+        ]
+
+    def _vbin_printf(self, fmt, data):
+        """
+        Format the binary arguments recorded by ``trace_printk()``.
+        """
+        byteorder = 'big' if self._endian == '>' else 'little'
+        long_size = self._long_size
+        pos = 0
+
+        def read_int(size, signed):
+            nonlocal pos
+            # Arguments are always aligned on 4 bytes
+            pos = (pos + 3) & ~3
+            value = int.from_bytes(data[pos:pos + size], byteorder=byteorder, signed=signed)
+            pos += size
+            return value
+
+        def read_str():
+            nonlocal pos
+            end = data.find(b'\0', pos)
+            end = len(data) if end < 0 else end
+            value = data[pos:end]
+            pos = end + 1
+            return value
+
+        def replace(match):
+            conv = match.group('conv')
+            if conv == b'%':
+                return b'%'
+
+            width = match.group('width')
+            if width == b'*':
+                width = str(read_int(4, True)).encode('ascii')
+            prec = match.group('prec')
+            if prec == b'*':
+                prec = str(read_int(4, True)).encode('ascii')
+
+            length = match.group('length') or b''
+            size = {
+                b'': 4,
+                b'hh': 4,
+                b'h': 4,
+                b'l': long_size,
+                b'z': long_size,
+                b't': long_size,
+                b'j': 8,
+                b'll': 8,
+                b'L': 8,
+                b'q': 8,
+            }[length]
+
+            if conv == b's':
+                value = read_str().decode('utf-8', errors='replace')
+            elif conv == b'p':
+                value = read_int(long_size, False)
+                if match.group('ext')[:1] in (b'S', b's', b'F', b'f'):
+                    value, = self._resolve_symbols(np.array([value], dtype=np.uint64))
+                else:
+                    value = hex(value)
+                conv = b's'
+            elif conv == b'c':
+                value = read_int(size, False)
+            else:
+                value = read_int(size, conv in (b'd', b'i'))
+                if conv in (b'i', b'u'):
+                    conv = b'd'
+
+            spec = b'%' + match.group('flags') + (width or b'') + (b'.' + prec if prec else b'') + conv
+            return (spec.decode('ascii') % value).encode('utf-8')
+
+        try:
+            return self._BPRINT_SPEC_REGEX.sub(replace, fmt)
+        except (KeyError, ValueError, TypeError, OverflowError):
+            return fmt
+
+    def _postprocess_df(self, event, df):
+        """
+        Convert the columns to the dtypes used by :class:`TxtTraceParser` for
+        the same events, so that both parsers give interchangeable results.
+        """
+        try:
+            parser = TxtTraceParser.EVENT_DESCS[event]
+        except KeyError:
+            fields = {}
+        else:
+            if isinstance(parser, Mapping):
+                fields = parser['fields']
+            else:
+                fields = parser.fields
+
+        fields = {
+            **fields,
+            **TxtTraceParser.HEADER_FIELDS,
+        }
+
+        for col in df.columns:
+            series = df[col]
+            dtype = fields.get(col)
+            is_numeric = is_numeric_dtype(series.dtype)
+
+            if dtype is None:
+                if not is_numeric:
+                    dtype = 'string'
+            # Addresses are resolved to symbol names like trace-cmd does,
+            # otherwise the raw value is kept.
+            elif dtype in ('string', 'bytes'):
+                if is_numeric:
+                    if set(self._symbols.keys()) - {0}:
+                        series = pd.Series(
+                            self._resolve_symbols(series.to_numpy()),
+                            index=series.index,
+                        )
+                    else:
+                        dtype = None
+            elif not is_numeric:
+                dtype = None
+
+            if dtype == 'bytes':
+                continue
+            elif dtype == 'string':
+                df[col] = _series_to_category(series)
+            elif dtype:
+                df[col] = series_convert(series, dtype)
+
+        return df
+
+
+class TrappyTraceParser(TraceParserBase):
+    """
+    Glue with :mod:`trappy` trace parsers.
+
+    .. note:: This class is deprecated and the use of :class:`TxtTraceParser`
+        is recommended instead. This class is only provided in case
+        compatibility with :mod:`trappy` is needed for one reason or another.
+    """
+
+    @kwargs_forwarded_to(TraceParserBase.__init__)
+    def __init__(self, path, events, trace_format=None, **kwargs):
+        super().__init__(events=events, **kwargs)
+
+        # Lazy import so that it's not a required dependency
+        import trappy # pylint: disable=import-outside-toplevel,import-error
+
+        events = set(events)
+        # Make sure we won't attempt parsing 'print' events, so that this
+        # parser is not used to resolve meta events.
+        events -= {'print'}
+        self._events = events
+
+        events = set(events)
+        if trace_format is None:
+            if path.endswith('html'):
+                trace_format = 'SySTrace'
+            else:
+                trace_format = 'FTrace'
+
+        self.logger.debug(f'Parsing {trace_format} events from {path}: {sorted(events)}')
+        if trace_format == 'SysTrace':
+            trace_class = trappy.SysTrace
+        elif trace_format == 'FTrace':
+            trace_class = trappy.FTrace
+        else:
+            raise ValueError(f'Unknown trace format: {trace_format}')
+
+        # Since we handle the cache in lisa.trace.Trace, we do not need to duplicate it
+        trace_class.disable_cache = True
+        trace = trace_class(
+            path,
+            scope="custom",
+            events=sorted(events),
+            normalize_time=False,
+        )
+        self._trace = trace
+
+        # trappy sometimes decides to be "clever" and overrules the path to be
+        # used, even though it was specifically asked for a given file path
+        assert path == trace.trace_path
+
+    def get_metadata(self, key):
+        if key == 'time-range':
+            trace = self._trace
+            return (trace.basetime, trace.endtime)
+        else:
+            return super().get_metadata(key)
+
+    def parse_event(self, event):
+        trace = self._trace
+
+        if event not in self._events:
+            raise MissingTraceEventError([event])
+
+        df = getattr(trace, event).data_frame
+        if df.empty:
+            raise MissingTraceEventError([event])
+
+        return df
+
+
+class TraceBase(abc.ABC):
+    """
+    Base class for common functionalities between :class:`Trace` and :class:`TraceView`
+    """
+
+    def __init__(self):
+        # Import here to avoid a circular dependency issue at import time
+        # with lisa.analysis.base
+
+        # pylint: disable=import-outside-toplevel
         from lisa.analysis._proxy import AnalysisProxy, _DeprecatedAnalysisProxy
         # self.analysis is deprecated so we can transition to using holoviews
         # in all situations, even when the backend is matplotlib
@@ -2483,6 +3762,15 @@ class _CacheDataDescNF:
             data=self._nf,
         )
 
+    @property
+    @memoized
+    def digest(self):
+        """
+        Hexadecimal digest of the normal form, stable across processes.
+        """
+        data = json.dumps(self.to_json_map(), sort_keys=True, default=repr)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
     @classmethod
     def _coerce_json(cls, x):
         """
@@ -2527,6 +3815,13 @@ class _CacheDataSwapEntry:
 
     :param written: ``True`` if the swap entry is already written on-disk.
     :type written: bool
+
+    :param coverage: Part of the trace the data was computed from, as a
+        mapping with an ``offset`` key giving the size of the trace file and
+        a ``time`` key giving the timestamp of the last event in that part of
+        the file. If ``None``, the data is only valid for the trace it was
+        computed from and will be discarded if anything is appended to it.
+    :type coverage: dict(str, object) or None
     """
 
     META_EXTENSION = 'meta'
@@ -2534,10 +3829,11 @@ class _CacheDataSwapEntry:
     Extension used by the metadata file of the swap entry in the swap.
     """
 
-    def __init__(self, cache_desc_nf, name=None, written=False):
+    def __init__(self, cache_desc_nf, name=None, written=False, coverage=None):
         self.cache_desc_nf = cache_desc_nf
         self.name = name or uuid.uuid4().hex
         self.written = written
+        self.coverage = coverage
 
     @property
     def meta_filename(self):
@@ -2561,6 +3857,7 @@ class _CacheDataSwapEntry:
             'version-token': VERSION_TOKEN,
             'name': self.name,
             'desc': self.cache_desc_nf.to_json_map(),
+            'coverage': self.coverage,
         }
 
     @classmethod
@@ -2573,14 +3870,15 @@ class _CacheDataSwapEntry:
 
         cache_desc_nf = _CacheDataDescNF.from_json_map(mapping['desc'])
         name = mapping['name']
-        return cls(cache_desc_nf=cache_desc_nf, name=name, written=written)
+        coverage = mapping.get('coverage')
+        return cls(cache_desc_nf=cache_desc_nf, name=name, written=written, coverage=coverage)
 
     def to_path(self, path):
         """
         Save the swap entry metadata to the given ``path``.
         """
         data = self.to_json_map()
-        with open(path, 'w') as f:
+        with _atomic_write(path, 'w') as f:
             json.dump(data, f)
             f.write('\n')
 
@@ -2595,6 +3893,78 @@ class _CacheDataSwapEntry:
         return cls.from_json_map(mapping, written=True)
 
 
+_TMP_EXTENSION = 'tmp'
+_LOCK_EXTENSION = 'lock'
+
+
+@contextlib.contextmanager
+def _atomic_write(path, mode='wb'):
+    """
+    Open a temporary file that replaces ``path`` once closed, so that other
+    processes never see a partially written file.
+    """
+    tmp_path = f'{path}.{uuid.uuid4().hex}.{_TMP_EXTENSION}'
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+
+
+@contextlib.contextmanager
+def _flock(path):
+    """
+    Take an exclusive :func:`fcntl.flock` lock on ``path``, blocking until it
+    is available.
+
+    .. note:: The lock is released if the process dies.
+    """
+    while True:
+        with open(path, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                # The file may have been removed by _remove_unused_lock()
+                # while we were waiting, in which case the lock would not
+                # exclude the processes opening the path from now on.
+                try:
+                    locked = os.path.samestat(os.fstat(f.fileno()), os.stat(path))
+                except FileNotFoundError:
+                    locked = False
+
+                if locked:
+                    yield
+                    return
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _remove_unused_lock(path):
+    """
+    Remove the lock file at ``path`` if no process holds a :func:`_flock` lock
+    on it.
+
+    :returns: ``True`` if the file was removed, ``False`` otherwise.
+    """
+    try:
+        f = open(path, 'r')
+    except FileNotFoundError:
+        return False
+
+    with f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        else:
+            # Unlink while holding the lock, so that _flock() notices it when
+            # it gets the lock after us.
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+            return True
+
+
 class TraceCacheSwapVersionError(ValueError):
     """
     Exception raised when the swap entry was created by another version of LISA
@@ -2620,6 +3990,19 @@ class TraceCache(Loggable):
     :param swap_dir: Folder to use as swap area.
     :type swap_dir: str or None
 
+    :param dataframe_swap_format: Format used to store the dataframes in the
+        swap area:
+
+        * ``parquet``: Compressed parquet files. This is the most compact
+          format.
+        * ``arrow``: Uncompressed Arrow IPC files (Feather V2 format), that
+          are memory mapped when reloaded. This makes reloading very cheap and
+          allows the pages to be shared between processes loading the same
+          data, at the expense of a larger swap area.
+
+        If ``None``, :attr:`DATAFRAME_SWAP_FORMAT` is used.
+    :type dataframe_swap_format: str or None
+
     :param trace_path: Absolute path of the trace file.
     :type trace_path: str or None
 
@@ -2627,16 +4010,44 @@ class TraceCache(Loggable):
         if the file changed.
     :type trace_md5: str or None
 
+    :param trace_size: Size of the trace file in bytes when ``trace_md5``
+        was computed.
+    :type trace_size: int or None
+
+    :param trace_fingerprint: Fingerprint of the trace file as returned by
+        :meth:`_compute_trace_fingerprint`, matching ``trace_md5``.
+    :type trace_fingerprint: dict or None
+
+    :param appended_trace: If data were appended to the trace file since the
+        swap area was created, mapping with a ``size`` key giving the previous
+        size of the trace file and a ``metadata`` key giving the metadata
+        recorded at that time. Only the swap entries with a known coverage are
+        kept in that case.
+    :type appended_trace: dict(str, object) or None
+
     :param metadata: Metadata mapping to store in the swap area.
     :type metadata: dict or None
 
     :param swap_content: Initial content of the swap area.
     :type swap_content: dict(_CacheDataDescNF, _CacheDataSwapEntry) or None
 
+    :param shared: If ``True``, the swap area is shared with other processes
+        using the same ``swap_dir``. Data computed under
+        :meth:`computation_lock` are always written to the swap, and other
+        processes asking for the same data wait for the computation to finish
+        and reload the result from the swap instead of computing it again.
+    :type shared: bool
+
     The cache manages both the :class:`pandas.DataFrame` and
     :class:`pandas.Series` generated in memory and a swap area used to evict
     them, and to reload them quickly. Some other data (typically JSON) can also
     be stored in the cache by analysis method.
+
+    If the trace file grows by having data appended to it, the swap entries
+    that recorded the part of the trace they cover are kept. These entries are
+    not returned by :meth:`fetch` anymore, but by :meth:`fetch_partial`, so
+    that the user can complete them with the data parsed from the end of the
+    trace.
     """
 
     INIT_SWAP_COST = 1e-8
@@ -2652,14 +4063,56 @@ class TraceCache(Loggable):
     Name of the trace metadata file in the swap area.
     """
 
+    SWAP_LOCK_FILENAME = f'swap.{_LOCK_EXTENSION}'
+    """
+    Name of the lock file protecting the swap area when it is shared between
+    processes.
+    """
+
     DATAFRAME_SWAP_FORMAT = 'parquet'
     """
-    Data storage format used to swap.
+    Default data storage format used to swap dataframes.
+    """
+
+    SWAP_LOAD_COST_RATIO = {
+        'parquet': 1,
+        'arrow': 0.1,
+    }
+    """
+    Initial estimation of the cost of loading data from the swap relative to
+    the cost of writing them, for each dataframe swap format. It is refined
+    with the actual load times as data get reloaded.
     """
 
-    def __init__(self, max_mem_size=None, trace_path=None, trace_md5=None, swap_dir=None, max_swap_size=None, swap_content=None, metadata=None):
+    PARQUET_ROW_GROUP_SIZE = 64 * 1024
+    """
+    Number of rows in each row group of the parquet files of the swap.
+
+    Since the dataframes are sorted by time, each row group covers a time
+    range recorded in its statistics. This allows :meth:`fetch_window` to
+    only read the row groups overlapping a given window.
+    """
+
+    TRACE_FINGERPRINT_BLOCKS = 64
+    """
+    Number of blocks of the trace file hashed by :meth:`_compute_trace_fingerprint`.
+    """
+
+    TRACE_FINGERPRINT_BLOCK_SIZE = 64 * 1024
+    """
+    Size in bytes of the blocks hashed by :meth:`_compute_trace_fingerprint`.
+    """
+
+    def __init__(self, max_mem_size=None, trace_path=None, trace_md5=None, swap_dir=None, max_swap_size=None, swap_content=None, metadata=None, trace_size=None, appended_trace=None, dataframe_swap_format=None, shared=False, trace_fingerprint=None):
+        dataframe_swap_format = dataframe_swap_format or self.DATAFRAME_SWAP_FORMAT
+        if dataframe_swap_format not in self.SWAP_LOAD_COST_RATIO:
+            raise ValueError(f'Unsupported dataframe swap format "{dataframe_swap_format}", available formats are: {", ".join(sorted(self.SWAP_LOAD_COST_RATIO.keys()))}')
+        self.dataframe_swap_format = dataframe_swap_format
+        self._swap_load_cost_ratio = self.SWAP_LOAD_COST_RATIO[dataframe_swap_format]
+
         self._cache = {}
         self._data_cost = {}
+        self._data_coverage = {}
         self._swap_content = swap_content or {}
         self._cache_desc_swap_filename = {}
         self.swap_cost = self.INIT_SWAP_COST
@@ -2673,6 +4126,12 @@ class TraceCache(Loggable):
 
         self.trace_path = os.path.abspath(trace_path) if trace_path else trace_path
         self._trace_md5 = trace_md5
+        self._trace_size = trace_size
+        self._trace_fingerprint = trace_fingerprint
+        self.appended_trace = appended_trace
+
+        self.shared = shared
+        self._computation_locks = {}
 
     @property
     @memoized
@@ -2686,7 +4145,7 @@ class TraceCache(Loggable):
         def get_size(nr_col):
             df = make_df(nr_col)
             buffer = io.BytesIO()
-            self._write_data('parquet', df, buffer)
+            self._write_data(self.dataframe_swap_format, df, buffer)
             return buffer.getbuffer().nbytes
 
         size1 = get_size(1)
@@ -2706,7 +4165,8 @@ class TraceCache(Loggable):
         Remove the fixed size overhead of the file format being used, assuming
         a non-compressible overhead per file and per column.
 
-        .. note:: This model seems to work pretty well for parquet format.
+        .. note:: This model seems to work pretty well for parquet and arrow
+            formats.
         """
         if isinstance(data, (pd.DataFrame, pd.Series)):
             file_overhead, col_overhead = self._swap_size_overhead
@@ -2728,11 +4188,103 @@ class TraceCache(Loggable):
         trace_path = self.trace_path
         if md5 is None and trace_path:
             with open(trace_path, 'rb') as f:
+                self._trace_size = os.fstat(f.fileno()).st_size
+                # Fingerprint the same file we compute the checksum of
+                self._trace_fingerprint = self._compute_trace_fingerprint(f)
+                f.seek(0)
                 md5 = checksum(f, 'md5')
             self._trace_md5 = md5
 
         return md5
 
+    @property
+    def trace_fingerprint(self):
+        """
+        Fingerprint of the trace file, as it was when :attr:`trace_md5` was
+        computed.
+        """
+        if self._trace_fingerprint is None and self.trace_path:
+            # Computing the checksum also records the fingerprint
+            self.trace_md5 # pylint: disable=pointless-statement
+        return self._trace_fingerprint
+
+    @property
+    def trace_size(self):
+        """
+        Size of the trace file in bytes, as it was when :attr:`trace_md5` was
+        computed.
+        """
+        if self._trace_size is None and self.trace_path:
+            # Computing the checksum also records the size
+            self.trace_md5 # pylint: disable=pointless-statement
+        return self._trace_size
+
+    @classmethod
+    def _compute_trace_fingerprint(cls, f):
+        """
+        Compute a fingerprint of the file object ``f``.
+
+        :returns: A JSON-serializable mapping.
+
+        Unlike the MD5 checksum, only :attr:`TRACE_FINGERPRINT_BLOCKS` blocks
+        evenly spread across the file are read, so the cost does not depend
+        on the size of the trace. Along with the size, modification time and
+        inode of the file, this is enough to detect a trace that was
+        re-recorded or modified in place without reading it entirely.
+        """
+        stat = os.fstat(f.fileno())
+        size = stat.st_size
+        block_size = cls.TRACE_FINGERPRINT_BLOCK_SIZE
+        nr_blocks = cls.TRACE_FINGERPRINT_BLOCKS
+
+        h = hashlib.blake2b(digest_size=16)
+        h.update(str(size).encode('ascii'))
+        if size <= nr_blocks * block_size:
+            f.seek(0)
+            h.update(f.read())
+        else:
+            # Always include the first and last block, as appending to the
+            # trace or rewriting its header are the most common changes.
+            last = size - block_size
+            for i in range(nr_blocks):
+                f.seek(i * last // (nr_blocks - 1))
+                h.update(f.read(block_size))
+
+        return {
+            'size': size,
+            'mtime-ns': stat.st_mtime_ns,
+            'inode': stat.st_ino,
+            'blake2b': h.hexdigest(),
+        }
+
+    @staticmethod
+    def _trace_checksums(f, prefix_size):
+        """
+        Compute the MD5 checksum of the file object ``f`` along with the MD5
+        checksum of its first ``prefix_size`` bytes in a single pass.
+
+        :returns: A tuple ``(size, md5, prefix_md5)``. ``prefix_md5`` is
+            ``None`` if the file is not larger than ``prefix_size``.
+        """
+        f.seek(0)
+        size = os.fstat(f.fileno()).st_size
+        h = hashlib.md5()
+        prefix_md5 = None
+        if prefix_size is not None and size > prefix_size:
+            remaining = prefix_size
+            while remaining:
+                chunk = f.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                h.update(chunk)
+                remaining -= len(chunk)
+            prefix_md5 = h.hexdigest()
+
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+
+        return (size, h.hexdigest(), prefix_md5)
+
     def update_metadata(self, metadata):
         """
         Update the metadata mapping with the given ``metadata`` mapping and
@@ -2768,6 +4320,8 @@ class TraceCache(Loggable):
             'metadata': self._metadata,
             'trace-path': trace_path,
             'trace-md5': self.trace_md5,
+            'trace-size': self.trace_size,
+            'trace-fingerprint': self.trace_fingerprint,
         }
 
     def to_path(self, path):
@@ -2775,12 +4329,12 @@ class TraceCache(Loggable):
         Write the persistent state to the given ``path``.
         """
         mapping = self.to_json_map()
-        with open(path, 'w') as f:
+        with _atomic_write(path, 'w') as f:
             json.dump(mapping, f)
             f.write('\n')
 
     @classmethod
-    def _from_swap_dir(cls, swap_dir, trace_path=None, metadata=None, **kwargs):
+    def _from_swap_dir(cls, swap_dir, trace_path=None, metadata=None, trace_md5=None, trace_size=None, trace_fingerprint=None, **kwargs):
         metapath = os.path.join(swap_dir, cls.TRACE_META_FILENAME)
 
         with open(metapath) as f:
@@ -2793,55 +4347,83 @@ class TraceCache(Loggable):
         swap_trace_path = os.path.join(swap_dir, swap_trace_path) if swap_trace_path else None
 
         metadata = metadata or {}
-
-        if swap_trace_path:
-            try:
-                with open(swap_trace_path, 'rb') as f:
-                    new_md5 = checksum(f, 'md5')
-            except FileNotFoundError:
-                new_md5 = None
+        old_md5 = mapping['trace-md5']
+        old_size = mapping.get('trace-size')
+
+        appended_trace = None
+        # Content-addressed swap area shared by all the copies of the trace,
+        # see TraceSwapStore
+        if trace_md5 is not None:
+            new_size, new_md5, new_fingerprint = (trace_size, trace_md5, trace_fingerprint)
+            invalid_swap = (old_md5 != new_md5)
         else:
-            new_md5 = None
+            old_fingerprint = mapping.get('trace-fingerprint')
+
+            new_size, new_md5, prefix_md5, new_fingerprint = (None, None, None, None)
+            if swap_trace_path:
+                with contextlib.suppress(FileNotFoundError), open(swap_trace_path, 'rb') as f:
+                    new_fingerprint = cls._compute_trace_fingerprint(f)
+                    # If the file looks the same, trust the MD5 we recorded
+                    # rather than reading the whole trace again.
+                    if old_fingerprint is not None and new_fingerprint == old_fingerprint:
+                        new_size, new_md5 = (old_size, old_md5)
+                    else:
+                        new_size, new_md5, prefix_md5 = cls._trace_checksums(f, old_size)
 
-        if trace_path and not os.path.samefile(swap_trace_path, trace_path):
-            invalid_swap = True
-        else:
-            if new_md5 is None:
+            if trace_path and not os.path.samefile(swap_trace_path, trace_path):
                 invalid_swap = True
             else:
-                old_md5 = mapping['trace-md5']
-                invalid_swap = (old_md5 != new_md5)
+                if new_md5 is None:
+                    invalid_swap = True
+                else:
+                    invalid_swap = (old_md5 != new_md5)
+                    # The trace grew but the beginning of the file is unchanged,
+                    # so data covering only that beginning can be completed
+                    # rather than recomputed.
+                    if invalid_swap and prefix_md5 == old_md5:
+                        appended_trace = dict(
+                            size=old_size,
+                            metadata=mapping['metadata'],
+                        )
 
-        if invalid_swap:
-            # Remove the invalid swap and create a fresh directory
-            shutil.rmtree(swap_dir)
-            os.makedirs(swap_dir)
+        if invalid_swap and not appended_trace:
+            # Remove the invalid swap content. The lock files are kept, as
+            # other processes may be waiting on them.
+            for dir_entry in os.scandir(swap_dir):
+                if not dir_entry.name.endswith(f'.{_LOCK_EXTENSION}'):
+                    if dir_entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(dir_entry.path)
+                    else:
+                        os.unlink(dir_entry.path)
             swap_content = None
         else:
-            def load_swap_content(swap_dir):
-                swap_entry_filenames = {
-                    filename
-                    for filename in os.listdir(swap_dir)
-                    if filename.endswith(f'.{_CacheDataSwapEntry.META_EXTENSION}')
+            swap_content = cls._load_swap_content(swap_dir)
+
+            if appended_trace:
+                # Only keep the entries that can be completed with the
+                # appended data
+                for swap_entry in list(swap_content.values()):
+                    if swap_entry.coverage is None:
+                        del swap_content[swap_entry.cache_desc_nf]
+                        for filename in (swap_entry.meta_filename, swap_entry.data_filename):
+                            with contextlib.suppress(OSError):
+                                os.unlink(os.path.join(swap_dir, filename))
+
+                # Events present in the beginning of the trace are still
+                # there, but we don't know anything about the others anymore.
+                metadata_ = {
+                    'parseable-events': {
+                        event: True
+                        for event, available in mapping['metadata'].get('parseable-events', {}).items()
+                        if available
+                    }
                 }
+            else:
+                metadata_ = mapping['metadata']
 
-                for filename in swap_entry_filenames:
-                    path = os.path.join(swap_dir, filename)
-                    try:
-                        swap_entry = _CacheDataSwapEntry.from_path(path)
-                    # If there is any issue with that entry, just ignore it
-                    # pylint: disable=broad-except
-                    except Exception:
-                        continue
-                    else:
-                        yield (swap_entry.cache_desc_nf, swap_entry)
-
-            swap_content = dict(load_swap_content(swap_dir))
-
-            metadata_ = mapping['metadata']
             metadata = {**metadata_, **metadata}
 
-        return cls(swap_content=swap_content, swap_dir=swap_dir, metadata=metadata, trace_path=trace_path, trace_md5=new_md5, **kwargs)
+        return cls(swap_content=swap_content, swap_dir=swap_dir, metadata=metadata, trace_path=trace_path, trace_md5=new_md5, trace_size=new_size, trace_fingerprint=new_fingerprint, appended_trace=appended_trace, **kwargs)
 
     def to_swap_dir(self):
         """
@@ -2849,7 +4431,39 @@ class TraceCache(Loggable):
         """
         if self.swap_dir:
             path = os.path.join(self.swap_dir, self.TRACE_META_FILENAME)
-            self.to_path(path)
+            with self._swap_lock():
+                if self.shared:
+                    self._merge_swap_dir_metadata(path)
+                self.to_path(path)
+
+    def _merge_swap_dir_metadata(self, path):
+        """
+        Merge the metadata written by other processes sharing the swap area
+        with ours.
+        """
+        try:
+            with open(path) as f:
+                mapping = json.load(f)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return
+
+        if mapping.get('version-token') != VERSION_TOKEN or mapping.get('trace-md5') != self.trace_md5:
+            return
+
+        def merge(theirs, ours):
+            if isinstance(theirs, Mapping) and isinstance(ours, Mapping):
+                return {**theirs, **ours}
+            else:
+                return ours
+
+        theirs = mapping['metadata']
+        self._metadata = {
+            **theirs,
+            **{
+                key: merge(theirs.get(key), val)
+                for key, val in self._metadata.items()
+            },
+        }
 
     @classmethod
     def from_swap_dir(cls, swap_dir, **kwargs):
@@ -2859,15 +4473,118 @@ class TraceCache(Loggable):
         :Variable keyword arguments: Forwarded to :class:`TraceCache`.
         """
         if swap_dir:
-            try:
-                return cls._from_swap_dir(swap_dir=swap_dir, **kwargs)
-            except (FileNotFoundError, TraceCacheSwapVersionError, json.decoder.JSONDecodeError):
-                pass
+            with cls._swap_dir_lock(swap_dir, kwargs.get('shared')):
+                try:
+                    return cls._from_swap_dir(swap_dir=swap_dir, **kwargs)
+                except (FileNotFoundError, TraceCacheSwapVersionError, json.decoder.JSONDecodeError):
+                    pass
 
         return cls(swap_dir=swap_dir, **kwargs)
 
+    @staticmethod
+    def _load_swap_content(swap_dir):
+        def load(swap_dir):
+            swap_entry_filenames = {
+                filename
+                for filename in os.listdir(swap_dir)
+                if filename.endswith(f'.{_CacheDataSwapEntry.META_EXTENSION}')
+            }
+
+            for filename in swap_entry_filenames:
+                path = os.path.join(swap_dir, filename)
+                try:
+                    swap_entry = _CacheDataSwapEntry.from_path(path)
+                # If there is any issue with that entry, just ignore it
+                # pylint: disable=broad-except
+                except Exception:
+                    continue
+                else:
+                    yield (swap_entry.cache_desc_nf, swap_entry)
+
+        return dict(load(swap_dir))
+
+    @classmethod
+    def _swap_dir_lock(cls, swap_dir, shared):
+        if shared and swap_dir:
+            return _flock(os.path.join(swap_dir, cls.SWAP_LOCK_FILENAME))
+        else:
+            return nullcontext()
+
+    def _swap_lock(self):
+        """
+        Context manager protecting the swap area against concurrent
+        modifications by other processes in shared mode.
+        """
+        return self._swap_dir_lock(self.swap_dir, self.shared)
+
+    @contextlib.contextmanager
+    def computation_lock(self, *cache_descs):
+        """
+        Context manager to use around the computation of the data described
+        by ``cache_descs``.
+
+        In shared mode, this marks the data as being computed, and waits for
+        other processes that are already computing any of them. The caller is
+        expected to try :meth:`fetch` again once the lock is acquired, and to
+        :meth:`insert` the data it computed before releasing it. Outside of
+        shared mode, this is a no-op.
+
+        .. note:: The lock is reentrant within a given :class:`TraceCache`.
+        """
+        if not (self.shared and self.swap_dir):
+            yield
+            return
+
+        # Sort the locks to avoid deadlocks between processes locking
+        # overlapping sets of descriptors.
+        digests = sorted({
+            cache_desc.normal_form.digest
+            for cache_desc in cache_descs
+        } - self._computation_locks.keys())
+
+        with contextlib.ExitStack() as stack:
+            for digest in digests:
+                path = os.path.join(self.swap_dir, f'{digest}.{_LOCK_EXTENSION}')
+                stack.enter_context(_flock(path))
+                self._computation_locks[digest] = path
+                stack.callback(self._computation_locks.pop, digest)
+            yield
+
+    _COMPUTATION_LOCK_REGEX = re.compile(rf'([0-9a-f]+)\.{_LOCK_EXTENSION}')
+
+    @classmethod
+    def _remove_stale_computation_locks(cls, swap_dir, swap_content):
+        """
+        Remove the lock files created by :meth:`computation_lock` in
+        ``swap_dir`` that are not in use anymore and whose swap entry is not
+        in ``swap_content``.
+
+        .. note:: This is expected to be called with the swap area locked.
+        """
+        digests = {
+            swap_entry.cache_desc_nf.digest
+            for swap_entry in swap_content.values()
+        }
+        for dir_entry in os.scandir(swap_dir):
+            m = cls._COMPUTATION_LOCK_REGEX.fullmatch(dir_entry.name)
+            if m and m.group(1) not in digests:
+                _remove_unused_lock(dir_entry.path)
+
     def _estimate_data_swap_cost(self, data):
-        return self._estimate_data_swap_size(data) * self.swap_cost
+        # The swap cost is learnt from the write times, but what matters is
+        # the cost of reloading the data, which is much lower than writing for
+        # memory mapped formats.
+        write_cost = self._estimate_data_swap_size(data) * self.swap_cost
+        return write_cost * self._swap_load_cost_ratio
+
+    def _update_swap_load_cost(self, data, load_cost):
+        # We can only compare to the write cost once it has been measured
+        if self.swap_cost == self.INIT_SWAP_COST:
+            return
+
+        write_cost = self._estimate_data_swap_size(data) * self.swap_cost
+        if write_cost:
+            self._update_ewma('_swap_load_cost_ratio', load_cost / write_cost)
 
     def _estimate_data_swap_size(self, data):
         return self._data_mem_usage(data) * self._data_mem_swap_ratio
@@ -2912,6 +4629,34 @@ class TraceCache(Loggable):
     def _path_of_swap_entry(self, swap_entry):
         return os.path.join(self.swap_dir, swap_entry.meta_filename)
 
+    def _make_swap_entry(self, cache_desc_nf):
+        # In shared mode, the entry name is derived from the descriptor so
+        # that other processes can find it.
+        name = cache_desc_nf.digest if self.shared else None
+        return _CacheDataSwapEntry(cache_desc_nf, name=name)
+
+    def _get_swap_entry(self, cache_desc_nf):
+        try:
+            return self._swap_content[cache_desc_nf]
+        except KeyError:
+            if not (self.shared and self.swap_dir):
+                raise
+
+        # The entry may have been written by another process
+        swap_entry = self._make_swap_entry(cache_desc_nf)
+        try:
+            swap_entry = _CacheDataSwapEntry.from_path(
+                self._path_of_swap_entry(swap_entry)
+            )
+        except (FileNotFoundError, TraceCacheSwapVersionError, json.decoder.JSONDecodeError) as e:
+            raise KeyError(cache_desc_nf) from e
+
+        if swap_entry.cache_desc_nf != cache_desc_nf:
+            raise KeyError(cache_desc_nf)
+
+        self._swap_content[cache_desc_nf] = swap_entry
+        return swap_entry
+
     def _cache_desc_swap_path(self, cache_desc, create=False):
         if self.swap_dir:
             cache_desc_nf = cache_desc.normal_form
@@ -2959,7 +4704,18 @@ class TraceCache(Loggable):
         except KeyError:
             return False
         else:
-            return swap_entry.written
+            return swap_entry.written and not self._is_partial(swap_entry)
+
+    def _is_partial(self, swap_entry):
+        """
+        ``True`` if the swap entry only covers the beginning of the trace.
+        """
+        coverage = swap_entry.coverage
+        return (
+            coverage is not None and
+            self.trace_size is not None and
+            coverage['offset'] < self.trace_size
+        )
 
     @staticmethod
     def _data_to_parquet(data, path, **kwargs):
@@ -3001,13 +4757,188 @@ class TraceCache(Loggable):
 
         return data
 
+    @staticmethod
+    def _data_window_from_parquet(path, window, signals, columns=None):
+        """
+        Load the rows of a dataframe written by :meth:`_data_to_parquet` that
+        are needed to window it.
+
+        The statistics of the row groups on the index are used to only read
+        the row groups overlapping the window, and the ones containing the
+        rows preceding the window. See :meth:`fetch_window` for the
+        parameters.
+
+        :raises KeyError: If the file cannot be loaded partially, e.g. because
+            the index is not stored as a column or lacks statistics.
+        """
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        schema = parquet_file.schema_arrow
+        metadata = parquet_file.metadata
+
+        index_cols = (schema.pandas_metadata or {}).get('index_columns', [])
+        # RangeIndex are stored as a dict in the metadata, without any column
+        if len(index_cols) != 1 or not isinstance(index_cols[0], str):
+            raise KeyError(f'No index column in {path}')
+        index_col, = index_cols
+
+        names = schema.names
+        signals = [list(fields) for fields in signals]
+        missing = {
+            field
+            for fields in signals
+            for field in fields
+        } - set(names)
+        if missing:
+            raise KeyError(f'Signal columns not found in {path}: {", ".join(sorted(missing))}')
+
+        # Keep the columns order of the dataframe
+        read_cols = [
+            col
+            for col in names
+            if col == index_col or columns is None or col in columns
+        ]
+
+        start, end = window
+        start = -math.inf if start is None else start
+        end = math.inf if end is None else end
+
+        nr_groups = metadata.num_row_groups
+        offsets = np.cumsum([0] + [
+            metadata.row_group(i).num_rows
+            for i in range(nr_groups)
+        ])
+
+        def get_range(i):
+            group = metadata.row_group(i)
+            for j in range(group.num_columns):
+                col = group.column(j)
+                if col.path_in_schema == index_col:
+                    stats = col.statistics
+                    if stats is None or not stats.has_min_max:
+                        raise KeyError(f'No statistics for the index of {path}')
+                    return (stats.min, stats.max)
+            raise KeyError(f'Index column not found in {path}')
+
+        ranges = list(map(get_range, range(nr_groups)))
+        # Row groups overlapping the window
+        inside = {
+            i
+            for i, (first, last) in enumerate(ranges)
+            if last >= start and first <= end
+        }
+
+        # The first row is needed if the window is before the start of the
+        # dataframe, since df_window() clips the window.
+        selected = {0}
+        # Row groups with rows before the window, as a sorted list since the
+        # index is sorted.
+        before = [
+            i
+            for i, (first, last) in enumerate(ranges)
+            if first <= start
+        ]
+        if before:
+            fields = sorted(set(itertools.chain.from_iterable(signals)))
+            table = parquet_file.read_row_groups(before, columns=[index_col, *fields])
+            nr_rows = np.searchsorted(
+                table.column(index_col).to_numpy(),
+                start,
+                side='right',
+            )
+            if nr_rows:
+                # The row right before the window, as selected by
+                # df_window(method='pre')
+                selected.add(nr_rows - 1)
+
+                # The last value of each signal before the window, as
+                # selected by df_window_signals()
+                df = table.slice(0, nr_rows).select(fields).replace_schema_metadata(None).to_pandas()
+                for fields in signals:
+                    if fields:
+                        df_ = df[fields].drop_duplicates(keep='last')
+                        selected.update(df_.index)
+            del table
+
+        groups = inside | set(
+            np.searchsorted(offsets, list(selected), side='right') - 1
+        )
+        groups = sorted(i for i in groups if i < nr_groups)
+
+        selected = np.array(sorted(selected))
+        tables = []
+        for i in groups:
+            table = parquet_file.read_row_group(i, columns=read_cols)
+            index = table.column(index_col).to_numpy()
+            mask = (index >= start) & (index <= end)
+            pos = selected[(selected >= offsets[i]) & (selected < offsets[i + 1])]
+            mask[pos - offsets[i]] = True
+            tables.append(table.filter(pyarrow.array(mask)))
+
+        if tables:
+            table = pyarrow.concat_tables(tables)
+        else:
+            table = schema.empty_table().select(read_cols)
+
+        data = table.to_pandas()
+        data.attrs = json.loads(schema.metadata.get(b'lisa', '{}'))
+        return data
+
+    @staticmethod
+    def _data_to_arrow(data, path):
+        """
+        Write the data to an uncompressed Arrow IPC file, also known as Feather
+        V2 format, with the dataframe's attrs stored in the metadata.
+        """
+        is_series = isinstance(data, pd.Series)
+        df = data.to_frame() if is_series else data
+
+        table = pyarrow.Table.from_pandas(df)
+        updated_metadata = dict(
+            table.schema.metadata or {},
+            lisa=json.dumps(df.attrs),
+            lisa_series=json.dumps(is_series),
+        )
+        table = table.replace_schema_metadata(updated_metadata)
+        with pyarrow.ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table)
+
+    @staticmethod
+    def _data_from_arrow(path):
+        """
+        Load data written by :meth:`_data_to_arrow` by memory mapping the file.
+
+        .. note:: Columns are not copied when possible, so the data is backed
+            by the page cache and can be shared between processes. Such
+            columns are read-only.
+        """
+        # The memory map is kept alive by the buffers referencing it, so it
+        # must not be closed explicitly.
+        source = pyarrow.memory_map(path, 'r')
+        table = pyarrow.ipc.open_file(source).read_all()
+        metadata = table.schema.metadata or {}
+
+        data = table.to_pandas(split_blocks=True)
+        data.attrs = json.loads(metadata.get(b'lisa', '{}'))
+        if json.loads(metadata.get(b'lisa_series', 'false')):
+            attrs = data.attrs
+            data = data.iloc[:, 0]
+            data.attrs = attrs
+        return data
+
     @classmethod
     def _write_data(cls, fmt, data, path):
         if fmt == 'disk-only':
             return
         elif fmt == 'parquet':
             # Snappy compression seems very fast
-            cls._data_to_parquet(data, path, compression='snappy')
+            cls._data_to_parquet(
+                data,
+                path,
+                compression='snappy',
+                row_group_size=cls.PARQUET_ROW_GROUP_SIZE,
+            )
+        elif fmt == 'arrow':
+            cls._data_to_arrow(data, path)
         elif fmt == 'json':
             with open(path, 'wt') as f:
                 try:
@@ -3024,6 +4955,8 @@ class TraceCache(Loggable):
             data = None
         elif fmt == 'parquet':
             data = cls._data_from_parquet(path)
+        elif fmt == 'arrow':
+            data = cls._data_from_arrow(path)
         elif fmt == 'json':
             with open(path, 'rt') as f:
                 data = json.load(f)
@@ -3050,8 +4983,9 @@ class TraceCache(Loggable):
             try:
                 swap_entry = self._swap_content[cache_desc_nf]
             except KeyError:
-                swap_entry = _CacheDataSwapEntry(cache_desc_nf)
+                swap_entry = self._make_swap_entry(cache_desc_nf)
 
+            swap_entry.coverage = self._data_coverage.get(cache_desc)
             data_path = os.path.join(self.swap_dir, swap_entry.data_filename)
 
             # If that would make the swap dir too large, try to do some cleanup
@@ -3061,12 +4995,19 @@ class TraceCache(Loggable):
             def log_error(e):
                 self.logger.error(f'Could not write {cache_desc} to swap: {e}')
 
-            # Write the Parquet file and update the write speed
+            # Write the Parquet file and update the write speed. The file is
+            # renamed once complete, so that other processes never load a
+            # partially written file.
+            tmp_path = f'{data_path}.{uuid.uuid4().hex}.{_TMP_EXTENSION}'
             try:
                 with measure_time() as measure:
-                    self._write_data(cache_desc.fmt, data, data_path)
+                    self._write_data(cache_desc.fmt, data, tmp_path)
+                    with contextlib.suppress(FileNotFoundError):
+                        os.replace(tmp_path, data_path)
             # PyArrow fails to save dataframes containing integers > 64bits
             except OverflowError as e:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(tmp_path)
                 log_error(e)
             else:
                 # Update the swap entry on disk
@@ -3109,67 +5050,88 @@ class TraceCache(Loggable):
         # TODO: Load the file information from __init__ by discovering the swap
         # area's content to avoid doing it each time here
         if self._swap_size > self.max_swap_size and self.swap_dir:
-            stats = {
-                dir_entry.name: dir_entry.stat()
-                for dir_entry in os.scandir(self.swap_dir)
+            with self._swap_lock():
+                self._scrub_swap()
+
+    def _scrub_swap(self):
+        # Other processes sharing the swap may have written entries we don't
+        # know about, which must not be considered as stale files.
+        if self.shared:
+            self._swap_content = {
+                **self._load_swap_content(self.swap_dir),
+                **self._swap_content,
             }
 
-            data_files = {
-                swap_entry.data_filename: swap_entry
-                for swap_entry in self._swap_content.values()
-            }
+        stats = {
+            dir_entry.name: dir_entry.stat()
+            for dir_entry in os.scandir(self.swap_dir)
+            # Lock files can be in use by other processes, as well as the
+            # temporary files they are writing.
+            if not dir_entry.name.endswith((
+                f'.{_LOCK_EXTENSION}',
+                *([f'.{_TMP_EXTENSION}'] if self.shared else []),
+            ))
+        }
 
-            # Get rid of stale files that are not referenced by any swap entry
-            metadata_files = {
-                swap_entry.meta_filename
-                for swap_entry in self._swap_content.values()
-            }
-            metadata_files.add(self.TRACE_META_FILENAME)
-            non_stale_files = data_files.keys() | metadata_files
-            stale_files = stats.keys() - non_stale_files
-            for filename in stale_files:
-                stats.pop(filename, None)
+        data_files = {
+            swap_entry.data_filename: swap_entry
+            for swap_entry in self._swap_content.values()
+        }
+
+        # Get rid of stale files that are not referenced by any swap entry
+        metadata_files = {
+            swap_entry.meta_filename
+            for swap_entry in self._swap_content.values()
+        }
+        metadata_files.add(self.TRACE_META_FILENAME)
+        non_stale_files = data_files.keys() | metadata_files
+        stale_files = stats.keys() - non_stale_files
+        for filename in stale_files:
+            stats.pop(filename, None)
+            path = os.path.join(self.swap_dir, filename)
+            try:
+                os.unlink(path)
+            except Exception:
+                pass
+
+        def by_mtime(path_stat):
+            _, stat = path_stat
+            return stat.st_mtime
+
+        # Sort by modification time, so we discard the oldest caches
+        total_size = 0
+        discarded_swap_entries = set()
+        for filename, stat in sorted(stats.items(), key=by_mtime):
+            total_size += stat.st_size
+            if total_size > self.max_swap_size:
+                try:
+                    swap_entry = data_files[filename]
+                # That was not a data file
+                except KeyError:
+                    continue
+                else:
+                    discarded_swap_entries.add(swap_entry)
+
+        # Update the swap content
+        for swap_entry in discarded_swap_entries:
+            del self._swap_content[swap_entry.cache_desc_nf]
+            stats.pop(swap_entry.data_filename, None)
+
+            for filename in (swap_entry.meta_filename, swap_entry.data_filename):
                 path = os.path.join(self.swap_dir, filename)
                 try:
                     os.unlink(path)
                 except Exception:
                     pass
 
-            def by_mtime(path_stat):
-                _, stat = path_stat
-                return stat.st_mtime
-
-            # Sort by modification time, so we discard the oldest caches
-            total_size = 0
-            discarded_swap_entries = set()
-            for filename, stat in sorted(stats.items(), key=by_mtime):
-                total_size += stat.st_size
-                if total_size > self.max_swap_size:
-                    try:
-                        swap_entry = data_files[filename]
-                    # That was not a data file
-                    except KeyError:
-                        continue
-                    else:
-                        discarded_swap_entries.add(swap_entry)
-
-            # Update the swap content
-            for swap_entry in discarded_swap_entries:
-                del self._swap_content[swap_entry.cache_desc_nf]
-                stats.pop(swap_entry.data_filename, None)
+        if self.shared:
+            self._remove_stale_computation_locks(self.swap_dir, self._swap_content)
 
-                for filename in (swap_entry.meta_filename, swap_entry.data_filename):
-                    path = os.path.join(self.swap_dir, filename)
-                    try:
-                        os.unlink(path)
-                    except Exception:
-                        pass
-
-            self._swap_size = sum(
-                stats[swap_entry.data_filename].st_size
-                for swap_entry in self._swap_content.values()
-                if swap_entry.data_filename in stats
-            )
+        self._swap_size = sum(
+            stats[swap_entry.data_filename].st_size
+            for swap_entry in self._swap_content.values()
+            if swap_entry.data_filename in stats
+        )
 
     def fetch(self, cache_desc, insert=True):
         """
@@ -3187,12 +5149,20 @@ class TraceCache(Loggable):
         except KeyError as e:
             # pylint: disable=raise-missing-from
             try:
+                swap_entry = self._get_swap_entry(cache_desc.normal_form)
+                if self._is_partial(swap_entry):
+                    raise KeyError('Swap entry only covers the beginning of the trace')
                 path = self._cache_desc_swap_path(cache_desc)
             # If there is no swap, bail out
             except (ValueError, KeyError):
                 raise KeyError(f'Could not find swap entry for: {cache_desc}')
             else:
-                data = self._load_data(cache_desc.fmt, path)
+                with measure_time() as measure:
+                    data = self._load_data(cache_desc.fmt, path)
+
+                if cache_desc.fmt == self.dataframe_swap_format:
+                    self._update_swap_load_cost(data, measure.exclusive_delta)
+
                 if insert:
                     # We have no idea of the cost of something coming from
                     # the cache
@@ -3200,7 +5170,99 @@ class TraceCache(Loggable):
 
                 return data
 
-    def insert(self, cache_desc, data, compute_cost=None, write_swap=False, force_write_swap=False, write_meta=True):
+    def fetch_window(self, cache_desc, window, signals=None, columns=None):
+        """
+        Fetch the part of a dataframe entry needed to window it, without
+        loading the whole dataframe from the swap.
+
+        :param cache_desc: Descriptor of the whole dataframe.
+        :type cache_desc: _CacheDataDesc
+
+        :param window: Tuple ``(start, end)`` of the window.
+        :type window: tuple(float or None, float or None)
+
+        :param signals: List of fields of the signals to initialize at the
+            beginning of the window, as in :attr:`lisa.datautils.SignalDesc.fields`.
+        :type signals: list(list(str)) or None
+
+        :param columns: Columns to load. If ``None``, all the columns are
+            loaded.
+        :type columns: list(str) or None
+
+        :returns: A dataframe that gives the same result as the whole
+            dataframe when windowed with
+            :func:`lisa.datautils.df_window_signals` or
+            :func:`lisa.datautils.df_window` with ``method='pre'``. If the
+            data is in memory, it is returned as-is.
+
+        :raises KeyError: If there is no such entry, or if it cannot be
+            partially loaded.
+
+        Only the swap entries in ``parquet`` format can be partially loaded.
+        Since the rows are sorted by time, the row groups not overlapping the
+        window are skipped based on their statistics. Rows before the window
+        are only loaded for the last value of each signal.
+
+        .. note:: The data is not inserted in the cache.
+        """
+        with contextlib.suppress(KeyError):
+            return self._cache[cache_desc]
+
+        if cache_desc.fmt != 'parquet':
+            raise KeyError(f'Swap format does not support partial loading: {cache_desc.fmt}')
+
+        try:
+            swap_entry = self._get_swap_entry(cache_desc.normal_form)
+            if self._is_partial(swap_entry):
+                raise KeyError('Swap entry only covers the beginning of the trace')
+            path = self._cache_desc_swap_path(cache_desc)
+        except (ValueError, KeyError) as e:
+            raise KeyError(f'Could not find swap entry for: {cache_desc}') from e
+
+        try:
+            return self._data_window_from_parquet(
+                path,
+                window=window,
+                signals=signals or [],
+                columns=columns,
+            )
+        except OSError as e:
+            raise KeyError(f'Could not load swap entry for: {cache_desc}') from e
+
+    def fetch_partial(self, cache_desc):
+        """
+        Fetch an entry from the swap that only covers the beginning of the
+        trace, since data got appended to the trace file after it was
+        written.
+
+        :param cache_desc: Descriptor to look for.
+        :type cache_desc: _CacheDataDesc
+
+        :returns: A tuple ``(data, coverage)`` where ``coverage`` is the
+            ``coverage`` mapping of :class:`_CacheDataSwapEntry`.
+
+        :raises KeyError: If there is no such entry.
+
+        .. note:: The data is not inserted in the cache, it is the
+            responsibility of the caller to insert the completed data.
+        """
+        try:
+            swap_entry = self._get_swap_entry(cache_desc.normal_form)
+        except KeyError as e:
+            raise KeyError(f'Could not find swap entry for: {cache_desc}') from e
+
+        if not self._is_partial(swap_entry):
+            raise KeyError(f'Swap entry is not partial: {cache_desc}')
+
+        path = os.path.join(self.swap_dir, swap_entry.data_filename)
+        try:
+            data = self._load_data(cache_desc.fmt, path)
+        except OSError as e:
+            raise KeyError(f'Could not load swap entry for: {cache_desc}') from e
+
+        return (data, swap_entry.coverage)
+
+    def insert(self, cache_desc, data, compute_cost=None, write_swap=False, force_write_swap=False, write_meta=True, coverage=None):
         """
         Insert an entry in the cache.
 
@@ -3226,10 +5288,17 @@ class TraceCache(Loggable):
         :param write_meta: If ``True``, the swap entry metadata will be written
             on disk if the data are. Otherwise, no swap entry is written to disk.
         :type write_meta: bool
+
+        :param coverage: Part of the trace the data was computed from. See
+            :class:`_CacheDataSwapEntry`. Data with a coverage can be
+            completed if the trace grows, instead of being discarded.
+        :type coverage: dict(str, object) or None
         """
         self._cache[cache_desc] = data
         if compute_cost is not None:
             self._data_cost[cache_desc] = compute_cost
+        if coverage is not None:
+            self._data_coverage[cache_desc] = coverage
 
         if write_swap:
             self.write_swap(
@@ -3334,7 +5403,9 @@ class TraceCache(Loggable):
         except KeyError:
             pass
         else:
-            if force or self._should_evict_to_swap(cache_desc, data):
+            # In shared mode, other processes may reuse the data so it is
+            # worth writing it regardless of the cost.
+            if force or self.shared or self._should_evict_to_swap(cache_desc, data):
                 self._write_swap(cache_desc, data, write_meta)
 
     def write_swap_all(self):
@@ -3384,6 +5455,277 @@ class TraceCache(Loggable):
             )
         }
 
+class TraceSwapStore(Loggable):
+    """
+    Content-addressed store of swap areas shared by all the copies of a given
+    trace.
+
+    :param path: Folder of the store. If ``None``, a ``trace-swap`` folder
+        under :const:`lisa.utils.LISA_CACHE_HOME` is used.
+    :type path: str or None
+
+    :param max_size: Maximum size in bytes of the store. When it is exceeded,
+        the swap areas of the least recently used traces are removed. If
+        ``None``, :attr:`DEFAULT_MAX_SIZE` is used.
+    :type max_size: int or None
+
+    The swap areas are keyed by the MD5 checksum of the trace content rather
+    than by its path, so that a trace copied in multiple folders (e.g.
+    duplicated ``exekall`` or ``bisector`` artifacts) is only parsed once. The
+    checksum of each trace path is recorded along with the fingerprint of the
+    file, so that it is only computed again if the file changes.
+
+    The swap areas are always shared between processes, see :class:`TraceCache`
+    ``shared`` parameter.
+
+    **Example**::
+
+        trace = Trace('trace.dat', swap_store=TraceSwapStore())
+    """
+
+    DEFAULT_MAX_SIZE = 20 * 1024 ** 3
+    """
+    Default maximum size in bytes of the store.
+    """
+
+    GC_INTERVAL = 10 * 60
+    """
+    Minimum time in seconds between two garbage collections of the store
+    triggered by :meth:`get_cache`.
+    """
+
+    _INDEX_DIR = 'index'
+    _SWAP_DIR = 'swap'
+    _LOCK_FILENAME = f'store.{_LOCK_EXTENSION}'
+    _IN_USE_FILENAME = f'in-use.{_LOCK_EXTENSION}'
+    _GC_STAMP_FILENAME = 'gc.stamp'
+
+    def __init__(self, path=None, max_size=None):
+        self.path = os.path.abspath(path or os.path.join(LISA_CACHE_HOME, 'trace-swap'))
+        self.max_size = max_size if max_size is not None else self.DEFAULT_MAX_SIZE
+
+        for name in (self._INDEX_DIR, self._SWAP_DIR):
+            os.makedirs(os.path.join(self.path, name), exist_ok=True)
+
+    def _lock(self):
+        return _flock(os.path.join(self.path, self._LOCK_FILENAME))
+
+    def _index_path(self, trace_path):
+        key = hashlib.sha256(trace_path.encode('utf-8')).hexdigest()
+        return os.path.join(self.path, self._INDEX_DIR, f'{key}.json')
+
+    def _swap_dir(self, md5):
+        return os.path.join(self.path, self._SWAP_DIR, md5)
+
+    def get_trace_checksum(self, trace_path):
+        """
+        Get the MD5 checksum of the given trace file, using the index of the
+        store to avoid reading the whole file if it did not change.
+
+        :returns: A tuple ``(md5, fingerprint)``, with ``fingerprint`` as
+            recorded by :class:`TraceCache`.
+        """
+        trace_path = os.path.realpath(trace_path)
+        index_path = self._index_path(trace_path)
+
+        with open(trace_path, 'rb') as f:
+            fingerprint = TraceCache._compute_trace_fingerprint(f)
+            try:
+                with open(index_path) as f_index:
+                    mapping = json.load(f_index)
+            except (FileNotFoundError, json.decoder.JSONDecodeError):
+                mapping = {}
+
+            if mapping.get('trace-fingerprint') == fingerprint:
+                md5 = mapping['trace-md5']
+            else:
+                _, md5, _ = TraceCache._trace_checksums(f, None)
+                with _atomic_write(index_path, 'w') as f_index:
+                    json.dump(
+                        {
+                            'trace-path': trace_path,
+                            'trace-md5': md5,
+                            'trace-fingerprint': fingerprint,
+                        },
+                        f_index
+                    )
+
+        return (md5, fingerprint)
+
+    def get_cache(self, trace_path, **kwargs):
+        """
+        Get a :class:`TraceCache` for the given trace, backed by the swap area
+        of the store matching its content.
+
+        :Variable keyword arguments: Forwarded to
+            :meth:`TraceCache.from_swap_dir`.
+        """
+        md5, fingerprint = self.get_trace_checksum(trace_path)
+        swap_dir = self._swap_dir(md5)
+
+        with self._lock():
+            os.makedirs(swap_dir, exist_ok=True)
+            # Used as the last use time for the LRU eviction
+            os.utime(swap_dir)
+            # The shared lock is held as long as the cache is alive, so that
+            # the swap area is not removed under its feet.
+            in_use = open(os.path.join(swap_dir, self._IN_USE_FILENAME), 'a')
+            fcntl.flock(in_use, fcntl.LOCK_SH)
+
+        try:
+            cache = TraceCache.from_swap_dir(
+                swap_dir=swap_dir,
+                trace_path=trace_path,
+                trace_md5=md5,
+                trace_size=fingerprint['size'],
+                trace_fingerprint=fingerprint,
+                shared=True,
+                **kwargs,
+            )
+        except BaseException:
+            in_use.close()
+            raise
+        else:
+            weakref.finalize(cache, in_use.close)
+
+        # gc() scans the whole store with the lock held, so avoid doing it
+        # every time a trace is opened.
+        if self._gc_due():
+            self.gc()
+        return cache
+
+    def _gc_due(self):
+        """
+        ``True`` if the last garbage collection of the store is older than
+        :attr:`GC_INTERVAL`.
+        """
+        try:
+            last = os.stat(os.path.join(self.path, self._GC_STAMP_FILENAME)).st_mtime
+        except FileNotFoundError:
+            return True
+        else:
+            return time.time() - last >= self.GC_INTERVAL
+
+    @classmethod
+    @contextlib.contextmanager
+    def _try_lock_unused(cls, swap_dir):
+        """
+        Yield ``True`` with an exclusive lock taken on the swap area if no
+        :class:`TraceCache` is using it, ``False`` otherwise.
+        """
+        try:
+            f = open(os.path.join(swap_dir, cls._IN_USE_FILENAME), 'a')
+        except FileNotFoundError:
+            yield False
+            return
+
+        with f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+            else:
+                yield True
+
+    @staticmethod
+    def _dir_size(path):
+        return sum(
+            dir_entry.stat().st_size
+            for dir_entry in os.scandir(path)
+            if dir_entry.is_file(follow_symlinks=False)
+        )
+
+    def gc(self):
+        """
+        Garbage collect the store:
+
+            * Forget about the trace paths that do not exist anymore.
+            * Remove the swap areas of traces that do not exist anymore, and
+              the data files not referenced by any swap entry.
+            * Remove the swap areas of the least recently used traces until
+              the store fits in ``max_size``.
+
+        The swap areas in use by a :class:`TraceCache` are left untouched.
+
+        .. note:: This is done automatically by :meth:`get_cache`, at most
+            once every :attr:`GC_INTERVAL` seconds.
+        """
+        logger = self.logger
+        index_dir = os.path.join(self.path, self._INDEX_DIR)
+        swap_dir = os.path.join(self.path, self._SWAP_DIR)
+
+        def remove(path):
+            logger.debug(f'Removing trace swap area: {path}')
+            shutil.rmtree(path, ignore_errors=True)
+
+        with self._lock():
+            used = set()
+            for dir_entry in os.scandir(index_dir):
+                try:
+                    with open(dir_entry.path) as f:
+                        mapping = json.load(f)
+                    trace_path = mapping['trace-path']
+                    md5 = mapping['trace-md5']
+                except (OSError, KeyError, json.decoder.JSONDecodeError):
+                    trace_path = None
+
+                if trace_path and os.path.exists(trace_path):
+                    used.add(md5)
+                else:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.unlink(dir_entry.path)
+
+            swap_dirs = {}
+            for dir_entry in os.scandir(swap_dir):
+                path = dir_entry.path
+                with self._try_lock_unused(path) as unused:
+                    if unused and dir_entry.name not in used:
+                        remove(path)
+                        continue
+                    elif unused:
+                        self._remove_orphans(path)
+
+                swap_dirs[path] = (dir_entry.stat().st_mtime, self._dir_size(path))
+
+            total_size = sum(size for _, size in swap_dirs.values())
+            # Least recently used first
+            for path, (_, size) in sorted(swap_dirs.items(), key=lambda x: x[1][0]):
+                if total_size <= self.max_size:
+                    break
+                with self._try_lock_unused(path) as unused:
+                    if unused:
+                        remove(path)
+                        total_size -= size
+
+            stamp_path = os.path.join(self.path, self._GC_STAMP_FILENAME)
+            with open(stamp_path, 'a'):
+                pass
+            os.utime(stamp_path)
+
+    @staticmethod
+    def _remove_orphans(path):
+        """
+        Remove the files of the swap area at ``path`` that are not referenced
+        by any swap entry, such as data files that were being written when a
+        process died, along with the unused computation lock files.
+        """
+        swap_content = TraceCache._load_swap_content(path)
+        referenced = {
+            filename
+            for swap_entry in swap_content.values()
+            for filename in (swap_entry.meta_filename, swap_entry.data_filename)
+        }
+        for dir_entry in os.scandir(path):
+            if not (
+                dir_entry.name in referenced or
+                dir_entry.name == TraceCache.TRACE_META_FILENAME or
+                dir_entry.name.endswith(f'.{_LOCK_EXTENSION}')
+            ):
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(dir_entry.path)
+
+        TraceCache._remove_stale_computation_locks(path, swap_content)
+
 
 class Trace(Loggable, TraceBase):
     """
@@ -3465,10 +5807,29 @@ class Trace(Loggable, TraceBase):
         the max size is the size of the trace file.
     :type max_swap_size: int or None
 
+    :param swap_format: Format used to store dataframes in the swap
+        directory. See :class:`TraceCache` ``dataframe_swap_format``
+        parameter.
+    :type swap_format: str or None
+
+    :param shared_swap: If ``True``, the swap directory is shared with other
+        processes working on the same trace, such as parallel ``exekall``
+        workers or Jupyter kernels. A process asking for data that another
+        process is computing waits for it and reloads the result from the
+        swap, rather than computing it again. See :class:`TraceCache`
+        ``shared`` parameter.
+    :type shared_swap: bool
+
     :param write_swap: Default value used for :meth:`df_event` ``write_swap``
         parameter.
     :type write_swap: bool
 
+    :param swap_store: If not ``None``, the swap area is taken from the given
+        store rather than from ``swap_dir``, so that it is shared with all the
+        copies of the same trace. The swap is then always shared between
+        processes, as with ``shared_swap=True``.
+    :type swap_store: TraceSwapStore or None
+
     :Attributes:
         * ``start``: The timestamp of the first trace event in the trace
         * ``end``: The timestamp of the last trace event in the trace
@@ -3588,6 +5949,9 @@ class Trace(Loggable, TraceBase):
         max_swap_size=None,
         write_swap=True,
         events_namespaces=('lisa', None),
+        swap_format=None,
+        shared_swap=False,
+        swap_store=None,
     ):
         super().__init__()
         trace_path = str(trace_path) if trace_path else None
@@ -3600,7 +5964,8 @@ class Trace(Loggable, TraceBase):
 
         if enable_swap:
             if trace_path:
-                if swap_dir is None:
+                # The swap area is provided by swap_store if any
+                if swap_dir is None and swap_store is None:
                     basename = os.path.basename(trace_path)
                     swap_dir = os.path.join(
                         os.path.dirname(trace_path),
@@ -3621,12 +5986,22 @@ class Trace(Loggable, TraceBase):
             swap_dir = None
             max_swap_size = None
 
-        self._cache = TraceCache.from_swap_dir(
-            trace_path=trace_path,
-            swap_dir=swap_dir,
-            max_swap_size=max_swap_size,
-            max_mem_size=max_mem_size,
-        )
+        if enable_swap and trace_path and swap_store is not None:
+            self._cache = swap_store.get_cache(
+                trace_path=trace_path,
+                max_swap_size=max_swap_size,
+                max_mem_size=max_mem_size,
+                dataframe_swap_format=swap_format,
+            )
+        else:
+            self._cache = TraceCache.from_swap_dir(
+                trace_path=trace_path,
+                swap_dir=swap_dir,
+                max_swap_size=max_swap_size,
+                max_mem_size=max_mem_size,
+                dataframe_swap_format=swap_format,
+                shared=shared_swap,
+            )
         # Initial scrub of the swap to discard unwanted data, honoring the
         # max_swap_size right from the beginning
         self._cache.scrub_swap()
@@ -3648,6 +6023,7 @@ class Trace(Loggable, TraceBase):
             else:
                 parser = TxtTraceParser.from_dat
         self._parser = parser
+        self._update_appended_time_range()
 
         # The platform information used to run the experiments
         if plat_info is None:
@@ -3670,6 +6046,13 @@ class Trace(Loggable, TraceBase):
         except MissingMetadataError:
             self._parseable_events = {}
 
+        # Columns of the raw dataframes of each event that were only parsed
+        # for some columns, see _load_cache_raw_df_columns()
+        try:
+            self._raw_df_columns = self._cache.get_metadata('raw-df-columns')
+        except MissingMetadataError:
+            self._raw_df_columns = {}
+
         if isinstance(events, str):
             raise ValueError('Events passed to Trace(events=...) must be a list of strings, not a string.')
         elif events is None:
@@ -3939,11 +6322,15 @@ class Trace(Loggable, TraceBase):
         # pylint: disable=attribute-defined-outside-init
         proxy.base_trace = trace
 
-    def _get_parser(self, events=tuple(), needed_metadata=None, update_metadata=True):
+    def _get_parser(self, events=tuple(), needed_metadata=None, update_metadata=True, events_columns=None, **kwargs):
         path = self.trace_path
         events = set(events)
         needed_metadata = set(needed_metadata or [])
-        parser = self._parser(path=path, events=events, needed_metadata=needed_metadata)
+        # Only restrict the columns if the parser supports it, the caller
+        # selects the columns anyway.
+        if events_columns and self._parser_has_params({'events_columns'}):
+            kwargs['events_columns'] = events_columns
+        parser = self._parser(path=path, events=events, needed_metadata=needed_metadata, **kwargs)
 
         # While we are at it, gather a bunch of metadata. Since we did not
         # explicitly asked for it, the parser will only give
@@ -3969,6 +6356,94 @@ class Trace(Loggable, TraceBase):
 
         return parser
 
+    def _parser_has_params(self, params):
+        parser = self._parser
+        if isinstance(parser, PartialInit):
+            parser = object.__getattribute__(parser, '_ctor')
+
+        try:
+            parser_params = inspect.signature(parser).parameters
+        except (TypeError, ValueError):
+            return False
+        else:
+            return set(params) <= parser_params.keys()
+
+    @property
+    def _parser_supports_tail(self):
+        """
+        ``True`` if the parser is able to parse only the end of the trace file,
+        starting from a given byte offset.
+        """
+        return self._parser_has_params({'offset', 'prev_time'})
+
+    @property
+    def _parser_supports_chunks(self):
+        """
+        ``True`` if the parser is able to parse a given byte range of the trace
+        file.
+        """
+        return bool(self.trace_path) and self._parser_has_params({'offset', 'size', 'prev_time'})
+
+    def _update_appended_time_range(self):
+        """
+        If data were appended to the trace since the swap was created, update
+        the time range by only parsing the appended data.
+        """
+        appended = self._cache.appended_trace
+        if appended is None or not self._parser_supports_tail:
+            return
+
+        try:
+            begin, end = appended['metadata']['time-range']
+        except KeyError:
+            return
+
+        parser = self._get_parser(
+            update_metadata=False,
+            needed_metadata={'time-range'},
+            offset=appended['size'],
+            prev_time=end,
+        )
+        _, end = parser.get_metadata('time-range')
+        self._cache.update_metadata({'time-range': (begin, end)})
+
+    @property
+    @memoized
+    def _raw_df_coverage(self):
+        """
+        Coverage of the raw dataframes parsed from the trace, as expected by
+        :meth:`TraceCache.insert`.
+        """
+        if not self._parser_supports_tail:
+            return None
+
+        size = self._cache.trace_size
+        if not size:
+            return None
+
+        # The trace can only be completed later on if it does not end in the
+        # middle of a line.
+        with open(self.trace_path, 'rb') as f:
+            f.seek(size - 1)
+            if f.read(1) != b'\n':
+                return None
+
+        try:
+            time = self._get_time_range()[1]
+        except MissingMetadataError:
+            return None
+
+        return dict(
+            offset=size,
+            time=time,
+        )
+
+    def _update_raw_df_columns(self, event, columns):
+        self._raw_df_columns[event] = sorted(columns)
+        self._cache.update_metadata({
+            'raw-df-columns': self._raw_df_columns,
+        })
+
     def _update_parseable_events(self, mapping):
         self._parseable_events.update(mapping)
         self._cache.update_metadata({
@@ -3998,7 +6473,7 @@ class Trace(Loggable, TraceBase):
     def _get_time_range(self, parser=None):
         return self._get_cacheable_metadata('time-range', parser)
 
-    def df_event(self, event, raw=None, window=None, signals=None, signals_init=True, compress_signals_init=False, write_swap=None, namespaces=None):
+    def df_event(self, event, raw=None, window=None, signals=None, signals_init=True, compress_signals_init=False, write_swap=None, namespaces=None, columns=None):
         """
         Get a dataframe containing all occurrences of the specified trace event
         in the parsed trace.
@@ -4051,7 +6526,9 @@ class Trace(Loggable, TraceBase):
 
         :param window: Return a dataframe sliced to fit the given window (in
             seconds). Note that ``signals_init=True`` will result in including
-            more rows than what you might expect.
+            more rows than what you might expect. If the event was evicted to
+            the swap, only the parts of it needed for the window are loaded
+            (see :meth:`TraceCache.fetch_window`).
         :type window: tuple(float, float)
 
         :param signals: List of signals to fixup if ``signals_init == True``.
@@ -4081,6 +6558,15 @@ class Trace(Loggable, TraceBase):
                 * Computing the dataframe takes more time than the estimated
                   time it takes to write it to the cache.
         :type write_swap: bool
+
+        :param columns: If not ``None``, only these columns are returned. The
+            parser will only extract these fields from the trace if it
+            supports it, which makes parsing faster and the dataframe smaller.
+            The columns that are not part of the event are ignored.
+
+            .. note:: Parsing the same event for another set of columns later
+                on only parses the columns that were not already parsed.
+        :type columns: list(str) or None
         """
         call = functools.partial(
             self._df_event,
@@ -4090,6 +6576,7 @@ class Trace(Loggable, TraceBase):
             signals_init=signals_init,
             compress_signals_init=compress_signals_init,
             write_swap=write_swap,
+            columns=None if columns is None else sorted(set(columns)),
         )
 
         for event_ in self._expand_namespaces(event, namespaces):
@@ -4101,7 +6588,7 @@ class Trace(Loggable, TraceBase):
         raise last_excep
 
 
-    def _df_event(self, event, raw, window, signals, signals_init, compress_signals_init, write_swap):
+    def _df_event(self, event, raw, window, signals, signals_init, compress_signals_init, write_swap, columns):
         sanitization_f = self._sanitization_functions.get(event)
 
         # Make sure no `None` value flies around in the cache, since it's
@@ -4122,13 +6609,15 @@ class Trace(Loggable, TraceBase):
         if raw:
             # Make sure all raw descriptors are made the same way, to avoid
             # missed sharing opportunities
-            spec = self._make_raw_cache_desc_spec(event)
+            spec = self._make_raw_cache_desc_spec(event, columns)
         else:
             spec = dict(
                 event=event,
                 raw=raw,
                 trace_state=self.trace_state,
             )
+            if columns is not None:
+                spec['columns'] = columns
 
         if window is not None:
             signals = signals if signals else SignalDesc.from_event(event)
@@ -4149,12 +6638,18 @@ class Trace(Loggable, TraceBase):
                 sanitization=sanitization_f.__qualname__ if sanitization_f else None,
             )
 
-        cache_desc = _CacheDataDesc(spec=spec, fmt=TraceCache.DATAFRAME_SWAP_FORMAT)
+        cache_desc = _CacheDataDesc(spec=spec, fmt=self._cache.dataframe_swap_format)
 
         try:
             df = self._cache.fetch(cache_desc, insert=True)
         except KeyError:
-            df = self._load_df(cache_desc, sanitization_f=sanitization_f, write_swap=write_swap)
+            with self._cache.computation_lock(cache_desc):
+                # Another process sharing the swap might have computed it
+                # while we were waiting for the lock
+                try:
+                    df = self._cache.fetch(cache_desc, insert=True)
+                except KeyError:
+                    df = self._load_df(cache_desc, sanitization_f=sanitization_f, write_swap=write_swap)
 
         if df.empty:
             raise MissingTraceEventError(
@@ -4168,19 +6663,305 @@ class Trace(Loggable, TraceBase):
         df.attrs['name'] = event
         return df
 
-    def _make_raw_cache_desc(self, event):
-        spec = self._make_raw_cache_desc_spec(event)
-        return _CacheDataDesc(spec=spec, fmt=TraceCache.DATAFRAME_SWAP_FORMAT)
+    ITER_WINDOWS_CHUNK_SIZE = 64 * 1024 * 1024
+    """
+    Default number of bytes of the trace file parsed at once by
+    :meth:`iter_windows`.
+    """
 
-    def _make_raw_cache_desc_spec(self, event):
-        return dict(
+    def iter_windows(self, events, window_size, overlap=0, raw=None, signals=None, signals_init=True, compress_signals_init=False, namespaces=None, chunk_size=None):
+        """
+        Iterate over consecutive time windows of the trace.
+
+        When the parser is able to parse a byte range of the trace file (e.g.
+        :meth:`TxtTraceParserBase.from_txt_file`), the trace is parsed chunk
+        by chunk and the dataframes of the whole trace are never built. The
+        memory usage is then bounded by the size of the windows rather than by
+        the size of the trace. Other parsers fall back on :meth:`df_event`, as
+        do meta events and events whose sanitization depends on the whole
+        dataframe (e.g. ``print``).
+
+        :param events: Events to select in each window.
+        :type events: list(str)
+
+        :param window_size: Duration of each window in seconds.
+        :type window_size: float
+
+        :param overlap: Duration in seconds of the overlap between
+            consecutive windows.
+        :type overlap: float
+
+        :param chunk_size: Number of bytes of the trace file parsed at once.
+            Defaults to :attr:`ITER_WINDOWS_CHUNK_SIZE`.
+        :type chunk_size: int or None
+
+        :returns: A generator of ``(window, df_map)`` tuples, where ``df_map``
+            maps each event to the same dataframe as ``df_event(event,
+            window=window)`` would give. Events that do not have any row in a
+            given window are not in its ``df_map``.
+
+        The other parameters are the same as for :meth:`df_event`. The
+        ``signals_init`` rows are carried over from one window to the next so
+        that each window gets the same initial values as with
+        :meth:`df_event`.
+        """
+        if isinstance(events, str):
+            raise ValueError('Events passed to iter_windows() must be a list of strings, not a string.')
+        if window_size <= 0:
+            raise ValueError(f'The window size must be positive: {window_size}')
+        if not 0 <= overlap < window_size:
+            raise ValueError(f'The overlap must be positive and smaller than the window size: {overlap}')
+
+        events = list(events)
+        start, end = self.window
+        step = window_size - overlap
+        nr_windows = max(1, math.ceil((end - start) / step))
+        windows = (
+            (start + i * step, start + i * step + window_size)
+            for i in range(nr_windows)
+        )
+
+        def get_signals(*events):
+            return [
+                signal
+                for signal in signals
+                if signal.event in events
+            ]
+
+        def needs_whole_df(event):
+            # The sanitization of some events depends on other rows, so it
+            # cannot be applied on each chunk separately.
+            sanitization_f = None if raw else self._sanitization_functions.get(event)
+            return (
+                self._is_meta_event(event) or
+                not getattr(sanitization_f, 'row_wise', True)
+            )
+
+        if self._parser_supports_chunks and not any(
+            needs_whole_df(event_)
+            for event in events
+            for event_ in self._expand_namespaces(event, namespaces)
+        ):
+            yield from self._iter_windows_chunks(
+                events=events,
+                windows=windows,
+                raw=raw,
+                get_signals=get_signals if signals else None,
+                signals_init=signals_init,
+                compress_signals_init=compress_signals_init,
+                namespaces=namespaces,
+                chunk_size=chunk_size or self.ITER_WINDOWS_CHUNK_SIZE,
+            )
+        else:
+            self.logger.debug(f'Parser {self._parser} cannot parse chunks of the trace, iterating over windows of the full dataframes')
+
+            def get_df(event, window):
+                try:
+                    return self.df_event(
+                        event,
+                        raw=raw,
+                        window=window,
+                        signals=get_signals(event) if signals else None,
+                        signals_init=signals_init,
+                        compress_signals_init=compress_signals_init,
+                        namespaces=namespaces,
+                    )
+                except MissingTraceEventError:
+                    return None
+
+            for window in windows:
+                df_map = {
+                    event: get_df(event, window)
+                    for event in events
+                }
+                yield (
+                    window,
+                    {
+                        event: df
+                        for event, df in df_map.items()
+                        if df is not None
+                    }
+                )
+
+    def _iter_windows_chunks(self, events, windows, raw, get_signals, signals_init, compress_signals_init, namespaces, chunk_size):
+        candidates = {
+            event: self._expand_namespaces(event, namespaces)
+            for event in events
+        }
+        to_parse = sorted(set(itertools.chain.from_iterable(candidates.values())))
+
+        sanitization_fs = {}
+        for event in to_parse:
+            sanitization_f = None if raw else self._sanitization_functions.get(event)
+            if raw is not None and not raw and not sanitization_f:
+                raise ValueError(f'Sanitized dataframe for {event} does not exist, please pass raw=True or raw=None')
+            sanitization_fs[event] = sanitization_f
+
+        def iter_chunks():
+            path = self.trace_path
+            size = os.path.getsize(path)
+            offset = 0
+            with open(path, 'rb') as f:
+                while offset < size:
+                    # Extend the chunk to the end of the line
+                    f.seek(offset + chunk_size)
+                    f.readline()
+                    chunk_end = min(f.tell(), size)
+                    yield (offset, chunk_end - offset)
+                    offset = chunk_end
+
+        # Reference raw dataframe of each event, used to get consistent dtypes
+        # across chunks
+        ref_dfs = {}
+        # Rows of each event that are needed to build the upcoming windows
+        buffers = {}
+        resolved = {}
+
+        def get_event_signals(event):
+            if get_signals is None:
+                return SignalDesc.from_event(event)
+            else:
+                return get_signals(event, *(
+                    event_
+                    for event_, candidates_ in candidates.items()
+                    if event in candidates_
+                ))
+
+        def concat_chunks(dfs):
+            categories = {
+                col
+                for df in dfs
+                for col, dtype in df.dtypes.items()
+                if dtype.name == 'category'
+            }
+            attrs = dfs[0].attrs
+            df = _df_concat(dfs)
+            df.attrs = attrs
+            for col in categories:
+                if df[col].dtype.name != 'category':
+                    df[col] = df[col].astype('category', copy=False)
+            return df
+
+        def add_chunk(event, df):
+            df = self._apply_normalize_time(df, inplace=True)
+            df.attrs['name'] = event
+            df.index.name = 'Time'
+
+            try:
+                ref_df = ref_dfs[event]
+            except KeyError:
+                ref_dfs[event] = df.iloc[0:0]
+            else:
+                casted_df = self._cast_raw_df_like(df, ref_df)
+                if casted_df is not None:
+                    df = casted_df
+            self._make_raw_df_compact(df)
+
+            sanitization_f = sanitization_fs[event]
+            if sanitization_f:
+                df = sanitization_f(self, event, df, aspects=dict(rename_cols=True))
+
+            try:
+                buffer = buffers[event]
+            except KeyError:
+                buffers[event] = df
+            else:
+                buffers[event] = concat_chunks([buffer, df])
+
+        def resolve(event):
+            try:
+                return resolved[event]
+            except KeyError:
+                for event_ in candidates[event]:
+                    if event_ in buffers:
+                        resolved[event] = event_
+                        return event_
+                return None
+
+        def make_df_map(window):
+            df_map = {}
+            for event in events:
+                event_ = resolve(event)
+                if event_ is None:
+                    continue
+
+                df = buffers[event_]
+                signals = get_event_signals(event_)
+                if signals_init and signals:
+                    df = df_window_signals(df, window, signals, compress_init=compress_signals_init)
+                else:
+                    df = df_window(df, window, method='pre')
+
+                if not df.empty:
+                    df.attrs['name'] = event
+                    df_map[event] = df
+            return df_map
+
+        def prune(time):
+            for event, df in buffers.items():
+                i = df.index.searchsorted(time, side='left')
+                if not i:
+                    continue
+
+                # Only keep the rows that can be the initial value of a
+                # signal at the beginning of a window starting at "time"
+                before = df.iloc[:i]
+                keep = np.zeros(len(before), dtype=bool)
+                keep[-1] = True
+                if signals_init:
+                    for signal in get_event_signals(event):
+                        keep |= ~before.duplicated(subset=signal.fields, keep='last').to_numpy()
+
+                attrs = df.attrs
+                df = pd.concat([before[keep], df.iloc[i:]], copy=False)
+                df.attrs = attrs
+                buffers[event] = df
+
+        offset_time = self.basetime if self.normalize_time else 0
+        prev_time = 0
+        window = next(windows, None)
+        for offset, size in iter_chunks():
+            try:
+                parser = self._get_parser(to_parse, update_metadata=False, offset=offset, size=size, prev_time=prev_time)
+            except _NoEventLinesError:
+                continue
+
+            _, prev_time = parser.get_metadata('time-range')
+            for event, df in parser.parse_events(to_parse, best_effort=True).items():
+                add_chunk(event, df)
+            del parser
+
+            # Windows ending before the last parsed timestamp cannot get any
+            # more row from the rest of the trace.
+            parsed_until = prev_time - offset_time
+            while window is not None and window[1] < parsed_until:
+                yield (window, make_df_map(window))
+                window = next(windows, None)
+                if window is not None:
+                    prune(window[0])
+
+        while window is not None:
+            yield (window, make_df_map(window))
+            window = next(windows, None)
+
+    def _make_raw_cache_desc(self, event, columns=None):
+        spec = self._make_raw_cache_desc_spec(event, columns)
+        return _CacheDataDesc(spec=spec, fmt=self._cache.dataframe_swap_format)
+
+    def _make_raw_cache_desc_spec(self, event, columns=None):
+        spec = dict(
             event=event,
             raw=True,
             trace_state=self.trace_state,
         )
+        if columns is not None:
+            spec['columns'] = sorted(columns)
+        return spec
 
     def _load_df(self, cache_desc, sanitization_f=None, write_swap=None):
         event = cache_desc['event']
+        columns = cache_desc.get('columns')
+        window = cache_desc.get('window')
 
         # Do not even bother loading the event if we know it cannot be
         # there. This avoids some OSError in case the trace file has
@@ -4191,13 +6972,52 @@ class Trace(Loggable, TraceBase):
         if write_swap is None:
             write_swap = self._write_swap
 
-        df = self._load_cache_raw_df(TraceEventChecker(event), write_swap=True)[event]
+        if columns is None:
+            raw_columns = None
+        else:
+            raw_columns = set(columns)
+            # The fields of the signals are needed to window the dataframe
+            if window is not None:
+                raw_columns.update(itertools.chain.from_iterable(cache_desc['signals']))
 
-        if sanitization_f:
-            # Evict the raw dataframe once we got the sanitized version, since
-            # we are unlikely to reuse it again
-            self._cache.evict(self._make_raw_cache_desc(event))
+        def load_full_raw():
+            df = self._load_cache_raw_df(TraceEventChecker(event), write_swap=True)[event]
+            if sanitization_f:
+                # Evict the raw dataframe once we got the sanitized version,
+                # since we are unlikely to reuse it again
+                self._cache.evict(self._make_raw_cache_desc(event))
+            return df
+
+        def load_window_raw():
+            # Only load the rows needed for the window if the raw dataframe
+            # is in the swap. This requires the sanitization to not depend
+            # on other rows.
+            if (
+                window is None or
+                self._is_meta_event(event) or
+                not getattr(sanitization_f, 'row_wise', True)
+            ):
+                return None
+
+            signals = cache_desc['signals'] if cache_desc['signals_init'] else []
+            try:
+                return self._cache.fetch_window(
+                    self._make_raw_cache_desc(event),
+                    window=window,
+                    signals=signals,
+                    columns=raw_columns,
+                )
+            except KeyError:
+                return None
 
+        df = load_window_raw()
+        if df is None:
+            if raw_columns is None:
+                df = load_full_raw()
+            else:
+                df = self._load_cache_raw_df_columns(event, raw_columns, write_swap=True)
+
+        if sanitization_f:
             # We can ask to sanitize various aspects of the dataframe.
             # Adding a new aspect can be done without modifying existing
             # sanitization functions, as long as the default is the
@@ -4205,13 +7025,28 @@ class Trace(Loggable, TraceBase):
             aspects = dict(
                 rename_cols=cache_desc['rename_cols'],
             )
-            with measure_time() as measure:
-                df = sanitization_f(self, event, df, aspects=aspects)
-            sanitization_time = measure.exclusive_delta
+
+            def sanitize(df):
+                with measure_time() as measure:
+                    df = sanitization_f(self, event, df, aspects=aspects)
+                return (df, measure.exclusive_delta)
+
+            if raw_columns is None:
+                df, sanitization_time = sanitize(df)
+            else:
+                try:
+                    df, sanitization_time = sanitize(df)
+                except KeyError:
+                    df = None
+
+                # The sanitization function might need other columns or
+                # rename some of them, in which case we fall back on the
+                # full raw dataframe.
+                if df is None or not raw_columns <= set(df.columns):
+                    df, sanitization_time = sanitize(load_full_raw())
         else:
             sanitization_time = 0
 
-        window = cache_desc.get('window')
         if window is not None:
             signals_init = cache_desc['signals_init']
             compress_signals_init = cache_desc['compress_signals_init']
@@ -4228,10 +7063,89 @@ class Trace(Loggable, TraceBase):
         else:
             windowing_time = 0
 
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+
         compute_cost = sanitization_time + windowing_time
         self._cache.insert(cache_desc, df, compute_cost=compute_cost, write_swap=write_swap)
         return df
 
+    def _load_cache_raw_df_columns(self, event, columns, write_swap):
+        """
+        Same as :meth:`_load_cache_raw_df` for a single event, but only parsing
+        the given ``columns``.
+
+        Only one such dataframe is cached per event: if other columns are
+        requested later on, the cached dataframe is widened by parsing only
+        the missing columns.
+        """
+        columns = set(columns)
+
+        def select(df):
+            return df[[col for col in df.columns if col in columns]]
+
+        # The full dataframe contains all the columns
+        with contextlib.suppress(KeyError):
+            df = self._cache.fetch(self._make_raw_cache_desc(event), insert=True)
+            return select(df)
+
+        # Meta events are computed from other dataframes rather than parsed
+        if self._is_meta_event(event):
+            df = self._load_cache_raw_df(TraceEventChecker(event), write_swap=write_swap)[event]
+            return select(df)
+
+        def fetch(columns):
+            try:
+                return self._cache.fetch(self._make_raw_cache_desc(event, columns), insert=True)
+            except KeyError:
+                return None
+
+        known = set(self._raw_df_columns.get(event, []))
+        base = fetch(known) if known else None
+        if base is None:
+            known = set()
+        elif columns <= known:
+            return select(base)
+
+        wider = known | columns
+        cache_desc = self._make_raw_cache_desc(event, wider)
+        with self._cache.computation_lock(cache_desc):
+            # Another process sharing the swap might have parsed it while we
+            # were waiting for the lock
+            df = fetch(wider)
+            if df is None:
+                try:
+                    df = self._load_raw_df([event], columns={event: columns - known})[event]
+                except KeyError as e:
+                    raise MissingTraceEventError([event], available_events=self.available_events) from e
+
+                if base is not None:
+                    # The parser may give more columns than asked for
+                    df = df[[col for col in df.columns if col not in base.columns]]
+                    attrs = base.attrs
+                    # All dataframes of a given event share the same index,
+                    # since timestamps are deduplicated across all events.
+                    df = pd.concat([base, df], axis=1, copy=False)
+                    df.attrs = attrs
+
+                # Columns that turned out to not be in the event are recorded
+                # as well, so that they are not parsed again.
+                wider |= set(df.columns)
+                cache_desc = self._make_raw_cache_desc(event, wider)
+                self._cache.insert(
+                    cache_desc,
+                    df,
+                    write_swap=write_swap,
+                    # Parsing cost is known to be high
+                    force_write_swap=True,
+                )
+
+            if base is not None:
+                self._cache.evict(self._make_raw_cache_desc(event, known))
+
+        self._update_raw_df_columns(event, wider)
+        return select(df)
+
     def _load_cache_raw_df(self, event_checker, write_swap, allow_missing_events=False):
         events = event_checker.get_all_events()
         insert_kwargs = dict(
@@ -4241,6 +7155,13 @@ class Trace(Loggable, TraceBase):
             force_write_swap=True,
         )
 
+        def insert(event, df):
+            cache_desc = self._make_raw_cache_desc(event)
+            # Meta events are computed from other dataframes, so they cannot
+            # be completed by parsing the end of the trace.
+            coverage = None if self._is_meta_event(event) else self._raw_df_coverage
+            self._cache.insert(cache_desc, df, coverage=coverage, **insert_kwargs)
+
         # Get the raw dataframe from the cache if possible
         def try_from_cache(event):
             cache_desc = self._make_raw_cache_desc(event)
@@ -4251,29 +7172,46 @@ class Trace(Loggable, TraceBase):
             except KeyError:
                 return None
             else:
-                self._cache.insert(cache_desc, df, **insert_kwargs)
+                insert(event, df)
                 return df
 
-        from_cache = {
-            event: try_from_cache(event)
-            for event in events
-        }
+        def load_from_cache(events):
+            from_cache = {
+                event: try_from_cache(event)
+                for event in events
+            }
 
-        from_cache = {
-            event: df
-            for event, df in from_cache.items()
-            if df is not None
-        }
+            return {
+                event: df
+                for event, df in from_cache.items()
+                if df is not None
+            }
 
-        # Load the remaining events from the trace directly
-        events_to_load = sorted(events - from_cache.keys())
-        from_trace = self._load_raw_df(events_to_load)
+        from_cache = load_from_cache(events)
+        from_tail = {}
+        from_trace = {}
 
-        for event, df in from_trace.items():
-            cache_desc = self._make_raw_cache_desc(event)
-            self._cache.insert(cache_desc, df, **insert_kwargs)
+        to_compute = events - from_cache.keys()
+        if to_compute:
+            with self._cache.computation_lock(*map(self._make_raw_cache_desc, to_compute)):
+                # Another process sharing the swap might have parsed some of
+                # the events while we were waiting for the lock
+                from_cache.update(load_from_cache(to_compute))
 
-        df_map = {**from_cache, **from_trace}
+                # Complete the dataframes that were cached before data got appended
+                # to the trace
+                from_tail, missing = self._load_appended_raw_df(events - from_cache.keys())
+                for event, df in from_tail.items():
+                    insert(event, df)
+
+                # Load the remaining events from the trace directly
+                events_to_load = sorted(events - from_cache.keys() - from_tail.keys() - missing)
+                from_trace = self._load_raw_df(events_to_load)
+
+                for event, df in from_trace.items():
+                    insert(event, df)
+
+        df_map = {**from_cache, **from_tail, **from_trace}
         try:
             event_checker.check_events(df_map.keys())
         except MissingTraceEventError as e:
@@ -4283,6 +7221,101 @@ class Trace(Loggable, TraceBase):
                 raise
         return df_map
 
+    def _load_appended_raw_df(self, events):
+        """
+        Load the raw dataframes of ``events`` that were cached before data was
+        appended to the trace, and complete them by parsing only the end of
+        the trace.
+
+        :returns: A tuple ``(df_map, missing)`` with the mapping of events to
+            completed dataframes, and the set of events that were known to be
+            missing in the beginning of the trace and are not in the end of
+            it either. Events that cannot be handled that way are in neither.
+        """
+        appended = self._cache.appended_trace
+        if appended is None or not self._parser_supports_tail:
+            return ({}, set())
+
+        metadata = appended['metadata']
+        # Meta events are not parsed from the trace directly
+        missing_before = {
+            event
+            for event, available in metadata.get('parseable-events', {}).items()
+            if not (available or self._is_meta_event(event))
+        }
+        try:
+            _, end = metadata['time-range']
+        except KeyError:
+            missing_before = set()
+
+        def fetch(event):
+            if event in missing_before:
+                return (event, None, appended['size'], end)
+
+            try:
+                df, coverage = self._cache.fetch_partial(self._make_raw_cache_desc(event))
+            except KeyError:
+                return None
+            else:
+                return (event, df, coverage['offset'], coverage['time'])
+
+        partial = [
+            x
+            for x in map(fetch, sorted(events))
+            if x is not None
+        ]
+
+        df_map = {}
+        missing = set()
+        # Parse the end of the trace once for all the events that were cached
+        # at the same time.
+        for (offset, time), group in groupby(partial, key=itemgetter(2, 3)):
+            group_events = [event for event, *_ in group]
+            self.logger.debug(f'Parsing events appended to the trace after offset {offset}: {group_events}')
+            try:
+                parser = self._get_parser(group_events, update_metadata=False, offset=offset, prev_time=time)
+            except ValueError:
+                tail_map = {}
+            else:
+                tail_map = parser.parse_events(group_events, best_effort=True)
+
+            for event, df, *_ in group:
+                try:
+                    tail_df = tail_map[event]
+                except KeyError:
+                    if df is None:
+                        missing.add(event)
+                    else:
+                        df_map[event] = df
+                    continue
+
+                tail_df = self._apply_normalize_time(tail_df, inplace=True)
+                tail_df.attrs['name'] = event
+                tail_df.index.name = 'Time'
+                self._make_raw_df_compact(tail_df)
+
+                # The event only appears in the appended data
+                if df is None:
+                    df_map[event] = tail_df
+                    continue
+                # The dtypes inferred from the end of the trace might be
+                # different, in which case we parse the whole event again
+                tail_df = self._cast_raw_df_like(tail_df, df)
+                if tail_df is None:
+                    continue
+
+                attrs = df.attrs
+                df = _df_concat([df, tail_df])
+                df.attrs = attrs
+                self._make_raw_df_compact(df)
+                df_map[event] = df
+
+        self._update_parseable_events({
+            **{event: True for event in df_map.keys()},
+            **{event: False for event in missing},
+        })
+        return (df_map, missing)
+
     def _apply_normalize_time(self, df, inplace):
         df = df if inplace else df.copy(deep=False)
 
@@ -4291,11 +7324,11 @@ class Trace(Loggable, TraceBase):
 
         return df
 
-    def _mp_parse_worker(self, event):
+    def _mp_parse_worker(self, event, columns=None):
         # Do not update the metadata to avoid concurrency issues while updating
         # the cache. Instead, we return the metadata and let the main thread
         # deal with it.
-        parser = self._get_parser([event], update_metadata=False)
+        parser = self._get_parser([event], update_metadata=False, events_columns=columns)
 
         try:
             data = parser.parse_event(event)
@@ -4307,13 +7340,32 @@ class Trace(Loggable, TraceBase):
         metadata = parser.get_all_metadata()
         return (data, metadata)
 
-    def _parse_raw_events(self, events):
+    @property
+    def _parser_is_txt(self):
+        """
+        ``True`` if the parser is a :class:`TxtTraceParserBase`, either as a
+        class, a factory classmethod or a partially-applied instance.
+        """
+        parser = self._parser
+        if isinstance(parser, type):
+            cls = parser
+        elif isinstance(parser, PartialInit):
+            cls = type(parser)
+        elif inspect.ismethod(parser):
+            cls = parser.__self__
+        else:
+            return False
+
+        return isinstance(cls, type) and issubclass(cls, TxtTraceParserBase)
+
+    def _parse_raw_events(self, events, columns=None):
         if not events:
             return {}
 
+        cpu_count = multiprocessing.cpu_count()
         nr_processes = min(
             len(events),
-            multiprocessing.cpu_count(),
+            cpu_count,
         )
         chunk_size = int(math.ceil(len(events) / nr_processes))
 
@@ -4323,13 +7375,25 @@ class Trace(Loggable, TraceBase):
         # we are already executing from a Pool.
         use_mp = (
             self._cache.max_mem_size >= math.inf
-            and nr_processes > 1
             and not multiprocessing.current_process().daemon
         )
 
-        if use_mp:
+        # Text parsers can parse all the events from a single trace-cmd report
+        # output, split across worker processes. This avoids creating as many
+        # report as there are events.
+        if use_mp and cpu_count > 1 and self._parser_is_txt:
+            parser = self._get_parser(events, update_metadata=True, jobs=cpu_count, events_columns=columns)
+            df_map = parser.parse_events(events, best_effort=True)
+
+            for df in df_map.values():
+                self._apply_normalize_time(df, inplace=True)
+        elif use_mp and nr_processes > 1:
             with multiprocessing.Pool(processes=nr_processes) as pool:
-                res_list = pool.map(self._mp_parse_worker, events, chunksize=chunk_size)
+                res_list = pool.map(
+                    functools.partial(self._mp_parse_worker, columns=columns),
+                    events,
+                    chunksize=chunk_size,
+                )
 
             if res_list:
                 data_list, metadata_list = zip(*res_list)
@@ -4353,7 +7417,7 @@ class Trace(Loggable, TraceBase):
             else:
                 df_map = {}
         else:
-            parser = self._get_parser(events, update_metadata=True)
+            parser = self._get_parser(events, update_metadata=True, events_columns=columns)
             df_map = parser.parse_events(events, best_effort=True)
 
             for df in df_map.values():
@@ -4465,7 +7529,13 @@ class Trace(Loggable, TraceBase):
             for event, df in df_map.items()
         }
 
-    def _load_raw_df(self, events):
+    def _load_raw_df(self, events, columns=None):
+        """
+        Parse the raw dataframes of ``events``.
+
+        ``columns`` is an optional mapping of events to the columns to parse
+        for them, see :class:`TraceParserBase`.
+        """
         events = set(events)
         if not events:
             return {}
@@ -4474,23 +7544,14 @@ class Trace(Loggable, TraceBase):
         regular_events = events - meta_events
 
         df_map = {
-            **self._parse_raw_events(regular_events),
+            **self._parse_raw_events(regular_events, columns=columns),
             **self._parse_meta_events(meta_events),
         }
 
         for event, df in df_map.items():
             df.attrs['name'] = event
             df.index.name = 'Time'
-
-        # Save some memory by changing values of this column into an category
-        categorical_fields = [
-            '__comm',
-            'comm',
-        ]
-        for df in df_map.values():
-            for field in categorical_fields:
-                with contextlib.suppress(KeyError):
-                    df[field] = df[field].astype('category', copy=False)
+            self._make_raw_df_compact(df)
 
         # remember the events that we tried to parse and that turned out to not be available
         self._update_parseable_events({
@@ -4500,6 +7561,45 @@ class Trace(Loggable, TraceBase):
 
         return df_map
 
+    @staticmethod
+    def _cast_raw_df_like(df, ref):
+        """
+        Cast the columns of ``df`` to the dtypes of ``ref``, so that raw
+        dataframes parsed from different parts of the trace can be
+        concatenated.
+
+        :returns: The casted dataframe, or ``None`` if the columns or dtypes
+            are not compatible.
+        """
+        if list(df.columns) != list(ref.columns):
+            return None
+
+        # Categories are unified when concatenating, using the categories of
+        # ref would turn unknown values into NaN
+        dtypes = {
+            col: ('category' if dtype.name == 'category' else dtype)
+            for col, dtype in ref.dtypes.items()
+        }
+        try:
+            return df.astype(dtypes, copy=False)
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def _make_raw_df_compact(df):
+        """
+        Save some memory by changing values of some columns into categories.
+
+        .. note:: The dataframe is modified in place.
+        """
+        categorical_fields = [
+            '__comm',
+            'comm',
+        ]
+        for field in categorical_fields:
+            with contextlib.suppress(KeyError):
+                df[field] = df[field].astype('category', copy=False)
+
     @memoized
     def _get_task_maps(self):
         """
@@ -4826,13 +7926,17 @@ class Trace(Loggable, TraceBase):
 ###############################################################################
 
     _SANITIZATION_FUNCTIONS = {}
-    def _sanitize_event(event, mapping=_SANITIZATION_FUNCTIONS):
+    def _sanitize_event(event, mapping=_SANITIZATION_FUNCTIONS, row_wise=True):
         """
         Sanitization functions must not modify their input.
+
+        ``row_wise`` must be ``False`` if the sanitization of a row depends on
+        other rows, so that the function is always given the whole dataframe.
         """
         # pylint: disable=dangerous-default-value,no-self-argument
 
         def decorator(f):
+            f.row_wise = row_wise
             mapping[event] = f
             return f
         return decorator
@@ -4853,17 +7957,21 @@ class Trace(Loggable, TraceBase):
                 copied = True
                 return x.copy(deep=False)
 
-        if df['prev_state'].dtype.name == 'string':
+        if 'prev_state' in df.columns and df['prev_state'].dtype.name in ('string', 'category'):
             # Avoid circular dependency issue by importing at the last moment
             # pylint: disable=import-outside-toplevel
             from lisa.analysis.tasks import TaskState
             df = copy_once(df)
-            df['prev_state'] = df['prev_state'].apply(TaskState.from_sched_switch_str).astype('uint16', copy=False)
+            # Only parse each distinct state once
+            prev_state = df['prev_state'].astype('category', copy=False)
+            prev_state = prev_state.map(TaskState.from_sched_switch_str)
+            df['prev_state'] = prev_state.astype('uint16', copy=False)
 
         # Save a lot of memory by using category for strings
         df = copy_once(df)
         for col in ('next_comm', 'prev_comm'):
-            df[col] = df[col].astype('category', copy=False)
+            if col in df.columns:
+                df[col] = df[col].astype('category', copy=False)
 
         return df
 
@@ -4879,13 +7987,13 @@ class Trace(Loggable, TraceBase):
                 copied = True
                 return x.copy(deep=False)
 
-        if not df['overutilized'].dtype.name == 'bool':
+        if 'overutilized' in df.columns and not df['overutilized'].dtype.name == 'bool':
             df = copy_once(df)
             df['overutilized'] = df['overutilized'].astype(bool, copy=False)
 
-        if 'span' in df.columns and df['span'].dtype.name == 'string':
+        if 'span' in df.columns and df['span'].dtype.name in ('string', 'category'):
             df = copy_once(df)
-            df['span'] = df['span'].apply(lambda x: x if pd.isna(x) else int(x, base=16))
+            df['span'] = df['span'].astype(object).apply(lambda x: x if pd.isna(x) else int(x, base=16))
 
         return df
 
@@ -4904,18 +8012,19 @@ class Trace(Loggable, TraceBase):
         df = df.rename(columns={'cpus': 'cpumask'}, copy=False)
         df = df.copy(deep=False)
 
-        if df['cpumask'].dtype.name == 'object':
+        if 'cpumask' in df.columns and df['cpumask'].dtype.name == 'object':
             df['cpumask'] = df['cpumask'].apply(self._expand_bitmask_field)
 
-        if event == 'thermal_power_cpu_get_power':
+        if event == 'thermal_power_cpu_get_power' and 'load' in df.columns:
             if df['load'].dtype.name == 'object':
                 df['load'] = df['load'].apply(parse_load)
 
         return df
 
-    @_sanitize_event('print')
-    @_sanitize_event('bprint')
-    @_sanitize_event('bputs')
+    # The trailing newline is only stripped if the first row has one
+    @_sanitize_event('print', row_wise=False)
+    @_sanitize_event('bprint', row_wise=False)
+    @_sanitize_event('bputs', row_wise=False)
     def _sanitize_print(self, event, df, aspects):
         # pylint: disable=unused-argument,no-self-use
 
@@ -4923,12 +8032,14 @@ class Trace(Loggable, TraceBase):
 
         # Only process string "ip" (function name), not if it is a numeric
         # address
-        if not is_numeric_dtype(df['ip'].dtype):
+        if 'ip' in df.columns and not is_numeric_dtype(df['ip'].dtype):
             # Reduce memory usage and speedup selection based on function
             with contextlib.suppress(KeyError):
                 df['ip'] = df['ip'].astype('category', copy=False)
 
         content_col = 'str' if event == 'bputs' else 'buf'
+        if content_col not in df.columns:
+            return df
 
         # Ensure we have "bytes" values, since some parsers might give
         # str type.
@@ -3196,7 +3196,7 @@ def checksum(file_, method):
         h = getattr(hashlib, method)()
         update = h.update
         result = h.hexdigest
-        chunk_size = h.block_size
+        chunk_size = 1 * 1024 * 1024
     elif method == 'crc32':
         crc32_state = 0
         def update(data):
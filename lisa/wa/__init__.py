@@ -23,6 +23,8 @@ import contextlib
 import sqlite3
 import pathlib
 import warnings
+import multiprocessing
+import pickle
 from functools import lru_cache
 
 import pandas as pd
@@ -31,7 +33,7 @@ from wa import discover_wa_outputs, Status
 
 from lisa.version import VERSION_TOKEN
 from lisa.stats import Stats
-from lisa.utils import Loggable, memoized, get_subclasses, LazyMapping
+from lisa.utils import Loggable, memoized, get_subclasses, LazyMapping, measure_time
 from lisa._git import find_shortest_symref, get_commit_message
 from lisa.trace import Trace
 
@@ -39,6 +41,26 @@ def _df_concat(dfs):
     return pd.concat(dfs, ignore_index=True, copy=False, sort=False)
 
 
+_JOB_LOADER = None
+
+
+def _job_loader_worker_init(loader):
+    # pylint: disable=global-statement
+    global _JOB_LOADER
+    _JOB_LOADER = loader
+
+
+def _job_loader_worker(i):
+    df, excep, load_time = _JOB_LOADER(i)
+    # The exception is sent back to the parent process, so make sure it can
+    # be pickled
+    try:
+        pickle.dumps(excep)
+    except Exception: # pylint: disable=broad-except
+        excep = ValueError(f'{excep.__class__.__qualname__}: {excep}')
+    return (df, excep, load_time)
+
+
 class WAOutputNotFoundError(Exception):
     def __init__(self, collectors):
         # pylint: disable=super-init-not-called
@@ -151,6 +173,10 @@ class WAOutput(StatsProp, Mapping, Loggable):
         kernel which ran the workload.
     :param kernel_path: str
 
+    :param processes: Number of processes used by the collectors to load the
+        jobs in parallel. If ``None``, the number of CPUs is used.
+    :type processes: int or None
+
     **Example**::
 
         wa_output = WAOutput('wa/output/path')
@@ -159,9 +185,14 @@ class WAOutput(StatsProp, Mapping, Loggable):
         stats.plot_stats(filename='stats.html')
     """
 
-    def __init__(self, path, kernel_path=None):
+    def __init__(self, path, kernel_path=None, processes=1):
         self.path = path
         self.kernel_path = kernel_path
+        self.processes = processes or multiprocessing.cpu_count()
+        self._outputs = None
+        # Incremented every time new outputs are discovered by update()
+        self._generation = 0
+        self._df = (None, None)
 
         collector_classes = {
             cls.NAME: cls
@@ -202,12 +233,18 @@ class WAOutput(StatsProp, Mapping, Loggable):
         return len(self._auto_collectors)
 
     @property
-    @memoized
     def df(self):
         """
         DataFrame containing the data collected by all the registered
         :class:`WAOutput` collectors.
         """
+        generation, df = self._df
+        if generation != self._generation:
+            df = self._get_df()
+            self._df = (self._generation, df)
+        return df
+
+    def _get_df(self):
         dfs = []
         exceps = {}
         for name, collector in self.items():
@@ -258,7 +295,6 @@ class WAOutput(StatsProp, Mapping, Loggable):
         )
 
     @property
-    @memoized
     def jobs(self):
         """
         List containing all the jobs present in the output of 'wa run'.
@@ -268,7 +304,6 @@ class WAOutput(StatsProp, Mapping, Loggable):
         return list(self._jobs.values())[0][1]
 
     @property
-    @memoized
     def _jobs(self):
         return {
             name: (output, [
@@ -280,12 +315,49 @@ class WAOutput(StatsProp, Mapping, Loggable):
         }
 
     @property
-    @memoized
     def outputs(self):
         """
         Dict containing a mapping of 'wa run' names to
         :class:`RunOutput` objects.
+
+        .. seealso:: :meth:`update` to discover outputs added afterwards.
         """
+        if self._outputs is None:
+            self._outputs = self._discover_outputs()
+        return self._outputs
+
+    def update(self):
+        """
+        Discover the outputs of ``wa run`` that were added to :attr:`path`
+        since :attr:`outputs` was computed.
+
+        The dataframes of the collectors will include the jobs of the new
+        outputs the next time they are accessed. The jobs that were already
+        successfully loaded by a collector are not loaded again, but the ones
+        that failed to load are retried.
+
+        :returns: The names of the new outputs.
+        :rtype: list(str)
+        """
+        def get_path(output):
+            return pathlib.Path(output.basepath).resolve()
+
+        known = set(map(get_path, self.outputs.values()))
+        outputs = self._discover_outputs()
+        new = [
+            name
+            for name, output in outputs.items()
+            if get_path(output) not in known
+        ]
+
+        self._outputs = outputs
+        # Always invalidate the dataframes, so that the jobs that failed to
+        # load get another chance. The jobs already loaded are cached by the
+        # collectors so this is cheap.
+        self._generation += 1
+        return new
+
+    def _discover_outputs(self):
         wa_outputs = list(discover_wa_outputs(self.path))
 
         if len(wa_outputs) > 1:
@@ -346,6 +418,13 @@ class WACollectorBase(StatsProp, Loggable, abc.ABC):
     def __init__(self, wa_output, df_postprocess=None):
         self.wa_output = wa_output
         self._df_postprocess = df_postprocess or (lambda x: x)
+        # Output of _load_job() for each job, keyed by job path
+        self._jobs_df = {}
+        self._df = (None, None)
+        self.jobs_load_time = {}
+        """
+        Mapping of job paths to the time in seconds it took to load them.
+        """
 
     @abc.abstractclassmethod
     def _get_job_df(cls, job):
@@ -376,66 +455,136 @@ class WACollectorBase(StatsProp, Loggable, abc.ABC):
         """
 
     @property
-    @memoized
     def df(self):
         """
         :class:`pandas.DataFrame` containing the data collected.
         """
-        return self._get_df()
+        generation, df = self._df
+        if generation != self.wa_output._generation:
+            df = self._get_df()
+            self._df = (self.wa_output._generation, df)
+        return df
 
-    def _get_df(self):
-        self.logger.debug(f"Collecting dataframe for {self.NAME}")
+    def _load_job(self, job):
+        """
+        Load the dataframe of a job.
 
-        def load_df(job):
-            def loader(job):
-                cache_path = os.path.join(
-                    job.basepath,
-                    f'.{self.NAME}-cache.{VERSION_TOKEN}.parquet'
-                )
+        :returns: A tuple ``(df, excep, load_time)`` where only one of ``df``
+            and ``excep`` is not ``None``.
+
+        .. note:: This is executed in a worker process when
+            :attr:`WAOutput.processes` > 1.
+        """
+        cache_path = os.path.join(
+            job.basepath,
+            f'.{self.NAME}-cache.{VERSION_TOKEN}.parquet'
+        )
 
-                # _get_job_df usually returns fairly large dataframes, so cache
-                # the result for faster reloading
+        # _get_job_df usually returns fairly large dataframes, so cache
+        # the result for faster reloading
 
-                get_df = lambda: self._get_job_df(job)
+        get_df = lambda: self._get_job_df(job)
 
+        with measure_time() as measure:
+            try:
                 if self._PURE_GET_JOB_DF:
                     try:
                         df = pd.read_parquet(cache_path)
                     except OSError:
                         df = get_df()
                         df.to_parquet(cache_path)
-                    return df
                 else:
-                    return get_df()
+                    df = get_df()
+            except Exception as e: # pylint: disable=broad-except
+                df = None
+                excep = e
+            else:
+                excep = None
+
+        return (df, excep, measure.delta)
+
+    def _load_jobs(self, jobs):
+        """
+        Load the dataframe of the given jobs, using a pool of processes if
+        :attr:`WAOutput.processes` > 1.
+        """
+        processes = min(self.wa_output.processes, len(jobs))
+        # Daemonic processes cannot have children, so we cannot create a Pool
+        # if we are already executing from a Pool.
+        if processes > 1 and not multiprocessing.current_process().daemon:
+            # Use fork explicitly, so that the collector is inherited by the
+            # workers rather than pickled: it can refer to user-provided
+            # functions such as lambdas.
+            ctx = multiprocessing.get_context('fork')
+            pool = ctx.Pool(
+                processes=processes,
+                initializer=_job_loader_worker_init,
+                initargs=(lambda i: self._load_job(jobs[i]),),
+            )
+            with pool:
+                # Jobs are sent by index, as they are inherited by the workers
+                # as well
+                res = pool.map(_job_loader_worker, range(len(jobs)), chunksize=1)
+        else:
+            res = map(self._load_job, jobs)
+
+        for job, (df, excep, load_time) in zip(jobs, res):
+            self.logger.debug(f'Loaded {self.NAME} dataframe for job {job} in {load_time:.2f}s')
+            self.jobs_load_time[job.basepath] = load_time
+            self._jobs_df[job.basepath] = (df, excep)
 
+    def _get_df(self):
+        self.logger.debug(f"Collecting dataframe for {self.NAME}")
+
+        jobs = [
+            (name, wa_output, job)
+            for name, (wa_output, jobs) in self.wa_output._jobs.items()
+            for job in jobs
+        ]
+        def is_loaded(job):
             try:
-                df = loader(job)
-            except Exception as e: # pylint: disable=broad-except
+                df, excep = self._jobs_df[job.basepath]
+            except KeyError:
+                return False
+            else:
+                # Jobs that failed to load are retried, e.g. in case their
+                # output was not complete yet
+                return excep is None
+
+        # Only load the jobs that were not loaded already, e.g. before new
+        # outputs were discovered by WAOutput.update()
+        self._load_jobs([
+            job
+            for name, wa_output, job in jobs
+            if not is_loaded(job)
+        ])
+
+        def load_df(job):
+            df, excep = self._jobs_df[job.basepath]
+            if excep is None:
+                # The user postprocessing and _add_output_info() may modify
+                # the dataframe in place, so give them a copy of the one we
+                # keep. The copy needs to be deep, otherwise modifying
+                # existing columns in place would still affect the cache.
+                return self._df_postprocess(df.copy(deep=True))
+            else:
                 # Swallow the error if that job was not from the expected
                 # workload
                 expected_name = self._EXPECTED_WORKLOAD_NAME
                 if expected_name is None or job.spec.workload_name == expected_name:
-                    self.logger.error(f'Could not load {self.NAME} dataframe for job {job}: {e}')
-                else:
-                    return None
-            else:
-                return self._df_postprocess(df)
+                    self.logger.error(f'Could not load {self.NAME} dataframe for job {job}: {excep}')
+                return None
 
         dfs = [
             self._add_output_info(wa_output, name, df)
-            for name, (wa_output, jobs) in self.wa_output._jobs.items()
-            for df in [
-                load_df(job)
-                for job in jobs
-            ]
+            for name, wa_output, job in jobs
+            for df in [load_df(job)]
             if df is not None
         ]
 
         if not dfs:
             raise WAOutputNotFoundError.from_collector(self, 'Could not find any valid job output')
 
-        # It is unfortunately not safe to cache the output of load_df, as the
-        # user postprocessing could change at any time
         df = _df_concat(dfs)
         return self._add_kernel_id(df)
 
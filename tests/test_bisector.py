@@ -0,0 +1,208 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (C) 2026, Arm Limited and contributors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+from unittest import mock
+
+import pytest
+
+pytest.importorskip('bisector')
+
+from bisector.bisector import (
+    Report, ReportStore, MacroStep, MacroStepResult, StepSeqResult,
+    StepResult, StoredStepSeqResult, BasicStatTest, BisectRet,
+)
+from .utils import StorageTestCase
+
+
+class TestReportStore(StorageTestCase):
+    """
+    Check :class:`bisector.bisector.ReportStore` and the lazy loading of the
+    iterations results.
+    """
+
+    NR_ITERATIONS = 4
+
+    def _make_report(self, nr_iterations=NR_ITERATIONS):
+        macro = MacroStep(
+            steps=[
+                {'class': 'shell', 'name': 'good', 'cmd': 'true'},
+                {'class': 'shell', 'name': 'flaky', 'cmd': 'false'},
+            ],
+            stat_test=BasicStatTest(0),
+        )
+        good, flaky = macro.steps_list
+
+        def make_iteration(i):
+            return StepSeqResult(
+                macro,
+                [
+                    StepResult(good, [(0, b'good log')], BisectRet.GOOD),
+                    StepResult(
+                        flaky,
+                        [(i % 2, b'flaky log')],
+                        BisectRet.BAD if i % 2 else BisectRet.GOOD,
+                    ),
+                ],
+                run_time=i,
+            )
+
+        res = MacroStepResult(macro, [
+            make_iteration(i)
+            for i in range(nr_iterations)
+        ])
+        return Report(res, description='test report')
+
+    @staticmethod
+    def _iterations(report):
+        return [
+            (
+                res.run_time,
+                [
+                    (step_res.step.name, step_res.ret, step_res.bisect_ret)
+                    for step_res in res.steps_res
+                ],
+            )
+            for res in report.result.res_list
+        ]
+
+    def _nr_stored(self, path):
+        store = ReportStore(path)
+        nr, = store._conn.execute('SELECT COUNT(*) FROM iterations').fetchone()
+        return nr
+
+    def test_save_load(self):
+        path = os.path.join(self.res_dir, 'report.sqlite')
+        report = self._make_report()
+        report.save(path)
+        assert ReportStore.is_store(path)
+
+        loaded = Report.load(path)
+        res_list = loaded.result.res_list
+        assert len(res_list) == self.NR_ITERATIONS
+        assert all(isinstance(res, StoredStepSeqResult) for res in res_list)
+
+        assert loaded.description == report.description
+        assert loaded.bisect_ret == report.bisect_ret == BisectRet.BAD
+        assert self._iterations(loaded) == self._iterations(report)
+
+        # The results share the steps of the report
+        steps = set(map(id, loaded.result.step.steps_list))
+        assert all(
+            id(step_res.step) in steps
+            for res in res_list
+            for step_res in res.steps_res
+        )
+
+    def test_save_incremental(self):
+        path = os.path.join(self.res_dir, 'report.sqlite')
+        self._make_report().save(path)
+
+        report = Report.load(path)
+        # Add a new iteration, as when resuming
+        macro = report.result.step
+        report.result.res_list.append(StepSeqResult(
+            macro,
+            [
+                StepResult(step, [(0, b'new log')], BisectRet.GOOD)
+                for step in macro.steps_list
+            ],
+        ))
+
+        with mock.patch.object(ReportStore, '_dumps', wraps=report._store._dumps) as dumps:
+            report.save(path)
+        # Only the new iteration and the metadata are pickled again
+        assert dumps.call_count == 3
+        assert self._nr_stored(path) == self.NR_ITERATIONS + 1
+
+        loaded = Report.load(path)
+        assert len(loaded.result.res_list) == self.NR_ITERATIONS + 1
+        assert [
+            step_res.ret
+            for step_res in loaded.result.res_list[-1].steps_res
+        ] == [0, 0]
+
+    def test_lazy_load(self):
+        path = os.path.join(self.res_dir, 'report.sqlite')
+        report = self._make_report()
+        report.save(path)
+
+        def load_result(self, i):
+            raise AssertionError(f'Iteration {i} was loaded')
+
+        loaded = Report.load(path)
+        # The summaries are enough to get the overall result
+        with mock.patch.object(ReportStore, 'load_result', load_result):
+            assert loaded.bisect_ret == BisectRet.BAD
+            assert loaded.result.avg_run_time == report.result.avg_run_time
+
+        # Showing the report loads the results, but does not keep them
+        out, bisect_ret = loaded.show()
+        assert bisect_ret == BisectRet.BAD
+        assert 'returned 1, bisect bad' in str(out)
+        assert all(
+            res._res is None
+            for res in loaded.result.res_list
+        )
+
+        # Accessing other attributes loads the result and keeps it
+        res = loaded.result.res_list[0]
+        assert res.step_res_run_times == {}
+        assert res._res is not None
+
+    def test_old_format(self):
+        report = self._make_report()
+        path = os.path.join(self.res_dir, 'report.pickle')
+        report.save(path)
+        assert not ReportStore.is_store(path)
+
+        loaded = Report.load(path)
+        assert not any(
+            isinstance(res, StoredStepSeqResult)
+            for res in loaded.result.res_list
+        )
+        assert self._iterations(loaded) == self._iterations(report)
+
+        # The cache of an old format report is a ReportStore
+        cache_path = os.path.join(
+            self.res_dir,
+            Report.REPORT_CACHE_TEMPLATE.format(report_filename='report.pickle'),
+        )
+        loaded = Report.load(path, use_cache=True)
+        assert ReportStore.is_store(cache_path)
+        assert self._iterations(loaded) == self._iterations(report)
+
+        loaded = Report.load(path, use_cache=True)
+        assert all(
+            isinstance(res, StoredStepSeqResult)
+            for res in loaded.result.res_list
+        )
+        assert self._iterations(loaded) == self._iterations(report)
+
+    def test_export_old_format(self):
+        path = os.path.join(self.res_dir, 'report.sqlite')
+        report = self._make_report()
+        report.save(path)
+
+        # Saving to another format loads all the results
+        loaded = Report.load(path)
+        export_path = os.path.join(self.res_dir, 'report.pickle')
+        loaded.save(export_path)
+
+        exported = Report.load(export_path)
+        assert self._iterations(exported) == self._iterations(report)
+        assert exported.bisect_ret == report.bisect_ret
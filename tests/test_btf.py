@@ -22,8 +22,9 @@ import io
 import subprocess
 import lzma
 import logging
+import tempfile
 
-from lisa._btf import parse_btf, dump_c
+from lisa._btf import parse_btf, dump_c, BTFType, BTFStruct
 
 from .utils import ASSET_DIR
 
@@ -81,3 +82,37 @@ class BTFDump(TestCase):
             _test_btf(btf_path)
 
 
+class BTFParse(TestCase):
+    TYP_NAMES = ['task_struct', 'rq', 'cfs_rq']
+
+    def _load_btf(self):
+        with lzma.open(Path(ASSET_DIR) / 'btf' / '1.btf.xz', 'rb') as f:
+            return f.read()
+
+    @staticmethod
+    def _summary(typs):
+        return sorted(
+            (typ.id, typ.__class__.__qualname__, getattr(typ, 'name', None))
+            for typ in BTFType.reachable_from(typs)
+            if typ.id is not None
+        )
+
+    def _select(self, typ):
+        return isinstance(typ, BTFStruct) and typ.name in self.TYP_NAMES
+
+    def test_select_names(self):
+        buf = self._load_btf()
+        ref = parse_btf(buf, select_typ=self._select)
+        typs = parse_btf(buf, select_typ=self._select, select_names=self.TYP_NAMES)
+
+        assert len(typs) == len(self.TYP_NAMES)
+        assert self._summary(typs) == self._summary(ref)
+
+    def test_cache(self):
+        buf = self._load_btf()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            ref = parse_btf(buf, select_names=self.TYP_NAMES, cache_dir=cache_dir)
+            assert list(Path(cache_dir).rglob('*.pickle'))
+            typs = parse_btf(buf, select_names=self.TYP_NAMES, cache_dir=cache_dir)
+
+        assert self._summary(typs) == self._summary(ref)
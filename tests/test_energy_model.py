@@ -16,11 +16,13 @@
 #
 
 from collections import OrderedDict
+from itertools import product
 from unittest import TestCase
 import os
 import shutil
 import tempfile
 
+import pandas as pd
 import pytest
 
 from devlib.target import KernelVersion
@@ -187,6 +189,46 @@ class TestOptimalPlacement(TestCase):
         self.assert_placement_list_equal(placements, [[total_util, 0, 0, 0],
                                                    [0, total_util, 0, 0]])
 
+    def test_many_tasks(self):
+        tasks = {'task' + str(i): 10 for i in range(30)}
+        placements = em.get_optimal_placements(tasks)
+        self.assert_placement_list_equal(placements, [[150, 150, 0, 0]])
+
+    def test_spread(self):
+        tasks = {'task' + str(i): 10 * (i + 1) for i in range(8)}
+        placements = em.get_optimal_placements(tasks)
+        self.assert_placement_list_equal(placements, [[180, 180, 0, 0]])
+
+    def test_brute_force(self):
+        def brute_force(capacities):
+            candidates = {}
+            for cpus in product(em.cpus, repeat=len(capacities)):
+                util = [0] * len(em.cpus)
+                for cap, cpu in zip(capacities.values(), cpus):
+                    util[cpu] += cap
+                util = tuple(util)
+
+                freqs, overutilized = em._guess_freqs(util, 0)
+                if not overutilized:
+                    power = em.estimate_from_cpu_util(util, freqs=freqs)
+                    candidates[util] = sum(power.values())
+
+            min_power = min(candidates.values())
+            return [u for u, p in candidates.items() if p == min_power]
+
+        for utils in (
+            [1, 1, 1],
+            [50, 150, 250],
+            [100, 100, 100, 100],
+            [10, 120, 380, 390],
+            [200, 200, 10, 10, 60],
+        ):
+            tasks = {f'task{i}': util for i, util in enumerate(utils)}
+            self.assert_placement_list_equal(
+                em.get_optimal_placements(tasks),
+                brute_force(tasks),
+            )
+
     def test_overutilized_single(self):
         with pytest.raises(EnergyModelCapacityError):
             em.get_optimal_placements({'task0': 401})
@@ -350,7 +392,8 @@ class TestGetCpuCapacity(TestCase):
 
 
 class TestEstimateFromTrace(TestCase):
-    def test_estimate_from_trace(self):
+    @staticmethod
+    def _get_trace():
         trace_data = (
             # Set all CPUs at lowest freq
             """
@@ -399,7 +442,10 @@ class TestEstimateFromTrace(TestCase):
                 strict_events=True,
                 parser=TxtTraceParser.from_txt_file,
             )
+        return trace
 
+    def test_estimate_from_trace(self):
+        trace = self._get_trace()
         energy_df = em.estimate_from_trace(trace)
 
         exp_entries = [
@@ -473,6 +519,37 @@ class TestEstimateFromTrace(TestCase):
             assert row.name == pytest.approx(exp_index, abs=1e-4)
             assert row.to_dict() == exp_values
 
+    def test_estimate_from_trace_ref(self):
+        """
+        Check the lookup tables against a row-by-row estimation
+        """
+        trace = self._get_trace()
+        energy_df = em.estimate_from_trace(trace)
+
+        idle = trace.ana.idle.df_cpus_idle().pivot(columns='cpu')['state']
+        freqs = trace.ana.frequency.df_cpus_frequency().pivot(columns='cpu')['frequency']
+        inputs = pd.concat([idle, freqs], axis=1, keys=['idle', 'freq'], sort=True)
+        inputs = inputs.ffill().dropna().astype(int)
+        inputs = inputs.loc[energy_df.index]
+
+        for (_, row), (_, nrg) in zip(inputs.iterrows(), energy_df.iterrows()):
+            cpus_active = row['idle'] == -1
+            deepest = em._deepest_idle_idxs(cpus_active)
+            idle_states = [
+                node.idle_state_by_idx(max(min(i, j), 0))
+                for node, i, j in zip(em.cpu_nodes, deepest, row['idle'])
+            ]
+            expected = em.estimate_from_cpu_util(
+                cpu_utils=cpus_active * em.capacity_scale,
+                idle_states=idle_states,
+                freqs=row['freq'],
+            )
+            expected = {
+                '-'.join(str(c) for c in k): v
+                for k, v in expected.items()
+            }
+            assert nrg.to_dict() == expected
+
 
 class TestSerialization(StorageTestCase):
     """
@@ -0,0 +1,145 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (C) 2026, Arm Limited and contributors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import argparse
+import threading
+import time
+from unittest import TestCase
+
+import pytest
+
+pytest.importorskip('exekall')
+
+import exekall.engine as engine
+import exekall.utils as utils
+
+from lisa.target import Target
+from lisa.exekall_customize import LISAAdaptor
+
+
+class _Target(Target):
+    """
+    :class:`lisa.target.Target` that does not connect to anything.
+    """
+    def __init__(self):
+        # pylint: disable=super-init-not-called
+        pass
+
+
+class _Res1:
+    pass
+
+
+class _Res2:
+    pass
+
+
+class _Final:
+    pass
+
+
+_USAGE = dict(active=0, max=0)
+_USAGE_LOCK = threading.Lock()
+
+
+def _use_target(target):
+    with _USAGE_LOCK:
+        _USAGE['active'] += 1
+        _USAGE['max'] = max(_USAGE['max'], _USAGE['active'])
+
+    time.sleep(0.1)
+
+    with _USAGE_LOCK:
+        _USAGE['active'] -= 1
+
+
+def make_target() -> _Target:
+    return _Target()
+
+
+def use_target1(target: Target) -> _Res1:
+    _use_target(target)
+    return _Res1()
+
+
+def use_target2(target: Target) -> _Res2:
+    _use_target(target)
+    return _Res2()
+
+
+def final1(res: _Res1) -> _Final:
+    return _Final()
+
+
+def final2(res: _Res2) -> _Final:
+    return _Final()
+
+
+class TestLISAAdaptor(TestCase):
+    """
+    Check the behavior of :class:`lisa.exekall_customize.LISAAdaptor` when
+    computing expressions concurrently.
+    """
+
+    @staticmethod
+    def _get_computable_expr_list():
+        op_set = {
+            engine.Operator(callable_)
+            for callable_ in (make_target, use_target1, use_target2, final1, final2)
+        }
+        root_op_set = {
+            op
+            for op in op_set
+            if issubclass(op.value_type, _Final)
+        }
+        class_ctx = engine.ClassContext.from_op_set(op_set)
+        expr_list = class_ctx.build_expr_list(
+            root_op_set,
+            non_produced_handler='raise',
+            cycle_handler='raise',
+        )
+        return engine.ComputableExpression.from_expr_list(expr_list)
+
+    def _get_max_usage(self, exclusive_type_set):
+        _USAGE.update(active=0, max=0)
+        expr_list = self._get_computable_expr_list()
+        assert len(expr_list) == 2
+
+        engine.ComputableExpression.precompute_all(
+            expr_list,
+            jobs=4,
+            exclusive_type_set=exclusive_type_set,
+        )
+        for expr in expr_list:
+            for expr_val in expr.execute():
+                assert isinstance(expr_val.value, _Final)
+
+        return _USAGE['max']
+
+    def test_exclusive_target(self):
+        adaptor = LISAAdaptor(argparse.Namespace())
+        # Same as exekall's main
+        exclusive_type_set = set(utils.flatten_seq(
+            utils.get_subclasses(cls)
+            for cls in adaptor.get_exclusive_type_set()
+        ))
+        assert _Target in exclusive_type_set
+        assert self._get_max_usage(exclusive_type_set) == 1
+
+    def test_non_exclusive_target(self):
+        # Make sure the test above would notice concurrent uses of the target
+        assert self._get_max_usage(set()) == 2
@@ -0,0 +1,122 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (C) 2026, Arm Limited and contributors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import math
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+import lisa.pelt as pelt
+
+
+def _ref_windowed(df, init, scale, window, half_life):
+    """
+    Row-by-row windowed simulator, as a reference implementation.
+    """
+    decay = (1 / 2)**(1 / half_life)
+    alpha = 1 - decay
+    acc = 0
+    signal = init / scale
+    output = signal
+
+    def sim(row):
+        nonlocal acc, signal, output
+        running = row['activations']
+        clock = row['clock']
+        delta = row['delta']
+        windows = row['crossed_windows'].astype('int')
+
+        if windows:
+            first_window_fraction = window - ((clock - delta) % window)
+            first_window_fraction /= window
+
+            acc += running * first_window_fraction
+            signal = alpha * acc + (1 - alpha) * signal
+            for _ in range(windows - 1):
+                signal = alpha * running + (1 - alpha) * signal
+
+            last_window_fraction = (clock % window) / window
+            extrapolated = running * alpha + (1 - alpha) * signal
+            output = signal + last_window_fraction * (extrapolated - signal)
+            signal += alpha * running * last_window_fraction
+            acc = 0
+        else:
+            acc += running * delta / window
+
+        return output * scale
+
+    return df.apply(sim, axis=1)
+
+
+def _ref_windowless(df, init, scale, window, half_life):
+    """
+    Row-by-row windowless simulator, as a reference implementation.
+    """
+    tau = pelt._pelt_tau(half_life, window)
+    signal = init
+
+    def sim(row):
+        nonlocal signal
+        exp_ = math.exp(-row['delta'] / tau)
+        signal = row['activations'] * scale * (1 - exp_) + signal * exp_
+        return signal
+
+    return df.apply(sim, axis=1)
+
+
+class SimulatePELT(TestCase):
+    def _make_df(self, nr_rows, mean_duration):
+        rng = np.random.default_rng(42)
+        clock = np.cumsum(rng.exponential(mean_duration, size=nr_rows)) + 10
+        df = pd.DataFrame(
+            dict(
+                activations=np.tile([1.0, 0.0], nr_rows // 2),
+                clock=clock,
+            ),
+            index=clock,
+        )
+        df['delta'] = df['clock'].diff()
+        df['crossed_windows'] = (df['clock'] // pelt.PELT_WINDOW).diff()
+        return df.dropna()
+
+    def _test_sim(self, sim, ref_sim):
+        kwargs = dict(
+            init=300,
+            scale=pelt.PELT_SCALE,
+            window=pelt.PELT_WINDOW,
+            half_life=pelt.PELT_HALF_LIFE,
+        )
+        for mean_duration in (1e-4, 5e-3, 0.2):
+            df = self._make_df(1000, mean_duration)
+            ref = ref_sim(df, **kwargs).to_numpy()
+            # The results must be bit-identical
+            assert np.array_equal(sim(df, **kwargs), ref)
+
+    def test_windowed(self):
+        self._test_sim(pelt._simulate_windowed_pelt, _ref_windowed)
+
+    def test_windowless(self):
+        self._test_sim(pelt._simulate_windowless_pelt, _ref_windowless)
+
+    def test_step_response(self):
+        t = 0.1
+        activations = pd.Series([1, 0], index=[0, t])
+        simulated = pelt.simulate_pelt(activations, windowless=True)
+        assert math.isclose(simulated.iloc[-1], pelt.pelt_step_response(t))
+
+# vim :set tabstop=4 shiftwidth=4 textwidth=80 expandtab
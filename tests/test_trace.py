@@ -17,18 +17,24 @@
 
 import json
 import os
+import shutil
+import gc
+import multiprocessing
 from unittest import TestCase
 import numpy as np
 import pandas as pd
 import copy
+from unittest import mock
 
 import pytest
 
 from devlib.target import KernelVersion
 
-from lisa.trace import Trace, TxtTraceParser, TaskID, MockTraceParser
-from lisa.datautils import df_squash
+from lisa.trace import Trace, TraceCache, TraceSwapStore, TxtTraceParser, TxtEventParser, TraceDatParser, TaskID, MockTraceParser, MissingTraceEventError, _CacheDataDesc
+from lisa.datautils import df_squash, df_window, df_window_signals, df_filter_task_ids, SignalDesc
+from lisa._benchmark import SyntheticTrace, BenchmarkSuite
 from lisa.platforms.platinfo import PlatformInfo
+from lisa.analysis.functions import _CallGraph
 from .utils import StorageTestCase, ASSET_DIR
 
 
@@ -337,6 +343,43 @@ class TestTrace(TraceTestCase):
         """Test parsing sched_load_avg_task events from EAS1.2"""
         self._test_tasks_dfs('sched_load_avg')
 
+    def test_df_tasks_signal_split(self):
+        trace = self.get_trace('sched_load')
+        ana = trace.ana.load_tracking
+        df = ana.df_tasks_signal('util')
+
+        split = ana.df_tasks_signal_split('util')
+        assert sum(map(len, split.values())) == len(df)
+        for task_id, task_df in split.items():
+            pd.testing.assert_frame_equal(task_df, df_filter_task_ids(df, [task_id]))
+            pd.testing.assert_frame_equal(ana.df_task_signal(task_id, 'util'), task_df)
+
+        task1, task2, task3 = list(split.keys())[:3]
+        tasks = [task1.pid, task2.comm, TaskID(pid=None, comm=task3.comm)]
+        split = ana.df_tasks_signal_split('util', tasks=tasks)
+        assert list(split.keys()) == [task1, task2, TaskID(pid=None, comm=task3.comm)]
+        for task_id, task_df in split.items():
+            pd.testing.assert_frame_equal(task_df, df_filter_task_ids(df, [task_id]))
+
+    def test_required_capacity(self):
+        # The CPU capacities are needed even when testing without platform
+        # info
+        trace = Trace(
+            os.path.join(self.traces_dir, 'sched_load', 'trace.dat'),
+            plat_info=TraceTestCase._get_plat_info(self, 'sched_load'),
+            events=self.events,
+        )
+        capacities = sorted(trace.plat_info['cpu-capacities']['orig'].values())
+        df = trace.ana.load_tracking.df_tasks_signal('required_capacity')
+        expected = [
+            min(
+                (capacity for capacity in capacities if util <= capacity),
+                default=capacities[-1],
+            )
+            for util in trace.ana.load_tracking.df_tasks_signal('util')['util']
+        ]
+        assert df['required_capacity'].tolist() == expected
+
     def df_peripheral_clock_effective_rate(self):
         """
         TestTrace: getPeripheralClockInfo() returns proper effective rate info.
@@ -373,6 +416,78 @@ class TestTrace(TraceTestCase):
         # Proxy check for detecting delta computation changes
         assert df.delta.sum() == pytest.approx(134.568219)
 
+    def test_df_event_columns(self):
+        trace = Trace(
+            self.trace_path,
+            plat_info=self.plat_info,
+            parser=TxtTraceParser.from_txt_file,
+            # Make sure the full dataframes cached by other tests are not used
+            enable_swap=False,
+        )
+        ref = self.trace.df_event('sched_switch')
+
+        for columns in (['next_pid', 'prev_state'], ['__cpu', 'next_comm']):
+            df = trace.df_event('sched_switch', columns=columns)
+            pd.testing.assert_frame_equal(df, ref[sorted(columns)], check_categorical=False)
+
+        # The cached dataframe was widened rather than replaced
+        assert {'next_pid', 'prev_state', '__cpu', 'next_comm'} <= set(trace._raw_df_columns['sched_switch'])
+
+        view = trace.get_view((trace.start + 1, trace.start + 2))
+        ref_view = self.trace.get_view((trace.start + 1, trace.start + 2))
+        pd.testing.assert_frame_equal(
+            view.df_event('sched_wakeup', columns=['pid']),
+            ref_view.df_event('sched_wakeup')[['pid']],
+            check_categorical=False,
+        )
+
+    def test_df_task_states(self):
+        ana = self.trace.ana.tasks
+        timeline = ana._df_tasks_states_timeline()
+        pids = timeline['pid'].unique()
+
+        tasks = dict(ana._df_tasks_states())
+        assert sorted(task.pid for task in tasks) == sorted(pids)
+
+        for pid in pids:
+            # Only look at the PIDs that can be designated unambiguously
+            if len(self.trace.get_task_ids(pid)) > 1:
+                continue
+            ref = timeline[timeline['pid'] == pid]
+            df = ana.df_task_states(pid)
+            assert df.index.equals(ref.index)
+            assert df['curr_state'].equals(ref['curr_state'])
+            assert df['next_state'].iloc[:-1].tolist() == ref['curr_state'].iloc[1:].tolist()
+            assert df.equals(
+                tasks[TaskID(pid=pid, comm=None)].drop(columns=['pid', 'comm'])[df.columns]
+            )
+
+    def test_df_runtimes(self):
+        from lisa.analysis.tasks import TaskState
+
+        trace = self.make_trace("""
+          <idle>-0     [000]   100.000000: sched_wakeup:         comm=task1 pid=1 prio=120 target_cpu=000
+          <idle>-0     [000]   100.000001: sched_switch:         prev_comm=swapper/0 prev_pid=0 prev_prio=120 prev_state=0 next_comm=task1 next_pid=1 next_prio=120
+           task1-1     [000]   100.000002: sched_wakeup:         comm=task1 pid=1 prio=120 target_cpu=000
+           task1-1     [000]   100.000004: sched_switch:         prev_comm=task1 prev_pid=1 prev_prio=120 prev_state=1 next_comm=swapper/0 next_pid=0 next_prio=120
+          <idle>-0     [000]   100.000010: sched_wakeup:         comm=task1 pid=1 prio=120 target_cpu=000
+          <idle>-0     [000]   100.000011: sched_switch:         prev_comm=swapper/0 prev_pid=0 prev_prio=120 prev_state=0 next_comm=task1 next_pid=1 next_prio=120
+           task1-1     [000]   100.000013: sched_switch:         prev_comm=task1 prev_pid=1 prev_prio=120 prev_state=0 next_comm=swapper/0 next_pid=0 next_prio=120
+          <idle>-0     [000]   100.000017: sched_switch:         prev_comm=swapper/0 prev_pid=0 prev_prio=120 prev_state=0 next_comm=task1 next_pid=1 next_prio=120
+           task1-1     [000]   100.000018: sched_switch:         prev_comm=task1 prev_pid=1 prev_prio=120 prev_state=1 next_comm=swapper/0 next_pid=0 next_prio=120
+          <idle>-0     [000]   100.000020: sched_wakeup:         comm=task1 pid=1 prio=120 target_cpu=000
+        """)
+        df = trace.ana.latency.df_runtimes(1)
+
+        assert df['curr_state'].tolist() == [
+            TaskState.TASK_INTERRUPTIBLE,
+            TaskState.TASK_RUNNING,
+            TaskState.TASK_INTERRUPTIBLE,
+        ]
+        # The spurious wakeup is accounted as running time, and the
+        # preemption does not reset the activation
+        assert df['running_time'].tolist() == pytest.approx([3e-6, 2e-6, 3e-6])
+
 
 class TestTraceView(TraceTestCase):
 
@@ -469,6 +584,207 @@ class TestTraceNoPlatform(TestTrace):
     def _get_plat_info(self, trace_name=None):
         return None
 
+class TestFrequencyAnalysis(StorageTestCase):
+    """
+    Check :meth:`lisa.analysis.frequency.FrequencyAnalysis.df_cpus_frequency`.
+    """
+
+    TRACE = """\
+         shutils-1703  [001]    76.538557: print:                tracing_mark_write: cpu_frequency_devlib:        state=950000 cpu_id=0
+         shutils-1703  [001]    76.538652: print:                tracing_mark_write: cpu_frequency_devlib:        state=1200000 cpu_id=1
+          <idle>-0     [000]    76.600000: cpu_frequency:        state=450000 cpu_id=0
+         sugov:0-1842  [001]    76.700000: cpu_frequency:        state=800000 cpu_id=1
+         sugov:0-1842  [000]    76.800000: cpu_frequency:        state=600000 cpu_id=0
+"""
+
+    def _make_trace(self):
+        path = os.path.join(self.res_dir, 'trace.txt')
+        with open(path, 'w') as f:
+            f.write(self.TRACE)
+
+        return Trace(
+            path,
+            parser=TxtTraceParser.from_txt_file,
+            normalize_time=False,
+            enable_swap=False,
+        )
+
+    def _test_df_cpus_frequency(self, signals_init, expected):
+        df = self._make_trace().ana.frequency.df_cpus_frequency(signals_init=signals_init)
+
+        # The header columns of the events are preserved
+        assert df.columns.tolist() == ['__comm', '__pid', '__cpu', 'frequency', 'cpu']
+        assert df['__pid'].dtype == 'uint32'
+        assert df['__cpu'].dtype == 'uint32'
+
+        expected = pd.DataFrame(
+            expected,
+            columns=['Time', '__comm', '__pid', '__cpu', 'frequency', 'cpu'],
+        ).set_index('Time')
+        pd.testing.assert_frame_equal(
+            df.astype({'__comm': str}),
+            expected,
+            check_dtype=False,
+        )
+
+    def test_df_cpus_frequency(self):
+        self._test_df_cpus_frequency(
+            signals_init=True,
+            expected=[
+                (76.538557, 'shutils', 1703, 1, 950000, 0),
+                (76.538652, 'shutils', 1703, 1, 1200000, 1),
+                (76.6, '<idle>', 0, 0, 450000, 0),
+                (76.7, 'sugov:0', 1842, 1, 800000, 1),
+                (76.8, 'sugov:0', 1842, 0, 600000, 0),
+            ],
+        )
+
+    def test_df_cpus_frequency_no_init(self):
+        self._test_df_cpus_frequency(
+            signals_init=False,
+            expected=[
+                (76.6, '<idle>', 0, 0, 450000, 0),
+                (76.7, 'sugov:0', 1842, 1, 800000, 1),
+                (76.8, 'sugov:0', 1842, 0, 600000, 0),
+            ],
+        )
+
+
+class TestCallGraph(TestCase):
+    """
+    Check :meth:`lisa.analysis.functions._CallGraph.from_df` on hand-written
+    function entry and exit events.
+    """
+
+    EVENT = _CallGraph._EVENT
+
+    def _make_df(self, rows, columns=()):
+        return pd.DataFrame.from_records(
+            rows,
+            columns=['Time', '__cpu', 'event', 'func_name', 'tags', 'capacity', *columns],
+            index='Time',
+        ).sort_index()
+
+    @classmethod
+    def _tree(cls, node):
+        """
+        Summary of a call tree made of the nodes' attributes and metrics.
+        """
+        def metric(key):
+            val = node[key]
+            return None if np.isnan(val) else val
+
+        return (
+            node.func_name,
+            node.cpu,
+            node.cpu_capacity,
+            node.entry_time,
+            node.exit_time,
+            node.valid_metrics,
+            node.tags,
+            metric('self_time'),
+            metric('cum_time'),
+            [cls._tree(child) for child in node.children],
+        )
+
+    def test_from_df(self):
+        EVENT = self.EVENT
+        df = self._make_df([
+            (0, 0, EVENT.SET_CAPACITY, None, None, 512),
+            (1, 0, EVENT.ENTRY, 'a', None, None),
+            (2, 0, EVENT.ENTRY, 'b', None, None),
+            (3, 0, EVENT.SET_TAG, None, {'k': 'x'}, None),
+            (4, 0, EVENT.EXIT, 'b', None, None),
+            (5, 0, EVENT.SET_CAPACITY, None, None, 1024),
+            # Preempts "a" without being accounted as one of its children
+            (6, 0, EVENT.ENTRY, 'irq', None, None),
+            (7, 0, EVENT.EXIT, 'irq', None, None),
+            (8, 0, EVENT.EXIT, 'a', None, None),
+            # Missing entry
+            (9, 0, EVENT.EXIT, 'z', None, None),
+            # Mismatched exit
+            (10, 0, EVENT.ENTRY, 'c', None, None),
+            (11, 0, EVENT.EXIT, 'd', None, None),
+            # Missing exits
+            (12, 0, EVENT.ENTRY, 'e', None, None),
+            (13, 0, EVENT.ENTRY, 'f', None, None),
+            (14, 0, EVENT.EXIT, 'f', None, None),
+            (15, 0, EVENT.ENTRY, 'g', None, None),
+
+            # Entry before the capacity is known
+            (1.5, 1, EVENT.ENTRY, 'h', None, None),
+            (2.5, 1, EVENT.SET_CAPACITY, None, None, 256),
+            (3.5, 1, EVENT.ENTRY, 'i', None, None),
+            (4.5, 1, EVENT.SET_TAG, None, {'k': 'y'}, None),
+            (5.5, 1, EVENT.EXIT, 'i', None, None),
+            (6.5, 1, EVENT.EXIT, 'h', None, None),
+        ])
+        graph = _CallGraph.from_df(df, thread_root_functions=['irq'], ts_cols=None)
+
+        tag_x = {'k': frozenset({'x'})}
+        tag_y = {'k': frozenset({'y'})}
+        assert sorted(graph.cpu_nodes) == [0, 1]
+        assert self._tree(graph.cpu_nodes[0]) == (
+            None, None, None, 1, 15, False, tag_x, None, None, [
+                ('a', 0, 512, 1, 8, True, tag_x, 4, 6, [
+                    ('b', 0, 512, 2, 4, True, tag_x, 2, 2, []),
+                ]),
+                ('c', 0, 1024, 10, 11, False, {}, None, None, []),
+                ('e', 0, 1024, 12, 15, False, {}, None, None, [
+                    ('f', 0, 1024, 13, 14, True, {}, 1, 1, []),
+                    ('g', 0, 1024, 15, 15, False, {}, None, None, []),
+                ]),
+            ]
+        )
+        assert self._tree(graph.cpu_nodes[1]) == (
+            None, None, None, 1.5, 6.5, True, tag_y, 0, 5, [
+                ('h', 1, 1024, 1.5, 6.5, True, tag_y, 3, 5, [
+                    ('i', 1, 256, 3.5, 5.5, True, tag_y, 2, 2, []),
+                ]),
+            ]
+        )
+
+        a = graph.cpu_nodes[0].children[0]
+        irq, = a._preempting_children
+        assert irq.func_name == 'irq'
+        assert irq.parent is a
+        assert irq.logical_thread != a.logical_thread
+        assert (irq.entry_time, irq.exit_time) == (6, 7)
+
+        assert [node.func_name for node in graph.all_nodes] == [
+            'a', 'b', 'c', 'e', 'f', 'g', 'h', 'i',
+        ]
+
+    def test_from_df_ts_cols(self):
+        EVENT = self.EVENT
+        df = self._make_df(
+            [
+                (1, 0, EVENT.ENTRY, 'a', None, None, None, None),
+                (2, 0, EVENT.ENTRY, 'b', None, None, None, None),
+                (3, 0, EVENT.EXIT, 'b', None, None, 1.5e9, 2.5e9),
+                (4, 0, EVENT.EXIT, 'a', None, None, 0.5e9, 3.5e9),
+            ],
+            columns=['calltime', 'rettime'],
+        )
+        graph = _CallGraph.from_df(df)
+
+        assert self._tree(graph.cpu_nodes[0]) == (
+            None, None, None, 0.5, 3.5, True, {}, 0, 3, [
+                ('a', 0, 1024, 0.5, 3.5, True, {}, 2, 3, [
+                    ('b', 0, 1024, 1.5, 2.5, True, {}, 1, 1, []),
+                ]),
+            ]
+        )
+
+    def test_from_df_unknown_event(self):
+        df = self._make_df([
+            (1, 0, self.EVENT.ENTRY, 'a', None, None),
+            (2, 0, 42, None, None, None),
+        ])
+        with pytest.raises(ValueError):
+            _CallGraph.from_df(df)
+
+
 class TestMockTraceParser(TestCase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -494,4 +810,776 @@ class TestMockTraceParser(TestCase):
         assert self.trace.start == 0
         assert self.trace.end == 42
 
+
+class TestTxtTraceParserJobs(TestCase):
+    """
+    Check that parsing the lines in parallel gives the same result as parsing
+    them sequentially.
+    """
+
+    class _TxtTraceParser(TxtTraceParser):
+        # Very small chunks so that duplicated timestamps straddle chunk
+        # boundaries
+        PARALLEL_CHUNK_SIZE = 3
+
+    events = ['sched_wakeup', 'foo_event']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        lines = []
+        for i in range(50):
+            time = 1 + (i // 7) * 1e-6
+            if i % 3:
+                lines.append(f'  sh-1 [001] {time:.6f}: sched_wakeup: comm=sh pid={i} prio=120 target_cpu=1')
+            else:
+                lines.append(f'  sh-1 [001] {time:.6f}: foo_event: a={i} b=x')
+        self.txt = '\n'.join(lines)
+
+    def _test_parse(self, events):
+        seq = TxtTraceParser.from_string(self.txt, events=events)
+        par = self._TxtTraceParser.from_string(self.txt, events=events, jobs=3)
+
+        assert seq.get_metadata('time-range') == par.get_metadata('time-range')
+        assert seq.get_metadata('available-events') == par.get_metadata('available-events')
+        for event in events:
+            pd.testing.assert_frame_equal(seq.parse_event(event), par.parse_event(event))
+
+    def test_parse_one_event(self):
+        self._test_parse(['sched_wakeup'])
+
+    def test_parse_events(self):
+        self._test_parse(self.events)
+
+
+class TestTxtTraceParserCompact(TestCase):
+    """
+    Check that the columns built by chunks have compact dtypes and do not
+    depend on the size of the chunks.
+    """
+
+    class _TxtTraceParser(TxtTraceParser):
+        # Very small chunks so that the categories grow across chunks
+        COMPACT_CHUNK_SIZE = 4
+
+    events = ['sched_switch', 'foo_event']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        lines = []
+        for i in range(50):
+            time = 1 + i * 1e-6
+            if i % 3:
+                lines.append(f'  task{i % 7}-{i} [001] {time:.6f}: sched_switch: prev_comm=task{i % 7} prev_pid={i} prev_prio=120 prev_state=1 next_comm=task{i % 5} next_pid={i + 1} next_prio=120')
+            else:
+                lines.append(f'  sh-1 [001] {time:.6f}: foo_event: a={i} b=x{i % 4}')
+        self.txt = '\n'.join(lines)
+
+    def test_dtypes(self):
+        parser = TxtTraceParser.from_string(self.txt, events=self.events)
+        df = parser.parse_event('sched_switch')
+        for col in ('__comm', 'prev_comm', 'next_comm'):
+            assert df[col].dtype.name == 'category'
+        assert df['prev_pid'].dtype.name == 'uint32'
+        assert df['prev_prio'].dtype.name == 'int16'
+        assert list(df['next_comm'].cat.categories) == sorted(
+            f'task{i}' for i in range(5)
+        )
+
+        df = parser.parse_event('foo_event')
+        assert df['b'].dtype.name == 'category'
+
+    def test_chunks(self):
+        ref = TxtTraceParser.from_string(self.txt, events=self.events)
+        parser = self._TxtTraceParser.from_string(self.txt, events=self.events)
+
+        assert ref.get_metadata('available-events') == parser.get_metadata('available-events')
+        for event in self.events:
+            pd.testing.assert_frame_equal(ref.parse_event(event), parser.parse_event(event))
+
+
+class TestTxtEventParserHeader(TestCase):
+    """
+    Check the header regex of :class:`lisa.trace.TxtEventParser` on lines
+    that used to be parsed with a backtracking regex.
+    """
+
+    def test_header(self):
+        parser = TxtEventParser('foo_event', fields={'a': 'string'})
+        for line, expected in (
+            (
+                '  kworker/u16:6-262   [003]   177.417147: foo_event: a=1',
+                ('kworker/u16:6', '262', '003'),
+            ),
+            (
+                'CPU:2 [LOST EVENTS] my-task-name-42 [002] 1.000001: foo_event: a=1',
+                ('my-task-name', '42', '002'),
+            ),
+            (
+                ' thread pool-1234 [000] 1.000001: foo_event:  a=hello world',
+                ('pool', '1234', '000'),
+            ),
+        ):
+            match = parser.regex.search(line)
+            assert match.group('__comm', '__pid', '__cpu') == expected
+
+    def test_no_match(self):
+        parser = TxtEventParser('foo_event', fields={'a': 'string'})
+        for line in (
+            'task-1 [000] 1.000001: foo_event: a=1',
+            '  task-x [000] 1.000001: foo_event: a=1',
+            '  task-1 [000] 1.000001: bar_event: a=1',
+        ):
+            assert parser.regex.search(line) is None
+
+
+class TestTraceDatParser(TestCase):
+    """
+    Check that the binary parser gives the same result as the text parser.
+    """
+
+    path = os.path.join(ASSET_DIR, 'sched_load', 'trace.dat')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dat = TraceDatParser(self.path)
+        self.events = self.dat.get_metadata('available-events')
+        self.txt = TxtTraceParser.from_dat(self.path, events=self.events)
+
+    def test_metadata(self):
+        assert self.dat.get_metadata('time-range') == self.txt.get_metadata('time-range')
+        assert self.dat.get_metadata('cpus-count') == 6
+        assert set(self.events) >= {'sched_switch', 'cpu_idle', 'print'}
+
+    def test_parse_event(self):
+        for event in self.events:
+            txt_df = self.txt.parse_event(event)
+            dat_df = self.dat.parse_event(event)[txt_df.columns]
+            dat_df.index.name = txt_df.index.name
+
+            # The text output cannot represent comms containing spaces
+            comm = ~dat_df['__comm'].str.contains(' ')
+            assert (
+                dat_df['__comm'][comm].astype(object) ==
+                txt_df['__comm'][comm].astype(object)
+            ).all()
+
+            # The binary format gives the exact width of the fields, where the
+            # text parser has to infer it for the events it does not know.
+            pd.testing.assert_frame_equal(
+                dat_df.drop(columns='__comm'),
+                txt_df.drop(columns='__comm'),
+                check_dtype=False,
+            )
+
+    def test_events_columns(self):
+        event = 'sched_switch'
+        columns = ['__cpu', 'next_pid', 'prev_state']
+        events_columns = {event: columns}
+        dat = TraceDatParser(self.path, events_columns=events_columns)
+        txt = TxtTraceParser.from_dat(self.path, events=[event], events_columns=events_columns)
+
+        for parser, ref in ((dat, self.dat), (txt, self.txt)):
+            df = parser.parse_event(event)
+            assert sorted(df.columns) == columns
+            pd.testing.assert_frame_equal(df, ref.parse_event(event)[df.columns])
+
+    def test_trace(self):
+        trace = Trace(self.path, parser=TraceDatParser, normalize_time=False)
+        df = trace.df_event('userspace@cpu_frequency_devlib')
+        assert not df.empty
+        assert trace.start == self.txt.get_metadata('time-range')[0]
+
+
+class TestTraceCacheAppend(StorageTestCase):
+    """
+    Check that the swap of a trace that grows is completed by only parsing the
+    data appended to the trace.
+    """
+
+    events = ['sched_switch', 'sched_wakeup']
+
+    def _make_trace(self, path, **kwargs):
+        return Trace(
+            path,
+            events=self.events,
+            parser=TxtTraceParser.from_txt_file,
+            # The default limit is based on the trace size, which is tiny at
+            # the beginning
+            max_swap_size=1e9,
+            **kwargs,
+        )
+
+    def _test_append(self, normalize_time):
+        src = os.path.join(ASSET_DIR, 'trace.txt')
+        path = os.path.join(self.res_dir, 'trace.txt')
+        with open(src, 'rb') as f:
+            lines = f.readlines()
+
+        # The first part does not contain any sched_wakeup event, and the
+        # second part starts with a duplicated timestamp
+        with open(path, 'wb') as f:
+            f.writelines(lines[:3])
+        self._make_trace(path, normalize_time=normalize_time).df_event('sched_switch')
+
+        def load_raw_df(trace, events):
+            if events:
+                raise AssertionError(f'The whole trace was parsed for: {events}')
+            return {}
+
+        for start, end in ((3, 1500), (1500, None)):
+            with open(path, 'ab') as f:
+                f.writelines(lines[start:end])
+
+            with mock.patch.object(Trace, '_load_raw_df', load_raw_df):
+                trace = self._make_trace(path, normalize_time=normalize_time)
+                assert trace._cache.appended_trace is not None
+                dfs = {
+                    event: trace.df_event(event)
+                    for event in self.events
+                }
+
+        ref = Trace(
+            src,
+            events=self.events,
+            parser=TxtTraceParser.from_txt_file,
+            normalize_time=normalize_time,
+            enable_swap=False,
+        )
+        assert trace.time_range == ref.time_range
+        for event, df in dfs.items():
+            pd.testing.assert_frame_equal(
+                df,
+                ref.df_event(event),
+            )
+
+    def test_append(self):
+        self._test_append(normalize_time=False)
+
+    def test_append_normalize_time(self):
+        self._test_append(normalize_time=True)
+
+    def test_modified(self):
+        src = os.path.join(ASSET_DIR, 'trace.txt')
+        path = os.path.join(self.res_dir, 'trace.txt')
+        with open(src, 'rb') as f:
+            lines = f.readlines()
+
+        with open(path, 'wb') as f:
+            f.writelines(lines[:1500])
+        self._make_trace(path).df_event('sched_switch')
+
+        # Not an append: the beginning of the file changed
+        with open(path, 'wb') as f:
+            f.writelines(lines[1:])
+        trace = self._make_trace(path)
+        assert trace._cache.appended_trace is None
+        assert len(trace.df_event('sched_switch')) > 1000
+
+    def test_fingerprint(self):
+        src = os.path.join(ASSET_DIR, 'trace.txt')
+        path = os.path.join(self.res_dir, 'trace.txt')
+        shutil.copy(src, path)
+        self._make_trace(path).df_event('sched_switch')
+
+        checksums = TraceCache._trace_checksums
+        def no_checksums(*args, **kwargs):
+            raise AssertionError('The trace was hashed entirely')
+
+        # Unchanged trace: the fingerprint is enough
+        with mock.patch.object(TraceCache, '_trace_checksums', no_checksums):
+            trace = self._make_trace(path)
+            assert trace._cache._swap_content
+            md5 = trace._cache.trace_md5
+
+        # Modified in place with the same size and modification time
+        stat = os.stat(path)
+        with open(path, 'r+b') as f:
+            f.seek(stat.st_size // 2)
+            f.write(b'#')
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        with mock.patch.object(TraceCache, '_trace_checksums', wraps=checksums) as m:
+            trace = self._make_trace(path)
+            assert m.called
+            assert trace._cache.trace_md5 != md5
+
+
+class TestTraceIterWindows(TestCase):
+    """
+    Check that :meth:`lisa.trace.Trace.iter_windows` gives the same
+    dataframes as windowed :meth:`lisa.trace.Trace.df_event`.
+    """
+
+    events = ['sched_switch', 'sched_wakeup', 'cpu_frequency']
+
+    def _make_trace(self, parser, **kwargs):
+        return Trace(
+            os.path.join(ASSET_DIR, 'trace.txt'),
+            parser=parser,
+            enable_swap=False,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _normalize(df):
+        # A window only knows about the categories found in the chunks it was
+        # built from, where the reference inherits the categories of the whole
+        # trace. The categories must still be sorted the same way.
+        for col, dtype in df.dtypes.items():
+            if dtype.name == 'category':
+                assert dtype.categories.is_monotonic_increasing
+
+        return df.apply(
+            lambda series: (
+                series.cat.remove_unused_categories()
+                if series.dtype.name == 'category' else
+                series
+            )
+        )
+
+    def _test_windows(self, trace, windows_iter):
+        windows = list(windows_iter)
+        assert len(windows) > 1
+
+        for window, df_map in windows:
+            for event in self.events:
+                try:
+                    ref = trace.df_event(event, window=window)
+                except MissingTraceEventError:
+                    assert event not in df_map
+                else:
+                    pd.testing.assert_frame_equal(
+                        self._normalize(df_map[event]),
+                        self._normalize(ref),
+                    )
+
+    def _test_chunks(self, normalize_time):
+        trace = self._make_trace(TxtTraceParser.from_txt_file, normalize_time=normalize_time)
+        assert trace._parser_supports_chunks
+
+        def load_raw_df(trace, events):
+            raise AssertionError(f'The whole trace was parsed for: {events}')
+
+        with mock.patch.object(Trace, '_load_raw_df', load_raw_df):
+            windows = list(trace.iter_windows(self.events, window_size=1, overlap=0.5, chunk_size=10000))
+
+        self._test_windows(trace, windows)
+
+    def test_chunks(self):
+        self._test_chunks(normalize_time=False)
+
+    def test_chunks_normalize_time(self):
+        self._test_chunks(normalize_time=True)
+
+    def test_not_row_wise(self):
+        # The sanitization of "print" looks at the first row of the
+        # dataframe, so it cannot be applied on each chunk separately.
+        trace = self._make_trace(TxtTraceParser.from_txt_file)
+        assert trace._parser_supports_chunks
+
+        def iter_windows_chunks(*args, **kwargs):
+            raise AssertionError('print events were sanitized chunk by chunk')
+
+        with mock.patch.object(Trace, '_iter_windows_chunks', iter_windows_chunks):
+            windows = list(trace.iter_windows(['print'], window_size=1, chunk_size=10000))
+
+        assert windows
+        for window, df_map in windows:
+            if 'print' in df_map:
+                pd.testing.assert_frame_equal(
+                    df_map['print'],
+                    trace.df_event('print', window=window),
+                )
+
+    def test_fallback(self):
+        # Hide the parameters of the parser, so that the trace cannot be
+        # parsed in chunks
+        def parser(path, **kwargs):
+            return TxtTraceParser.from_txt_file(path, **kwargs)
+
+        trace = self._make_trace(parser)
+        assert not trace._parser_supports_chunks
+        self._test_windows(trace, trace.iter_windows(self.events, window_size=1))
+
+
+class TestTraceCacheSwapFormat(StorageTestCase):
+    """
+    Check the dataframe swap formats of :class:`lisa.trace.TraceCache`.
+    """
+
+    def test_arrow_data(self):
+        path = os.path.join(self.res_dir, 'data.arrow')
+        df = pd.DataFrame(
+            dict(
+                foo=[1, 2, 3],
+                bar=['a', 'b', 'a'],
+            ),
+            index=pd.Index([0.1, 0.2, 0.3], name='Time'),
+        )
+        df.attrs['name'] = 'foo'
+
+        TraceCache._write_data('arrow', df, path)
+        reloaded = TraceCache._load_data('arrow', path)
+        pd.testing.assert_frame_equal(df, reloaded)
+        assert reloaded.attrs == df.attrs
+        # The data are memory mapped rather than copied
+        assert not reloaded['foo'].to_numpy().flags.writeable
+
+        series = df['foo']
+        TraceCache._write_data('arrow', series, path)
+        reloaded = TraceCache._load_data('arrow', path)
+        pd.testing.assert_series_equal(series, reloaded)
+
+    def test_arrow_trace(self):
+        trace_path = os.path.join(ASSET_DIR, 'trace.txt')
+        swap_dir = os.path.join(self.res_dir, 'swap')
+        os.makedirs(swap_dir)
+
+        def make_trace():
+            return Trace(
+                trace_path,
+                parser=TxtTraceParser.from_txt_file,
+                swap_dir=swap_dir,
+                swap_format='arrow',
+                max_swap_size=1e9,
+            )
+
+        ref = make_trace().df_event('sched_switch', namespaces=[])
+        assert any(
+            filename.endswith('.arrow')
+            for filename in os.listdir(swap_dir)
+        )
+
+        def load_raw_df(trace, events):
+            raise AssertionError(f'The trace was parsed for: {events}')
+
+        with mock.patch.object(Trace, '_load_raw_df', load_raw_df):
+            df = make_trace().df_event('sched_switch', namespaces=[])
+
+        pd.testing.assert_frame_equal(df, ref)
+
+    def test_invalid_format(self):
+        with pytest.raises(ValueError):
+            TraceCache(dataframe_swap_format='foo')
+
+
+class TestTraceCacheFetchWindow(StorageTestCase):
+    """
+    Check that windows of dataframes can be loaded from the parquet swap
+    without loading the whole dataframe.
+    """
+
+    def test_parquet_data(self):
+        path = os.path.join(self.res_dir, 'data.parquet')
+        nr_rows = 1000
+        df = pd.DataFrame(
+            dict(
+                cpu=[i % 3 if i < 500 else i % 2 for i in range(nr_rows)],
+                comm=pd.Categorical([f'task{i % 5}' for i in range(nr_rows)]),
+                value=range(nr_rows),
+            ),
+            index=pd.Index([i * 0.01 for i in range(nr_rows)], name='Time'),
+        )
+        df.attrs['name'] = 'foo'
+
+        with mock.patch.object(TraceCache, 'PARQUET_ROW_GROUP_SIZE', 64):
+            TraceCache._write_data('parquet', df, path)
+
+        signals = [SignalDesc('foo', ['cpu']), SignalDesc('foo', ['comm'])]
+        for window in ((-2, -1), (0, 0), (1.005, 1.2), (6, 6.5), (9.99, 12), (11, 12), (None, 2)):
+            reduced = TraceCache._data_window_from_parquet(
+                path,
+                window=window,
+                signals=[signal.fields for signal in signals],
+            )
+            assert len(reduced) < nr_rows
+            assert reduced.attrs == df.attrs
+            pd.testing.assert_frame_equal(
+                df_window(reduced, window, method='pre'),
+                df_window(df, window, method='pre'),
+            )
+            if window[0] is not None:
+                pd.testing.assert_frame_equal(
+                    df_window_signals(reduced, window, signals),
+                    df_window_signals(df, window, signals),
+                )
+
+    def test_trace(self):
+        trace_path = os.path.join(ASSET_DIR, 'trace.txt')
+        swap_dir = os.path.join(self.res_dir, 'swap')
+        os.makedirs(swap_dir)
+        events = ['sched_switch', 'sched_wakeup']
+
+        ref = Trace(trace_path, parser=TxtTraceParser.from_txt_file, events=events)
+        trace = Trace(
+            trace_path,
+            parser=TxtTraceParser.from_txt_file,
+            events=events,
+            swap_dir=swap_dir,
+            max_swap_size=1e9,
+            # Evict all the dataframes to the swap
+            max_mem_size=1,
+        )
+        for event in events:
+            trace.df_event(event)
+
+        def load_cache_raw_df(trace, event_checker, *args, **kwargs):
+            raise AssertionError(f'The whole dataframe was loaded: {event_checker}')
+
+        start, end = ref.window
+        with mock.patch.object(Trace, '_load_cache_raw_df', load_cache_raw_df):
+            for event in events:
+                for window in ((start + 1, start + 1.5), (end - 0.1, end)):
+                    for signals_init in (True, False):
+                        df = trace.df_event(event, window=window, signals_init=signals_init)
+                        pd.testing.assert_frame_equal(
+                            df,
+                            ref.df_event(event, window=window, signals_init=signals_init),
+                            check_like=True,
+                        )
+
+                df = trace[start + 1:start + 1.5].df_event(event)
+                pd.testing.assert_frame_equal(
+                    df,
+                    ref[start + 1:start + 1.5].df_event(event),
+                    check_like=True,
+                )
+
+
+def _shared_swap_worker(path):
+    parsed = []
+    load_raw_df = Trace._load_raw_df
+
+    def _load_raw_df(self, events):
+        parsed.extend(events)
+        return load_raw_df(self, events)
+
+    with mock.patch.object(Trace, '_load_raw_df', _load_raw_df):
+        trace = Trace(
+            path,
+            parser=TxtTraceParser.from_txt_file,
+            shared_swap=True,
+            max_swap_size=1e9,
+        )
+        df = trace.df_event('sched_switch', namespaces=[])
+
+    return (len(df), parsed)
+
+
+class TestTraceCacheShared(StorageTestCase):
+    """
+    Check that processes sharing the swap of a trace reuse each other's
+    results.
+    """
+
+    def _copy_trace(self):
+        path = os.path.join(self.res_dir, 'trace.txt')
+        shutil.copy(os.path.join(ASSET_DIR, 'trace.txt'), path)
+        return path
+
+    def test_parse_once(self):
+        path = self._copy_trace()
+        with multiprocessing.get_context('fork').Pool(4) as pool:
+            res = pool.map(_shared_swap_worker, [path] * 8)
+
+        lengths, parsed = zip(*res)
+        assert len(set(lengths)) == 1
+        assert sum(events.count('sched_switch') for events in parsed) == 1
+
+    def test_fetch_other_cache(self):
+        swap_dir = os.path.join(self.res_dir, 'swap')
+        os.makedirs(swap_dir)
+
+        def make_cache():
+            return TraceCache.from_swap_dir(swap_dir, shared=True)
+
+        cache1 = make_cache()
+        cache2 = make_cache()
+
+        cache_desc = _CacheDataDesc(spec=dict(foo=1), fmt='parquet')
+        df = pd.DataFrame(dict(foo=[1, 2, 3]))
+        with pytest.raises(KeyError):
+            cache2.fetch(cache_desc)
+
+        with cache1.computation_lock(cache_desc):
+            cache1.insert(cache_desc, df, write_swap=True)
+
+        pd.testing.assert_frame_equal(cache2.fetch(cache_desc), df)
+
+    def test_remove_stale_locks(self):
+        swap_dir = os.path.join(self.res_dir, 'swap')
+        os.makedirs(swap_dir)
+        cache1 = TraceCache.from_swap_dir(swap_dir, shared=True)
+        cache2 = TraceCache.from_swap_dir(swap_dir, shared=True)
+
+        def lock_path(cache_desc):
+            digest = cache_desc.normal_form.digest
+            return os.path.join(swap_dir, f'{digest}.lock')
+
+        inserted, aborted, computing = (
+            _CacheDataDesc(spec=dict(foo=i), fmt='parquet')
+            for i in range(3)
+        )
+        df = pd.DataFrame(dict(foo=[1, 2, 3]))
+        with cache1.computation_lock(inserted):
+            cache1.insert(inserted, df, write_swap=True)
+        with cache1.computation_lock(aborted):
+            pass
+
+        with cache2.computation_lock(computing):
+            with cache1._swap_lock():
+                cache1._scrub_swap()
+
+            assert os.path.exists(lock_path(inserted))
+            assert not os.path.exists(lock_path(aborted))
+            assert os.path.exists(lock_path(computing))
+            assert os.path.exists(os.path.join(swap_dir, TraceCache.SWAP_LOCK_FILENAME))
+
+        pd.testing.assert_frame_equal(cache2.fetch(inserted), df)
+        with cache1.computation_lock(aborted):
+            assert os.path.exists(lock_path(aborted))
+
+
+class TestTraceSwapStore(StorageTestCase):
+    """
+    Check that copies of the same trace share their swap area in a
+    :class:`lisa.trace.TraceSwapStore`.
+    """
+
+    def _copy_trace(self, name):
+        path = os.path.join(self.res_dir, name, 'trace.txt')
+        os.makedirs(os.path.dirname(path))
+        shutil.copy(os.path.join(ASSET_DIR, 'trace.txt'), path)
+        return path
+
+    def _make_trace(self, path, store):
+        return Trace(path, parser=TxtTraceParser.from_txt_file, swap_store=store)
+
+    def _swap_dirs(self, store):
+        return os.listdir(os.path.join(store.path, store._SWAP_DIR))
+
+    def test_copies(self):
+        store = TraceSwapStore(os.path.join(self.res_dir, 'store'))
+        path1 = self._copy_trace('1')
+        path2 = self._copy_trace('2')
+
+        df = self._make_trace(path1, store).df_event('sched_switch')
+
+        load_raw_df = Trace._load_raw_df
+        def check_load_raw_df(self, events, **kwargs):
+            assert 'sched_switch' not in events
+            return load_raw_df(self, events, **kwargs)
+
+        trace = self._make_trace(path2, store)
+        with mock.patch.object(Trace, '_load_raw_df', check_load_raw_df):
+            pd.testing.assert_frame_equal(trace.df_event('sched_switch'), df)
+
+        assert len(self._swap_dirs(store)) == 1
+
+    def test_gc(self):
+        store = TraceSwapStore(os.path.join(self.res_dir, 'store'))
+        path1 = self._copy_trace('1')
+        path2 = self._copy_trace('2')
+
+        for path in (path1, path2):
+            self._make_trace(path, store).df_event('sched_switch')
+        gc.collect()
+
+        # One copy remains
+        os.unlink(path1)
+        store.gc()
+        assert len(self._swap_dirs(store)) == 1
+
+        # Computation lock without any matching swap entry
+        swap_dir, = self._swap_dirs(store)
+        swap_dir = os.path.join(store.path, store._SWAP_DIR, swap_dir)
+        stale_lock = os.path.join(swap_dir, f'{"0" * 64}.lock')
+        open(stale_lock, 'w').close()
+        store.gc()
+        assert not os.path.exists(stale_lock)
+        assert os.path.exists(os.path.join(swap_dir, store._IN_USE_FILENAME))
+        assert os.path.exists(os.path.join(swap_dir, TraceCache.SWAP_LOCK_FILENAME))
+
+        # No copy remains
+        os.unlink(path2)
+        store.gc()
+        assert not self._swap_dirs(store)
+
+    def test_gc_interval(self):
+        store = TraceSwapStore(os.path.join(self.res_dir, 'store'))
+        path = self._copy_trace('1')
+
+        with mock.patch.object(TraceSwapStore, 'gc', wraps=store.gc) as store_gc:
+            self._make_trace(path, store)
+            self._make_trace(path, store)
+            assert store_gc.call_count == 1
+
+            # Make the last garbage collection look old enough
+            stamp_path = os.path.join(store.path, store._GC_STAMP_FILENAME)
+            last = os.stat(stamp_path).st_mtime - store.GC_INTERVAL
+            os.utime(stamp_path, (last, last))
+            self._make_trace(path, store)
+            assert store_gc.call_count == 2
+
+    def test_lru(self):
+        store = TraceSwapStore(os.path.join(self.res_dir, 'store'), max_size=0)
+        path = self._copy_trace('1')
+
+        trace = self._make_trace(path, store)
+        trace.df_event('sched_switch')
+
+        # In use, so not evicted
+        store.gc()
+        assert len(self._swap_dirs(store)) == 1
+
+        del trace
+        gc.collect()
+        store.gc()
+        assert not self._swap_dirs(store)
+
+
+class TestSyntheticTrace(StorageTestCase):
+    """
+    Check that the synthetic traces used by the benchmarks parse to the same
+    dataframes in text and binary formats.
+    """
+
+    def test_txt_dat(self):
+        synthetic = SyntheticTrace(nr_events=2000, nr_cpus=4, nr_tasks=10, seed=1)
+        txt_path = os.path.join(self.res_dir, 'trace.txt')
+        dat_path = os.path.join(self.res_dir, 'trace.dat')
+        synthetic.write_txt(txt_path)
+        synthetic.write_dat(dat_path)
+
+        txt = Trace(txt_path, parser=TxtTraceParser.from_txt_file, enable_swap=False)
+        dat = Trace(dat_path, parser=TraceDatParser, enable_swap=False)
+        assert set(txt.available_events) == set(dat.available_events) == set(synthetic.events)
+
+        for event in synthetic.events:
+            txt_df = txt.df_event(event)
+            dat_df = dat.df_event(event)
+            pd.testing.assert_frame_equal(
+                txt_df,
+                dat_df[txt_df.columns],
+                check_dtype=False,
+                check_categorical=False,
+            )
+
+        assert len(txt.ana.tasks.df_tasks_states())
+
+    def test_benchmark(self):
+        path = os.path.join(self.res_dir, 'trace.dat')
+        SyntheticTrace(nr_events=500, seed=1).write_dat(path)
+
+        suite = BenchmarkSuite(traces=dict(dat=path), repeat=1)
+        res = suite.run(select=['df_event.sched_switch', 'swap.*'])
+        # Must be serializable
+        json.dumps(res)
+
+        names = {result['name'] for result in res['results']}
+        assert 'df_event.sched_switch' in names
+        assert 'swap.write.parquet' in names
+        assert 'trace.init' not in names
+        assert all(result['min'] > 0 for result in res['results'])
+
 # vim :set tabstop=4 shiftwidth=4 textwidth=80 expandtab
@@ -0,0 +1,191 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright (C) 2026, Arm Limited and contributors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+import pandas as pd
+
+pytest.importorskip('wa')
+
+from wa import Status
+
+from lisa.wa import WAOutput, WACollectorBase
+from .utils import StorageTestCase
+
+
+class _CountingCollector(WACollectorBase):
+    """
+    Collector recording each load of a job in a file of the job's folder, so
+    that loads happening in worker processes are accounted for as well.
+    """
+    NAME = '_test_counting'
+    _PURE_GET_JOB_DF = False
+
+    @classmethod
+    def _get_job_df(cls, job):
+        with open(os.path.join(job.basepath, 'loads'), 'a') as f:
+            f.write('load\n')
+
+        if os.path.exists(os.path.join(job.basepath, 'fail')):
+            raise ValueError(f'Could not load {job.id}')
+
+        df = pd.DataFrame(dict(value=[1.0, 2.0]))
+        return cls._add_job_info(job, df)
+
+
+class TestWACollector(StorageTestCase):
+    """
+    Check the loading of jobs by :class:`lisa.wa.WACollectorBase`.
+    """
+
+    def setup_method(self, method):
+        super().setup_method(method)
+        self.outputs = {}
+
+    def _add_output(self, name, nr_jobs):
+        basepath = os.path.join(self.res_dir, name)
+        jobs = []
+        for i in range(nr_jobs):
+            job_id = f'{name}-{i}'
+            job_path = os.path.join(basepath, job_id)
+            os.makedirs(job_path)
+            jobs.append(SimpleNamespace(
+                basepath=job_path,
+                id=job_id,
+                iteration=1,
+                label='wk',
+                classifiers={},
+                status=Status.OK,
+                spec=SimpleNamespace(workload_name='wk'),
+            ))
+
+        self.outputs[name] = SimpleNamespace(
+            basepath=basepath,
+            jobs=jobs,
+            target_info=SimpleNamespace(
+                kernel_version=SimpleNamespace(release='5.10', sha1=None),
+            ),
+        )
+        return jobs
+
+    def _make_collector(self, processes, **kwargs):
+        def discover_outputs(wa_output):
+            return dict(self.outputs)
+
+        patcher = mock.patch.object(WAOutput, '_discover_outputs', discover_outputs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        wa_output = WAOutput(self.res_dir, processes=processes)
+        return _CountingCollector(wa_output, **kwargs)
+
+    @staticmethod
+    def _nr_loads(job):
+        try:
+            with open(os.path.join(job.basepath, 'loads')) as f:
+                return len(f.readlines())
+        except FileNotFoundError:
+            return 0
+
+    def _test_parallel(self, name, processes):
+        jobs = self._add_output(name, 4)
+        collector = self._make_collector(processes=processes)
+        df = collector.df
+
+        assert sorted(df['id'].unique()) == sorted(job.id for job in jobs)
+        assert len(df) == 2 * len(jobs)
+        assert all(self._nr_loads(job) == 1 for job in jobs)
+        assert sorted(collector.jobs_load_time) == sorted(job.basepath for job in jobs)
+        return df.drop(columns=['id', 'wa_path'])
+
+    def test_parallel(self):
+        df = self._test_parallel('parallel', processes=4)
+        self.outputs.clear()
+        ref = self._test_parallel('sequential', processes=1)
+        pd.testing.assert_frame_equal(df, ref)
+
+    def test_cache(self):
+        def postprocess(df):
+            # Modify the dataframe in place
+            df['value'] *= 10
+            return df
+
+        jobs = self._add_output('out1', 2)
+        collector = self._make_collector(processes=1, df_postprocess=postprocess)
+        df = collector.df
+        assert collector.df is df
+
+        # Force building the dataframe again from the cached jobs
+        collector.wa_output.update()
+        df2 = collector.df
+        assert df2 is not df
+        assert all(self._nr_loads(job) == 1 for job in jobs)
+        # The postprocessing did not modify the cached dataframes
+        pd.testing.assert_frame_equal(df, df2)
+        assert (df2['value'] >= 10).all()
+
+    def _test_update(self, processes):
+        jobs1 = self._add_output('out1', 2)
+        collector = self._make_collector(processes=processes)
+        wa_output = collector.wa_output
+
+        assert len(collector.df) == 2 * len(jobs1)
+        assert wa_output.update() == []
+
+        jobs2 = self._add_output('out2', 3)
+        assert wa_output.update() == ['out2']
+
+        df = collector.df
+        assert sorted(df['id'].unique()) == sorted(
+            job.id for job in jobs1 + jobs2
+        )
+        assert all(self._nr_loads(job) == 1 for job in jobs1 + jobs2)
+
+    def test_update(self):
+        self._test_update(processes=1)
+
+    def test_update_parallel(self):
+        self._test_update(processes=2)
+
+    def _test_update_retry(self, processes):
+        jobs = self._add_output('out1', 3)
+        failing = jobs[1]
+        fail_path = os.path.join(failing.basepath, 'fail')
+        open(fail_path, 'w').close()
+
+        collector = self._make_collector(processes=processes)
+        assert failing.id not in collector.df['id'].unique()
+
+        os.remove(fail_path)
+        assert collector.wa_output.update() == []
+
+        assert sorted(collector.df['id'].unique()) == sorted(job.id for job in jobs)
+        assert self._nr_loads(failing) == 2
+        assert all(
+            self._nr_loads(job) == 1
+            for job in jobs
+            if job is not failing
+        )
+
+    def test_update_retry(self):
+        self._test_update_retry(processes=1)
+
+    def test_update_retry_parallel(self):
+        self._test_update_retry(processes=2)
@@ -32,6 +32,7 @@ import gzip
 import hashlib
 import importlib
 import inspect
+import io
 import itertools
 import json
 import logging
@@ -50,6 +51,7 @@ import select
 import shlex
 import shutil
 import signal
+import sqlite3
 import statistics
 import subprocess
 import sys
@@ -61,6 +63,7 @@ import tempfile
 import types
 import urllib.parse
 import uuid
+import zlib
 
 import requests
 import ruamel.yaml
@@ -1850,7 +1853,6 @@ class LISATestStep(ShellStep):
         self.prune_db = prune_db
 
     def run(self, i_stack, service_hub):
-        from exekall.utils import NoValue
         from exekall.engine import ValueDB
 
         artifact_path = os.getenv(
@@ -1904,11 +1906,16 @@ class LISATestStep(ShellStep):
                         # been copied to the pruned DB.
                         froz_val.uuid in root_froz_val_uuids
                         or
-                        # keep errors and values leading to them
-                        froz_val.value is NoValue
+                        # keep errors and values leading to them. This
+                        # avoids deserializing the values that are pruned.
+                        not froz_val.has_value
                     )
                 db = db.prune_by_predicate(prune_predicate)
 
+            # The values are lazily loaded from the DB file, which might be
+            # deleted or compressed below.
+            db.materialize()
+
         # Remove the hidden folders and files in the artifacts
         if self.delete_artifact_hidden:
             def remove_hidden(root, name, rm):
@@ -2878,10 +2885,19 @@ class StepSeqResult(StepResultBase):
         else:
             steps_res = self.steps_res
 
-        bisect_ret_stats = collections.Counter(
-            res.filtered_bisect_ret(steps_filter) for res in steps_res
+        return self._aggregate_bisect_ret(
+            (res.filtered_bisect_ret(steps_filter) for res in steps_res),
+            ignore_yield=ignore_yield,
         )
 
+    @staticmethod
+    def _aggregate_bisect_ret(bisect_ret_list, ignore_yield=False):
+        """
+        Compute the overall bisect result of a sequence of steps from the
+        bisect result of each of them.
+        """
+        bisect_ret_stats = collections.Counter(bisect_ret_list)
+
         # If there are no results at all, this is untestable
         if not bisect_ret_stats:
             bisect_ret = BisectRet.NA
@@ -2910,6 +2926,82 @@ class StepSeqResult(StepResultBase):
         return bisect_ret
 
 
+class StoredStepSeqResult:
+    """
+    :class:`StepSeqResult` stored in a :class:`ReportStore`, loaded on first
+    access.
+
+    As long as the result is not loaded, the run time and the bisect result
+    are computed from the summary recorded in the store. Accessing any other
+    attribute loads the :class:`StepSeqResult`, which is then kept so that
+    modifications are preserved.
+    """
+
+    def __init__(self, store, i, run_time, summary):
+        self._store = store
+        self._i = i
+        self._run_time = run_time
+        self._summary = summary
+        self._res = None
+
+    def load(self):
+        """
+        Return the :class:`StepSeqResult` without keeping it if it was not
+        already loaded.
+        """
+        if self._res is None:
+            return self._store.load_result(self._i)
+        else:
+            return self._res
+
+    def materialize(self):
+        """
+        Load and return the :class:`StepSeqResult`.
+        """
+        if self._res is None:
+            self._res = self._store.load_result(self._i)
+        return self._res
+
+    def __getattr__(self, attr):
+        # Avoid infinite recursion when the instance is not initialized yet
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.materialize(), attr)
+
+    @property
+    def run_time(self):
+        if self._res is None:
+            return self._run_time
+        else:
+            return self._res.run_time
+
+    @property
+    def bisect_ret(self):
+        return self._filtered_bisect_ret()
+
+    def filtered_bisect_ret(self, steps_filter=None):
+        return self.bisect_ret
+
+    def _filtered_bisect_ret(self, steps_set=None, steps_filter=None, ignore_yield=False):
+        # The summary is not available when the result depends on the filter,
+        # i.e. when there are nested MacroStep.
+        if self._res is not None or self._summary is None:
+            return self.materialize()._filtered_bisect_ret(
+                steps_set=steps_set,
+                steps_filter=steps_filter,
+                ignore_yield=ignore_yield,
+            )
+        else:
+            return StepSeqResult._aggregate_bisect_ret(
+                (
+                    bisect_ret
+                    for step, bisect_ret in self._summary
+                    if steps_set is None or step in steps_set
+                ),
+                ignore_yield=ignore_yield,
+            )
+
+
 class ServiceHub:
     def __init__(self, **kwargs):
         for name, service in kwargs.items():
@@ -3367,6 +3459,11 @@ class MacroStep(StepBase):
             ))
             step_res_run_times = {}
             for i, macrostep_i_res in enumerate(macrostep_res.res_list):
+                # Results of a ReportStore are only loaded for the time of the
+                # report, rather than being kept in memory afterwards.
+                if isinstance(macrostep_i_res, StoredStepSeqResult):
+                    macrostep_i_res = macrostep_i_res.load()
+
                 i += 1
                 i_stack_ = copy.copy(i_stack)
                 i_stack_.append(i)
@@ -3794,6 +3891,202 @@ def disable_gc(f):
     return wrapper
 
 
+class ReportStore:
+    """
+    On-disk format of a :class:`Report` based on SQLite, used for file names
+    ending with :attr:`SUFFIX`.
+
+    Each iteration of the top-level :class:`MacroStep` is stored as a separate
+    record, along with a summary made of its run time and the bisect result of
+    each step. That allows:
+
+        * Only writing the new iterations when the report is saved again.
+        * Loading the report without deserializing the step results. They are
+          loaded on demand using :class:`StoredStepSeqResult`, and the overall
+          bisect result only needs the summaries.
+
+    The steps are stored once alongside the report, and are shared by all the
+    records.
+
+    :param path: Path to the SQLite database. It is created if needed.
+    :type path: str
+    """
+
+    SUFFIX = '.sqlite'
+    MAGIC = b'SQLite format 3\x00'
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._conn = sqlite3.connect(self.path)
+        with self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS iterations (i INTEGER PRIMARY KEY, run_time REAL, summary TEXT, result BLOB)')
+
+        # All the steps referred to by the records
+        self._steps = []
+        self._step_ids = {}
+
+    @classmethod
+    def is_store(cls, path):
+        """
+        Check whether the given file is a :class:`ReportStore`.
+        """
+        try:
+            with open(path, 'rb') as f:
+                return f.read(len(cls.MAGIC)) == cls.MAGIC
+        except OSError:
+            return False
+
+    def move(self, path):
+        """
+        Move the store to a new path.
+        """
+        self._conn.close()
+        os.replace(self.path, path)
+        self.path = os.path.abspath(path)
+        self._conn = sqlite3.connect(self.path)
+
+    def _get_step_id(self, obj):
+        if isinstance(obj, StepBase):
+            try:
+                return self._step_ids[id(obj)]
+            except KeyError:
+                id_ = len(self._steps)
+                self._steps.append(obj)
+                self._step_ids[id(obj)] = id_
+                return id_
+        else:
+            return None
+
+    def _dumps(self, obj, share_steps=True):
+        # Temporary workaround this bug:
+        # https://bugs.python.org/issue43460
+        try:
+            from exekall._utils import ExceptionPickler as Pickler
+        except ImportError:
+            Pickler = pickle.Pickler
+
+        f = io.BytesIO()
+        pickler = Pickler(f, protocol=4)
+        if share_steps:
+            pickler.persistent_id = self._get_step_id
+        pickler.dump(obj)
+        return zlib.compress(f.getvalue())
+
+    @disable_gc
+    def _loads(self, data):
+        unpickler = pickle.Unpickler(io.BytesIO(zlib.decompress(data)))
+        unpickler.persistent_load = self._steps.__getitem__
+        return unpickler.load()
+
+    def _get_meta(self, key):
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            raise ValueError(f'Could not find "{key}" in report store: {self.path}')
+        return row[0]
+
+    def _set_meta(self, key, value):
+        self._conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, value))
+
+    def _make_summary(self, res):
+        summary = []
+        for step_res in res.steps_res:
+            # The bisect result of a nested MacroStep depends on the filters
+            # applied when showing the report.
+            if isinstance(step_res, MacroStepResult):
+                return None
+            summary.append((self._get_step_id(step_res.step), step_res.bisect_ret.name))
+        return summary
+
+    def _load_summary(self, summary):
+        summary = json.loads(summary)
+        if summary is None:
+            return None
+        else:
+            return [
+                (self._steps[step_id], BisectRet[bisect_ret])
+                for step_id, bisect_ret in summary
+            ]
+
+    def save(self, report):
+        """
+        Save the :class:`Report`. Iterations already stored are not written
+        again.
+        """
+        res_list = report.result.res_list
+
+        # Everything but the step results, which are stored separately
+        report_state = copy.copy(report)
+        report_state.result = copy.copy(report.result)
+        report_state.result.res_list = []
+
+        with self._conn:
+            nr_stored, = self._conn.execute('SELECT COUNT(*) FROM iterations').fetchone()
+            for i, res in enumerate(res_list[nr_stored:], nr_stored + 1):
+                if isinstance(res, StoredStepSeqResult):
+                    res = res.load()
+
+                self._conn.execute(
+                    'INSERT INTO iterations VALUES (?, ?, ?, ?)',
+                    (
+                        i,
+                        res.run_time,
+                        json.dumps(self._make_summary(res)),
+                        self._dumps(res),
+                    )
+                )
+
+            # The steps are pickled along with the report, so that the
+            # references to the steps in the records point at the ones of the
+            # report once reloaded.
+            self._set_meta('version', self.VERSION)
+            self._set_meta('preamble', self._dumps(report.preamble, share_steps=False))
+            self._set_meta('report', self._dumps((report_state, self._steps), share_steps=False))
+
+    def load_preamble(self):
+        """
+        Load the :class:`ReportPreamble`.
+        """
+        return self._loads(self._get_meta('preamble'))
+
+    def load_report(self):
+        """
+        Load the :class:`Report`, with the step results of each iteration
+        represented by a :class:`StoredStepSeqResult`.
+        """
+        version = self._get_meta('version')
+        if version > self.VERSION:
+            raise ValueError(f'Unsupported report store version {version}: {self.path}')
+
+        report, self._steps = self._loads(self._get_meta('report'))
+        self._step_ids = {
+            id(step): id_
+            for id_, step in enumerate(self._steps)
+        }
+
+        report.result.res_list = [
+            StoredStepSeqResult(
+                store=self,
+                i=i,
+                run_time=run_time,
+                summary=self._load_summary(summary),
+            )
+            for i, run_time, summary in self._conn.execute(
+                'SELECT i, run_time, summary FROM iterations ORDER BY i'
+            )
+        ]
+        report._store = self
+        return report
+
+    def load_result(self, i):
+        """
+        Load the :class:`StepSeqResult` of the given iteration.
+        """
+        data, = self._conn.execute('SELECT result FROM iterations WHERE i = ?', (i,)).fetchone()
+        return self._loads(data)
+
+
 class Report(Serializable):
     """
     Report body containg the result of the top level :class:`MacroStep` .
@@ -3801,9 +4094,14 @@ class Report(Serializable):
 
     yaml_tag = '!report'
     # The preamble is saved separately
-    dont_save = ['preamble', 'path']
+    dont_save = ['preamble', 'path', '_store']
+
+    attr_init = dict(
+        # ReportStore the report was loaded from or saved to
+        _store=None,
+    )
 
-    REPORT_CACHE_TEMPLATE = '{report_filename}.cache.pickle'
+    REPORT_CACHE_TEMPLATE = '{report_filename}.cache' + ReportStore.SUFFIX
 
     def __init__(self, macrostep_res, description='', path=None, src_files=None):
         self.creation_time = datetime.datetime.now()
@@ -3889,8 +4187,50 @@ class Report(Serializable):
             '.{filename}.temp'.format(filename=os.path.basename(self.path))
         )
 
+        res_list = self.result.res_list
+        is_store = self.path.endswith(ReportStore.SUFFIX)
+
+        # The other formats need the step results lazily loaded from a
+        # ReportStore
+        if not is_store:
+            res_list[:] = [
+                res.materialize() if isinstance(res, StoredStepSeqResult) else res
+                for res in res_list
+            ]
+
+        # Save to a ReportStore
+        if is_store:
+            abs_path = os.path.abspath(self.path)
+            store = self._store
+            if store is None or store.path != abs_path:
+                # Append to the store the results were loaded from, e.g. when
+                # resuming.
+                store_set = {
+                    res._store
+                    for res in res_list
+                    if isinstance(res, StoredStepSeqResult)
+                }
+                if len(store_set) == 1:
+                    store, = store_set
+                    if store.path != abs_path:
+                        store = None
+                else:
+                    store = None
+
+            if store is None:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(temp_path)
+                store = ReportStore(temp_path)
+                store.save(self)
+                store.move(self.path)
+            else:
+                store.save(self)
+
+            self._store = store
+            temp_path = None
+
         # Save to YAML
-        if is_yaml:
+        elif is_yaml:
             # The file needs to be opened as utf-8 since the underlying stream
             # will need to accept utf-8 data in its write() method.
             with open_f(temp_path, 'wt', encoding='utf-8') as yaml_f:
@@ -3921,7 +4261,8 @@ class Report(Serializable):
 
         # Rename the file once we know for sure that writing to the temporary
         # report completed with success
-        os.replace(temp_path, self.path)
+        if temp_path:
+            os.replace(temp_path, self.path)
 
         # Upload if needed
         url = None
@@ -3965,8 +4306,6 @@ class Report(Serializable):
                 if cls.name in macrostep_names:
                     _import_steps_from_yaml(spec['steps'])
 
-        open_f, is_yaml = check_report_path(path, probe_file=True)
-
         def import_modules(steps_path, src_files):
             # Try to import the steps defined in steps_path if specified
             if steps_path:
@@ -3976,6 +4315,22 @@ class Report(Serializable):
                 excep = import_files(src_files)
             return excep
 
+        # Read the report store
+        if ReportStore.is_store(path):
+            excep = None
+            store = ReportStore(path)
+            try:
+                preamble = store.load_preamble()
+                excep = import_modules(steps_path, preamble.src_files)
+                report = store.load_report()
+            except Exception as e:
+                if excep is not None:
+                    error(excep)
+                raise
+            return cls._finalize_load(report, preamble, path)
+
+        open_f, is_yaml = check_report_path(path, probe_file=True)
+
         # Read as YAML or Pickle depending on the filename.
         if is_yaml:
             # Get the generator that will parse the YAML documents
@@ -4023,6 +4378,10 @@ class Report(Serializable):
                     error(excep)
                 raise
 
+        return cls._finalize_load(report, preamble, path)
+
+    @staticmethod
+    def _finalize_load(report, preamble, path):
         # Tie the preamble to its report
         report.preamble = preamble
 
@@ -4077,7 +4436,8 @@ class Report(Serializable):
     @classmethod
     def _load(cls, path, steps_path, use_cache):
         write_cache = False
-        if use_cache:
+        # A ReportStore is already fast to load
+        if use_cache and not ReportStore.is_store(path):
             dirname = os.path.dirname(path)
             basename = os.path.basename(path)
             cache_filename = os.path.join(
@@ -5117,7 +5477,10 @@ command line""")
         slow to generate and load, Pickle format cannot expected to be backward
         compatible with different versions of the tool but can be faster to read
         and write. CAVEAT: Pickle format will not handle references to modules
-        that are not in sys.path.""")
+        that are not in sys.path. If the file name ends with .sqlite, a report
+        store is created. It shares the caveats of the Pickle format, but only
+        the new iterations are written every time the report is saved, and the
+        results of each iteration are only loaded when needed.""")
 
     run_parser.add_argument('--overwrite', action='store_true',
         help="""Overwrite existing report files.""")
@@ -5158,15 +5521,16 @@ command line""")
         help="Read back a previous session saved using --report option of run subcommand.")
 
     report_parser.add_argument('--export',
-        help="""Export the report as a Pickle or YAML file. File format is
-        infered from the filename. If it ends with .pickle, a Pickle file is
-        created, otherwise YAML format is used.""")
+        help="""Export the report as a Pickle, report store or YAML file. File
+        format is infered from the filename. If it ends with .pickle, a Pickle
+        file is created, if it ends with .sqlite a report store is created,
+        otherwise YAML format is used.""")
 
     report_parser.add_argument('--cache', action='store_true',
         help="""When loading a report, create a cache file named "{template}"
         using the fastest format available. It is the reused until the original
         file is modified. This is mostly useful when working with big YAML
-        files that are long to load.""".format(
+        files that are long to load. Report stores are never cached.""".format(
             template=Report.REPORT_CACHE_TEMPLATE
         )
     )
@@ -31,6 +31,7 @@ import pickle
 import subprocess
 import sys
 import tempfile
+import threading
 import traceback
 import types
 import uuid
@@ -1221,6 +1222,9 @@ def measure_time(iterator):
 
 def capture_log(iterator):
     logger = logging.getLogger()
+    # Only capture the records emitted by the thread consuming the iterator,
+    # as other threads may be computing other values concurrently.
+    thread = threading.get_ident()
 
     def make_handler(level):
         formatter = LOGGING_FOMATTER_MAP['normal']
@@ -1228,6 +1232,7 @@ def capture_log(iterator):
         handler = logging.StreamHandler(string)
         handler.setLevel(level)
         handler.setFormatter(formatter)
+        handler.addFilter(lambda record: record.thread == thread)
         return (string, handler)
 
     def setup():
@@ -50,6 +50,19 @@ class AdaptorBase:
         """
         return set()
 
+    def get_exclusive_type_set(self):
+        """
+        Return a set of types representing exclusive resources.
+
+        When computing subexpressions concurrently, the ones producing or
+        consuming a given value of these types are computed one at a time.
+        This is typically used for values representing a target, which can
+        only run one experiment at a time.
+
+        Defaults to an empty set.
+        """
+        return set()
+
     @staticmethod
     def get_tags(value):
         """
@@ -195,6 +208,25 @@ class AdaptorBase:
         """
         return db
 
+    @classmethod
+    def reload_value(cls, value, path=None):
+        """
+        Hook called when a value of a serialized
+        :class:`exekall.engine.ValueDB` is deserialized. The returned value
+        will be used.
+
+        :param value: Value that has just been deserialized.
+        :type value: object
+
+        :param path: Path of the file of the serialized database.
+        :type path: str or None
+
+        .. note:: Values can be deserialized lazily on first access, so this
+            hook should be preferred over :meth:`reload_db` to post-process the
+            values.
+        """
+        return value
+
     def finalize_expr(self, expr):
         """
         Finalize an :class:`exekall.engine.ComputableExpression` right after
@@ -36,6 +36,10 @@ import datetime
 import io
 import typing
 import types
+import concurrent.futures
+import os
+import struct
+import zlib
 from operator import attrgetter
 
 import exekall._utils as utils
@@ -221,7 +225,10 @@ class ValueDB:
         """
         Deserialize a :class:`ValueDB` from a file.
 
-        At the moment, it is assumed to be an LZMA compressed Pickle file.
+        The file can either be in the streaming format written by
+        :meth:`to_path` and :class:`ValueDBWriter`, or a monolithic LZMA
+        compressed Pickle file. In the former case, the values are only
+        deserialized when they are first accessed.
 
         :param path: Path to the file containing the serialized
             :class:`ValueDB`.
@@ -240,13 +247,23 @@ class ValueDB:
                 relative_to = pathlib.Path(relative_to).parent
             path = pathlib.Path(relative_to, path)
 
-        with lzma.open(str(path), 'rb') as f:
-            # Disabling garbage collection while loading result in significant
-            # speed improvement, since it creates a lot of new objects in a
-            # very short amount of time.
-            with utils.disable_gc():
-                db = pickle.load(f)
-        assert isinstance(db, cls)
+        if _ValueDBStream.is_stream(path):
+            db = _ValueDBReader(path).load_db(cls)
+        else:
+            with lzma.open(str(path), 'rb') as f:
+                # Disabling garbage collection while loading result in
+                # significant speed improvement, since it creates a lot of new
+                # objects in a very short amount of time.
+                with utils.disable_gc():
+                    db = pickle.load(f)
+            assert isinstance(db, cls)
+
+            # Values of the monolithic format are all loaded already
+            adaptor_cls = db.adaptor_cls
+            if adaptor_cls:
+                for froz_val in db.get_all():
+                    if froz_val.value is not NoValue:
+                        froz_val.value = adaptor_cls.reload_value(froz_val.value, path=path)
 
         # Apply some post-processing on the DB with a known path
         cls._call_adaptor_reload(db, path=path)
@@ -278,7 +295,7 @@ class ValueDB:
             db = adaptor_cls.reload_db(db, path=path)
         return db
 
-    def to_path(self, path, optimize=True):
+    def to_path(self, path, optimize=True, compression='xz'):
         """
         Write the DB to the given file.
 
@@ -289,20 +306,24 @@ class ValueDB:
             increase the dump time and memory consumption, but should speed-up
             loading/file size.
         :type optimize: bool
-        """
-        protocol = self.PICKLE_PROTOCOL
 
-        if optimize:
-            def dumper(f):
-                bytes_ = utils.ExceptionPickler.dump_bytestring(self, protocol=protocol)
-                bytes_ = pickletools.optimize(bytes_)
-                return f.write(bytes_)
-        else:
-            def dumper(f):
-                return utils.ExceptionPickler.dump_file(f, self, protocol=protocol)
+        :param compression: Compression to use. See :class:`ValueDBWriter`.
+        :type compression: str
 
-        with lzma.open(str(path), 'wb') as f:
-            dumper(f)
+        .. seealso:: :class:`ValueDBWriter`
+        """
+        path = pathlib.Path(path)
+        # Write to a temporary file first, since the values of this DB could
+        # be lazily loaded from the file we are about to overwrite.
+        tmp_path = path.with_name(f'.{path.name}.tmp')
+        with ValueDBWriter(
+            tmp_path,
+            adaptor_cls=self.adaptor_cls,
+            compression=compression,
+            optimize=optimize,
+        ) as writer:
+            writer.append(self.froz_val_seq_list)
+        os.replace(str(tmp_path), str(path))
 
     @property
     @utils.once
@@ -509,6 +530,18 @@ class ValueDB:
             adaptor_cls=self.adaptor_cls,
         )
 
+    def materialize(self):
+        """
+        Deserialize all the values that were not accessed yet.
+
+        The values of a :class:`ValueDB` loaded from a file in the streaming
+        format are only deserialized on first access. Once this method
+        returned, the file is not needed anymore and can be removed.
+        """
+        for froz_val in self.get_all():
+            # Accessing the value deserializes it
+            froz_val.value # pylint: disable=pointless-statement
+
     def get_all(self, **kwargs):
         """
         Get all :class:`FrozenExprVal` contained in this database.
@@ -571,6 +604,387 @@ class ValueDB:
         return self.get_by_predicate(predicate, **kwargs)
 
 
+class _ValueDBStream:
+    """
+    Streaming on-disk format of :class:`ValueDB`.
+
+    The file starts with :attr:`MAGIC`, followed by a sequence of frames. Each
+    frame is made of a header, a key and a payload compressed independently
+    from the other frames:
+
+    * ``H``: header, with the format version and the adaptor class.
+    * ``V``: value of a :class:`FrozenExprVal`, keyed by its UUID.
+    * ``G``: graph of :class:`FrozenExprValSeq`, with the values replaced by
+      references to the ``V`` frames. Values smaller than
+      :attr:`ValueDBWriter.INLINE_SIZE` are kept in the graph.
+    * ``I``: index of the offsets of all the other frames.
+
+    The file is terminated by the offset of the ``I`` frame and
+    :attr:`TRAILER_MAGIC`. If the file was not closed properly, the index is
+    rebuilt by scanning the frames.
+    """
+
+    MAGIC = b'EXEKALL-VALUEDB\n'
+    TRAILER_MAGIC = b'EXKIDX\n\0'
+    VERSION = 1
+
+    _FRAME_HEADER = struct.Struct('<cBHQ')
+    _TRAILER = struct.Struct('<Q8s')
+
+    # Map of compression name to (ID, compress, decompress)
+    _COMPRESSIONS = {
+        'none': (0, lambda data: data, lambda data: data),
+        'zlib': (1, functools.partial(zlib.compress, level=1), zlib.decompress),
+        'xz': (2, lzma.compress, lzma.decompress),
+    }
+    _DECOMPRESS = {
+        id_: decompress
+        for id_, _, decompress in _COMPRESSIONS.values()
+    }
+
+    @classmethod
+    def is_stream(cls, path):
+        """
+        Check whether ``path`` is a file in the streaming format.
+        """
+        with open(str(path), 'rb') as f:
+            return f.read(len(cls.MAGIC)) == cls.MAGIC
+
+
+class _ValueDBPickler(utils.ExceptionPickler):
+    """
+    Pickler replacing the lazy values by their UUID.
+    """
+    def persistent_id(self, obj):
+        if isinstance(obj, _LazyValue):
+            return obj.uuid
+        else:
+            return None
+
+
+class _ValueDBUnpickler(pickle.Unpickler):
+    """
+    Unpickler creating a lazy value for each reference to a ``V`` frame.
+    """
+    def __init__(self, f, reader):
+        super().__init__(f)
+        self.reader = reader
+
+    def persistent_load(self, uuid_):
+        return _LazyValue(uuid_, reader=self.reader)
+
+
+class _LazyValue:
+    """
+    Value of a :class:`FrozenExprVal` stored in a ``V`` frame of a file in the
+    streaming format, deserialized on first access.
+    """
+
+    def __init__(self, uuid, reader=None, value=NoValue):
+        self.uuid = uuid
+        self.reader = reader
+        self._value = value
+
+    def load(self):
+        if self._value is NoValue:
+            self._value = self.reader.load_value(self.uuid)
+        return self._value
+
+    def __reduce__(self):
+        # The file may not be available anymore by the time the object is
+        # deserialized.
+        return (self.__class__, (self.uuid, None, self.load()))
+
+
+class _ValueDBReader(_ValueDBStream):
+    """
+    Read a file in the streaming format.
+
+    :param path: Path to the file.
+    :type path: str or pathlib.Path
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path).resolve()
+        with self._open() as f:
+            self._file_id = self._get_file_id(f)
+            self._index = self._read_index(f)
+            header = self._read_obj(self._index['header'], f=f)
+
+        if header['version'] > self.VERSION:
+            raise ValueError(f'Unsupported ValueDB format version {header["version"]}: {self.path}')
+        self.adaptor_cls = header['adaptor_cls']
+
+    @staticmethod
+    def _get_file_id(f):
+        stat = os.fstat(f.fileno())
+        return (stat.st_dev, stat.st_ino)
+
+    def _open(self):
+        return open(str(self.path), 'rb')
+
+    @contextlib.contextmanager
+    def _open_checked(self):
+        with self._open() as f:
+            # The offsets of the index are only valid for the file they were
+            # read from.
+            if self._get_file_id(f) != self._file_id:
+                raise ValueError(f'ValueDB file was replaced since it was loaded: {self.path}')
+            yield f
+
+    def _read_frame(self, offset, f=None):
+        if f is None:
+            with self._open_checked() as f:
+                return self._read_frame(offset, f=f)
+
+        f.seek(offset)
+        kind, compression, key_size, size = self._FRAME_HEADER.unpack(
+            f.read(self._FRAME_HEADER.size)
+        )
+        key = f.read(key_size).decode('utf-8')
+        data = f.read(size)
+        return (kind, compression, key, data)
+
+    def _read_obj(self, offset, f=None):
+        kind, compression, key, data = self._read_frame(offset, f=f)
+        data = self._DECOMPRESS[compression](data)
+        # Disabling garbage collection while loading result in significant
+        # speed improvement, since it creates a lot of new objects in a very
+        # short amount of time.
+        with utils.disable_gc():
+            return _ValueDBUnpickler(io.BytesIO(data), reader=self).load()
+
+    def _read_index(self, f):
+        size = f.seek(0, os.SEEK_END)
+        trailer_size = self._TRAILER.size
+        if size >= len(self.MAGIC) + trailer_size:
+            f.seek(size - trailer_size)
+            offset, magic = self._TRAILER.unpack(f.read(trailer_size))
+            if magic == self.TRAILER_MAGIC:
+                return self._read_obj(offset, f=f)
+
+        # The file was not closed properly, so we need to scan it. A truncated
+        # frame at the end is ignored.
+        index = dict(header=None, graph=[], values={})
+        offset = len(self.MAGIC)
+        while True:
+            f.seek(offset)
+            header = f.read(self._FRAME_HEADER.size)
+            if len(header) < self._FRAME_HEADER.size:
+                break
+            kind, compression, key_size, frame_size = self._FRAME_HEADER.unpack(header)
+            key = f.read(key_size).decode('utf-8')
+            end = offset + len(header) + key_size + frame_size
+            if end > size:
+                break
+
+            if kind == b'H':
+                index['header'] = offset
+            elif kind == b'G':
+                index['graph'].append(offset)
+            elif kind == b'V':
+                index['values'][key] = offset
+            offset = end
+
+        if index['header'] is None:
+            raise ValueError(f'Invalid ValueDB file: {self.path}')
+        return index
+
+    def read_value_frame(self, uuid_):
+        """
+        Return a tuple ``(compression ID, compressed data)`` of the pickled
+        value with the given UUID.
+        """
+        kind, compression, key, data = self._read_frame(self._index['values'][uuid_])
+        assert kind == b'V' and key == uuid_
+        return (compression, data)
+
+    def load_value(self, uuid_):
+        """
+        Load the value with the given UUID.
+        """
+        value = self._read_obj(self._index['values'][uuid_])
+        if self.adaptor_cls:
+            value = self.adaptor_cls.reload_value(value, path=self.path)
+        return value
+
+    def load_db(self, db_cls=None):
+        """
+        Load the :class:`ValueDB` from all the graph frames.
+        """
+        db_cls = db_cls or ValueDB
+        with self._open_checked() as f:
+            froz_val_seq_list = list(itertools.chain.from_iterable(
+                self._read_obj(offset, f=f)
+                for offset in self._index['graph']
+            ))
+        return db_cls(froz_val_seq_list, adaptor_cls=self.adaptor_cls)
+
+
+class ValueDBWriter(_ValueDBStream):
+    """
+    Incrementally write a :class:`ValueDB` to a file.
+
+    :param path: Path to the file to write.
+    :type path: str or pathlib.Path
+
+    :param adaptor_cls: Adaptor class of the DB. See :class:`ValueDB`.
+    :type adaptor_cls: type
+
+    :param compression: Compression used for each chunk of the file. ``xz``
+        gives the smallest files, ``zlib`` is much faster at the expense of
+        file size and ``none`` disables compression.
+    :type compression: str
+
+    :param optimize: Optimize the pickled representation of each chunk.
+    :type optimize: bool
+
+    Each value is stored in its own chunk, separately from the graph of
+    :class:`FrozenExprVal`, so that the DB can be loaded with
+    :meth:`ValueDB.from_path` without deserializing all the values. The chunks
+    are written as soon as :meth:`append` is called, and the index is written
+    by :meth:`close`. The file can still be loaded if it was not closed.
+
+    It can be used as a context manager, which will call :meth:`close` on
+    exit.
+    """
+
+    INLINE_SIZE = 4096
+    """
+    Size in bytes of the pickled values under which they are stored in the
+    graph of :class:`FrozenExprVal` rather than in their own chunk.
+    """
+
+    def __init__(self, path, adaptor_cls=None, compression='xz', optimize=False):
+        try:
+            self._compression, self._compress, _ = self._COMPRESSIONS[compression]
+        except KeyError:
+            raise ValueError(f'Unknown compression "{compression}", available ones are: {", ".join(sorted(self._COMPRESSIONS.keys()))}')
+
+        self.path = pathlib.Path(path)
+        self.optimize = optimize
+        self._file = open(str(self.path), 'wb')
+        self._file.write(self.MAGIC)
+        self._index = dict(
+            header=self._write_frame(b'H', dict(
+                version=self.VERSION,
+                adaptor_cls=adaptor_cls,
+            )),
+            graph=[],
+            values={},
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+    def _dump(self, obj):
+        data = _ValueDBPickler.dump_bytestring(obj, protocol=ValueDB.PICKLE_PROTOCOL)
+        if self.optimize:
+            data = pickletools.optimize(data)
+        return data
+
+    def _write_raw_frame(self, kind, compression, data, key=''):
+        key = key.encode('utf-8')
+        f = self._file
+        offset = f.tell()
+        f.write(self._FRAME_HEADER.pack(kind, compression, len(key), len(data)))
+        f.write(key)
+        f.write(data)
+        return offset
+
+    def _write_frame(self, kind, obj, key='', data=None):
+        if data is None:
+            data = self._dump(obj)
+        return self._write_raw_frame(kind, self._compression, self._compress(data), key=key)
+
+    def _write_value(self, froz_val):
+        """
+        Write the value of a copy of a :class:`FrozenExprVal` in its own frame,
+        and replace it by a lazy value.
+        """
+        dct = froz_val.__dict__
+        uuid_ = froz_val.uuid
+        values = self._index['values']
+
+        try:
+            value = dct['value']
+        except KeyError:
+            lazy = dct['_value_loader']
+            if uuid_ not in values:
+                # Copy the frame as-is if possible
+                if lazy.reader is None:
+                    values[uuid_] = self._write_frame(b'V', lazy.load(), key=uuid_)
+                else:
+                    compression, data = lazy.reader.read_value_frame(uuid_)
+                    values[uuid_] = self._write_raw_frame(b'V', compression, data, key=uuid_)
+        else:
+            dct.pop('_value_loader', None)
+            if value is NoValue or uuid_ is None:
+                return
+
+            if uuid_ not in values:
+                data = self._dump(value)
+                # Small values do not need their own frame
+                if len(data) < self.INLINE_SIZE:
+                    return
+                values[uuid_] = self._write_frame(b'V', value, key=uuid_, data=data)
+            del dct['value']
+
+        dct['_value_loader'] = _LazyValue(uuid_)
+
+    def append(self, froz_val_seq_list):
+        """
+        Append a list of :class:`FrozenExprValSeq` to the file.
+
+        Values that have already been written by a previous call are not
+        written again.
+        """
+        froz_val_seq_list = ValueDB._dedup_froz_val_seq_list(froz_val_seq_list)
+
+        copies = {}
+
+        def copy_graph(froz_val):
+            try:
+                return copies[id(froz_val)]
+            except KeyError:
+                new = copy.copy(froz_val)
+                copies[id(froz_val)] = new
+                new.param_map = OrderedDict(
+                    (param, copy_graph(param_froz_val))
+                    for param, param_froz_val in froz_val.param_map.items()
+                )
+                self._write_value(new)
+                return new
+
+        froz_val_seq_list = [
+            FrozenExprValSeq(
+                froz_val_list=list(map(copy_graph, froz_val_seq)),
+                param_map=OrderedDict(
+                    (param, copy_graph(froz_val))
+                    for param, froz_val in froz_val_seq.param_map.items()
+                ),
+            )
+            for froz_val_seq in froz_val_seq_list
+        ]
+        self._index['graph'].append(
+            self._write_frame(b'G', froz_val_seq_list)
+        )
+        self._file.flush()
+
+    def close(self):
+        """
+        Write the index and close the file.
+        """
+        f = self._file
+        if not f.closed:
+            offset = self._write_frame(b'I', self._index)
+            f.write(self._TRAILER.pack(offset, self.TRAILER_MAGIC))
+            f.close()
+
+
 class ScriptValueDB:
     """
     Class tying together a generated script and a :class:`ValueDB`.
@@ -1673,6 +2087,60 @@ class ComputableExpression(ExpressionBase):
             for expr_val in comp_expr.execute(*args, **kwargs):
                 yield (comp_expr, expr_val)
 
+    @classmethod
+    def precompute_all(cls, expr_list, jobs, post_compute_cb=None, exclusive_type_set=None):
+        """
+        Compute the reusable subexpressions of ``expr_list`` on a pool of
+        ``jobs`` threads.
+
+        :param expr_list: List of expressions to compute.
+        :type expr_list: list(ComputableExpression)
+
+        :param jobs: Maximum number of subexpressions computed concurrently.
+        :type jobs: int
+
+        :param post_compute_cb: See :meth:`execute`. It is called from the
+            worker threads.
+        :type post_compute_cb: collections.abc.Callable
+
+        :param exclusive_type_set: Set of types of values representing
+            exclusive resources, such as a target. The subexpressions
+            producing or consuming a given value of these types are never
+            computed concurrently.
+        :type exclusive_type_set: set(type)
+
+        Once all the values of the parameters of a reusable subexpression are
+        computed, the subexpression is computed by a worker thread.
+        Non-reusable subexpressions are computed by the worker computing their
+        consumer, since they need to be computed again for every consumer.
+        Subexpressions are only computed if they would be when executing the
+        expressions one by one, i.e. the parameters following a parameter that
+        failed to be computed are not computed.
+
+        Each subexpression is computed by one worker, so the values recorded
+        in the :class:`ComputableExpression`, and therefore in the
+        :class:`ValueDB`, do not depend on the scheduling. The values are then
+        available to :meth:`execute` as already computed values, so that only
+        non-reusable root expressions are computed by :meth:`execute`.
+
+        .. note:: The expressions whose reusable parameters depend on the
+            :class:`ExprData` of the root expression are computed again for
+            each root expression by :meth:`execute`, so they are left to it.
+        """
+        # Subexpressions shared between root expressions use the ExprData of
+        # the last root expression prepared. Going backward makes them use the
+        # ExprData of the first root expression using them, as they would
+        # when executing the expressions one by one.
+        for expr in reversed(expr_list):
+            expr.prepare_execute()
+
+        _ExprScheduler(
+            expr_list=expr_list,
+            jobs=jobs,
+            post_compute_cb=post_compute_cb,
+            exclusive_type_set=exclusive_type_set,
+        ).run()
+
     def _clone_consumer(self, consumer_expr_stack):
         expr = self
         if isinstance(expr.op, ConsumerOperator):
@@ -1839,6 +2307,258 @@ class ComputableExpression(ExpressionBase):
         ))
 
 
+class _ExprScheduler:
+    """
+    Schedule the computation of the reusable subexpressions of a list of
+    :class:`ComputableExpression` on a pool of threads.
+
+    .. seealso:: :meth:`ComputableExpression.precompute_all`
+    """
+
+    def __init__(self, expr_list, jobs, post_compute_cb=None, exclusive_type_set=None):
+        self.jobs = jobs
+        self.post_compute_cb = post_compute_cb
+        self.exclusive_type_set = set(exclusive_type_set or set())
+
+        # Reusable parameters needed by each expression, in the order they are
+        # computed by ComputableExpression._execute()
+        self.deps = {}
+        # Non-reusable subexpressions computed along with each expression
+        self.inline = {}
+        # Expressions depending on the ExprData of the root expression
+        self.root_bound = set()
+        self.consumers = collections.defaultdict(list)
+        # Expressions in post-order, so that they come after their parameters
+        self.expr_list = []
+        for expr in expr_list:
+            self._visit(expr)
+
+        # Expressions cloned by ComputableExpression._clone_consumer() share
+        # the list of their values. They are computed one after the other, in
+        # the order of self.expr_list, so that the list is deterministic.
+        self.list_sharers = collections.defaultdict(list)
+        for expr in self.expr_list:
+            self.list_sharers[id(expr.expr_val_seq_list)].append(expr)
+
+        # Non-reusable root expressions are not computed by the scheduler, but
+        # they still need the values of their reusable parameters.
+        self.needed = set(expr_list)
+        self.skipped = set()
+        self.started = set()
+        # Values of each computed expression
+        self.done = {}
+        self._replayed = {}
+
+    def _visit(self, expr):
+        if expr in self.deps:
+            return
+
+        deps = []
+        inline = []
+        def visit(expr):
+            param_expr_list = list(expr.param_map.values())
+            # Reusable parameters are computed first, then the non-reusable
+            # ones if all the reusable ones were successfully computed.
+            deps.extend(
+                param_expr
+                for param_expr in param_expr_list
+                if param_expr.op.reusable
+            )
+            for param_expr in param_expr_list:
+                if not param_expr.op.reusable:
+                    inline.append(param_expr)
+                    visit(param_expr)
+
+        visit(expr)
+        self.deps[expr] = deps
+        self.inline[expr] = inline
+
+        for dep in deps:
+            self._visit(dep)
+            self.consumers[dep].append(expr)
+
+        if any(
+            isinstance(param_expr.op, ExprDataOperator) or param_expr in self.root_bound
+            for param_expr in expr.param_map.values()
+            if param_expr.op.reusable
+        ):
+            self.root_bound.add(expr)
+
+        self.expr_list.append(expr)
+
+    def _is_exclusive(self, expr):
+        return expr.op.value_type in self.exclusive_type_set
+
+    def has_value(self, expr):
+        """
+        Whether some values of a computed ``expr`` are usable by its
+        consumers.
+        """
+        return any(
+            expr_val.value is not NoValue
+            for expr_val in self.done[expr]
+        )
+
+    def pulled_deps(self, expr):
+        """
+        Yield the reusable parameters of ``expr`` that will be computed
+        when computing ``expr``, given the parameters computed so far.
+
+        ``None`` is yielded for a parameter that might be computed, depending
+        on the outcome of the preceding ones.
+        """
+        for dep in self.deps[expr]:
+            if dep in self.done:
+                yield dep
+                # No value can be combined with the values of the next
+                # parameters, so there is no point in computing them.
+                if not self.has_value(dep):
+                    return
+            elif dep in self.skipped:
+                return
+            else:
+                yield dep
+                yield None
+                return
+
+    def _pulls(self, consumer, expr):
+        for dep in self.pulled_deps(consumer):
+            if dep is None:
+                return None
+            elif dep is expr:
+                return True
+        return False
+
+    def _update_status(self):
+        # Consumers come after their parameters, so going backward allows
+        # deciding about an expression after deciding about its consumers.
+        for expr in reversed(self.expr_list):
+            if expr in self.needed or expr in self.skipped:
+                continue
+
+            undecided = False
+            for consumer in self.consumers[expr]:
+                if consumer in self.skipped:
+                    continue
+                elif consumer in self.needed:
+                    pulls = self._pulls(consumer, expr)
+                    if pulls:
+                        self.needed.add(expr)
+                        break
+                    elif pulls is None:
+                        undecided = True
+                else:
+                    undecided = True
+            else:
+                if not undecided:
+                    self.skipped.add(expr)
+
+    def _is_ready(self, expr):
+        def is_finished(expr):
+            return expr in self.done or expr in self.skipped
+
+        return (
+            expr.op.reusable and
+            expr not in self.root_bound and
+            expr in self.needed and
+            expr not in self.started and
+            None not in self.pulled_deps(expr) and
+            all(
+                is_finished(sharer)
+                for sharer in itertools.takewhile(
+                    lambda sharer: sharer is not expr,
+                    self.list_sharers[id(expr.expr_val_seq_list)],
+                )
+            )
+        )
+
+    def _get_replayed(self, expr):
+        # Computed expressions replayed when computing the consumers of expr
+        try:
+            return self._replayed[expr]
+        except KeyError:
+            replayed = {expr}
+            for dep in self.pulled_deps(expr):
+                replayed.update(self._get_replayed(dep))
+            replayed = frozenset(replayed)
+            self._replayed[expr] = replayed
+            return replayed
+
+    def get_resources(self, expr):
+        """
+        Resources that cannot be used concurrently with another computation.
+        """
+        resources = set()
+        for expr_ in [expr, *self.inline[expr]]:
+            if self._is_exclusive(expr_):
+                resources.add(expr_)
+            resources.update(
+                param_expr
+                for param_expr in expr_.param_map.values()
+                if self._is_exclusive(param_expr)
+            )
+
+        # Non-reusable subexpressions record new values each time they are
+        # computed, so they cannot be shared between concurrent computations.
+        resources.update(self.inline[expr])
+
+        # Replaying parameters which failed to be computed records a new
+        # ExprVal each time, which would end up interleaved if done
+        # concurrently.
+        resources.update(
+            dep
+            for dep in utils.flatten_seq(
+                self._get_replayed(dep)
+                for dep in self.pulled_deps(expr)
+            )
+            if any(
+                expr_val_seq.param_map.is_partial(ignore_error=True)
+                for expr_val_seq in dep.expr_val_seq_list
+            )
+        )
+        return resources
+
+    def _compute(self, expr):
+        return list(expr._execute(post_compute_cb=self.post_compute_cb))
+
+    def run(self):
+        """
+        Compute the needed subexpressions and return when they are all
+        computed.
+        """
+        running = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while True:
+                self._update_status()
+                busy = set(itertools.chain.from_iterable(
+                    resources
+                    for expr, resources in running.values()
+                ))
+                for expr in self.expr_list:
+                    if len(running) >= self.jobs:
+                        break
+                    elif self._is_ready(expr):
+                        resources = self.get_resources(expr)
+                        if not (resources & busy):
+                            future = executor.submit(self._compute, expr)
+                            running[future] = (expr, resources)
+                            self.started.add(expr)
+                            busy.update(resources)
+
+                # Anything that was not computed will be computed by
+                # ComputableExpression.execute()
+                if not running:
+                    break
+
+                finished, _ = concurrent.futures.wait(
+                    running.keys(),
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in finished:
+                    expr, _ = running.pop(future)
+                    self.done[expr] = future.result()
+
+
 class ClassContext:
     """
     Collect callables and types that put together will be used to create
@@ -3693,6 +4413,31 @@ class FrozenExprVal(ExprValBase):
         else:
             self.excep_tb = None
 
+    def __getattr__(self, attr):
+        # The value is deserialized on first access when it was loaded from a
+        # ValueDB file in the streaming format.
+        if attr == 'value':
+            try:
+                loader = self.__dict__.pop('_value_loader')
+            except KeyError:
+                pass
+            else:
+                value = loader.load()
+                self.__dict__['value'] = value
+                return value
+
+        raise AttributeError(f'{self.__class__.__qualname__} object has no attribute "{attr}"')
+
+    @property
+    def has_value(self):
+        """
+        ``True`` if a value was computed, ``False`` otherwise.
+
+        Unlike checking ``value`` against :attr:`~exekall._utils.NoValue`, this
+        will not deserialize the value if it was not accessed yet.
+        """
+        return '_value_loader' in self.__dict__ or self.value is not NoValue
+
     @property
     def callable_(self):
         """
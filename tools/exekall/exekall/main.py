@@ -296,12 +296,19 @@ please run ``exekall run YOUR_SOURCES_OR_MODULES --help``.
         dest='save_value_db',
         help="""Do not create a VALUE_DB.pickle.xz file in the artifact folder. This avoids a costly serialization of the results, but prevents partial re-execution of expressions.""")
 
+    add_argument(run_advanced_group, '--value-db-compression', default='xz',
+        choices=('xz', 'zlib', 'none'),
+        help="""Compression used for the VALUE_DB.pickle.xz file. "zlib" is much faster than "xz" at the expense of a larger file.""")
+
     add_argument(run_advanced_group, '--verbose', '-v', action='count', default=0,
         help="""More verbose output. Can be repeated for even more verbosity. This only impacts exekall output, --log-level for more global settings.""")
 
     add_argument(run_advanced_group, '--pdb', action='store_true',
         help="""If an exception occurs in the code ran by ``exekall``, drops into a debugger shell.""")
 
+    add_argument(run_advanced_group, '--jobs', '-j', type=int, default=1,
+        help="""Number of threads used to compute concurrently the subexpressions that do not depend on each other. Subexpressions using an exclusive resource such as a target are still computed one at a time. Ignored with --pdb.""")
+
     add_argument(run_advanced_group, '--log-level', default='info',
         choices=('debug', 'info', 'warn', 'error', 'critical'),
         help="""Change the default log level of the standard logging module.""")
@@ -746,6 +753,8 @@ def do_run(args, parser, run_parser, argv):
     verbose = args.verbose
     use_pdb = args.pdb or args.replay
     save_db = args.save_value_db
+    # The debugger cannot be used from the worker threads
+    jobs = 1 if use_pdb else args.jobs
 
     iteration_nr = args.n
     shared_pattern_set = set(args.share)
@@ -830,6 +839,10 @@ def do_run(args, parser, run_parser, argv):
         utils.get_subclasses(cls)
         for cls in adaptor.get_non_reusable_type_set()
     ))
+    exclusive_type_set = set(utils.flatten_seq(
+        utils.get_subclasses(cls)
+        for cls in adaptor.get_exclusive_type_set()
+    ))
 
     op_set = build_op_set(
         callable_pool, non_reusable_type_set, allowed_pattern_set, adaptor,
@@ -1032,6 +1045,9 @@ def do_run(args, parser, run_parser, argv):
         verbose=verbose,
         save_db=save_db,
         use_pdb=use_pdb,
+        jobs=jobs,
+        exclusive_type_set=exclusive_type_set,
+        db_compression=args.value_db_compression,
     )
 
     # If we reloaded a DB, merge it with the current DB so the outcome is a
@@ -1047,7 +1063,8 @@ def do_run(args, parser, run_parser, argv):
 
 
 def exec_expr_list(iteration_expr_list, adaptor, artifact_dir, testsession_uuid,
-                   hidden_callable_set, only_template_scripts, adaptor_cls, verbose, save_db, use_pdb):
+                   hidden_callable_set, only_template_scripts, adaptor_cls, verbose, save_db, use_pdb,
+                   jobs=1, exclusive_type_set=None, db_compression='xz'):
 
     if not only_template_scripts:
         with (artifact_dir / 'UUID').open('wt') as f:
@@ -1114,6 +1131,30 @@ def exec_expr_list(iteration_expr_list, adaptor, artifact_dir, testsession_uuid,
     if only_template_scripts:
         return 0
 
+    def get_log_f(expr_val):
+        op = expr_val.expr.op
+        if (
+            op.callable_ not in hidden_callable_set
+            and not issubclass(op.value_type, engine.ForcedParamType)
+        ):
+            return info
+        else:
+            return debug
+
+    def get_uuid_str(expr_val):
+        return f'UUID={expr_val.uuid}'
+
+    # The DB is written as the iterations complete, so that the values
+    # computed so far are available even if exekall is interrupted.
+    db_path = artifact_dir / utils.DB_FILENAME
+    db_froz_val_seq_list = []
+    if save_db:
+        db_writer = engine.ValueDBWriter(
+            db_path,
+            adaptor_cls=adaptor_cls,
+            compression=db_compression,
+        )
+
     # Preserve the execution order, so the summary is displayed in the same
     # order
     result_map = collections.OrderedDict()
@@ -1121,6 +1162,38 @@ def exec_expr_list(iteration_expr_list, adaptor, artifact_dir, testsession_uuid,
         i += 1
         info(f'Iteration #{i}\n')
 
+        # Values computed concurrently ahead of executing the expressions one
+        # by one. They are accounted for in the first expression using them,
+        # as if they had been computed while executing it.
+        precomputed_expr_val_set = set()
+        # Callback of the expression being executed. The values are reported
+        # to the callback they were computed with when they are reused, so the
+        # precomputed ones need to be forwarded.
+        current_log_expr_val = None
+        if jobs > 1:
+            def log_precomputed(expr_val, reused):
+                if reused:
+                    if current_log_expr_val:
+                        current_log_expr_val(expr_val, reused)
+                elif not isinstance(expr_val.expr.op, engine.PrebuiltOperator):
+                    precomputed_expr_val_set.add(expr_val)
+                    get_log_f(expr_val)('Computed {id} {uuid}'.format(
+                        id=expr_val.get_id(
+                            full_qual=False,
+                            with_tags=True,
+                            hidden_callable_set=hidden_callable_set,
+                        ),
+                        uuid=get_uuid_str(expr_val),
+                    ))
+
+            info(f'Computing subexpressions using {jobs} jobs\n')
+            engine.ComputableExpression.precompute_all(
+                expr_list,
+                jobs=jobs,
+                post_compute_cb=log_precomputed,
+                exclusive_type_set=exclusive_type_set,
+            )
+
         for expr in expr_list:
             exec_start_msg = 'Executing: {short_id}\n\nID: {full_id}\nArtifacts: {folder}\nUUID: {uuid_}'.format(
                 short_id=expr.get_id(
@@ -1153,13 +1226,16 @@ def exec_expr_list(iteration_expr_list, adaptor, artifact_dir, testsession_uuid,
                 sys.stdout.flush()
                 sys.stderr.flush()
 
-            def get_uuid_str(expr_val):
-                return f'UUID={expr_val.uuid}'
-
             computed_expr_val_set = set()
             reused_expr_val_set = set()
 
             def log_expr_val(expr_val, reused):
+                # Already logged when it was computed
+                if expr_val in precomputed_expr_val_set:
+                    precomputed_expr_val_set.remove(expr_val)
+                    computed_expr_val_set.add(expr_val)
+                    return
+
                 # Consider that PrebuiltOperator reuse values instead of
                 # actually computing them.
                 if isinstance(expr_val.expr.op, engine.PrebuiltOperator):
@@ -1172,16 +1248,7 @@ def exec_expr_list(iteration_expr_list, adaptor, artifact_dir, testsession_uuid,
                     msg = 'Computed {id} {uuid}'
                     computed_expr_val_set.add(expr_val)
 
-                op = expr_val.expr.op
-                if (
-                    op.callable_ not in hidden_callable_set
-                    and not issubclass(op.value_type, engine.ForcedParamType)
-                ):
-                    log_f = info
-                else:
-                    log_f = debug
-
-                log_f(msg.format(
+                get_log_f(expr_val)(msg.format(
                     id=expr_val.get_id(
                         full_qual=False,
                         with_tags=True,
@@ -1207,6 +1274,7 @@ def exec_expr_list(iteration_expr_list, adaptor, artifact_dir, testsession_uuid,
 
                 return f'{duration}{cumulative}'
 
+            current_log_expr_val = log_expr_val
             # This returns an iterator
             executor = expr.execute(log_expr_val)
 
@@ -1282,17 +1350,20 @@ def exec_expr_list(iteration_expr_list, adaptor, artifact_dir, testsession_uuid,
             for uuid_ in computed_uuid_set:
                 (artifact_dir / 'BY_UUID' / uuid_).symlink_to(expr_artifact_dir)
 
+        if save_db:
+            froz_val_seq_list = engine.FrozenExprValSeq.from_expr_list(
+                expr_list,
+                hidden_callable_set=hidden_callable_set,
+            )
+            db_writer.append(froz_val_seq_list)
+            db_froz_val_seq_list.extend(froz_val_seq_list)
+
     if save_db:
+        db_writer.close()
         db = engine.ValueDB(
-            engine.FrozenExprValSeq.from_expr_list(
-                utils.flatten_seq(iteration_expr_list),
-                hidden_callable_set=hidden_callable_set,
-            ),
+            db_froz_val_seq_list,
             adaptor_cls=adaptor_cls,
         )
-
-        db_path = artifact_dir / utils.DB_FILENAME
-        db.to_path(db_path)
         relative_db_path = db_path.relative_to(artifact_dir)
     else:
         relative_db_path = None
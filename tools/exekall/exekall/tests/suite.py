@@ -22,6 +22,9 @@ import functools
 import operator
 import contextlib
 import shutil
+import threading
+import time
+import pickle
 
 import exekall.utils as utils
 import exekall.engine as engine
@@ -91,6 +94,12 @@ class TestCaseABC(abc.ABC):
     NON_REUSABLE_TYPES = None
     "Set of types that are not considered reusable"
 
+    JOBS = 1
+    "Number of threads used to compute the expressions"
+
+    EXCLUSIVE_TYPES = None
+    "Set of types representing exclusive resources"
+
     @staticmethod
     def get_tags(obj):
         """
@@ -249,7 +258,15 @@ class TestCaseABC(abc.ABC):
             computed :class:`exekall.engine.ExprVal`.
         :type check_excep: bool
         """
-        for computable_expr in self.get_computable_expr_list():
+        computable_expr_list = self.get_computable_expr_list()
+        if self.JOBS > 1:
+            engine.ComputableExpression.precompute_all(
+                computable_expr_list,
+                jobs=self.JOBS,
+                exclusive_type_set=self.EXCLUSIVE_TYPES,
+            )
+
+        for computable_expr in computable_expr_list:
             expr_val_list = list(computable_expr.execute())
             if check_excep:
                 self.check_excep(expr_val_list)
@@ -512,6 +529,132 @@ class SingleExprTestCase(NoExcepTestCase):
             TestResult.fail_if(len(expr_val_list) != 1, "too many values", [computable_expr])
 
 
+class ConcurrentTestCase(SingleExprTestCase):
+    JOBS = 4
+
+
+class ValueDBTestCase(SingleExprTestCase):
+    @TestCaseABC.test
+    def test_materialize(self):
+        """
+        Test that a pruned :class:`exekall.engine.ValueDB` can be used after
+        its file is removed once it is materialized.
+        """
+        computable_expr_list = self.get_computable_expr_list()
+        for computable_expr in computable_expr_list:
+            self.check_excep(list(computable_expr.execute()))
+
+        folder = self.artifact_dir / 'test_value_db'
+        folder.mkdir(exist_ok=True)
+        path = folder / 'VALUE_DB.pickle.xz'
+        with engine.ValueDBWriter(path) as writer:
+            # Store all the values in their own frame, so they are loaded
+            # lazily like large values would be.
+            writer.INLINE_SIZE = 0
+            writer.append(
+                engine.FrozenExprValSeq.from_expr_list(computable_expr_list)
+            )
+
+        db = engine.ValueDB.from_path(path)
+        root_uuids = {
+            froz_val.uuid
+            for froz_val in db.get_roots()
+        }
+        db = db.prune_by_predicate(lambda froz_val: froz_val.uuid not in root_uuids)
+        db.materialize()
+        path.unlink()
+
+        db = pickle.loads(pickle.dumps(db))
+        roots = db.get_roots()
+        TestResult.fail_if(not roots, 'no root value in the DB')
+        for froz_val in roots:
+            TestResult.fail_if(
+                type(froz_val.value) is not Final,
+                f'wrong root value: {froz_val.value}',
+            )
+
+
+class Resource:
+    pass
+
+
+class Resource1:
+    pass
+
+
+class Resource2:
+    pass
+
+
+RESOURCE_USAGE = dict(active=0, max=0)
+RESOURCE_USAGE_LOCK = threading.Lock()
+
+
+def use_resource(resource):
+    assert type(resource) is Resource
+    with RESOURCE_USAGE_LOCK:
+        RESOURCE_USAGE['active'] += 1
+        RESOURCE_USAGE['max'] = max(RESOURCE_USAGE['max'], RESOURCE_USAGE['active'])
+
+    time.sleep(0.1)
+
+    with RESOURCE_USAGE_LOCK:
+        RESOURCE_USAGE['active'] -= 1
+
+
+def make_resource() -> Resource:
+    return Resource()
+
+
+def use_resource1(resource: Resource) -> Resource1:
+    use_resource(resource)
+    return Resource1()
+
+
+def use_resource2(resource: Resource) -> Resource2:
+    use_resource(resource)
+    return Resource2()
+
+
+# Independent expressions sharing the resource. Parameters of a given callable
+# are not computed concurrently, since a parameter is not computed if the
+# preceding one failed.
+def final_resource1(r1: Resource1) -> Final:
+    assert type(r1) is Resource1
+    return Final()
+
+
+def final_resource2(r2: Resource2) -> Final:
+    assert type(r2) is Resource2
+    return Final()
+
+
+class NonExclusiveTestCase(NoExcepTestCase):
+    CALLABLES = {make_resource, use_resource1, use_resource2, final_resource1, final_resource2}
+    JOBS = 4
+    EXPECTED_MAX_USAGE = 2
+
+    @TestCaseABC.test
+    def test_resource_usage(self):
+        """
+        Test the number of subexpressions using the resource at the same time.
+        """
+        RESOURCE_USAGE.update(active=0, max=0)
+        list(self.execute())
+        TestResult.fail_if(
+            RESOURCE_USAGE['max'] != self.EXPECTED_MAX_USAGE,
+            'Resource used by {} subexpressions at the same time, expected {}'.format(
+                RESOURCE_USAGE['max'],
+                self.EXPECTED_MAX_USAGE,
+            ),
+        )
+
+
+class ExclusiveTestCase(NonExclusiveTestCase):
+    EXCLUSIVE_TYPES = {Resource}
+    EXPECTED_MAX_USAGE = 1
+
+
 class Bderived(B):
     pass
 
@@ -20,6 +20,7 @@
 # external code.
 from exekall.engine import (
     ValueDB,
+    ValueDBWriter,
     FrozenExprVal,
     PrunedFrozVal,
     FrozenExprValSeq,